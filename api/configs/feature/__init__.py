@@ -6,6 +6,7 @@ from pydantic import (
     Field,
     HttpUrl,
     NegativeInt,
+    NonNegativeFloat,
     NonNegativeInt,
     PositiveFloat,
     PositiveInt,
@@ -83,6 +84,27 @@ class AppExecutionConfig(BaseSettings):
     )
 
 
+class ConversationMemoryConfig(BaseSettings):
+    """
+    Configuration for conversation memory snapshots
+    """
+
+    CONVERSATION_MEMORY_SNAPSHOT_ENABLED: bool = Field(
+        description="Enable or disable caching of token-counted conversation memory windows in Redis",
+        default=False,
+    )
+
+    CONVERSATION_MEMORY_SNAPSHOT_TTL: PositiveInt = Field(
+        description="Expiration time in seconds for conversation memory snapshots",
+        default=3600,
+    )
+
+    CONVERSATION_MEMORY_SNAPSHOT_MAX_TOKENS: PositiveInt = Field(
+        description="Maximum number of history tokens kept in a conversation memory snapshot",
+        default=32000,
+    )
+
+
 class CodeExecutionSandboxConfig(BaseSettings):
     """
     Configuration for the code execution sandbox environment
@@ -191,6 +213,56 @@ class PluginConfig(BaseSettings):
 
     INNER_API_KEY_FOR_PLUGIN: str = Field(description="Inner api key for plugin", default="inner-api-key")
 
+    PLUGIN_DAEMON_CONNECT_TIMEOUT: PositiveFloat = Field(
+        description="Connect timeout in seconds for plugin daemon requests",
+        default=10.0,
+    )
+
+    PLUGIN_DAEMON_READ_TIMEOUT: PositiveFloat | None = Field(
+        description="Read timeout in seconds for plugin daemon requests, covering long running model invocations"
+        " (set to None to disable)",
+        default=600.0,
+    )
+
+    PLUGIN_DAEMON_WRITE_TIMEOUT: PositiveFloat | None = Field(
+        description="Write timeout in seconds for plugin daemon requests (set to None to disable)",
+        default=600.0,
+    )
+
+    PLUGIN_DAEMON_POOL_MAX_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of concurrent connections per process for the plugin daemon HTTP client."
+        " Streaming model and tool invocations hold a connection until they finish, so with more concurrent"
+        " invocations than this per process, further requests wait up to PLUGIN_DAEMON_POOL_TIMEOUT"
+        " for a free connection",
+        default=100,
+    )
+
+    PLUGIN_DAEMON_POOL_TIMEOUT: PositiveFloat | None = Field(
+        description="Timeout in seconds to wait for a free plugin daemon connection when all"
+        " PLUGIN_DAEMON_POOL_MAX_CONNECTIONS are in use (set to None to wait indefinitely)",
+        default=30.0,
+    )
+
+    PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of persistent keep-alive connections for the plugin daemon HTTP client",
+        default=50,
+    )
+
+    PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY: PositiveFloat | None = Field(
+        description="Keep-alive expiry in seconds for idle plugin daemon connections (set to None to disable)",
+        default=30.0,
+    )
+
+    PLUGIN_DAEMON_CONNECT_RETRIES: NonNegativeInt = Field(
+        description="Number of retries when connecting to the plugin daemon fails",
+        default=3,
+    )
+
+    PLUGIN_DAEMON_HTTP2_ENABLED: bool = Field(
+        description="Enable HTTP/2 for plugin daemon requests, requires the `h2` package and a TLS endpoint",
+        default=False,
+    )
+
     PLUGIN_REMOTE_INSTALL_HOST: str = Field(
         description="Plugin Remote Install Host",
         default="localhost",
@@ -604,6 +676,80 @@ class WorkflowConfig(BaseSettings):
         ge=0.1,
     )
 
+    GRAPH_ENGINE_READY_QUEUE: Literal["fifo", "priority"] = Field(
+        description="Order in which ready nodes are executed: 'fifo' in the order they became ready,"
+        " 'priority' favouring the critical path to answer/end nodes and sharing workers fairly between"
+        " parallel branches",
+        default="priority",
+    )
+
+    GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED: bool = Field(
+        description="Run the nodes of all GraphEngine instances in the process, including nested iteration and loop"
+        " runs, on one shared worker pool instead of per-instance worker threads",
+        default=False,
+    )
+
+    GRAPH_ENGINE_SHARED_WORKER_POOL_SIZE: PositiveInt = Field(
+        description="Maximum number of threads of the shared GraphEngine worker pool, not counting threads waiting"
+        " for nested iteration or loop runs",
+        default=100,
+    )
+
+    GRAPH_ENGINE_EVENT_BUFFER_SIZE: PositiveInt = Field(
+        description="Maximum number of unconsumed events buffered per GraphEngine before producers are blocked",
+        default=1000,
+    )
+
+    WORKFLOW_GRAPH_TOPOLOGY_CACHE_SIZE: NonNegativeInt = Field(
+        description="Maximum number of compiled workflow graph topologies kept in memory per process, 0 to disable",
+        default=256,
+    )
+
+    WORKFLOW_CPU_BOUND_PROCESS_POOL_SIZE: NonNegativeInt = Field(
+        description="Number of worker processes per API or Celery process for CPU-bound workflow nodes,"
+        " such as document extraction, 0 to run them on the graph engine worker threads",
+        default=0,
+    )
+
+    WORKFLOW_CHECKPOINT_ENABLED: bool = Field(
+        description="Save checkpoints of running workflows, so that a run restarted with the same workflow run ID"
+        " resumes from its last checkpoint instead of running its completed nodes again",
+        default=False,
+    )
+
+    WORKFLOW_CHECKPOINT_STORE: Literal["redis", "file"] = Field(
+        description="Where workflow checkpoints are stored: 'redis', or 'file' for a local directory",
+        default="redis",
+    )
+
+    WORKFLOW_CHECKPOINT_FILE_DIR: str = Field(
+        description="Directory for workflow checkpoints when WORKFLOW_CHECKPOINT_STORE is 'file'",
+        default="storage/workflow_checkpoints",
+    )
+
+    WORKFLOW_CHECKPOINT_INTERVAL: NonNegativeFloat = Field(
+        description="Minimum number of seconds between two checkpoints of a workflow run,"
+        " checkpoints are saved when a node completes",
+        default=10.0,
+    )
+
+    WORKFLOW_CHECKPOINT_TTL: PositiveInt = Field(
+        description="Seconds a workflow checkpoint in Redis is kept after its last update",
+        default=86400,
+    )
+
+    WORKFLOW_PROFILING_ENABLED: bool = Field(
+        description="Profile each node execution of workflow runs: queue wait, execution time, event handling time,"
+        " variable sizes and LLM latency",
+        default=False,
+    )
+
+    WORKFLOW_PROFILING_EXPORTER: Literal["otel", "json"] = Field(
+        description="How workflow profiles are exported: 'otel' as OpenTelemetry spans, or 'json' as a flamegraph"
+        " saved to storage under workflow_profiles/",
+        default="otel",
+    )
+
 
 class WorkflowNodeExecutionConfig(BaseSettings):
     """
@@ -638,10 +784,24 @@ class RepositoryConfig(BaseSettings):
         "'core.repositories.sqlalchemy_workflow_node_execution_repository."
         "SQLAlchemyWorkflowNodeExecutionRepository' (default), "
         "'core.repositories.celery_workflow_node_execution_repository."
-        "CeleryWorkflowNodeExecutionRepository'",
+        "CeleryWorkflowNodeExecutionRepository', "
+        "'core.repositories.batched_workflow_node_execution_repository."
+        "BatchedWorkflowNodeExecutionRepository'",
         default="core.repositories.sqlalchemy_workflow_node_execution_repository.SQLAlchemyWorkflowNodeExecutionRepository",
     )
 
+    WORKFLOW_NODE_EXECUTION_FLUSH_INTERVAL: PositiveFloat = Field(
+        description="Maximum number of seconds the batched node execution repository buffers changes before "
+        "writing them to the database",
+        default=1.0,
+    )
+
+    WORKFLOW_NODE_EXECUTION_FLUSH_BATCH_SIZE: PositiveInt = Field(
+        description="Number of buffered node executions that makes the batched node execution repository "
+        "write them to the database immediately",
+        default=500,
+    )
+
     API_WORKFLOW_NODE_EXECUTION_REPOSITORY: str = Field(
         description="Service-layer repository implementation for WorkflowNodeExecutionModel operations. "
         "Specify as a module path",
@@ -932,6 +1092,82 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    EMBEDDING_CACHE_LOOKUP_BATCH_SIZE: PositiveInt = Field(
+        description="Maximum number of text hashes looked up per query when probing the embedding cache table",
+        default=500,
+    )
+
+    EMBEDDING_LOCAL_CACHE_SIZE: PositiveInt = Field(
+        description="Maximum number of embedding vectors kept in the per-process LRU cache",
+        default=1000,
+    )
+
+    EMBEDDING_SCHEDULER_MAX_CONCURRENCY: PositiveInt = Field(
+        description="Maximum number of in-flight embedding requests per provider credentials in a process,"
+        " shared by all the indexing tasks of a worker and lowered while the provider rate limits",
+        default=4,
+    )
+
+    EMBEDDING_SCHEDULER_MAX_BATCH_TOKENS: PositiveInt = Field(
+        description="Maximum number of tokens sent in one embedding request",
+        default=100000,
+    )
+
+    EMBEDDING_SCHEDULER_MAX_RETRIES: NonNegativeInt = Field(
+        description="Number of times a rate limited embedding request is retried",
+        default=5,
+    )
+
+    EMBEDDING_SCHEDULER_BACKOFF_BASE: PositiveFloat = Field(
+        description="Seconds embedding requests wait after a rate limited request, doubled for each consecutive one",
+        default=1.0,
+    )
+
+    EMBEDDING_SCHEDULER_BACKOFF_MAX: PositiveFloat = Field(
+        description="Maximum number of seconds embedding requests wait after a rate limited request",
+        default=60.0,
+    )
+
+    INDEXING_MAX_WORKERS: PositiveInt = Field(
+        description="Number of threads loading the chunks of a document into the index",
+        default=10,
+    )
+
+    EXTRACT_PROCESS_POOL_SIZE: NonNegativeInt = Field(
+        description="Number of worker processes per API or Celery process extracting the pages of large PDF files"
+        " in parallel, 0 to extract them sequentially",
+        default=0,
+    )
+
+    PDF_EXTRACT_PAGES_PER_TASK: PositiveInt = Field(
+        description="Number of PDF pages extracted by one task of the extraction process pool,"
+        " files with fewer pages are extracted sequentially",
+        default=50,
+    )
+
+    DOCUMENT_SEGMENT_BATCH_SIZE: PositiveInt = Field(
+        description="Number of document chunks whose segments are looked up, inserted and committed together"
+        " when saving chunks during indexing",
+        default=1000,
+    )
+
+    INDEXING_PIPELINE_ENABLED: bool = Field(
+        description="Index documents as a pipeline, saving and embedding the chunks of a document"
+        " while it is still being extracted and split",
+        default=True,
+    )
+
+    INDEXING_PIPELINE_BATCH_SIZE: PositiveInt = Field(
+        description="Number of chunks saved and embedded together by the indexing pipeline",
+        default=100,
+    )
+
+    INDEXING_PIPELINE_MAX_PENDING_BATCHES: PositiveInt = Field(
+        description="Maximum number of chunk batches being embedded by the indexing pipeline,"
+        " extraction waits until one of them is done when reached",
+        default=10,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -1103,6 +1339,7 @@ class FeatureConfig(
     AuthConfig,  # Changed from OAuthConfig to AuthConfig
     BillingConfig,
     CodeExecutionSandboxConfig,
+    ConversationMemoryConfig,
     PluginConfig,
     MarketplaceConfig,
     DataSetConfig,
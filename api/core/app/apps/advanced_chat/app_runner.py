@@ -143,6 +143,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
+                workflow_graph=self._workflow.graph,
             )
 
         db.session.close()
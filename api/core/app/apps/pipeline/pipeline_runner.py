@@ -14,6 +14,7 @@ from core.workflow.entities.graph_init_params import GraphInitParams
 from core.workflow.entities.graph_runtime_state import GraphRuntimeState
 from core.workflow.entities.variable_pool import VariablePool
 from core.workflow.graph import Graph
+from core.workflow.graph.graph_topology import workflow_graph_cache_key
 from core.workflow.graph_events import GraphEngineEvent, GraphRunFailedEvent
 from core.workflow.nodes.node_factory import DifyNodeFactory
 from core.workflow.system_variable import SystemVariable
@@ -222,6 +223,7 @@ class PipelineRunner(WorkflowBasedAppRunner):
         # graph_config["nodes"] = real_run_nodes
         # graph_config["edges"] = real_edges
         # init graph
+        graph_cache_key = workflow_graph_cache_key(workflow.id, workflow.graph)
         # Create required parameters for Graph.init
         graph_init_params = GraphInitParams(
             tenant_id=workflow.tenant_id,
@@ -232,13 +234,16 @@ class PipelineRunner(WorkflowBasedAppRunner):
             user_from=UserFrom.ACCOUNT.value,
             invoke_from=InvokeFrom.SERVICE_API.value,
             call_depth=0,
+            graph_cache_key=graph_cache_key,
         )
 
         node_factory = DifyNodeFactory(
             graph_init_params=graph_init_params,
             graph_runtime_state=graph_runtime_state,
         )
-        graph = Graph.init(graph_config=graph_config, node_factory=node_factory, root_node_id=start_node_id)
+        graph = Graph.init(
+            graph_config=graph_config, node_factory=node_factory, root_node_id=start_node_id, cache_key=graph_cache_key
+        )
 
         if not graph:
             raise ValueError("graph not found in workflow")
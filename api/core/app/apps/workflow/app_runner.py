@@ -88,6 +88,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
+                workflow_graph=self._workflow.graph,
             )
 
         # RUN WORKFLOW
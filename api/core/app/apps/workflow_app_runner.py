@@ -27,6 +27,7 @@ from core.app.entities.queue_entities import (
 )
 from core.workflow.entities import GraphInitParams, GraphRuntimeState, VariablePool
 from core.workflow.graph import Graph
+from core.workflow.graph.graph_topology import workflow_graph_cache_key
 from core.workflow.graph_events import (
     GraphEngineEvent,
     GraphRunFailedEvent,
@@ -80,9 +81,13 @@ class WorkflowBasedAppRunner:
         workflow_id: str = "",
         tenant_id: str = "",
         user_id: str = "",
+        workflow_graph: str | None = None,
     ) -> Graph:
         """
         Init graph
+
+        When the serialized `workflow_graph` is given, the compiled graph topology is shared by all
+        runs of the same workflow version, as are the topologies of its iteration and loop sub-graphs.
         """
         if "nodes" not in graph_config or "edges" not in graph_config:
             raise ValueError("nodes or edges not found in workflow graph")
@@ -93,6 +98,10 @@ class WorkflowBasedAppRunner:
         if not isinstance(graph_config.get("edges"), list):
             raise ValueError("edges in workflow graph must be a list")
 
+        graph_cache_key = None
+        if workflow_graph:
+            graph_cache_key = workflow_graph_cache_key(workflow_id, workflow_graph)
+
         # Create required parameters for Graph.init
         graph_init_params = GraphInitParams(
             tenant_id=tenant_id or "",
@@ -103,6 +112,7 @@ class WorkflowBasedAppRunner:
             user_from=UserFrom.ACCOUNT.value,
             invoke_from=InvokeFrom.SERVICE_API.value,
             call_depth=0,
+            graph_cache_key=graph_cache_key,
         )
 
         # Use the provided graph_runtime_state for consistent state management
@@ -113,7 +123,7 @@ class WorkflowBasedAppRunner:
         )
 
         # init graph
-        graph = Graph.init(graph_config=graph_config, node_factory=node_factory)
+        graph = Graph.init(graph_config=graph_config, node_factory=node_factory, cache_key=graph_cache_key)
 
         if not graph:
             raise ValueError("graph not found in workflow")
@@ -247,6 +257,8 @@ class WorkflowBasedAppRunner:
             user_from=UserFrom.ACCOUNT.value,
             invoke_from=InvokeFrom.SERVICE_API.value,
             call_depth=0,
+            # the filtered graph is fully determined by the workflow graph and the node run
+            graph_cache_key=f"{workflow_graph_cache_key(workflow.id, workflow.graph)}:{node_id}",
         )
 
         node_factory = DifyNodeFactory(
@@ -5,6 +5,7 @@ import re
 import threading
 import time
 import uuid
+from collections.abc import Iterator
 from typing import Any
 
 from flask import current_app
@@ -67,23 +68,7 @@ class IndexingRunner:
                     raise ValueError("no process rule found")
                 index_type = dataset_document.doc_form
                 index_processor = IndexProcessorFactory(index_type).init_index_processor()
-                # extract
-                text_docs = self._extract(index_processor, dataset_document, processing_rule.to_dict())
-
-                # transform
-                documents = self._transform(
-                    index_processor, dataset, text_docs, dataset_document.doc_language, processing_rule.to_dict()
-                )
-                # save segment
-                self._load_segments(dataset, dataset_document, documents)
-
-                # load
-                self._load(
-                    index_processor=index_processor,
-                    dataset=dataset,
-                    dataset_document=dataset_document,
-                    documents=documents,
-                )
+                self._index_document(index_processor, dataset, dataset_document, processing_rule.to_dict())
             except DocumentIsPausedError:
                 raise DocumentIsPausedError(f"Document paused, document id: {dataset_document.id}")
             except ProviderTokenNotInitError as e:
@@ -116,6 +101,16 @@ class IndexingRunner:
                 .all()
             )
 
+            index_type = dataset_document.doc_form
+            index_processor = IndexProcessorFactory(index_type).init_index_processor()
+            if document_segments:
+                # an interrupted pipeline run may have indexed some of the segments already
+                index_processor.clean(
+                    dataset,
+                    [document_segment.index_node_id for document_segment in document_segments],
+                    with_keywords=True,
+                    delete_child_chunks=True,
+                )
             for document_segment in document_segments:
                 db.session.delete(document_segment)
                 if dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX:
@@ -128,22 +123,7 @@ class IndexingRunner:
             if not processing_rule:
                 raise ValueError("no process rule found")
 
-            index_type = dataset_document.doc_form
-            index_processor = IndexProcessorFactory(index_type).init_index_processor()
-            # extract
-            text_docs = self._extract(index_processor, dataset_document, processing_rule.to_dict())
-
-            # transform
-            documents = self._transform(
-                index_processor, dataset, text_docs, dataset_document.doc_language, processing_rule.to_dict()
-            )
-            # save segment
-            self._load_segments(dataset, dataset_document, documents)
-
-            # load
-            self._load(
-                index_processor=index_processor, dataset=dataset, dataset_document=dataset_document, documents=documents
-            )
+            self._index_document(index_processor, dataset, dataset_document, processing_rule.to_dict())
         except DocumentIsPausedError:
             raise DocumentIsPausedError(f"Document paused, document id: {dataset_document.id}")
         except ProviderTokenNotInitError as e:
@@ -326,6 +306,189 @@ class IndexingRunner:
             return IndexingEstimate(total_segments=total_segments * 20, qa_preview=qa_preview_texts, preview=[])
         return IndexingEstimate(total_segments=total_segments, preview=preview_texts)
 
+    def _index_document(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset: Dataset,
+        dataset_document: DatasetDocument,
+        process_rule: dict,
+    ):
+        """Extract, split and index a document, as a pipeline when its chunks can be split incrementally."""
+        if dify_config.INDEXING_PIPELINE_ENABLED and index_processor.supports_incremental_transform(process_rule):
+            self._run_pipeline(index_processor, dataset, dataset_document, process_rule)
+            return
+
+        # extract
+        text_docs = self._extract(index_processor, dataset_document, process_rule)
+
+        # transform
+        documents = self._transform(index_processor, dataset, text_docs, dataset_document.doc_language, process_rule)
+        # save segment
+        self._load_segments(dataset, dataset_document, documents)
+
+        # load
+        self._load(
+            index_processor=index_processor, dataset=dataset, dataset_document=dataset_document, documents=documents
+        )
+
+    def _run_pipeline(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset: Dataset,
+        dataset_document: DatasetDocument,
+        process_rule: dict,
+    ):
+        """
+        Index a document as a pipeline: the document is split as its pages are extracted, and each
+        batch of chunks is saved as segments and handed over to the indexing workers while the next
+        batches are extracted and split.
+
+        Extraction waits while INDEXING_PIPELINE_MAX_PENDING_BATCHES batches are being indexed, so
+        only a bounded number of chunks is held in memory when the extractor yields pages lazily.
+        The document goes through the same statuses as with the sequential phases, its segment count
+        grows as batches are saved and its completed segment count as they are indexed. It stays in
+        splitting until the whole document has been split, so an interrupted run is recovered by
+        splitting the document again instead of completing the segments saved so far.
+        """
+        embedding_model_instance = None
+        if dataset.indexing_technique == "high_quality":
+            embedding_model_instance = self.model_manager.get_model_instance(
+                tenant_id=dataset.tenant_id,
+                provider=dataset.embedding_model_provider,
+                model_type=ModelType.TEXT_EMBEDDING,
+                model=dataset.embedding_model,
+            )
+        doc_store = DatasetDocumentStore(
+            dataset=dataset, user_id=dataset_document.created_by, document_id=dataset_document.id
+        )
+        max_pending_batches = dify_config.INDEXING_PIPELINE_MAX_PENDING_BATCHES
+
+        indexing_start_at = time.perf_counter()
+        tokens = 0
+        pending: set[concurrent.futures.Future] = set()
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_pending_batches, dify_config.INDEXING_MAX_WORKERS)
+        ) as executor:
+            batches = self._split_in_batches(index_processor, dataset, dataset_document, process_rule)
+            for documents in batches:
+                if len(pending) >= max_pending_batches:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    tokens += sum(future.result() or 0 for future in done)
+
+                # check document is paused
+                self._check_document_paused_status(dataset_document.id)
+                # save segment
+                doc_store.add_documents(
+                    docs=documents, save_child=dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX
+                )
+                db.session.query(DocumentSegment).where(
+                    DocumentSegment.document_id == dataset_document.id,
+                    DocumentSegment.dataset_id == dataset.id,
+                    DocumentSegment.index_node_id.in_([document.metadata["doc_id"] for document in documents]),
+                ).update(
+                    {
+                        DocumentSegment.status: "indexing",
+                        DocumentSegment.indexing_at: naive_utc_now(),
+                    }
+                )
+                db.session.commit()
+
+                # load
+                if dataset.indexing_technique == "high_quality":
+                    pending.add(
+                        executor.submit(
+                            self._process_chunk,
+                            current_app._get_current_object(),  # type: ignore
+                            index_processor,
+                            documents,
+                            dataset,
+                            dataset_document,
+                            embedding_model_instance,
+                        )
+                    )
+                elif dataset_document.doc_form != IndexType.PARENT_CHILD_INDEX:
+                    pending.add(
+                        executor.submit(
+                            self._process_keyword_index,
+                            current_app._get_current_object(),  # type: ignore
+                            dataset.id,
+                            dataset_document.id,
+                            documents,
+                        )
+                    )
+
+            for future in concurrent.futures.as_completed(pending):
+                tokens += future.result() or 0
+        indexing_end_at = time.perf_counter()
+
+        # update document status to completed
+        self._update_document_index_status(
+            document_id=dataset_document.id,
+            after_indexing_status="completed",
+            extra_update_params={
+                DatasetDocument.tokens: tokens,
+                DatasetDocument.completed_at: naive_utc_now(),
+                DatasetDocument.indexing_latency: indexing_end_at - indexing_start_at,
+                DatasetDocument.error: None,
+            },
+        )
+
+    def _split_in_batches(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset: Dataset,
+        dataset_document: DatasetDocument,
+        process_rule: dict,
+    ) -> Iterator[list[Document]]:
+        """Extract the document lazily and split each page as it comes, yielding the chunks in batches."""
+        text_docs: Iterator[Document] = iter(())
+        if dataset_document.data_source_type in {"upload_file", "notion_import", "website_crawl"}:
+            extract_setting = self._get_extract_setting(dataset_document)
+            if extract_setting:
+                text_docs = index_processor.lazy_extract(extract_setting, process_rule_mode=process_rule["mode"])
+        embedding_model_instance = self._get_splitter_embedding_model_instance(dataset)
+        batch_size = dify_config.INDEXING_PIPELINE_BATCH_SIZE
+
+        word_count = 0
+        chunks: list[Document] = []
+        for page_number, text_doc in enumerate(text_docs):
+            if page_number == 0:
+                # update document status to splitting
+                self._update_document_index_status(document_id=dataset_document.id, after_indexing_status="splitting")
+            word_count += len(text_doc.page_content)
+            # replace doc id to document model id
+            if text_doc.metadata is not None:
+                text_doc.metadata["document_id"] = dataset_document.id
+                text_doc.metadata["dataset_id"] = dataset_document.dataset_id
+
+            chunks.extend(
+                index_processor.transform(
+                    [text_doc],
+                    embedding_model_instance=embedding_model_instance,
+                    process_rule=process_rule,
+                    tenant_id=dataset.tenant_id,
+                    doc_language=dataset_document.doc_language,
+                )
+            )
+            while len(chunks) >= batch_size:
+                yield chunks[:batch_size]
+                chunks = chunks[batch_size:]
+        if chunks:
+            yield chunks
+
+        # update document status to indexing, the whole document has been extracted and split
+        cur_time = naive_utc_now()
+        self._update_document_index_status(
+            document_id=dataset_document.id,
+            after_indexing_status="indexing",
+            extra_update_params={
+                DatasetDocument.word_count: word_count,
+                DatasetDocument.parsing_completed_at: cur_time,
+                DatasetDocument.cleaning_completed_at: cur_time,
+                DatasetDocument.splitting_completed_at: cur_time,
+            },
+        )
+
     def _extract(
         self, index_processor: BaseIndexProcessor, dataset_document: DatasetDocument, process_rule: dict
     ) -> list[Document]:
@@ -333,8 +496,31 @@ class IndexingRunner:
         if dataset_document.data_source_type not in {"upload_file", "notion_import", "website_crawl"}:
             return []
 
-        data_source_info = dataset_document.data_source_info_dict
         text_docs = []
+        extract_setting = self._get_extract_setting(dataset_document)
+        if extract_setting:
+            text_docs = index_processor.extract(extract_setting, process_rule_mode=process_rule["mode"])
+        # update document status to splitting
+        self._update_document_index_status(
+            document_id=dataset_document.id,
+            after_indexing_status="splitting",
+            extra_update_params={
+                DatasetDocument.word_count: sum(len(text_doc.page_content) for text_doc in text_docs),
+                DatasetDocument.parsing_completed_at: naive_utc_now(),
+            },
+        )
+
+        # replace doc id to document model id
+        for text_doc in text_docs:
+            if text_doc.metadata is not None:
+                text_doc.metadata["document_id"] = dataset_document.id
+                text_doc.metadata["dataset_id"] = dataset_document.dataset_id
+
+        return text_docs
+
+    @staticmethod
+    def _get_extract_setting(dataset_document: DatasetDocument) -> ExtractSetting | None:
+        data_source_info = dataset_document.data_source_info_dict
         if dataset_document.data_source_type == "upload_file":
             if not data_source_info or "upload_file_id" not in data_source_info:
                 raise ValueError("no upload file found")
@@ -342,12 +528,11 @@ class IndexingRunner:
             file_detail = db.session.scalars(stmt).one_or_none()
 
             if file_detail:
-                extract_setting = ExtractSetting(
+                return ExtractSetting(
                     datasource_type=DatasourceType.FILE.value,
                     upload_file=file_detail,
                     document_model=dataset_document.doc_form,
                 )
-                text_docs = index_processor.extract(extract_setting, process_rule_mode=process_rule["mode"])
         elif dataset_document.data_source_type == "notion_import":
             if (
                 not data_source_info
@@ -355,7 +540,7 @@ class IndexingRunner:
                 or "notion_page_id" not in data_source_info
             ):
                 raise ValueError("no notion import info found")
-            extract_setting = ExtractSetting(
+            return ExtractSetting(
                 datasource_type=DatasourceType.NOTION.value,
                 notion_info={
                     "credential_id": data_source_info["credential_id"],
@@ -367,7 +552,6 @@ class IndexingRunner:
                 },
                 document_model=dataset_document.doc_form,
             )
-            text_docs = index_processor.extract(extract_setting, process_rule_mode=process_rule["mode"])
         elif dataset_document.data_source_type == "website_crawl":
             if (
                 not data_source_info
@@ -376,7 +560,7 @@ class IndexingRunner:
                 or "job_id" not in data_source_info
             ):
                 raise ValueError("no website import info found")
-            extract_setting = ExtractSetting(
+            return ExtractSetting(
                 datasource_type=DatasourceType.WEBSITE.value,
                 website_info={
                     "provider": data_source_info["provider"],
@@ -388,24 +572,7 @@ class IndexingRunner:
                 },
                 document_model=dataset_document.doc_form,
             )
-            text_docs = index_processor.extract(extract_setting, process_rule_mode=process_rule["mode"])
-        # update document status to splitting
-        self._update_document_index_status(
-            document_id=dataset_document.id,
-            after_indexing_status="splitting",
-            extra_update_params={
-                DatasetDocument.word_count: sum(len(text_doc.page_content) for text_doc in text_docs),
-                DatasetDocument.parsing_completed_at: naive_utc_now(),
-            },
-        )
-
-        # replace doc id to document model id
-        for text_doc in text_docs:
-            if text_doc.metadata is not None:
-                text_doc.metadata["document_id"] = dataset_document.id
-                text_doc.metadata["dataset_id"] = dataset_document.dataset_id
-
-        return text_docs
+        return None
 
     @staticmethod
     def filter_string(text):
@@ -539,7 +706,7 @@ class IndexingRunner:
             )
             create_keyword_thread.start()
 
-        max_workers = 10
+        max_workers = dify_config.INDEXING_MAX_WORKERS
         if dataset.indexing_technique == "high_quality":
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
                 futures = []
@@ -691,25 +858,9 @@ class IndexingRunner:
         doc_language: str,
         process_rule: dict,
     ) -> list[Document]:
-        # get embedding model instance
-        embedding_model_instance = None
-        if dataset.indexing_technique == "high_quality":
-            if dataset.embedding_model_provider:
-                embedding_model_instance = self.model_manager.get_model_instance(
-                    tenant_id=dataset.tenant_id,
-                    provider=dataset.embedding_model_provider,
-                    model_type=ModelType.TEXT_EMBEDDING,
-                    model=dataset.embedding_model,
-                )
-            else:
-                embedding_model_instance = self.model_manager.get_default_model_instance(
-                    tenant_id=dataset.tenant_id,
-                    model_type=ModelType.TEXT_EMBEDDING,
-                )
-
         documents = index_processor.transform(
             text_docs,
-            embedding_model_instance=embedding_model_instance,
+            embedding_model_instance=self._get_splitter_embedding_model_instance(dataset),
             process_rule=process_rule,
             tenant_id=dataset.tenant_id,
             doc_language=doc_language,
@@ -717,6 +868,22 @@ class IndexingRunner:
 
         return documents
 
+    def _get_splitter_embedding_model_instance(self, dataset: Dataset) -> ModelInstance | None:
+        """Get the embedding model instance whose tokenizer the splitter counts tokens with."""
+        if dataset.indexing_technique != "high_quality":
+            return None
+        if dataset.embedding_model_provider:
+            return self.model_manager.get_model_instance(
+                tenant_id=dataset.tenant_id,
+                provider=dataset.embedding_model_provider,
+                model_type=ModelType.TEXT_EMBEDDING,
+                model=dataset.embedding_model,
+            )
+        return self.model_manager.get_default_model_instance(
+            tenant_id=dataset.tenant_id,
+            model_type=ModelType.TEXT_EMBEDDING,
+        )
+
     def _load_segments(self, dataset, dataset_document, documents):
         # save node to document segment
         doc_store = DatasetDocumentStore(
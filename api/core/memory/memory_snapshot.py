@@ -0,0 +1,134 @@
+import logging
+from collections.abc import Sequence
+
+from pydantic import BaseModel, ValidationError
+
+from configs import dify_config
+from core.model_runtime.entities import AssistantPromptMessage, PromptMessage, PromptMessageRole, UserPromptMessage
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class MemorySnapshotEntry(BaseModel):
+    """One history prompt message of a thread, with its token count."""
+
+    message_id: str
+    role: PromptMessageRole
+    content: str
+    tokens: int
+    # prompt messages with files are rebuilt from the database, only their text is kept here
+    has_files: bool = False
+
+    def to_prompt_message(self) -> PromptMessage:
+        if self.role == PromptMessageRole.USER:
+            return UserPromptMessage(content=self.content)
+        return AssistantPromptMessage(content=self.content)
+
+
+class MemorySnapshot(BaseModel):
+    """
+    Token-counted history window of the conversation thread ending at a given message.
+
+    Entries are ordered from the newest prompt message to the oldest. Since completed messages
+    are immutable and a thread is fully determined by its last message, the snapshot of a message
+    never changes: the snapshot of a new message is the snapshot of its parent with the new
+    message prepended, pruned to the maximum number of tokens kept. The store keeps one snapshot
+    per thread, the snapshot of the parent is dropped once the snapshot of its child is saved.
+    """
+
+    entries: list[MemorySnapshotEntry]
+    # largest max_token_limit the entries are guaranteed to answer
+    token_limit: int
+    # largest number of history messages the entries are guaranteed to answer
+    message_limit: int
+    # whether the entries reach the first message of the thread
+    exhausted: bool
+
+    def covers(self, max_token_limit: int, message_limit: int) -> bool:
+        return self.exhausted or (max_token_limit <= self.token_limit and message_limit <= self.message_limit)
+
+    def select_window(self, max_token_limit: int, message_limit: int) -> list[MemorySnapshotEntry]:
+        """Pick the newest entries within the limits, keeping at least one, ordered from oldest to newest."""
+        window: list[MemorySnapshotEntry] = []
+        message_ids: set[str] = set()
+        curr_message_tokens = 0
+        for entry in self.entries:
+            if entry.message_id not in message_ids and len(message_ids) >= message_limit:
+                break
+            if window and curr_message_tokens + entry.tokens > max_token_limit:
+                break
+            message_ids.add(entry.message_id)
+            curr_message_tokens += entry.tokens
+            window.append(entry)
+        window.reverse()
+        return window
+
+    def extend(self, entries: Sequence[MemorySnapshotEntry]) -> "MemorySnapshot":
+        """Build the snapshot of a child message from this (parent) snapshot, `entries` newest first."""
+        added_tokens = sum(entry.tokens for entry in entries)
+        snapshot = MemorySnapshot(
+            entries=[*entries, *self.entries],
+            token_limit=self.token_limit + added_tokens,
+            message_limit=self.message_limit + 1,
+            exhausted=self.exhausted,
+        )
+        snapshot.truncate(dify_config.CONVERSATION_MEMORY_SNAPSHOT_MAX_TOKENS)
+        return snapshot
+
+    def truncate(self, max_tokens: int):
+        """Drop the oldest entries beyond `max_tokens`, so snapshots of long threads stay bounded."""
+        curr_message_tokens = 0
+        for index, entry in enumerate(self.entries):
+            if index > 0 and curr_message_tokens + entry.tokens > max_tokens:
+                self.entries = self.entries[:index]
+                self.token_limit = min(self.token_limit, curr_message_tokens)
+                self.exhausted = False
+                return
+            curr_message_tokens += entry.tokens
+
+
+class MemorySnapshotStore:
+    """
+    Stores memory snapshots in Redis, keyed by conversation, thread head message and model.
+
+    Only the snapshot of the current head of a thread is kept, so storage grows with the number of
+    threads rather than with the number of messages. A message regenerated from a parent whose
+    snapshot was superseded rebuilds its history from the database.
+    """
+
+    def __init__(self, conversation_id: str, provider: str, model: str):
+        self._conversation_id = conversation_id
+        self._provider = provider
+        self._model = model
+
+    def _key(self, message_id: str) -> str:
+        return f"memory_snapshot:{self._conversation_id}:{message_id}:{self._provider}:{self._model}"
+
+    def get(self, message_id: str) -> MemorySnapshot | None:
+        try:
+            data = redis_client.get(self._key(message_id))
+            if not data:
+                return None
+            return MemorySnapshot.model_validate_json(data)
+        except ValidationError:
+            return None
+        except Exception:
+            logger.warning("Failed to load memory snapshot of message %s", message_id, exc_info=True)
+            return None
+
+    def save(self, message_id: str, snapshot: MemorySnapshot):
+        try:
+            redis_client.setex(
+                self._key(message_id), dify_config.CONVERSATION_MEMORY_SNAPSHOT_TTL, snapshot.model_dump_json()
+            )
+        except Exception:
+            logger.warning("Failed to save memory snapshot of message %s", message_id, exc_info=True)
+
+    def replace(self, parent_message_id: str, message_id: str, snapshot: MemorySnapshot):
+        """Save the snapshot of a new thread head, dropping the snapshot of its parent superseded by it."""
+        self.save(message_id, snapshot)
+        try:
+            redis_client.delete(self._key(parent_message_id))
+        except Exception:
+            logger.warning("Failed to delete memory snapshot of message %s", parent_message_id, exc_info=True)
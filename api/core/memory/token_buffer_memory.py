@@ -1,9 +1,15 @@
+import dataclasses
+import logging
+from collections import defaultdict
 from collections.abc import Sequence
 
 from sqlalchemy import select
 
+from configs import dify_config
+from constants import UUID_NIL
 from core.app.app_config.features.file_upload.manager import FileUploadConfigManager
 from core.file import file_manager
+from core.memory.memory_snapshot import MemorySnapshot, MemorySnapshotEntry, MemorySnapshotStore
 from core.model_manager import ModelInstance
 from core.model_runtime.entities import (
     AssistantPromptMessage,
@@ -16,10 +22,40 @@ from core.model_runtime.entities import (
 from core.model_runtime.entities.message_entities import PromptMessageContentUnionTypes
 from core.prompt.utils.extract_thread_messages import extract_thread_messages
 from extensions.ext_database import db
+from extensions.ext_redis import redis_client
 from factories import file_factory
 from models.model import AppMode, Conversation, Message, MessageFile
 from models.workflow import Workflow, WorkflowRun
 
+logger = logging.getLogger(__name__)
+
+# per-message token counts only depend on the message text and the model, keep them for a day
+MESSAGE_TOKEN_COUNT_CACHE_TTL = 86400
+
+
+@dataclasses.dataclass
+class _HistoryPromptMessage:
+    """The user or assistant prompt message of a history message, with its token count once known."""
+
+    message_id: str
+    role: PromptMessageRole
+    content: str
+    prompt_message: PromptMessage
+    has_files: bool
+    tokens: int | None
+    # key of the cached token count, None for prompt messages with files
+    cache_key: str | None
+
+    def to_snapshot_entry(self) -> MemorySnapshotEntry:
+        assert self.tokens is not None
+        return MemorySnapshotEntry(
+            message_id=self.message_id,
+            role=self.role,
+            content=self.content,
+            tokens=self.tokens,
+            has_files=self.has_files,
+        )
+
 
 class TokenBufferMemory:
     def __init__(
@@ -102,18 +138,27 @@ class TokenBufferMemory:
         :param max_token_limit: max token limit
         :param message_limit: message limit
         """
-        app_record = self.conversation.app
+        if message_limit and message_limit > 0:
+            message_limit = min(message_limit, 500)
+        else:
+            message_limit = 500
+
+        snapshot_store = None
+        if dify_config.CONVERSATION_MEMORY_SNAPSHOT_ENABLED:
+            snapshot_store = MemorySnapshotStore(
+                self.conversation.id, self.model_instance.provider, self.model_instance.model
+            )
+            snapshot_messages = self._get_history_prompt_messages_from_snapshot(
+                snapshot_store, max_token_limit, message_limit
+            )
+            if snapshot_messages is not None:
+                return snapshot_messages
 
         # fetch limited messages, and return reversed
         stmt = (
             select(Message).where(Message.conversation_id == self.conversation.id).order_by(Message.created_at.desc())
         )
 
-        if message_limit and message_limit > 0:
-            message_limit = min(message_limit, 500)
-        else:
-            message_limit = 500
-
         msg_limit_stmt = stmt.limit(message_limit)
 
         messages = db.session.scalars(msg_limit_stmt).all()
@@ -123,63 +168,240 @@ class TokenBufferMemory:
         thread_messages = extract_thread_messages(messages)
 
         # for newly created message, its answer is temporarily empty, we don't need to add it to memory
+        history_message_limit = message_limit
         if thread_messages and not thread_messages[0].answer and thread_messages[0].answer_tokens == 0:
             thread_messages.pop(0)
+            history_message_limit -= 1
+
+        if not thread_messages:
+            return []
 
-        messages = list(reversed(thread_messages))
+        # load the files of every message in the thread with a single query
+        message_files: dict[str, list[MessageFile]] = defaultdict(list)
+        for message_file in db.session.scalars(
+            select(MessageFile).where(MessageFile.message_id.in_([message.id for message in thread_messages]))
+        ):
+            message_files[message_file.message_id].append(message_file)
 
+        cached_token_counts = self._get_cached_token_counts([message.id for message in thread_messages])
+        new_token_counts: dict[str, int] = {}
+
+        # newest first
+        history = [
+            self._build_history_prompt_message(message, role, message_files.get(message.id, []), cached_token_counts)
+            for message in thread_messages
+            for role in (PromptMessageRole.ASSISTANT, PromptMessageRole.USER)
+        ]
+
+        # count the prompt messages missing from the cache with a single call, they are only counted
+        # one by one when the window has to be pruned, or when their counts are kept in a snapshot
+        uncounted = [item for item in history if item.tokens is None]
+        if len(uncounted) > 1 and not snapshot_store:
+            counted_tokens = sum(item.tokens or 0 for item in history)
+            uncounted_tokens = self.model_instance.get_llm_num_tokens([item.prompt_message for item in uncounted])
+            if counted_tokens + uncounted_tokens <= max_token_limit:
+                return [item.prompt_message for item in reversed(history)]
+
+        # walk from the newest message backwards, tokenizing each prompt message at most once,
+        # and stop as soon as the accumulated token count exceeds the limit
         curr_message_tokens = 0
         prompt_messages: list[PromptMessage] = []
-        for message in messages:
-            # Process user message with files
-            user_files = db.session.scalars(
-                select(MessageFile).where(
-                    MessageFile.message_id == message.id,
-                    (MessageFile.belongs_to == "user") | (MessageFile.belongs_to.is_(None)),
-                )
-            ).all()
+        snapshot_entries: list[MemorySnapshotEntry] = []
+        exhausted = True
+        for item in history:
+            message_tokens = self._count_history_tokens(item, new_token_counts)
 
-            if user_files:
-                user_prompt_message = self._build_prompt_message_with_files(
-                    message_files=user_files,
-                    text_content=message.query,
-                    message=message,
-                    app_record=app_record,
-                    is_user_message=True,
-                )
-                prompt_messages.append(user_prompt_message)
+            # prune the chat message if it exceeds the max token limit, keeping at least one message
+            if prompt_messages and curr_message_tokens + message_tokens > max_token_limit:
+                exhausted = False
+                break
+            curr_message_tokens += message_tokens
+            prompt_messages.append(item.prompt_message)
+            snapshot_entries.append(item.to_snapshot_entry())
+
+        self._set_cached_token_counts(new_token_counts)
+
+        if snapshot_store:
+            snapshot = MemorySnapshot(
+                entries=snapshot_entries,
+                token_limit=max_token_limit,
+                message_limit=history_message_limit,
+                # the thread is complete only if the whole conversation fitted into the message limit
+                exhausted=exhausted and len(messages) < message_limit,
+            )
+            snapshot.truncate(dify_config.CONVERSATION_MEMORY_SNAPSHOT_MAX_TOKENS)
+            snapshot_store.save(thread_messages[0].id, snapshot)
+
+        prompt_messages.reverse()
+        return prompt_messages
+
+    def _build_history_prompt_message(
+        self,
+        message: Message,
+        role: PromptMessageRole,
+        message_files: Sequence[MessageFile],
+        cached_token_counts: dict[str, int],
+    ) -> _HistoryPromptMessage:
+        """
+        Build the user or assistant prompt message of a history message, with its cached token count.
+        :param message: Message object
+        :param role: role of the prompt message
+        :param message_files: all files of the message
+        :param cached_token_counts: token counts loaded from the cache
+        :return: the prompt message, its tokens are left uncounted when not cached
+        """
+        is_user_message = role == PromptMessageRole.USER
+        text_content = message.query if is_user_message else message.answer
+        role_files = [file for file in message_files if (file.belongs_to in {"user", None}) == is_user_message]
+        prompt_message: PromptMessage
+        if role_files:
+            prompt_message = self._build_prompt_message_with_files(
+                message_files=role_files,
+                text_content=text_content,
+                message=message,
+                app_record=self.conversation.app,
+                is_user_message=is_user_message,
+            )
+            # token counts of messages with files depend on the upload config, they are not cached
+            cache_key = None
+        else:
+            if is_user_message:
+                prompt_message = UserPromptMessage(content=text_content)
             else:
-                prompt_messages.append(UserPromptMessage(content=message.query))
+                prompt_message = AssistantPromptMessage(content=text_content)
+            cache_key = self._token_count_cache_key(message.id, role)
 
-            # Process assistant message with files
-            assistant_files = db.session.scalars(
-                select(MessageFile).where(MessageFile.message_id == message.id, MessageFile.belongs_to == "assistant")
+        return _HistoryPromptMessage(
+            message_id=message.id,
+            role=role,
+            content=text_content,
+            prompt_message=prompt_message,
+            has_files=bool(role_files),
+            tokens=cached_token_counts.get(cache_key) if cache_key else None,
+            cache_key=cache_key,
+        )
+
+    def _count_history_tokens(self, item: _HistoryPromptMessage, new_token_counts: dict[str, int]) -> int:
+        """
+        Count the tokens of a history prompt message unless already known.
+        :param item: history prompt message
+        :param new_token_counts: token counts computed here, to be written back to the cache
+        """
+        if item.tokens is None:
+            item.tokens = self.model_instance.get_llm_num_tokens([item.prompt_message])
+            if item.cache_key:
+                new_token_counts[item.cache_key] = item.tokens
+        return item.tokens
+
+    def _get_history_prompt_messages_from_snapshot(
+        self, snapshot_store: MemorySnapshotStore, max_token_limit: int, message_limit: int
+    ) -> list[PromptMessage] | None:
+        """
+        Read the history window from the snapshot of the thread head, extending the snapshot of its
+        parent with the head message when needed.
+        :return: history prompt messages, or None when the snapshot can not answer the request
+        """
+        latest_message = db.session.scalar(
+            select(Message)
+            .where(Message.conversation_id == self.conversation.id)
+            .order_by(Message.created_at.desc())
+            .limit(1)
+        )
+        if not latest_message:
+            return []
+
+        head_message: Message | None = latest_message
+        head_message_id = latest_message.id
+        history_message_limit = message_limit
+        # for newly created message, its answer is temporarily empty, the thread head is its parent
+        if not latest_message.answer and latest_message.answer_tokens == 0:
+            if not latest_message.parent_message_id:
+                return []
+            head_message = None
+            head_message_id = latest_message.parent_message_id
+            history_message_limit -= 1
+
+        # messages created before threads were introduced are not linked to their parent
+        if head_message_id == UUID_NIL:
+            return None
+        if history_message_limit <= 0:
+            return []
+
+        snapshot = snapshot_store.get(head_message_id)
+        if snapshot is None:
+            if head_message is None:
+                head_message = db.session.get(Message, head_message_id)
+            if head_message is None or head_message.parent_message_id == UUID_NIL:
+                return None
+
+            parent_snapshot = None
+            if head_message.parent_message_id:
+                parent_snapshot = snapshot_store.get(head_message.parent_message_id)
+                if parent_snapshot is None:
+                    return None
+
+            message_files = db.session.scalars(
+                select(MessageFile).where(MessageFile.message_id == head_message.id)
             ).all()
+            cached_token_counts = self._get_cached_token_counts([head_message.id])
+            new_token_counts: dict[str, int] = {}
+            entries = []
+            for role in (PromptMessageRole.ASSISTANT, PromptMessageRole.USER):
+                item = self._build_history_prompt_message(head_message, role, message_files, cached_token_counts)
+                self._count_history_tokens(item, new_token_counts)
+                entries.append(item.to_snapshot_entry())
+            self._set_cached_token_counts(new_token_counts)
 
-            if assistant_files:
-                assistant_prompt_message = self._build_prompt_message_with_files(
-                    message_files=assistant_files,
-                    text_content=message.answer,
-                    message=message,
-                    app_record=app_record,
-                    is_user_message=False,
-                )
-                prompt_messages.append(assistant_prompt_message)
+            if parent_snapshot and head_message.parent_message_id:
+                snapshot = parent_snapshot.extend(entries)
+                snapshot_store.replace(head_message.parent_message_id, head_message.id, snapshot)
             else:
-                prompt_messages.append(AssistantPromptMessage(content=message.answer))
+                # the head message starts the thread
+                snapshot = MemorySnapshot(
+                    entries=entries,
+                    token_limit=sum(entry.tokens for entry in entries),
+                    message_limit=1,
+                    exhausted=True,
+                )
+                snapshot_store.save(head_message.id, snapshot)
 
-        if not prompt_messages:
-            return []
+        if not snapshot.covers(max_token_limit, history_message_limit):
+            return None
 
-        # prune the chat message if it exceeds the max token limit
-        curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+        window = snapshot.select_window(max_token_limit, history_message_limit)
+        if any(entry.has_files for entry in window):
+            return None
+        return [entry.to_prompt_message() for entry in window]
 
-        if curr_message_tokens > max_token_limit:
-            while curr_message_tokens > max_token_limit and len(prompt_messages) > 1:
-                prompt_messages.pop(0)
-                curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+    def _token_count_cache_key(self, message_id: str, role: PromptMessageRole) -> str:
+        return (
+            f"token_buffer_memory:tokens:{self.model_instance.provider}:{self.model_instance.model}"
+            f":{message_id}:{role.value}"
+        )
 
-        return prompt_messages
+    def _get_cached_token_counts(self, message_ids: Sequence[str]) -> dict[str, int]:
+        keys = [
+            self._token_count_cache_key(message_id, role)
+            for message_id in message_ids
+            for role in (PromptMessageRole.USER, PromptMessageRole.ASSISTANT)
+        ]
+        try:
+            values = redis_client.mget(keys)
+            return {key: int(value) for key, value in zip(keys, values) if value is not None}
+        except Exception:
+            logger.warning("Failed to load cached message token counts", exc_info=True)
+            return {}
+
+    def _set_cached_token_counts(self, token_counts: dict[str, int]):
+        if not token_counts:
+            return
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            for key, tokens in token_counts.items():
+                pipeline.setex(key, MESSAGE_TOKEN_COUNT_CACHE_TTL, tokens)
+            pipeline.execute()
+        except Exception:
+            logger.warning("Failed to cache message token counts", exc_info=True)
 
     def get_history_prompt_text(
         self,
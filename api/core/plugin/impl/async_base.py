@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import weakref
+from collections.abc import AsyncGenerator, Callable
+
+import httpx
+
+from configs import dify_config
+from core.plugin.entities.plugin_daemon import PluginDaemonInnerError
+from core.plugin.impl.base import POOL_TIMEOUT_MESSAGE, STREAM_CHUNK_SIZE, BasePluginClient, StreamLineSplitter, T
+
+logger = logging.getLogger(__name__)
+
+# an async client and its connections are bound to the event loop that created them
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+
+
+def _get_async_plugin_daemon_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=dify_config.PLUGIN_DAEMON_HTTP2_ENABLED,
+                limits=httpx.Limits(
+                    max_connections=dify_config.PLUGIN_DAEMON_POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=dify_config.PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=dify_config.PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY,
+                ),
+                retries=dify_config.PLUGIN_DAEMON_CONNECT_RETRIES,
+            ),
+            timeout=httpx.Timeout(
+                connect=dify_config.PLUGIN_DAEMON_CONNECT_TIMEOUT,
+                read=dify_config.PLUGIN_DAEMON_READ_TIMEOUT,
+                write=dify_config.PLUGIN_DAEMON_WRITE_TIMEOUT,
+                pool=dify_config.PLUGIN_DAEMON_POOL_TIMEOUT,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def _aiter_stream_lines(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+    splitter = StreamLineSplitter()
+    async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+        for line in splitter.feed(chunk):
+            yield line
+    for line in splitter.flush():
+        yield line
+
+
+class AsyncBasePluginClient(BasePluginClient):
+    """
+    asyncio-native plugin daemon client, so that a single event loop can multiplex many concurrent
+    streaming invocations instead of pinning one worker per stream.
+    Request building and response parsing are shared with `BasePluginClient`.
+    """
+
+    async def _arequest(
+        self,
+        method: str,
+        path: str,
+        headers: dict | None = None,
+        data: bytes | dict | str | None = None,
+        params: dict | None = None,
+        files: dict | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Make a request to the plugin daemon inner API.
+        When `stream` is set, the body is not read and the caller must close the response.
+        """
+        client = _get_async_plugin_daemon_client()
+        request = client.build_request(method, **self._prepare_request(path, headers, data, params, files))
+        try:
+            return await client.send(request, stream=stream)
+        except httpx.PoolTimeout:
+            logger.warning("No free connection to Plugin Daemon Service within the pool timeout")
+            raise PluginDaemonInnerError(code=-500, message=POOL_TIMEOUT_MESSAGE)
+        except httpx.TransportError:
+            logger.exception("Request to Plugin Daemon Service failed")
+            raise PluginDaemonInnerError(code=-500, message="Request to Plugin Daemon Service failed")
+
+    async def _astream_request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        data: bytes | dict | None = None,
+        files: dict | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Make a stream request to the plugin daemon inner API
+        """
+        response = await self._arequest(method, path, headers, data, params, files, stream=True)
+        try:
+            async for line in _aiter_stream_lines(response):
+                yield line
+        finally:
+            await response.aclose()
+
+    async def _arequest_with_plugin_daemon_response(
+        self,
+        method: str,
+        path: str,
+        type: type[T],
+        headers: dict | None = None,
+        data: bytes | dict | None = None,
+        params: dict | None = None,
+        files: dict | None = None,
+        transformer: Callable[[dict], dict] | None = None,
+    ) -> T:
+        """
+        Make a request to the plugin daemon inner API and return the response as a model.
+        """
+        try:
+            response = await self._arequest(method, path, headers, data, params, files)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            msg = f"Failed to request plugin daemon, status: {e.response.status_code}, url: {path}"
+            logger.exception(msg)
+            raise e
+        except Exception as e:
+            msg = f"Failed to request plugin daemon, url: {path}"
+            logger.exception(msg)
+            raise ValueError(msg) from e
+
+        return self._parse_plugin_daemon_response(response.json, path, type, transformer)
+
+    async def _arequest_with_plugin_daemon_response_stream(
+        self,
+        method: str,
+        path: str,
+        type: type[T],
+        headers: dict | None = None,
+        data: bytes | dict | None = None,
+        params: dict | None = None,
+        files: dict | None = None,
+    ) -> AsyncGenerator[T, None]:
+        """
+        Make a stream request to the plugin daemon inner API and yield the response as a model.
+        """
+        async for line in self._astream_request(method, path, params, headers, data, files):
+            yield self._parse_plugin_daemon_stream_line(line, type)
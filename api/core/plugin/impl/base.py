@@ -1,15 +1,15 @@
 import inspect
 import json
 import logging
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterable
 from typing import TypeVar
 
-import requests
+import httpx
 from pydantic import BaseModel
-from requests.exceptions import HTTPError
 from yarl import URL
 
 from configs import dify_config
+from core.helper.http_client_pooling import get_pooled_http_client
 from core.model_runtime.errors.invoke import (
     InvokeAuthorizationError,
     InvokeBadRequestError,
@@ -37,6 +37,75 @@ T = TypeVar("T", bound=(BaseModel | dict | list | bool | str))
 
 logger = logging.getLogger(__name__)
 
+_PLUGIN_DAEMON_CLIENT_KEY = "plugin_daemon:http_client"
+STREAM_CHUNK_SIZE = 1024 * 8
+POOL_TIMEOUT_MESSAGE = (
+    "Too many concurrent requests to Plugin Daemon Service, no connection was free within PLUGIN_DAEMON_POOL_TIMEOUT"
+)
+
+
+def _build_plugin_daemon_client() -> httpx.Client:
+    transport = httpx.HTTPTransport(
+        http2=dify_config.PLUGIN_DAEMON_HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=dify_config.PLUGIN_DAEMON_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=dify_config.PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=dify_config.PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY,
+        ),
+        # only failed connection attempts are retried, requests that reached the daemon are never replayed
+        retries=dify_config.PLUGIN_DAEMON_CONNECT_RETRIES,
+    )
+    return httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(
+            connect=dify_config.PLUGIN_DAEMON_CONNECT_TIMEOUT,
+            read=dify_config.PLUGIN_DAEMON_READ_TIMEOUT,
+            write=dify_config.PLUGIN_DAEMON_WRITE_TIMEOUT,
+            pool=dify_config.PLUGIN_DAEMON_POOL_TIMEOUT,
+        ),
+    )
+
+
+class StreamLineSplitter:
+    """
+    Splits a streamed response into its non-empty payload lines, stripping the SSE `data:` prefix.
+    Lines are kept as bytes, since pydantic and json parse bytes directly.
+    """
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        buffer = self._buffer + chunk
+        lines = []
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line = self._strip(buffer[start:end])
+            start = end + 1
+            if line:
+                lines.append(line)
+        self._buffer = buffer[start:]
+        return lines
+
+    def flush(self) -> list[bytes]:
+        line = self._strip(self._buffer)
+        self._buffer = b""
+        return [line] if line else []
+
+    @staticmethod
+    def _strip(line: bytes) -> bytes:
+        line = line.strip()
+        if line.startswith(b"data:"):
+            line = line[5:].lstrip()
+        return line
+
+
+def _iter_stream_lines(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    splitter = StreamLineSplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.flush()
+
 
 class BasePluginClient:
     def _request(
@@ -48,9 +117,32 @@ class BasePluginClient:
         params: dict | None = None,
         files: dict | None = None,
         stream: bool = False,
-    ) -> requests.Response:
+    ) -> httpx.Response:
         """
         Make a request to the plugin daemon inner API.
+        When `stream` is set, the body is not read and the caller must close the response.
+        """
+        client = get_pooled_http_client(_PLUGIN_DAEMON_CLIENT_KEY, _build_plugin_daemon_client)
+        request = client.build_request(method, **self._prepare_request(path, headers, data, params, files))
+        try:
+            return client.send(request, stream=stream)
+        except httpx.PoolTimeout:
+            logger.warning("No free connection to Plugin Daemon Service within the pool timeout")
+            raise PluginDaemonInnerError(code=-500, message=POOL_TIMEOUT_MESSAGE)
+        except httpx.TransportError:
+            logger.exception("Request to Plugin Daemon Service failed")
+            raise PluginDaemonInnerError(code=-500, message="Request to Plugin Daemon Service failed")
+
+    def _prepare_request(
+        self,
+        path: str,
+        headers: dict | None,
+        data: bytes | dict | str | None,
+        params: dict | None,
+        files: dict | None,
+    ) -> dict:
+        """
+        Build the keyword arguments of a plugin daemon request.
         """
         url = plugin_daemon_inner_api_baseurl / path
         headers = headers or {}
@@ -60,15 +152,13 @@ class BasePluginClient:
         if headers.get("Content-Type") == "application/json" and isinstance(data, dict):
             data = json.dumps(data)
 
-        try:
-            response = requests.request(
-                method=method, url=str(url), headers=headers, data=data, params=params, stream=stream, files=files
-            )
-        except requests.ConnectionError:
-            logger.exception("Request to Plugin Daemon Service failed")
-            raise PluginDaemonInnerError(code=-500, message="Request to Plugin Daemon Service failed")
-
-        return response
+        request_kwargs: dict = {"url": str(url), "headers": headers, "params": params, "files": files}
+        # raw bodies are sent as content, dicts are form encoded
+        if isinstance(data, bytes | str):
+            request_kwargs["content"] = data
+        else:
+            request_kwargs["data"] = data
+        return request_kwargs
 
     def _stream_request(
         self,
@@ -83,12 +173,11 @@ class BasePluginClient:
         Make a stream request to the plugin daemon inner API
         """
         response = self._request(method, path, headers, data, params, files, stream=True)
-        for line in response.iter_lines(chunk_size=1024 * 8):
-            line = line.decode("utf-8").strip()
-            if line.startswith("data:"):
-                line = line[5:].strip()
-            if line:
-                yield line
+        try:
+            yield from _iter_stream_lines(response.iter_bytes(STREAM_CHUNK_SIZE))
+        finally:
+            # return the connection to the pool, also when the consumer stops early
+            response.close()
 
     def _stream_request_with_model(
         self,
@@ -139,7 +228,7 @@ class BasePluginClient:
         try:
             response = self._request(method, path, headers, data, params, files)
             response.raise_for_status()
-        except HTTPError as e:
+        except httpx.HTTPStatusError as e:
             msg = f"Failed to request plugin daemon, status: {e.response.status_code}, url: {path}"
             logger.exception(msg)
             raise e
@@ -148,8 +237,20 @@ class BasePluginClient:
             logger.exception(msg)
             raise ValueError(msg) from e
 
+        return self._parse_plugin_daemon_response(response.json, path, type, transformer)
+
+    def _parse_plugin_daemon_response(
+        self,
+        load_json: Callable[[], dict],
+        path: str,
+        type: type[T],
+        transformer: Callable[[dict], dict] | None = None,
+    ) -> T:
+        """
+        Parse a plugin daemon response body into its data, raising the error it carries.
+        """
         try:
-            json_response = response.json()
+            json_response = load_json()
             if transformer:
                 json_response = transformer(json_response)
             rep = PluginDaemonBasicResponse[type](**json_response)  # type: ignore
@@ -188,33 +289,39 @@ class BasePluginClient:
         Make a stream request to the plugin daemon inner API and yield the response as a model.
         """
         for line in self._stream_request(method, path, params, headers, data, files):
+            yield self._parse_plugin_daemon_stream_line(line, type)
+
+    def _parse_plugin_daemon_stream_line(self, line: bytes, type: type[T]) -> T:
+        """
+        Parse one line of a plugin daemon stream into its data, raising the error it carries.
+        """
+        try:
+            rep = PluginDaemonBasicResponse[type].model_validate_json(line)  # type: ignore
+        except (ValueError, TypeError):
+            # TODO modify this when line_data has code and message
             try:
-                rep = PluginDaemonBasicResponse[type].model_validate_json(line)  # type: ignore
+                line_data = json.loads(line)
             except (ValueError, TypeError):
-                # TODO modify this when line_data has code and message
+                raise ValueError(line.decode("utf-8", errors="replace"))
+            # If the dictionary contains the `error` key, use its value as the argument
+            # for `ValueError`.
+            # Otherwise, use the `line` to provide better contextual information about the error.
+            raise ValueError(line_data.get("error", line.decode("utf-8", errors="replace")))
+
+        if rep.code != 0:
+            if rep.code == -500:
                 try:
-                    line_data = json.loads(line)
-                except (ValueError, TypeError):
-                    raise ValueError(line)
-                # If the dictionary contains the `error` key, use its value as the argument
-                # for `ValueError`.
-                # Otherwise, use the `line` to provide better contextual information about the error.
-                raise ValueError(line_data.get("error", line))
-
-            if rep.code != 0:
-                if rep.code == -500:
-                    try:
-                        error = PluginDaemonError(**json.loads(rep.message))
-                    except Exception:
-                        raise PluginDaemonInnerError(code=rep.code, message=rep.message)
-
-                    logger.error("Error in stream reponse for plugin %s", rep.__dict__)
-                    self._handle_plugin_daemon_error(error.error_type, error.message)
-                raise ValueError(f"plugin daemon: {rep.message}, code: {rep.code}")
-            if rep.data is None:
-                frame = inspect.currentframe()
-                raise ValueError(f"got empty data from plugin daemon: {frame.f_lineno if frame else 'unknown'}")
-            yield rep.data
+                    error = PluginDaemonError(**json.loads(rep.message))
+                except Exception:
+                    raise PluginDaemonInnerError(code=rep.code, message=rep.message)
+
+                logger.error("Error in stream reponse for plugin %s", rep.__dict__)
+                self._handle_plugin_daemon_error(error.error_type, error.message)
+            raise ValueError(f"plugin daemon: {rep.message}, code: {rep.code}")
+        if rep.data is None:
+            frame = inspect.currentframe()
+            raise ValueError(f"got empty data from plugin daemon: {frame.f_lineno if frame else 'unknown'}")
+        return rep.data
 
     def _handle_plugin_daemon_error(self, error_type: str, message: str):
         """
@@ -1,6 +1,6 @@
 import binascii
-from collections.abc import Generator, Sequence
-from typing import IO
+from collections.abc import AsyncGenerator, Generator, Sequence
+from typing import IO, Any
 
 from core.model_runtime.entities.llm_entities import LLMResultChunk
 from core.model_runtime.entities.message_entities import PromptMessage, PromptMessageTool
@@ -18,9 +18,50 @@ from core.plugin.entities.plugin_daemon import (
     PluginTextEmbeddingNumTokensResponse,
     PluginVoicesResponse,
 )
+from core.plugin.impl.async_base import AsyncBasePluginClient
 from core.plugin.impl.base import BasePluginClient
 
 
+def _build_invoke_llm_request(
+    tenant_id: str,
+    user_id: str,
+    plugin_id: str,
+    provider: str,
+    model: str,
+    credentials: dict,
+    prompt_messages: list[PromptMessage],
+    model_parameters: dict | None,
+    tools: list[PromptMessageTool] | None,
+    stop: list[str] | None,
+    stream: bool,
+) -> dict[str, Any]:
+    return {
+        "method": "POST",
+        "path": f"plugin/{tenant_id}/dispatch/llm/invoke",
+        "type": LLMResultChunk,
+        "data": jsonable_encoder(
+            {
+                "user_id": user_id,
+                "data": {
+                    "provider": provider,
+                    "model_type": "llm",
+                    "model": model,
+                    "credentials": credentials,
+                    "prompt_messages": prompt_messages,
+                    "model_parameters": model_parameters,
+                    "tools": tools,
+                    "stop": stop,
+                    "stream": stream,
+                },
+            }
+        ),
+        "headers": {
+            "X-Plugin-ID": plugin_id,
+            "Content-Type": "application/json",
+        },
+    }
+
+
 class PluginModelClient(BasePluginClient):
     def fetch_model_providers(self, tenant_id: str) -> Sequence[PluginModelProviderEntity]:
         """
@@ -160,29 +201,19 @@ class PluginModelClient(BasePluginClient):
         Invoke llm
         """
         response = self._request_with_plugin_daemon_response_stream(
-            method="POST",
-            path=f"plugin/{tenant_id}/dispatch/llm/invoke",
-            type=LLMResultChunk,
-            data=jsonable_encoder(
-                {
-                    "user_id": user_id,
-                    "data": {
-                        "provider": provider,
-                        "model_type": "llm",
-                        "model": model,
-                        "credentials": credentials,
-                        "prompt_messages": prompt_messages,
-                        "model_parameters": model_parameters,
-                        "tools": tools,
-                        "stop": stop,
-                        "stream": stream,
-                    },
-                }
-            ),
-            headers={
-                "X-Plugin-ID": plugin_id,
-                "Content-Type": "application/json",
-            },
+            **_build_invoke_llm_request(
+                tenant_id,
+                user_id,
+                plugin_id,
+                provider,
+                model,
+                credentials,
+                prompt_messages,
+                model_parameters,
+                tools,
+                stop,
+                stream,
+            )
         )
 
         try:
@@ -529,3 +560,48 @@ class PluginModelClient(BasePluginClient):
             return resp.result
 
         raise ValueError("Failed to invoke moderation")
+
+
+class AsyncPluginModelClient(AsyncBasePluginClient):
+    """
+    Async counterpart of `PluginModelClient` for streaming invocations.
+    """
+
+    async def invoke_llm(
+        self,
+        tenant_id: str,
+        user_id: str,
+        plugin_id: str,
+        provider: str,
+        model: str,
+        credentials: dict,
+        prompt_messages: list[PromptMessage],
+        model_parameters: dict | None = None,
+        tools: list[PromptMessageTool] | None = None,
+        stop: list[str] | None = None,
+        stream: bool = True,
+    ) -> AsyncGenerator[LLMResultChunk, None]:
+        """
+        Invoke llm
+        """
+        response = self._arequest_with_plugin_daemon_response_stream(
+            **_build_invoke_llm_request(
+                tenant_id,
+                user_id,
+                plugin_id,
+                provider,
+                model,
+                credentials,
+                prompt_messages,
+                model_parameters,
+                tools,
+                stop,
+                stream,
+            )
+        )
+
+        try:
+            async for chunk in response:
+                yield chunk
+        except PluginDaemonInnerError as e:
+            raise ValueError(e.message + str(e.code))
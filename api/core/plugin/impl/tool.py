@@ -1,4 +1,4 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Any
 
 from pydantic import BaseModel
@@ -7,13 +7,51 @@ from core.plugin.entities.plugin_daemon import (
     PluginBasicBooleanResponse,
     PluginToolProviderEntity,
 )
+from core.plugin.impl.async_base import AsyncBasePluginClient
 from core.plugin.impl.base import BasePluginClient
-from core.plugin.utils.chunk_merger import merge_blob_chunks
+from core.plugin.utils.chunk_merger import amerge_blob_chunks, merge_blob_chunks
 from core.schemas.resolver import resolve_dify_schema_refs
 from core.tools.entities.tool_entities import CredentialType, ToolInvokeMessage, ToolParameter
 from models.provider_ids import GenericProviderID, ToolProviderID
 
 
+def _build_invoke_tool_request(
+    tenant_id: str,
+    user_id: str,
+    tool_provider: str,
+    tool_name: str,
+    credentials: dict[str, Any],
+    credential_type: CredentialType,
+    tool_parameters: dict[str, Any],
+    conversation_id: str | None,
+    app_id: str | None,
+    message_id: str | None,
+) -> dict[str, Any]:
+    tool_provider_id = GenericProviderID(tool_provider)
+    return {
+        "method": "POST",
+        "path": f"plugin/{tenant_id}/dispatch/tool/invoke",
+        "type": ToolInvokeMessage,
+        "data": {
+            "user_id": user_id,
+            "conversation_id": conversation_id,
+            "app_id": app_id,
+            "message_id": message_id,
+            "data": {
+                "provider": tool_provider_id.provider_name,
+                "tool": tool_name,
+                "credentials": credentials,
+                "credential_type": credential_type,
+                "tool_parameters": tool_parameters,
+            },
+        },
+        "headers": {
+            "X-Plugin-ID": tool_provider_id.plugin_id,
+            "Content-Type": "application/json",
+        },
+    }
+
+
 class PluginToolManager(BasePluginClient):
     def fetch_tool_providers(self, tenant_id: str) -> list[PluginToolProviderEntity]:
         """
@@ -99,29 +137,19 @@ class PluginToolManager(BasePluginClient):
         Invoke the tool with the given tenant, user, plugin, provider, name, credentials and parameters.
         """
 
-        tool_provider_id = GenericProviderID(tool_provider)
-
         response = self._request_with_plugin_daemon_response_stream(
-            "POST",
-            f"plugin/{tenant_id}/dispatch/tool/invoke",
-            ToolInvokeMessage,
-            data={
-                "user_id": user_id,
-                "conversation_id": conversation_id,
-                "app_id": app_id,
-                "message_id": message_id,
-                "data": {
-                    "provider": tool_provider_id.provider_name,
-                    "tool": tool_name,
-                    "credentials": credentials,
-                    "credential_type": credential_type,
-                    "tool_parameters": tool_parameters,
-                },
-            },
-            headers={
-                "X-Plugin-ID": tool_provider_id.plugin_id,
-                "Content-Type": "application/json",
-            },
+            **_build_invoke_tool_request(
+                tenant_id,
+                user_id,
+                tool_provider,
+                tool_name,
+                credentials,
+                credential_type,
+                tool_parameters,
+                conversation_id,
+                app_id,
+                message_id,
+            )
         )
 
         return merge_blob_chunks(response)
@@ -230,3 +258,42 @@ class PluginToolManager(BasePluginClient):
             return resp.parameters
 
         return []
+
+
+class AsyncPluginToolManager(AsyncBasePluginClient):
+    """
+    Async counterpart of `PluginToolManager` for streaming invocations.
+    """
+
+    def invoke(
+        self,
+        tenant_id: str,
+        user_id: str,
+        tool_provider: str,
+        tool_name: str,
+        credentials: dict[str, Any],
+        credential_type: CredentialType,
+        tool_parameters: dict[str, Any],
+        conversation_id: str | None = None,
+        app_id: str | None = None,
+        message_id: str | None = None,
+    ) -> AsyncGenerator[ToolInvokeMessage, None]:
+        """
+        Invoke the tool with the given tenant, user, plugin, provider, name, credentials and parameters.
+        """
+        response = self._arequest_with_plugin_daemon_response_stream(
+            **_build_invoke_tool_request(
+                tenant_id,
+                user_id,
+                tool_provider,
+                tool_name,
+                credentials,
+                credential_type,
+                tool_parameters,
+                conversation_id,
+                app_id,
+                message_id,
+            )
+        )
+
+        return amerge_blob_chunks(response)
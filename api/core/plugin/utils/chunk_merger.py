@@ -1,4 +1,4 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from dataclasses import dataclass, field
 from typing import TypeVar, Union, cast
 
@@ -22,6 +22,64 @@ class FileChunk:
         self.data = bytearray(self.total_length)
 
 
+class BlobChunkMerger:
+    """
+    Accumulates BLOB_CHUNK messages by their ID, shared by the sync and async stream mergers.
+    """
+
+    def __init__(self, max_file_size: int, max_chunk_size: int):
+        self.max_file_size = max_file_size
+        self.max_chunk_size = max_chunk_size
+        self.files: dict[str, FileChunk] = {}
+
+    def feed(self, resp: MessageType) -> MessageType | None:
+        """
+        Process one message, returning the message to yield or None while a blob is incomplete.
+        """
+        if resp.type != ToolInvokeMessage.MessageType.BLOB_CHUNK:
+            return resp
+
+        assert isinstance(resp.message, ToolInvokeMessage.BlobChunkMessage)
+        files = self.files
+        # Get blob chunk information
+        chunk_id = resp.message.id
+        total_length = resp.message.total_length
+        blob_data = resp.message.blob
+        is_end = resp.message.end
+
+        # Initialize buffer for this file if it doesn't exist
+        if chunk_id not in files:
+            files[chunk_id] = FileChunk(total_length)
+
+        # Check if file is too large (before appending)
+        if files[chunk_id].bytes_written + len(blob_data) > self.max_file_size:
+            # Delete the file if it's too large
+            del files[chunk_id]
+            raise ValueError(f"File is too large which reached the limit of {self.max_file_size / 1024 / 1024}MB")
+
+        # Check if single chunk is too large
+        if len(blob_data) > self.max_chunk_size:
+            raise ValueError(f"File chunk is too large which reached the limit of {self.max_chunk_size / 1024}KB")
+
+        # Append the blob data to the buffer
+        files[chunk_id].data[files[chunk_id].bytes_written : files[chunk_id].bytes_written + len(blob_data)] = blob_data
+        files[chunk_id].bytes_written += len(blob_data)
+
+        if not is_end:
+            return None
+
+        # If this is the final chunk, return a complete blob message of the same type as the response
+        message_class = type(resp)
+        merged_message = message_class(
+            type=ToolInvokeMessage.MessageType.BLOB,
+            message=ToolInvokeMessage.BlobMessage(blob=bytes(files[chunk_id].data[: files[chunk_id].bytes_written])),
+            meta=resp.meta,
+        )
+        # Clean up the buffer
+        del files[chunk_id]
+        return cast(MessageType, merged_message)
+
+
 def merge_blob_chunks(
     response: Generator[MessageType, None, None],
     max_file_size: int = 30 * 1024 * 1024,
@@ -45,50 +103,23 @@ def merge_blob_chunks(
     Raises:
         ValueError: If file size exceeds max_file_size or chunk size exceeds max_chunk_size
     """
-    files: dict[str, FileChunk] = {}
-
+    merger = BlobChunkMerger(max_file_size, max_chunk_size)
     for resp in response:
-        if resp.type == ToolInvokeMessage.MessageType.BLOB_CHUNK:
-            assert isinstance(resp.message, ToolInvokeMessage.BlobChunkMessage)
-            # Get blob chunk information
-            chunk_id = resp.message.id
-            total_length = resp.message.total_length
-            blob_data = resp.message.blob
-            is_end = resp.message.end
-
-            # Initialize buffer for this file if it doesn't exist
-            if chunk_id not in files:
-                files[chunk_id] = FileChunk(total_length)
-
-            # Check if file is too large (before appending)
-            if files[chunk_id].bytes_written + len(blob_data) > max_file_size:
-                # Delete the file if it's too large
-                del files[chunk_id]
-                raise ValueError(f"File is too large which reached the limit of {max_file_size / 1024 / 1024}MB")
-
-            # Check if single chunk is too large
-            if len(blob_data) > max_chunk_size:
-                raise ValueError(f"File chunk is too large which reached the limit of {max_chunk_size / 1024}KB")
-
-            # Append the blob data to the buffer
-            files[chunk_id].data[files[chunk_id].bytes_written : files[chunk_id].bytes_written + len(blob_data)] = (
-                blob_data
-            )
-            files[chunk_id].bytes_written += len(blob_data)
-
-            # If this is the final chunk, yield a complete blob message
-            if is_end:
-                # Create the appropriate message type based on the response type
-                message_class = type(resp)
-                merged_message = message_class(
-                    type=ToolInvokeMessage.MessageType.BLOB,
-                    message=ToolInvokeMessage.BlobMessage(
-                        blob=bytes(files[chunk_id].data[: files[chunk_id].bytes_written])
-                    ),
-                    meta=resp.meta,
-                )
-                yield cast(MessageType, merged_message)
-                # Clean up the buffer
-                del files[chunk_id]
-        else:
-            yield resp
+        message = merger.feed(resp)
+        if message is not None:
+            yield message
+
+
+async def amerge_blob_chunks(
+    response: AsyncGenerator[MessageType, None],
+    max_file_size: int = 30 * 1024 * 1024,
+    max_chunk_size: int = 8192,
+) -> AsyncGenerator[MessageType, None]:
+    """
+    Async counterpart of `merge_blob_chunks`.
+    """
+    merger = BlobChunkMerger(max_file_size, max_chunk_size)
+    async for resp in response:
+        message = merger.feed(resp)
+        if message is not None:
+            yield message
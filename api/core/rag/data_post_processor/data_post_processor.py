@@ -56,8 +56,9 @@ class DataPostProcessor:
                         embedding_provider_name=weights["vector_setting"]["embedding_provider_name"],
                         embedding_model_name=weights["vector_setting"]["embedding_model_name"],
                     ),
-                    keyword_setting=KeywordSetting(
-                        keyword_weight=weights["keyword_setting"]["keyword_weight"],
+                    keyword_setting=KeywordSetting.model_validate(
+                        # scoring settings left unset keep their default
+                        {key: value for key, value in weights["keyword_setting"].items() if value is not None}
                     ),
                 ),
             )
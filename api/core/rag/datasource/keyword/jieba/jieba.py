@@ -1,3 +1,4 @@
+import heapq
 from collections import defaultdict
 from typing import Any
 
@@ -71,7 +72,7 @@ class Jieba(BaseKeyword):
         keyword_table = self._get_dataset_keyword_table()
         if keyword_table is None:
             return False
-        return id in set.union(*keyword_table.values())
+        return any(id in node_idxs for node_idxs in keyword_table.values())
 
     def delete_by_ids(self, ids: list[str]):
         lock_name = f"keyword_indexing_lock_{self.dataset.id}"
@@ -89,29 +90,7 @@ class Jieba(BaseKeyword):
         document_ids_filter = kwargs.get("document_ids_filter")
         sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table or {}, query, k)
 
-        documents = []
-        for chunk_index in sorted_chunk_indices:
-            segment_query = db.session.query(DocumentSegment).where(
-                DocumentSegment.dataset_id == self.dataset.id, DocumentSegment.index_node_id == chunk_index
-            )
-            if document_ids_filter:
-                segment_query = segment_query.where(DocumentSegment.document_id.in_(document_ids_filter))
-            segment = segment_query.first()
-
-            if segment:
-                documents.append(
-                    Document(
-                        page_content=segment.content,
-                        metadata={
-                            "doc_id": chunk_index,
-                            "doc_hash": segment.index_node_hash,
-                            "document_id": segment.document_id,
-                            "dataset_id": segment.dataset_id,
-                        },
-                    )
-                )
-
-        return documents
+        return self._retrieve_documents_by_ids(sorted_chunk_indices, document_ids_filter)
 
     def delete(self):
         lock_name = f"keyword_indexing_lock_{self.dataset.id}"
@@ -195,18 +174,47 @@ class Jieba(BaseKeyword):
 
         # go through text chunks in order of most matching keywords
         chunk_indices_count: dict[str, int] = defaultdict(int)
-        keywords_list = [keyword for keyword in keywords if keyword in set(keyword_table.keys())]
+        keywords_list = [keyword for keyword in keywords if keyword in keyword_table]
         for keyword in keywords_list:
             for node_id in keyword_table[keyword]:
                 chunk_indices_count[node_id] += 1
 
-        sorted_chunk_indices = sorted(
-            chunk_indices_count.keys(),
-            key=lambda x: chunk_indices_count[x],
-            reverse=True,
+        return heapq.nlargest(k, chunk_indices_count.keys(), key=lambda x: chunk_indices_count[x])
+
+    def _retrieve_documents_by_ids(
+        self, sorted_chunk_indices: list[str], document_ids_filter: list[str] | None = None
+    ) -> list[Document]:
+        """Load the segments of the ranked index node ids with a single query, keeping the ranking order."""
+        if not sorted_chunk_indices:
+            return []
+
+        segment_query = select(DocumentSegment).where(
+            DocumentSegment.dataset_id == self.dataset.id, DocumentSegment.index_node_id.in_(sorted_chunk_indices)
         )
+        if document_ids_filter:
+            segment_query = segment_query.where(DocumentSegment.document_id.in_(document_ids_filter))
+        segments: dict[str, DocumentSegment] = {}
+        for segment in db.session.scalars(segment_query):
+            # keep the first match per node, as the previous per-id `.first()` lookups did
+            segments.setdefault(segment.index_node_id, segment)
+
+        documents = []
+        for chunk_index in sorted_chunk_indices:
+            segment = segments.get(chunk_index)
+            if segment:
+                documents.append(
+                    Document(
+                        page_content=segment.content,
+                        metadata={
+                            "doc_id": chunk_index,
+                            "doc_hash": segment.index_node_hash,
+                            "document_id": segment.document_id,
+                            "dataset_id": segment.dataset_id,
+                        },
+                    )
+                )
 
-        return sorted_chunk_indices[:k]
+        return documents
 
     def _update_segment_keywords(self, dataset_id: str, node_id: str, keywords: list[str]):
         stmt = select(DocumentSegment).where(
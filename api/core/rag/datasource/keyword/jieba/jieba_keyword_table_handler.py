@@ -1,4 +1,6 @@
 import re
+from collections import Counter
+from collections.abc import Iterable
 from typing import cast
 
 
@@ -23,6 +25,13 @@ class JiebaKeywordTableHandler:
 
         return set(self._expand_tokens_with_subtokens(set(keywords)))
 
+    def count_keywords(self, text: str, keywords: Iterable[str]) -> dict[str, int]:
+        """Count the occurrences of keywords among the JIEBA tokens of the text."""
+        import jieba  # type: ignore
+
+        token_counts = Counter(jieba.cut(text))
+        return {keyword: token_counts[keyword] for keyword in keywords}
+
     def _expand_tokens_with_subtokens(self, tokens: set[str]) -> set[str]:
         """Get subtokens from a list of tokens., filtering for stopwords."""
         from core.rag.datasource.keyword.jieba.stopwords import STOPWORDS
@@ -32,6 +41,6 @@ class JiebaKeywordTableHandler:
             results.add(token)
             sub_tokens = re.findall(r"\w+", token)
             if len(sub_tokens) > 1:
-                results.update({w for w in sub_tokens if w not in list(STOPWORDS)})
+                results.update({w for w in sub_tokens if w not in STOPWORDS})
 
         return results
@@ -0,0 +1,160 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from core.rag.datasource.keyword.jieba.jieba import Jieba
+from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.datasource.keyword.keyword_base import BaseKeyword
+from core.rag.models.document import Document
+from extensions.ext_database import db
+from models.dataset import DatasetKeyword
+
+_INSERT_BATCH_SIZE = 1000
+
+
+class JiebaPostingList(Jieba):
+    """
+    Jieba keyword index stored as per-keyword posting lists in the `dataset_keywords` table.
+
+    Unlike `Jieba`, which loads and rewrites the whole keyword table of the dataset on every
+    operation, searches only read the posting lists of the query keywords and writes only
+    touch the rows of the affected index nodes, so no dataset-wide lock is needed.
+
+    Datasets indexed by `Jieba` before switching backends keep their keyword table until it is
+    converted into posting lists, the first time the dataset is searched or written to.
+    """
+
+    def create(self, texts: list[Document], **kwargs) -> BaseKeyword:
+        self.add_texts(texts, **kwargs)
+        return self
+
+    def add_texts(self, texts: list[Document], **kwargs):
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keywords_list = kwargs.get("keywords_list")
+        keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
+
+        postings: dict[str, list[str]] = {}
+        for i, text in enumerate(texts):
+            keywords = keywords_list[i] if keywords_list else None
+            if not keywords:
+                keywords = keyword_table_handler.extract_keywords(text.page_content, keyword_number)
+            if text.metadata is not None:
+                self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
+                postings[text.metadata["doc_id"]] = list(keywords)
+
+        self._add_postings(postings)
+
+    def text_exists(self, id: str) -> bool:
+        stmt = (
+            select(DatasetKeyword.id)
+            .where(DatasetKeyword.dataset_id == self.dataset.id, DatasetKeyword.index_node_id == id)
+            .limit(1)
+        )
+        return db.session.scalar(stmt) is not None
+
+    def delete_by_ids(self, ids: list[str]):
+        if not ids:
+            return
+        # convert a pre-existing keyword table first, otherwise the deleted nodes would come back with it
+        self._backfill_from_keyword_table()
+        db.session.execute(
+            delete(DatasetKeyword).where(
+                DatasetKeyword.dataset_id == self.dataset.id, DatasetKeyword.index_node_id.in_(ids)
+            )
+        )
+        db.session.commit()
+
+    def delete(self):
+        db.session.execute(delete(DatasetKeyword).where(DatasetKeyword.dataset_id == self.dataset.id))
+        db.session.commit()
+        # drop a keyword table that has not been converted yet along with the posting lists
+        super().delete()
+
+    def search(self, query: str, **kwargs: Any) -> list[Document]:
+        k = kwargs.get("top_k", 4)
+        document_ids_filter = kwargs.get("document_ids_filter")
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keywords = list(keyword_table_handler.extract_keywords(query))
+        if not keywords:
+            return []
+
+        # rank index nodes by the number of matching query keywords, reading only their posting lists
+        match_count = func.count(DatasetKeyword.id).label("match_count")
+        stmt = (
+            select(DatasetKeyword.index_node_id, match_count)
+            .where(DatasetKeyword.dataset_id == self.dataset.id, DatasetKeyword.keyword.in_(keywords))
+            .group_by(DatasetKeyword.index_node_id)
+            .order_by(match_count.desc(), DatasetKeyword.index_node_id)
+            .limit(k)
+        )
+        sorted_chunk_indices = [row.index_node_id for row in db.session.execute(stmt)]
+        if not sorted_chunk_indices and self._backfill_from_keyword_table():
+            sorted_chunk_indices = [row.index_node_id for row in db.session.execute(stmt)]
+
+        return self._retrieve_documents_by_ids(sorted_chunk_indices, document_ids_filter)
+
+    def create_segment_keywords(self, node_id: str, keywords: list[str]):
+        self._update_segment_keywords(self.dataset.id, node_id, keywords)
+        self._add_postings({node_id: keywords})
+
+    def multi_create_segment_keywords(self, pre_segment_data_list: list):
+        keyword_table_handler = JiebaKeywordTableHandler()
+        keyword_number = self.dataset.keyword_number or self._config.max_keywords_per_chunk
+        postings: dict[str, list[str]] = {}
+        for pre_segment_data in pre_segment_data_list:
+            segment = pre_segment_data["segment"]
+            keywords = pre_segment_data["keywords"]
+            if not keywords:
+                keywords = list(keyword_table_handler.extract_keywords(segment.content, keyword_number))
+            segment.keywords = keywords
+            postings[segment.index_node_id] = keywords
+        self._add_postings(postings)
+
+    def update_segment_keywords_index(self, node_id: str, keywords: list[str]):
+        self._add_postings({node_id: keywords})
+
+    def _add_postings(self, postings: Mapping[str, Sequence[str]]):
+        # convert a pre-existing keyword table first, so the dataset keeps its previously indexed nodes
+        self._backfill_from_keyword_table()
+        self._insert_postings(postings)
+
+    def _backfill_from_keyword_table(self) -> bool:
+        """
+        Convert the `Jieba` keyword table of the dataset into posting lists and remove it.
+
+        The keyword table is removed once converted, so node ids deleted from the posting lists
+        afterwards are never imported again.
+
+        :return: whether any posting rows were inserted
+        """
+        dataset_keyword_table = self.dataset.dataset_keyword_table
+        if not dataset_keyword_table:
+            return False
+        keyword_table_dict = dataset_keyword_table.keyword_table_dict
+        if keyword_table_dict is None:
+            # keep a keyword table that could not be loaded rather than dropping its keywords
+            return False
+
+        postings: dict[str, list[str]] = {}
+        for keyword, node_ids in keyword_table_dict["__data__"]["table"].items():
+            for node_id in node_ids:
+                postings.setdefault(node_id, []).append(keyword)
+        if postings:
+            # concurrent backfills of the same dataset are harmless, duplicate rows are skipped on conflict
+            self._insert_postings(postings)
+        super().delete()
+        return bool(postings)
+
+    def _insert_postings(self, postings: Mapping[str, Sequence[str]]):
+        rows = [
+            {"dataset_id": self.dataset.id, "keyword": keyword, "index_node_id": node_id}
+            for node_id, keywords in postings.items()
+            for keyword in set(keywords)
+        ]
+        for i in range(0, len(rows), _INSERT_BATCH_SIZE):
+            stmt = insert(DatasetKeyword).values(rows[i : i + _INSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_nothing(index_elements=["dataset_id", "keyword", "index_node_id"])
+            db.session.execute(stmt)
+        db.session.commit()
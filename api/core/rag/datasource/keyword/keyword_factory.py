@@ -24,6 +24,10 @@ class Keyword:
                 from core.rag.datasource.keyword.jieba.jieba import Jieba
 
                 return Jieba
+            case KeyWordType.JIEBA_POSTING_LIST:
+                from core.rag.datasource.keyword.jieba.jieba_posting_list import JiebaPostingList
+
+                return JiebaPostingList
             case _:
                 raise ValueError(f"Keyword store {keyword_type} is not supported.")
 
@@ -1,11 +1,13 @@
+import uuid
 from collections.abc import Sequence
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select
 
+from configs import dify_config
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
-from core.rag.models.document import Document
+from core.rag.models.document import ChildDocument, Document
 from extensions.ext_database import db
 from models.dataset import ChildChunk, Dataset, DocumentSegment
 
@@ -60,6 +62,19 @@ class DatasetDocumentStore:
         return output
 
     def add_documents(self, docs: Sequence[Document], allow_update: bool = True, save_child: bool = False):
+        """
+        Add documents as segments of the document, updating the segments that already exist.
+
+        Existing segments are looked up, and new segments and child chunks inserted, with one
+        statement per batch of DOCUMENT_SEGMENT_BATCH_SIZE documents, each batch being committed.
+        """
+        for doc in docs:
+            if not isinstance(doc, Document):
+                raise ValueError("doc must be a Document")
+
+            if doc.metadata is None:
+                raise ValueError("doc.metadata must be a dict")
+
         max_position = (
             db.session.query(func.max(DocumentSegment.position))
             .where(DocumentSegment.document_id == self._document_id)
@@ -84,60 +99,64 @@ class DatasetDocumentStore:
         else:
             tokens_list = [0] * len(docs)
 
-        for doc, tokens in zip(docs, tokens_list):
-            if not isinstance(doc, Document):
-                raise ValueError("doc must be a Document")
+        batch_size = dify_config.DOCUMENT_SEGMENT_BATCH_SIZE
+        for start in range(0, len(docs), batch_size):
+            max_position = self._add_document_batch(
+                docs[start : start + batch_size],
+                tokens_list[start : start + batch_size],
+                max_position,
+                allow_update,
+                save_child,
+            )
 
-            if doc.metadata is None:
-                raise ValueError("doc.metadata must be a dict")
+    def _add_document_batch(
+        self,
+        docs: Sequence[Document],
+        tokens_list: Sequence[int],
+        max_position: int,
+        allow_update: bool,
+        save_child: bool,
+    ) -> int:
+        existing_segments = self._get_document_segments([doc.metadata["doc_id"] for doc in docs])
+
+        # rows of the new segments, and of the child chunks by segment ID
+        new_segments: dict[str, dict[str, Any]] = {}
+        child_chunks: dict[str, list[dict[str, Any]]] = {}
+        replaced_child_segment_ids: list[str] = []
 
-            segment_document = self.get_document_segment(doc_id=doc.metadata["doc_id"])
+        for doc, tokens in zip(docs, tokens_list):
+            doc_id = doc.metadata["doc_id"]
+            segment_document = existing_segments.get(doc_id)
+            new_segment = new_segments.get(doc_id)
 
             # NOTE: doc could already exist in the store, but we overwrite it
-            if not allow_update and segment_document:
-                raise ValueError(
-                    f"doc_id {doc.metadata['doc_id']} already exists. Set allow_update to True to overwrite."
-                )
+            if not allow_update and (segment_document or new_segment):
+                raise ValueError(f"doc_id {doc_id} already exists. Set allow_update to True to overwrite.")
 
-            if not segment_document:
+            if segment_document is None and new_segment is None:
                 max_position += 1
 
-                segment_document = DocumentSegment(
-                    tenant_id=self._dataset.tenant_id,
-                    dataset_id=self._dataset.id,
-                    document_id=self._document_id,
-                    index_node_id=doc.metadata["doc_id"],
-                    index_node_hash=doc.metadata["doc_hash"],
-                    position=max_position,
-                    content=doc.page_content,
-                    word_count=len(doc.page_content),
-                    tokens=tokens,
-                    enabled=False,
-                    created_by=self._user_id,
-                )
+                new_segment = {
+                    "id": str(uuid.uuid4()),
+                    "tenant_id": self._dataset.tenant_id,
+                    "dataset_id": self._dataset.id,
+                    "document_id": self._document_id,
+                    "index_node_id": doc_id,
+                    "index_node_hash": doc.metadata["doc_hash"],
+                    "position": max_position,
+                    "content": doc.page_content,
+                    "word_count": len(doc.page_content),
+                    "tokens": tokens,
+                    "enabled": False,
+                    "created_by": self._user_id,
+                }
                 if doc.metadata.get("answer"):
-                    segment_document.answer = doc.metadata.pop("answer", "")
+                    new_segment["answer"] = doc.metadata.pop("answer", "")
+                new_segments[doc_id] = new_segment
 
-                db.session.add(segment_document)
-                db.session.flush()
-                if save_child:
-                    if doc.children:
-                        for position, child in enumerate(doc.children, start=1):
-                            child_segment = ChildChunk(
-                                tenant_id=self._dataset.tenant_id,
-                                dataset_id=self._dataset.id,
-                                document_id=self._document_id,
-                                segment_id=segment_document.id,
-                                position=position,
-                                index_node_id=child.metadata.get("doc_id"),
-                                index_node_hash=child.metadata.get("doc_hash"),
-                                content=child.page_content,
-                                word_count=len(child.page_content),
-                                type="automatic",
-                                created_by=self._user_id,
-                            )
-                            db.session.add(child_segment)
-            else:
+                if save_child and doc.children:
+                    child_chunks[new_segment["id"]] = self._child_chunk_rows(new_segment["id"], doc.children)
+            elif segment_document is not None:
                 segment_document.content = doc.page_content
                 if doc.metadata.get("answer"):
                     segment_document.answer = doc.metadata.pop("answer", "")
@@ -145,31 +164,66 @@ class DatasetDocumentStore:
                 segment_document.word_count = len(doc.page_content)
                 segment_document.tokens = tokens
                 if save_child and doc.children:
-                    # delete the existing child chunks
-                    db.session.query(ChildChunk).where(
-                        ChildChunk.tenant_id == self._dataset.tenant_id,
-                        ChildChunk.dataset_id == self._dataset.id,
-                        ChildChunk.document_id == self._document_id,
-                        ChildChunk.segment_id == segment_document.id,
-                    ).delete()
-                    # add new child chunks
-                    for position, child in enumerate(doc.children, start=1):
-                        child_segment = ChildChunk(
-                            tenant_id=self._dataset.tenant_id,
-                            dataset_id=self._dataset.id,
-                            document_id=self._document_id,
-                            segment_id=segment_document.id,
-                            position=position,
-                            index_node_id=child.metadata.get("doc_id"),
-                            index_node_hash=child.metadata.get("doc_hash"),
-                            content=child.page_content,
-                            word_count=len(child.page_content),
-                            type="automatic",
-                            created_by=self._user_id,
-                        )
-                        db.session.add(child_segment)
-
-            db.session.commit()
+                    # replace the existing child chunks
+                    replaced_child_segment_ids.append(segment_document.id)
+                    child_chunks[segment_document.id] = self._child_chunk_rows(segment_document.id, doc.children)
+            else:
+                # the same doc_id appeared earlier in this batch
+                assert new_segment is not None
+                new_segment["content"] = doc.page_content
+                if doc.metadata.get("answer"):
+                    new_segment["answer"] = doc.metadata.pop("answer", "")
+                new_segment["index_node_hash"] = doc.metadata.get("doc_hash")
+                new_segment["word_count"] = len(doc.page_content)
+                new_segment["tokens"] = tokens
+                if save_child and doc.children:
+                    child_chunks[new_segment["id"]] = self._child_chunk_rows(new_segment["id"], doc.children)
+
+        if replaced_child_segment_ids:
+            db.session.execute(
+                delete(ChildChunk).where(
+                    ChildChunk.tenant_id == self._dataset.tenant_id,
+                    ChildChunk.dataset_id == self._dataset.id,
+                    ChildChunk.document_id == self._document_id,
+                    ChildChunk.segment_id.in_(replaced_child_segment_ids),
+                )
+            )
+        if new_segments:
+            db.session.execute(insert(DocumentSegment), list(new_segments.values()))
+        child_chunk_rows = [row for rows in child_chunks.values() for row in rows]
+        if child_chunk_rows:
+            db.session.execute(insert(ChildChunk), child_chunk_rows)
+        db.session.commit()
+
+        return max_position
+
+    def _child_chunk_rows(self, segment_id: str, children: Sequence[ChildDocument]) -> list[dict[str, Any]]:
+        return [
+            {
+                "tenant_id": self._dataset.tenant_id,
+                "dataset_id": self._dataset.id,
+                "document_id": self._document_id,
+                "segment_id": segment_id,
+                "position": position,
+                "index_node_id": child.metadata.get("doc_id"),
+                "index_node_hash": child.metadata.get("doc_hash"),
+                "content": child.page_content,
+                "word_count": len(child.page_content),
+                "type": "automatic",
+                "created_by": self._user_id,
+            }
+            for position, child in enumerate(children, start=1)
+        ]
+
+    def _get_document_segments(self, doc_ids: Sequence[str]) -> dict[str, DocumentSegment]:
+        """Get the segments of the dataset with the given doc IDs, by doc ID."""
+        stmt = select(DocumentSegment).where(
+            DocumentSegment.dataset_id == self._dataset.id, DocumentSegment.index_node_id.in_(set(doc_ids))
+        )
+        segments: dict[str, DocumentSegment] = {}
+        for segment in db.session.scalars(stmt):
+            segments.setdefault(segment.index_node_id, segment)
+        return segments
 
     def document_exists(self, doc_id: str) -> bool:
         """Check if document exists."""
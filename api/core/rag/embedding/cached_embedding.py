@@ -1,8 +1,10 @@
-import base64
 import logging
+from dataclasses import dataclass
 from typing import Any, cast
 
 import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 
 from configs import dify_config
@@ -11,44 +13,83 @@ from core.model_manager import ModelInstance
 from core.model_runtime.entities.model_entities import ModelPropertyKey
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.rag.embedding.embedding_base import Embeddings
+from core.rag.embedding.embedding_cache import (
+    EmbeddingCache,
+    RedisEmbeddingCache,
+    TieredEmbeddingCache,
+    local_embedding_cache,
+)
+from core.rag.embedding.embedding_scheduler import embedding_scheduler
 from extensions.ext_database import db
-from extensions.ext_redis import redis_client
 from libs import helper
 from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters of the embedding cache for one CacheEmbedding instance."""
+
+    hits: int = 0
+    misses: int = 0
+
+
 class CacheEmbedding(Embeddings):
-    def __init__(self, model_instance: ModelInstance, user: str | None = None):
+    def __init__(
+        self,
+        model_instance: ModelInstance,
+        user: str | None = None,
+        document_cache: EmbeddingCache | None = None,
+        query_cache: EmbeddingCache | None = None,
+    ):
+        """
+        :param document_cache: cache consulted before the embeddings table, defaults to the process-local LRU
+        :param query_cache: cache for query embeddings, defaults to the process-local LRU backed by Redis
+        """
         self._model_instance = model_instance
         self._user = user
+        self._document_cache = document_cache or local_embedding_cache
+        self._query_cache = query_cache or TieredEmbeddingCache([local_embedding_cache, RedisEmbeddingCache()])
+        self.cache_stats = EmbeddingCacheStats()
+
+    def _cache_key(self, hash: str, input_type: EmbeddingInputType) -> str:
+        # asymmetric models embed the same text differently as a document and as a query
+        return f"{self._model_instance.provider}:{self._model_instance.model}:{input_type}:{hash}"
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """Embed search docs in batches of 10."""
+        """Embed search docs, in batches packed and scheduled by the embedding scheduler."""
         # use doc embedding cache or store if not exists
         text_embeddings: list[Any] = [None for _ in range(len(texts))]
-        embedding_queue_indices = []
-        for i, text in enumerate(texts):
-            hash = helper.generate_text_hash(text)
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=hash, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                text_embeddings[i] = embedding.get_embedding()
+        text_hashes = [helper.generate_text_hash(text) for text in texts]
+        cache_keys = {hash: self._cache_key(hash, EmbeddingInputType.DOCUMENT) for hash in text_hashes}
+        local_embeddings = self._document_cache.get_many(list(cache_keys.values()))
+        cached_embeddings = {
+            hash: local_embeddings[key].tolist() for hash, key in cache_keys.items() if key in local_embeddings
+        }
+        db_embeddings = self._load_cached_embeddings(set(cache_keys) - set(cached_embeddings))
+        if db_embeddings:
+            self._document_cache.set_many({cache_keys[hash]: embedding for hash, embedding in db_embeddings.items()})
+            cached_embeddings.update(db_embeddings)
+
+        # group cache misses by hash so that duplicated texts are only embedded once
+        embedding_queue: dict[str, list[int]] = {}
+        for i, hash in enumerate(text_hashes):
+            if hash in cached_embeddings:
+                text_embeddings[i] = cached_embeddings[hash]
             else:
-                embedding_queue_indices.append(i)
+                embedding_queue.setdefault(hash, []).append(i)
+
+        self.cache_stats.hits += len(texts) - sum(len(indices) for indices in embedding_queue.values())
+        self.cache_stats.misses += len(embedding_queue)
 
         # release database connection, because embedding may take a long time
         db.session.close()
 
-        if embedding_queue_indices:
-            embedding_queue_texts = [texts[i] for i in embedding_queue_indices]
-            embedding_queue_embeddings = []
+        if embedding_queue:
+            embedding_queue_hashes = list(embedding_queue.keys())
+            embedding_queue_texts = [texts[embedding_queue[hash][0]] for hash in embedding_queue_hashes]
+            new_embeddings: dict[str, list[float]] = {}
             try:
                 model_type_instance = cast(TextEmbeddingModel, self._model_instance.model_type_instance)
                 model_schema = model_type_instance.get_model_schema(
@@ -59,44 +100,34 @@ class CacheEmbedding(Embeddings):
                     if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties
                     else 1
                 )
-                for i in range(0, len(embedding_queue_texts), max_chunks):
-                    batch_texts = embedding_queue_texts[i : i + max_chunks]
-
-                    embedding_result = self._model_instance.invoke_text_embedding(
-                        texts=batch_texts, user=self._user, input_type=EmbeddingInputType.DOCUMENT
-                    )
-
-                    for vector in embedding_result.embeddings:
-                        try:
-                            # FIXME: type ignore for numpy here
-                            normalized_embedding = (vector / np.linalg.norm(vector)).tolist()  # type: ignore
-                            # stackoverflow best way: https://stackoverflow.com/questions/20319813/how-to-check-list-containing-nan
-                            if np.isnan(normalized_embedding).any():
-                                # for issue #11827  float values are not json compliant
-                                logger.warning("Normalized embedding is nan: %s", normalized_embedding)
-                                continue
-                            embedding_queue_embeddings.append(normalized_embedding)
-                        except IntegrityError:
-                            db.session.rollback()
-                        except Exception:
-                            logger.exception("Failed transform embedding")
-                cache_embeddings = []
-                try:
-                    for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
+                embeddings = embedding_scheduler.embed(
+                    self._model_instance,
+                    embedding_queue_texts,
+                    max_chunks=max_chunks,
+                    user=self._user,
+                    input_type=EmbeddingInputType.DOCUMENT,
+                )
+
+                for hash, vector in zip(embedding_queue_hashes, embeddings):
+                    try:
+                        # FIXME: type ignore for numpy here
+                        normalized_embedding = (vector / np.linalg.norm(vector)).tolist()  # type: ignore
+                        # stackoverflow best way: https://stackoverflow.com/questions/20319813/how-to-check-list-containing-nan
+                        if np.isnan(normalized_embedding).any():
+                            # for issue #11827  float values are not json compliant
+                            logger.warning("Normalized embedding is nan: %s", normalized_embedding)
+                            continue
+                        new_embeddings[hash] = normalized_embedding
+                    except Exception:
+                        logger.exception("Failed transform embedding")
+
+                for hash, n_embedding in new_embeddings.items():
+                    for i in embedding_queue[hash]:
                         text_embeddings[i] = n_embedding
-                        hash = helper.generate_text_hash(texts[i])
-                        if hash not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=hash,
-                                provider_name=self._model_instance.provider,
-                            )
-                            embedding_cache.set_embedding(n_embedding)
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(hash)
-                    db.session.commit()
-                except IntegrityError:
-                    db.session.rollback()
+                self._store_cached_embeddings(new_embeddings)
+                self._document_cache.set_many(
+                    {cache_keys[hash]: embedding for hash, embedding in new_embeddings.items()}
+                )
             except Exception as ex:
                 db.session.rollback()
                 logger.exception("Failed to embed documents")
@@ -104,45 +135,78 @@ class CacheEmbedding(Embeddings):
 
         return text_embeddings
 
+    def _load_cached_embeddings(self, hashes: set[str]) -> dict[str, list[float]]:
+        """Fetch cached embeddings for the given text hashes with chunked `IN` queries."""
+        cached_embeddings: dict[str, list[float]] = {}
+        if not hashes:
+            return cached_embeddings
+
+        hash_list = list(hashes)
+        batch_size = dify_config.EMBEDDING_CACHE_LOOKUP_BATCH_SIZE
+        for i in range(0, len(hash_list), batch_size):
+            stmt = select(Embedding).where(
+                Embedding.model_name == self._model_instance.model,
+                Embedding.provider_name == self._model_instance.provider,
+                Embedding.hash.in_(hash_list[i : i + batch_size]),
+            )
+            for embedding in db.session.scalars(stmt):
+                cached_embeddings[embedding.hash] = embedding.get_embedding()
+        return cached_embeddings
+
+    def _store_cached_embeddings(self, embeddings: dict[str, list[float]]):
+        """Bulk insert newly computed embeddings, ignoring rows written concurrently by other workers."""
+        if not embeddings:
+            return
+
+        rows = []
+        for hash, n_embedding in embeddings.items():
+            embedding_cache = Embedding(
+                model_name=self._model_instance.model,
+                hash=hash,
+                provider_name=self._model_instance.provider,
+            )
+            embedding_cache.set_embedding(n_embedding)
+            rows.append(
+                {
+                    "model_name": embedding_cache.model_name,
+                    "hash": embedding_cache.hash,
+                    "provider_name": embedding_cache.provider_name,
+                    "embedding": embedding_cache.embedding,
+                }
+            )
+
+        try:
+            batch_size = dify_config.EMBEDDING_CACHE_LOOKUP_BATCH_SIZE
+            for i in range(0, len(rows), batch_size):
+                stmt = insert(Embedding).values(rows[i : i + batch_size])
+                stmt = stmt.on_conflict_do_nothing(index_elements=["model_name", "hash", "provider_name"])
+                db.session.execute(stmt)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
     def embed_query(self, text: str) -> list[float]:
         """Embed query text."""
-        # use doc embedding cache or store if not exists
+        # use query embedding cache or store if not exists
         hash = helper.generate_text_hash(text)
-        embedding_cache_key = f"{self._model_instance.provider}_{self._model_instance.model}_{hash}"
-        embedding = redis_client.get(embedding_cache_key)
-        if embedding:
-            redis_client.expire(embedding_cache_key, 600)
-            decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
-            return [float(x) for x in decoded_embedding]
+        cache_key = self._cache_key(hash, EmbeddingInputType.QUERY)
+        cached_embedding = self._query_cache.get_many([cache_key]).get(cache_key)
+        if cached_embedding is not None:
+            self.cache_stats.hits += 1
+            return cached_embedding.tolist()
+        self.cache_stats.misses += 1
         try:
-            embedding_result = self._model_instance.invoke_text_embedding(
-                texts=[text], user=self._user, input_type=EmbeddingInputType.QUERY
-            )
+            embedding_result = embedding_scheduler.invoke_query(self._model_instance, text, user=self._user)
 
-            embedding_results = embedding_result.embeddings[0]
-            # FIXME: type ignore for numpy here
-            embedding_results = (embedding_results / np.linalg.norm(embedding_results)).tolist()  # type: ignore
-            if np.isnan(embedding_results).any():
+            embedding_vector = np.asarray(embedding_result.embeddings[0], dtype=np.float64)
+            embedding_vector = embedding_vector / np.linalg.norm(embedding_vector)
+            if np.isnan(embedding_vector).any():
                 raise ValueError("Normalized embedding is nan please try again")
         except Exception as ex:
             if dify_config.DEBUG:
                 logger.exception("Failed to embed query text '%s...(%s chars)'", text[:10], len(text))
             raise ex
 
-        try:
-            # encode embedding to base64
-            embedding_vector = np.array(embedding_results)
-            vector_bytes = embedding_vector.tobytes()
-            # Transform to Base64
-            encoded_vector = base64.b64encode(vector_bytes)
-            # Transform to string
-            encoded_str = encoded_vector.decode("utf-8")
-            redis_client.setex(embedding_cache_key, 600, encoded_str)
-        except Exception as ex:
-            if dify_config.DEBUG:
-                logger.exception(
-                    "Failed to add embedding to redis for the text '%s...(%s chars)'", text[:10], len(text)
-                )
-            raise ex
+        self._query_cache.set_many({cache_key: embedding_vector})
 
-        return embedding_results  # type: ignore
+        return embedding_vector.tolist()
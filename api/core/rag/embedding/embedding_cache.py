@@ -0,0 +1,140 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+from cachetools import LRUCache
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# vectors are cached as raw little-endian float32 buffers
+EMBEDDING_CACHE_DTYPE = np.dtype("<f4")
+
+
+def encode_embedding(embedding: Sequence[float] | np.ndarray) -> bytes:
+    return np.asarray(embedding, dtype=EMBEDDING_CACHE_DTYPE).tobytes()
+
+
+def decode_embedding(data: bytes) -> np.ndarray:
+    # np.frombuffer returns a read-only view over the buffer, no Python list is materialized
+    return np.frombuffer(data, dtype=EMBEDDING_CACHE_DTYPE)
+
+
+class EmbeddingCache(ABC):
+    """A single tier of the embedding cache, keyed by `provider:model:input-type:text-hash`."""
+
+    @abstractmethod
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """Return the cached vectors of the given keys, missing keys are omitted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_many(self, embeddings: Mapping[str, Sequence[float] | np.ndarray]):
+        raise NotImplementedError
+
+
+class LocalEmbeddingCache(EmbeddingCache):
+    """Bounded in-process LRU tier, shared by all CacheEmbedding instances of a process."""
+
+    def __init__(self, maxsize: int):
+        self._cache: LRUCache[str, np.ndarray] = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        result: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                embedding = self._cache.get(key)
+                if embedding is not None:
+                    result[key] = embedding
+        return result
+
+    def set_many(self, embeddings: Mapping[str, Sequence[float] | np.ndarray]):
+        with self._lock:
+            for key, embedding in embeddings.items():
+                self._cache[key] = np.asarray(embedding, dtype=EMBEDDING_CACHE_DTYPE)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class RedisEmbeddingCache(EmbeddingCache):
+    """Redis tier storing float32 buffers with a sliding expiration."""
+
+    def __init__(self, ttl: int = 600, prefix: str = "embedding_f32"):
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        redis_keys = [self._redis_key(key) for key in keys]
+        values = redis_client.mget(redis_keys)
+        result: dict[str, np.ndarray] = {}
+        for key, value in zip(keys, values):
+            if value:
+                result[key] = decode_embedding(value)
+        if result:
+            pipeline = redis_client.pipeline(transaction=False)
+            for key in result:
+                pipeline.expire(self._redis_key(key), self._ttl)
+            pipeline.execute()
+        return result
+
+    def set_many(self, embeddings: Mapping[str, Sequence[float] | np.ndarray]):
+        if not embeddings:
+            return
+        pipeline = redis_client.pipeline(transaction=False)
+        for key, embedding in embeddings.items():
+            pipeline.setex(self._redis_key(key), self._ttl, encode_embedding(embedding))
+        pipeline.execute()
+
+
+class TieredEmbeddingCache(EmbeddingCache):
+    """
+    Looks up the tiers in order and backfills the faster tiers on a hit in a slower one.
+    Writes go to every tier.
+    """
+
+    def __init__(self, tiers: Sequence[EmbeddingCache]):
+        self._tiers = list(tiers)
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        result: dict[str, np.ndarray] = {}
+        pending = list(dict.fromkeys(keys))
+        for index, tier in enumerate(self._tiers):
+            if not pending:
+                break
+            try:
+                found = tier.get_many(pending)
+            except Exception:
+                logger.exception("Failed to read embeddings from cache tier %s", type(tier).__name__)
+                continue
+            if not found:
+                continue
+            for upper_tier in self._tiers[:index]:
+                try:
+                    upper_tier.set_many(found)
+                except Exception:
+                    logger.exception("Failed to backfill embeddings to cache tier %s", type(upper_tier).__name__)
+            result.update(found)
+            pending = [key for key in pending if key not in found]
+        return result
+
+    def set_many(self, embeddings: Mapping[str, Sequence[float] | np.ndarray]):
+        for tier in self._tiers:
+            try:
+                tier.set_many(embeddings)
+            except Exception:
+                logger.exception("Failed to write embeddings to cache tier %s", type(tier).__name__)
+
+
+local_embedding_cache = LocalEmbeddingCache(maxsize=dify_config.EMBEDDING_LOCAL_CACHE_SIZE)
@@ -0,0 +1,285 @@
+"""
+Scheduling of embedding requests.
+
+Texts to embed are packed into requests bounded by the number of chunks the model
+accepts and by a token budget, and the requests are sent concurrently under a limit
+shared by everything embedding with the same provider credentials in the process,
+e.g. all indexing tasks of a Celery worker. The limit adapts to the provider: it is
+halved and requests back off when the provider rate limits, and grows back while
+requests succeed without slowing down. Query embeddings are user facing and bypass
+the limit.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+
+from configs import dify_config
+from core.entities.embedding_type import EmbeddingInputType
+from core.model_manager import ModelInstance
+from core.model_runtime.entities.text_embedding_entities import TextEmbeddingResult
+from core.model_runtime.errors.invoke import InvokeRateLimitError
+from core.model_runtime.model_providers.__base.tokenizers.gpt2_tokenizer import GPT2Tokenizer
+from libs.flask_utils import preserve_flask_contexts
+
+logger = logging.getLogger(__name__)
+
+# A request slower per character than this multiple of the baseline means the provider is saturated
+_SATURATED_LATENCY_FACTOR = 2.0
+# Requests smaller than this fraction of the baseline request are dominated by the fixed cost of a request,
+# their latency per character is not compared to the baseline
+_COMPARABLE_SIZE_RATIO = 0.5
+# Weight of each comparable request moving a baseline up, so it follows a provider getting slower for good
+_BASELINE_DECAY = 0.05
+
+
+def backoff_delay(backoff_base: float, backoff_max: float, attempt: int) -> float:
+    """Seconds to wait after the `attempt`-th consecutive rate limited request, exponential with jitter."""
+    backoff = min(backoff_base * 2 ** (attempt - 1), backoff_max)
+    # jitter spreads the retries of the requests rate limited together
+    return backoff * random.uniform(0.5, 1.0)  # noqa: S311
+
+
+def pack_batches(token_counts: Sequence[int], max_chunks: int, max_tokens: int) -> list[range]:
+    """
+    Split consecutive texts into batches of at most `max_chunks` texts and `max_tokens` tokens.
+
+    A text exceeding the token budget on its own is sent alone.
+    """
+    batches: list[range] = []
+    start = 0
+    batch_tokens = 0
+    for index, tokens in enumerate(token_counts):
+        if index > start and (index - start >= max_chunks or batch_tokens + tokens > max_tokens):
+            batches.append(range(start, index))
+            start = index
+            batch_tokens = 0
+        batch_tokens += tokens
+    if start < len(token_counts):
+        batches.append(range(start, len(token_counts)))
+    return batches
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of in-flight requests to a provider, adapting the limit with AIMD.
+
+    A rate limited request halves the limit and delays every request for an exponentially
+    growing backoff. A successful request grows the limit by one per limit requests, up to
+    `max_concurrency`, unless its latency per character shows the provider is saturated.
+
+    Saturation is measured against a baseline, the lowest latency per character of a request
+    at least about as large. Smaller requests are neither compared nor taken as baseline,
+    most of their latency is the fixed cost of a request rather than the characters sent.
+    """
+
+    def __init__(self, max_concurrency: int, backoff_base: float, backoff_max: float):
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._rate_limited_count = 0
+        self._baseline_latency_per_character: float | None = None
+        self._baseline_size = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        """Wait until a request can be sent."""
+        with self._condition:
+            while True:
+                delay = self._resume_at - time.monotonic()
+                if delay <= 0 and self._in_flight < int(self.limit):
+                    break
+                self._condition.wait(timeout=delay if delay > 0 else None)
+            self._in_flight += 1
+
+    def release(self, *, rate_limited: bool = False, latency: float | None = None, size: int = 0):
+        """
+        Record the outcome of a request sent after `acquire`.
+
+        The latency and the number of characters sent are given for successful requests,
+        failures other than rate limits leave the limit unchanged.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if rate_limited:
+                self._rate_limited_count += 1
+                self.limit = max(self.limit / 2, 1.0)
+                backoff = backoff_delay(self._backoff_base, self._backoff_max, self._rate_limited_count)
+                self._resume_at = max(self._resume_at, time.monotonic() + backoff)
+            elif latency is not None:
+                self._rate_limited_count = 0
+                if self._is_saturated(latency, size):
+                    self.limit = max(self.limit - 1, 1.0)
+                else:
+                    self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+            self._condition.notify_all()
+
+    def _is_saturated(self, latency: float, size: int) -> bool:
+        if size <= 0 or size < self._baseline_size * _COMPARABLE_SIZE_RATIO:
+            return False
+        latency_per_character = latency / size
+        baseline = self._baseline_latency_per_character
+        if baseline is None or latency_per_character < baseline:
+            self._baseline_latency_per_character = latency_per_character
+            self._baseline_size = size
+            return False
+        self._baseline_latency_per_character = baseline + (latency_per_character - baseline) * _BASELINE_DECAY
+        return latency_per_character > baseline * _SATURATED_LATENCY_FACTOR
+
+
+class EmbeddingScheduler:
+    """Sends embedding requests of a process through per-provider adaptive concurrency limits."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        max_batch_tokens: int | None = None,
+        max_retries: int | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+    ):
+        """
+        Arguments default to the EMBEDDING_SCHEDULER_* configuration.
+
+        :param max_concurrency: maximum number of in-flight requests per provider credentials
+        :param max_batch_tokens: maximum number of tokens sent in one request
+        :param max_retries: number of times a rate limited request is retried
+        :param backoff_base: seconds waited after the first rate limited request, doubled for each following one
+        :param backoff_max: maximum number of seconds waited after a rate limited request
+        """
+        self._max_concurrency = max_concurrency or dify_config.EMBEDDING_SCHEDULER_MAX_CONCURRENCY
+        self._max_batch_tokens = max_batch_tokens or dify_config.EMBEDDING_SCHEDULER_MAX_BATCH_TOKENS
+        self._max_retries = max_retries if max_retries is not None else dify_config.EMBEDDING_SCHEDULER_MAX_RETRIES
+        self._backoff_base = backoff_base or dify_config.EMBEDDING_SCHEDULER_BACKOFF_BASE
+        self._backoff_max = backoff_max or dify_config.EMBEDDING_SCHEDULER_BACKOFF_MAX
+        self._limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, model_instance: ModelInstance) -> AdaptiveConcurrencyLimiter:
+        """Get the limiter shared by the requests sent with the provider credentials of the model instance."""
+        credentials = json.dumps(model_instance.credentials, sort_keys=True, default=str)
+        key = f"{model_instance.provider}:{hashlib.sha256(credentials.encode()).hexdigest()}"
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AdaptiveConcurrencyLimiter(self._max_concurrency, self._backoff_base, self._backoff_max)
+                self._limiters[key] = limiter
+            return limiter
+
+    def embed(
+        self,
+        model_instance: ModelInstance,
+        texts: Sequence[str],
+        max_chunks: int,
+        user: str | None = None,
+        input_type: EmbeddingInputType = EmbeddingInputType.DOCUMENT,
+    ) -> list[list[float]]:
+        """Embed the texts in packed batches sent concurrently, returning the embeddings in order of the texts."""
+        if max_chunks > 1:
+            token_counts = [GPT2Tokenizer.get_num_tokens(text) for text in texts]
+        else:
+            token_counts = [0] * len(texts)
+        batches = pack_batches(token_counts, max_chunks, self._max_batch_tokens)
+
+        def embed_batch(batch: range) -> TextEmbeddingResult:
+            return self.invoke(model_instance, [texts[i] for i in batch], user=user, input_type=input_type)
+
+        if len(batches) <= 1:
+            results = [embed_batch(batch) for batch in batches]
+        else:
+            workers = min(len(batches), self.limiter(model_instance).max_concurrency)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._in_caller_context(embed_batch), batches))
+
+        return [embedding for result in results for embedding in result.embeddings]
+
+    def invoke(
+        self,
+        model_instance: ModelInstance,
+        texts: list[str],
+        user: str | None = None,
+        input_type: EmbeddingInputType = EmbeddingInputType.DOCUMENT,
+    ) -> TextEmbeddingResult:
+        """Send one embedding request once the provider has capacity, retrying it when rate limited."""
+        limiter = self.limiter(model_instance)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            start_at = time.perf_counter()
+            try:
+                result = model_instance.invoke_text_embedding(texts=texts, user=user, input_type=input_type)
+            except InvokeRateLimitError:
+                limiter.release(rate_limited=True)
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                logger.warning(
+                    "Embedding request to %s rate limited, retrying (%d/%d) with concurrency %d",
+                    model_instance.provider,
+                    attempt,
+                    self._max_retries,
+                    int(limiter.limit),
+                )
+                continue
+            except BaseException:
+                limiter.release()
+                raise
+            limiter.release(latency=time.perf_counter() - start_at, size=sum(len(text) for text in texts))
+            return result
+
+    def invoke_query(self, model_instance: ModelInstance, text: str, user: str | None = None) -> TextEmbeddingResult:
+        """
+        Send a query embedding request, retrying it when rate limited.
+
+        Queries are user facing: they do not wait for the limiter shared with indexing, and
+        their outcome does not adjust it.
+        """
+        attempt = 0
+        while True:
+            try:
+                return model_instance.invoke_text_embedding(
+                    texts=[text], user=user, input_type=EmbeddingInputType.QUERY
+                )
+            except InvokeRateLimitError:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                logger.warning(
+                    "Query embedding request to %s rate limited, retrying (%d/%d)",
+                    model_instance.provider,
+                    attempt,
+                    self._max_retries,
+                )
+                time.sleep(backoff_delay(self._backoff_base, self._backoff_max, attempt))
+
+    @staticmethod
+    def _in_caller_context(function):
+        """Run the function in worker threads with the Flask app and context variables of the caller."""
+        if not has_app_context():
+            return function
+        flask_app = current_app._get_current_object()  # type: ignore
+        context_vars = contextvars.copy_context()
+
+        def wrapper(*args, **kwargs):
+            with preserve_flask_contexts(flask_app, context_vars):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+
+embedding_scheduler = EmbeddingScheduler()
@@ -0,0 +1,54 @@
+"""
+Process pool for parallel document extraction.
+
+Indexing runs extraction on a single thread of the Celery worker, so parsing a large document
+uses one core however many the worker has. Extractors able to split a document into independent
+parts, such as page ranges of a PDF, hand the parts to this pool and collect the results in order.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from configs import dify_config
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_extract_process_pool() -> ProcessPoolExecutor | None:
+    """Get the shared extraction process pool, None when parallel extraction is disabled."""
+    global _executor
+    max_workers = dify_config.EXTRACT_PROCESS_POOL_SIZE
+    if max_workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # worker processes are spawned rather than forked, the calling process runs threads
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def discard_extract_process_pool(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool, a fresh one is started on next use."""
+    global _executor
+    logger.error("Extraction process pool is broken, recreating it")
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_extract_process_pool() -> None:
+    """Shut down the shared extraction process pool, it is recreated on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
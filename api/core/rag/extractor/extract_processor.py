@@ -1,5 +1,7 @@
 import re
 import tempfile
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Union
 from urllib.parse import unquote
@@ -92,6 +94,22 @@ class ExtractProcessor:
     def extract(
         cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: str | None = None
     ) -> list[Document]:
+        with cls._open_extractor(extract_setting, is_automatic, file_path) as extractor:
+            return extractor.extract()
+
+    @classmethod
+    def lazy_extract(
+        cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: str | None = None
+    ) -> Iterator[Document]:
+        """Extract the documents one at a time, e.g. page by page for PDF files."""
+        with cls._open_extractor(extract_setting, is_automatic, file_path) as extractor:
+            yield from extractor.lazy_extract()
+
+    @classmethod
+    @contextmanager
+    def _open_extractor(
+        cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: str | None = None
+    ) -> Generator[BaseExtractor, None, None]:
         if extract_setting.datasource_type == DatasourceType.FILE.value:
             with tempfile.TemporaryDirectory() as temp_dir:
                 if not file_path:
@@ -162,7 +180,7 @@ class ExtractProcessor:
                     else:
                         # txt
                         extractor = TextExtractor(file_path, autodetect_encoding=True)
-                return extractor.extract()
+                yield extractor
         elif extract_setting.datasource_type == DatasourceType.NOTION.value:
             assert extract_setting.notion_info is not None, "notion_info is required"
             extractor = NotionExtractor(
@@ -173,7 +191,7 @@ class ExtractProcessor:
                 tenant_id=extract_setting.notion_info.tenant_id,
                 credential_id=extract_setting.notion_info.credential_id,
             )
-            return extractor.extract()
+            yield extractor
         elif extract_setting.datasource_type == DatasourceType.WEBSITE.value:
             assert extract_setting.website_info is not None, "website_info is required"
             if extract_setting.website_info.provider == "firecrawl":
@@ -184,7 +202,7 @@ class ExtractProcessor:
                     mode=extract_setting.website_info.mode,
                     only_main_content=extract_setting.website_info.only_main_content,
                 )
-                return extractor.extract()
+                yield extractor
             elif extract_setting.website_info.provider == "watercrawl":
                 extractor = WaterCrawlWebExtractor(
                     url=extract_setting.website_info.url,
@@ -193,7 +211,7 @@ class ExtractProcessor:
                     mode=extract_setting.website_info.mode,
                     only_main_content=extract_setting.website_info.only_main_content,
                 )
-                return extractor.extract()
+                yield extractor
             elif extract_setting.website_info.provider == "jinareader":
                 extractor = JinaReaderWebExtractor(
                     url=extract_setting.website_info.url,
@@ -202,7 +220,7 @@ class ExtractProcessor:
                     mode=extract_setting.website_info.mode,
                     only_main_content=extract_setting.website_info.only_main_content,
                 )
-                return extractor.extract()
+                yield extractor
             else:
                 raise ValueError(f"Unsupported website provider: {extract_setting.website_info.provider}")
         else:
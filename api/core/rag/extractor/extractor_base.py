@@ -1,6 +1,9 @@
 """Abstract interface for document loader implementations."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from core.rag.models.document import Document
 
 
 class BaseExtractor(ABC):
@@ -9,3 +12,7 @@ class BaseExtractor(ABC):
     @abstractmethod
     def extract(self):
         raise NotImplementedError
+
+    def lazy_extract(self) -> Iterator[Document]:
+        """Lazily extract the documents, extractors able to yield them one at a time override this."""
+        yield from self.extract()
@@ -1,9 +1,14 @@
 """Abstract interface for document loader implementations."""
 
 import contextlib
+from collections import deque
 from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+from configs import dify_config
 from core.rag.extractor.blob.blob import Blob
+from core.rag.extractor.extract_process_pool import discard_extract_process_pool, get_extract_process_pool
 from core.rag.extractor.extractor_base import BaseExtractor
 from core.rag.models.document import Document
 from extensions.ext_storage import storage
@@ -41,6 +46,13 @@ class PdfExtractor(BaseExtractor):
 
         return documents
 
+    def lazy_extract(self) -> Iterator[Document]:
+        """Lazily extract the pages, documents with a plaintext cache are extracted at once."""
+        if self._file_cache_key:
+            yield from self.extract()
+            return
+        yield from self.load()
+
     def load(
         self,
     ) -> Iterator[Document]:
@@ -49,18 +61,74 @@ class PdfExtractor(BaseExtractor):
         yield from self.parse(blob)
 
     def parse(self, blob: Blob) -> Iterator[Document]:
-        """Lazily parse the blob."""
+        """Lazily parse the blob, in page ranges extracted in parallel when the extraction process pool is on."""
         import pypdfium2  # type: ignore
 
+        executor = get_extract_process_pool()
         with blob.as_bytes_io() as file_path:
             pdf_reader = pypdfium2.PdfDocument(file_path, autoclose=True)
             try:
-                for page_number, page in enumerate(pdf_reader):
-                    text_page = page.get_textpage()
-                    content = text_page.get_text_range()
-                    text_page.close()
-                    page.close()
-                    metadata = {"source": blob.source, "page": page_number}
-                    yield Document(page_content=content, metadata=metadata)
+                page_count = len(pdf_reader)
+                pages_per_task = dify_config.PDF_EXTRACT_PAGES_PER_TASK
+                if executor is None or blob.path is None or page_count <= pages_per_task:
+                    for page_number in range(page_count):
+                        metadata = {"source": blob.source, "page": page_number}
+                        yield Document(page_content=_get_page_text(pdf_reader, page_number), metadata=metadata)
+                    return
             finally:
                 pdf_reader.close()
+
+        yield from self._parse_in_parallel(executor, str(blob.path), blob.source, page_count, pages_per_task)
+
+    @staticmethod
+    def _parse_in_parallel(
+        executor: ProcessPoolExecutor, file_path: str, source: str | None, page_count: int, pages_per_task: int
+    ) -> Iterator[Document]:
+        # page ranges are submitted a few ahead of the one being yielded, so that results stream back
+        # in page order while only a bounded number of them are held in memory
+        ranges = iter(range(0, page_count, pages_per_task))
+        pending: deque[tuple[int, Future[list[str]]]] = deque()
+
+        def submit_next() -> None:
+            start = next(ranges, None)
+            if start is not None:
+                stop = min(start + pages_per_task, page_count)
+                pending.append((start, executor.submit(_extract_page_range, file_path, start, stop)))
+
+        try:
+            for _ in range(dify_config.EXTRACT_PROCESS_POOL_SIZE * 2):
+                submit_next()
+            while pending:
+                start, future = pending.popleft()
+                contents = future.result()
+                submit_next()
+                for offset, content in enumerate(contents):
+                    metadata = {"source": source, "page": start + offset}
+                    yield Document(page_content=content, metadata=metadata)
+        except BrokenProcessPool:
+            # a worker process died (e.g. killed for memory), start a fresh pool for later extractions
+            discard_extract_process_pool(executor)
+            raise
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _get_page_text(pdf_reader, page_number: int) -> str:
+    page = pdf_reader[page_number]
+    text_page = page.get_textpage()
+    content = text_page.get_text_range()
+    text_page.close()
+    page.close()
+    return content
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[str]:
+    """Extract the text of the pages [start, stop) of a PDF file, run in the extraction process pool."""
+    import pypdfium2  # type: ignore
+
+    pdf_reader = pypdfium2.PdfDocument(file_path, autoclose=True)
+    try:
+        return [_get_page_text(pdf_reader, page_number) for page_number in range(start, stop)]
+    finally:
+        pdf_reader.close()
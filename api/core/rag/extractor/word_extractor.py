@@ -272,18 +272,20 @@ class WordExtractor(BaseExtractor):
                     paragraph_content.append(run.text.strip())
             return "".join(paragraph_content) if paragraph_content else ""
 
-        paragraphs = doc.paragraphs.copy()
-        tables = doc.tables.copy()
+        # body elements come in document order, consumed with iterators rather than pop(0) so that
+        # walking a document is linear in its number of paragraphs and tables
+        paragraphs = iter(doc.paragraphs)
+        tables = iter(doc.tables)
         for element in doc.element.body:
             if hasattr(element, "tag"):
                 if isinstance(element.tag, str) and element.tag.endswith("p"):  # paragraph
-                    para = paragraphs.pop(0)
+                    para = next(paragraphs)
                     parsed_paragraph = parse_paragraph(para)
                     if parsed_paragraph.strip():
                         content.append(parsed_paragraph)
                     else:
                         content.append("\n")
                 elif isinstance(element.tag, str) and element.tag.endswith("tbl"):  # table
-                    table = tables.pop(0)
+                    table = next(tables)
                     content.append(self._table_to_markdown(table, image_map))
         return "\n".join(content)
@@ -1,7 +1,7 @@
 """Abstract interface for document loader implementations."""
 
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import TYPE_CHECKING, Any, Optional
 
 from configs import dify_config
@@ -26,10 +26,21 @@ class BaseIndexProcessor(ABC):
     def extract(self, extract_setting: ExtractSetting, **kwargs) -> list[Document]:
         raise NotImplementedError
 
+    def lazy_extract(self, extract_setting: ExtractSetting, **kwargs) -> Iterator[Document]:
+        """Extract the documents one at a time, by default from the fully extracted list."""
+        yield from self.extract(extract_setting, **kwargs)
+
     @abstractmethod
     def transform(self, documents: list[Document], **kwargs) -> list[Document]:
         raise NotImplementedError
 
+    def supports_incremental_transform(self, process_rule: dict) -> bool:
+        """
+        Whether the extracted documents can be transformed a few at a time, i.e. each chunk
+        only depends on the document it was split from.
+        """
+        return True
+
     @abstractmethod
     def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs):
         raise NotImplementedError
@@ -1,7 +1,7 @@
 """Paragraph index processor."""
 
 import uuid
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 from core.rag.cleaner.clean_processor import CleanProcessor
@@ -32,6 +32,14 @@ class ParagraphIndexProcessor(BaseIndexProcessor):
 
         return text_docs
 
+    def lazy_extract(self, extract_setting: ExtractSetting, **kwargs) -> Iterator[Document]:
+        yield from ExtractProcessor.lazy_extract(
+            extract_setting=extract_setting,
+            is_automatic=(
+                kwargs.get("process_rule_mode") == "automatic" or kwargs.get("process_rule_mode") == "hierarchical"
+            ),
+        )
+
     def transform(self, documents: list[Document], **kwargs) -> list[Document]:
         process_rule = kwargs.get("process_rule")
         if not process_rule:
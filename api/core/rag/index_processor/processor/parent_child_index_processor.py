@@ -2,7 +2,7 @@
 
 import json
 import uuid
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 from configs import dify_config
@@ -34,6 +34,14 @@ class ParentChildIndexProcessor(BaseIndexProcessor):
 
         return text_docs
 
+    def lazy_extract(self, extract_setting: ExtractSetting, **kwargs) -> Iterator[Document]:
+        yield from ExtractProcessor.lazy_extract(
+            extract_setting=extract_setting,
+            is_automatic=(
+                kwargs.get("process_rule_mode") == "automatic" or kwargs.get("process_rule_mode") == "hierarchical"
+            ),
+        )
+
     def transform(self, documents: list[Document], **kwargs) -> list[Document]:
         process_rule = kwargs.get("process_rule")
         if not process_rule:
@@ -103,6 +111,11 @@ class ParentChildIndexProcessor(BaseIndexProcessor):
 
         return all_documents
 
+    def supports_incremental_transform(self, process_rule: dict) -> bool:
+        # the full doc mode joins all the extracted documents into a single parent chunk
+        rules = process_rule.get("rules")
+        return not rules or Rule(**rules).parent_mode != ParentMode.FULL_DOC
+
     def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs):
         if dataset.indexing_technique == "high_quality":
             vector = Vector(dataset)
@@ -4,7 +4,7 @@ import logging
 import re
 import threading
 import uuid
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 import pandas as pd
@@ -40,6 +40,19 @@ class QAIndexProcessor(BaseIndexProcessor):
         )
         return text_docs
 
+    def lazy_extract(self, extract_setting: ExtractSetting, **kwargs) -> Iterator[Document]:
+        yield from ExtractProcessor.lazy_extract(
+            extract_setting=extract_setting,
+            is_automatic=(
+                kwargs.get("process_rule_mode") == "automatic" or kwargs.get("process_rule_mode") == "hierarchical"
+            ),
+        )
+
+    def supports_incremental_transform(self, process_rule: dict) -> bool:
+        # QA pairs are generated by up to 10 LLM threads per transform call, a single page
+        # rarely has enough chunks to keep them busy
+        return False
+
     def transform(self, documents: list[Document], **kwargs) -> list[Document]:
         preview = kwargs.get("preview")
         process_rule = kwargs.get("process_rule")
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from core.rag.rerank.keyword_scorer import KeywordScoringMethod
+
 
 class VectorSetting(BaseModel):
     vector_weight: float
@@ -12,6 +14,12 @@ class VectorSetting(BaseModel):
 class KeywordSetting(BaseModel):
     keyword_weight: float
 
+    scoring_method: KeywordScoringMethod = KeywordScoringMethod.TF_IDF
+
+    bm25_k1: float = 1.2
+
+    bm25_b: float = 0.75
+
 
 class Weights(BaseModel):
     """Model for weighted rerank."""
@@ -0,0 +1,193 @@
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from enum import StrEnum
+from typing import Any
+
+import numpy as np
+from cachetools import LRUCache
+
+from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.models.document import Document
+from libs import helper
+
+
+class KeywordScoringMethod(StrEnum):
+    TF_IDF = "tf_idf"
+    BM25 = "bm25"
+
+
+class KeywordExtractionCache:
+    """
+    Process-wide LRU of jieba keywords per chunk content, so candidates are not re-extracted per request.
+
+    The keyword term frequencies used by BM25 are cached alongside, computed on first use.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._cache: LRUCache[str, frozenset[str]] = LRUCache(maxsize=maxsize)
+        self._term_frequencies: LRUCache[str, Mapping[str, int]] = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def extract(self, keyword_table_handler: JiebaKeywordTableHandler, text: str) -> frozenset[str]:
+        key = helper.generate_text_hash(text)
+        with self._lock:
+            keywords = self._cache.get(key)
+        if keywords is None:
+            keywords = frozenset(keyword_table_handler.extract_keywords(text, None))
+            with self._lock:
+                self._cache[key] = keywords
+        return keywords
+
+    def term_frequencies(self, keyword_table_handler: JiebaKeywordTableHandler, text: str) -> Mapping[str, int]:
+        """Number of occurrences of each keyword of the text among its jieba tokens, at least 1."""
+        key = helper.generate_text_hash(text)
+        with self._lock:
+            frequencies = self._term_frequencies.get(key)
+        if frequencies is None:
+            keywords = self.extract(keyword_table_handler, text)
+            counts = keyword_table_handler.count_keywords(text, keywords)
+            # sub-tokens of compound keywords are not jieba tokens themselves
+            frequencies = {keyword: max(counts[keyword], 1) for keyword in keywords}
+            with self._lock:
+                self._term_frequencies[key] = frequencies
+        return frequencies
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._term_frequencies.clear()
+
+
+keyword_extraction_cache = KeywordExtractionCache()
+
+
+class TermDocumentMatrix:
+    """
+    Sparse term-document matrix in coordinate form, built once per scoring request.
+
+    Every (document, term) pair is stored once with its term frequency, so document frequencies,
+    document norms and query dot products reduce to `np.bincount` over the coordinate arrays.
+    """
+
+    def __init__(self, documents_terms: list[Counter[str]]):
+        self.vocabulary: dict[str, int] = {}
+        doc_indices: list[int] = []
+        term_indices: list[int] = []
+        term_frequencies: list[int] = []
+        for doc_index, terms in enumerate(documents_terms):
+            for term, frequency in terms.items():
+                term_index = self.vocabulary.setdefault(term, len(self.vocabulary))
+                doc_indices.append(doc_index)
+                term_indices.append(term_index)
+                term_frequencies.append(frequency)
+
+        self.num_documents = len(documents_terms)
+        self.doc_indices = np.asarray(doc_indices, dtype=np.int64)
+        self.term_indices = np.asarray(term_indices, dtype=np.int64)
+        self.term_frequencies = np.asarray(term_frequencies, dtype=np.float64)
+        self.document_frequencies = np.bincount(self.term_indices, minlength=len(self.vocabulary)).astype(np.float64)
+
+    def query_vector(self, query_terms: Counter[str]) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for term, frequency in query_terms.items():
+            term_index = self.vocabulary.get(term)
+            if term_index is not None:
+                vector[term_index] = frequency
+        return vector
+
+    def sum_by_document(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.doc_indices, weights=values, minlength=self.num_documents)
+
+
+class KeywordScorer:
+    """
+    Vectorized keyword relevance scoring of candidate documents against a query.
+
+    `TF_IDF` reproduces the cosine similarity of smoothed TF-IDF vectors used by weighted rerank,
+    `BM25` computes Okapi BM25 normalized into [0, 1] by the best scoring document.
+    """
+
+    def __init__(
+        self,
+        method: KeywordScoringMethod = KeywordScoringMethod.TF_IDF,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.method = method
+        self.k1 = k1
+        self.b = b
+        self._keyword_table_handler = JiebaKeywordTableHandler()
+
+    @classmethod
+    def from_keyword_setting(cls, keyword_setting: Mapping[str, Any] | None) -> "KeywordScorer":
+        """Create a scorer from the `keyword_setting` of retrieval weights, missing values keep their default."""
+        keyword_setting = keyword_setting or {}
+        kwargs: dict[str, Any] = {}
+        if keyword_setting.get("scoring_method"):
+            kwargs["method"] = KeywordScoringMethod(keyword_setting["scoring_method"])
+        if keyword_setting.get("bm25_k1") is not None:
+            kwargs["k1"] = float(keyword_setting["bm25_k1"])
+        if keyword_setting.get("bm25_b") is not None:
+            kwargs["b"] = float(keyword_setting["bm25_b"])
+        return cls(**kwargs)
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        """
+        Score documents by their keywords, the extracted keywords are stored in `metadata["keywords"]`
+        :param query: search query
+        :param documents: candidate documents
+
+        :return: one score per document, in the order of `documents`
+        """
+        if not documents:
+            return []
+
+        query_terms = Counter(self._keyword_table_handler.extract_keywords(query, None))
+        documents_terms = []
+        for document in documents:
+            document_keywords = keyword_extraction_cache.extract(self._keyword_table_handler, document.page_content)
+            if document.metadata is not None:
+                document.metadata["keywords"] = set(document_keywords)
+            if self.method == KeywordScoringMethod.BM25:
+                # term frequency is the number of occurrences of the keyword among the tokens of the chunk
+                documents_terms.append(
+                    Counter(
+                        keyword_extraction_cache.term_frequencies(self._keyword_table_handler, document.page_content)
+                    )
+                )
+            else:
+                documents_terms.append(Counter(document_keywords))
+
+        matrix = TermDocumentMatrix(documents_terms)
+        if self.method == KeywordScoringMethod.BM25:
+            scores = self._bm25(matrix, query_terms)
+        else:
+            scores = self._tf_idf_cosine(matrix, query_terms)
+        return scores.tolist()
+
+    def _tf_idf_cosine(self, matrix: TermDocumentMatrix, query_terms: Counter[str]) -> np.ndarray:
+        idf = np.log((1 + matrix.num_documents) / (1 + matrix.document_frequencies)) + 1
+        query_weights = matrix.query_vector(query_terms) * idf
+        document_weights = matrix.term_frequencies * idf[matrix.term_indices]
+
+        numerators = matrix.sum_by_document(document_weights * query_weights[matrix.term_indices])
+        document_norms = np.sqrt(matrix.sum_by_document(document_weights**2))
+        denominators = document_norms * np.linalg.norm(query_weights)
+        return np.divide(numerators, denominators, out=np.zeros_like(numerators), where=denominators > 0)
+
+    def _bm25(self, matrix: TermDocumentMatrix, query_terms: Counter[str]) -> np.ndarray:
+        document_frequencies = matrix.document_frequencies
+        idf = np.log(1 + (matrix.num_documents - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        query_weights = matrix.query_vector(query_terms)
+
+        document_lengths = matrix.sum_by_document(matrix.term_frequencies)
+        average_length = document_lengths.mean() or 1.0
+        length_norms = self.k1 * (1 - self.b + self.b * document_lengths / average_length)
+
+        tf = matrix.term_frequencies
+        saturated_tf = tf * (self.k1 + 1) / (tf + length_norms[matrix.doc_indices])
+        scores = matrix.sum_by_document(query_weights[matrix.term_indices] * idf[matrix.term_indices] * saturated_tf)
+
+        max_score = scores.max()
+        return scores / max_score if max_score > 0 else scores
@@ -122,26 +122,27 @@ class FixedRecursiveCharacterTextSplitter(EnhanceRecursiveCharacterTextSplitter)
                 merged_text = self._merge_splits(_good_splits, _separator, _good_splits_lengths)
                 final_chunks.extend(merged_text)
         else:
-            current_part = ""
+            # parts are collected in lists and joined once per chunk
+            current_part: list[str] = []
             current_length = 0
-            overlap_part = ""
+            overlap_part: list[str] = []
             overlap_part_length = 0
             for s, s_len in zip(splits, s_lens):
                 if current_length + s_len <= self._chunk_size - self._chunk_overlap:
-                    current_part += s
+                    current_part.append(s)
                     current_length += s_len
                 elif current_length + s_len <= self._chunk_size:
-                    current_part += s
+                    current_part.append(s)
                     current_length += s_len
-                    overlap_part += s
+                    overlap_part.append(s)
                     overlap_part_length += s_len
                 else:
-                    final_chunks.append(current_part)
-                    current_part = overlap_part + s
+                    final_chunks.append("".join(current_part))
+                    current_part = [*overlap_part, s]
                     current_length = s_len + overlap_part_length
-                    overlap_part = ""
+                    overlap_part = []
                     overlap_part_length = 0
             if current_part:
-                final_chunks.append(current_part)
+                final_chunks.append("".join(current_part))
 
         return final_chunks
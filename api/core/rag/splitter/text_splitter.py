@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import copy
+import functools
 import logging
 import re
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Callable, Collection, Iterable, Sequence, Set
 from dataclasses import dataclass
 from typing import (
@@ -20,17 +22,23 @@ logger = logging.getLogger(__name__)
 TS = TypeVar("TS", bound="TextSplitter")
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_separator(pattern: str) -> re.Pattern[str]:
+    """Compile a separator pattern once, splitters search and split with the same few separators."""
+    return re.compile(pattern)
+
+
 def _split_text_with_regex(text: str, separator: str, keep_separator: bool) -> list[str]:
     # Now that we have the separator, split the text
     if separator:
         if keep_separator:
             # The parentheses in the pattern keep the delimiters in the result.
-            _splits = re.split(f"({re.escape(separator)})", text)
+            _splits = _compile_separator(f"({re.escape(separator)})").split(text)
             splits = [_splits[i - 1] + _splits[i] for i in range(1, len(_splits), 2)]
             if len(_splits) % 2 != 0:
                 splits += _splits[-1:]
         else:
-            splits = re.split(separator, text)
+            splits = _compile_separator(separator).split(text)
     else:
         splits = list(text)
     return [s for s in splits if (s not in {"", "\n"})]
@@ -65,6 +73,7 @@ class TextSplitter(BaseDocumentTransformer, ABC):
         self._length_function = length_function
         self._keep_separator = keep_separator
         self._add_start_index = add_start_index
+        self._separator_lengths: dict[str, int] = {}
 
     @abstractmethod
     def split_text(self, text: str) -> list[str]:
@@ -93,7 +102,7 @@ class TextSplitter(BaseDocumentTransformer, ABC):
             metadatas.append(doc.metadata or {})
         return self.create_documents(texts, metadatas=metadatas)
 
-    def _join_docs(self, docs: list[str], separator: str) -> str | None:
+    def _join_docs(self, docs: Iterable[str], separator: str) -> str | None:
         text = separator.join(docs)
         text = text.strip()
         if text == "":
@@ -101,13 +110,23 @@ class TextSplitter(BaseDocumentTransformer, ABC):
         else:
             return text
 
+    def _separator_length(self, separator: str) -> int:
+        separator_len = self._separator_lengths.get(separator)
+        if separator_len is None:
+            separator_len = self._length_function([separator])[0]
+            self._separator_lengths[separator] = separator_len
+        return separator_len
+
     def _merge_splits(self, splits: Iterable[str], separator: str, lengths: list[int]) -> list[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
-        separator_len = self._length_function([separator])[0]
+        separator_len = self._separator_length(separator)
 
         docs = []
-        current_doc: list[str] = []
+        # the splits of the current chunk along with their lengths, dropped from the left
+        # as the window moves on so that merging is linear in the number of splits
+        current_doc: deque[str] = deque()
+        current_lengths: deque[int] = deque()
         total = 0
         for d, _len in zip(splits, lengths):
             if total + _len + (separator_len if len(current_doc) > 0 else 0) > self._chunk_size:
@@ -125,11 +144,10 @@ class TextSplitter(BaseDocumentTransformer, ABC):
                     while total > self._chunk_overlap or (
                         total + _len + (separator_len if len(current_doc) > 0 else 0) > self._chunk_size and total > 0
                     ):
-                        total -= self._length_function([current_doc[0]])[0] + (
-                            separator_len if len(current_doc) > 1 else 0
-                        )
-                        current_doc = current_doc[1:]
+                        total -= current_lengths.popleft() + (separator_len if len(current_doc) > 1 else 0)
+                        current_doc.popleft()
             current_doc.append(d)
+            current_lengths.append(_len)
             total += _len + (separator_len if len(current_doc) > 1 else 0)
         doc = self._join_docs(current_doc, separator)
         if doc is not None:
@@ -261,7 +279,7 @@ class RecursiveCharacterTextSplitter(TextSplitter):
             if _s == "":
                 separator = _s
                 break
-            if re.search(_s, text):
+            if _compile_separator(_s).search(text):
                 separator = _s
                 new_separators = separators[i + 1 :]
                 break
@@ -0,0 +1,274 @@
+"""
+Write-behind SQLAlchemy implementation of the WorkflowNodeExecutionRepository.
+"""
+
+import dataclasses
+import logging
+import threading
+from collections.abc import Iterable, Sequence
+from typing import Any, Union
+
+from sqlalchemy import Table, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from configs import dify_config
+from core.repositories.sqlalchemy_workflow_node_execution_repository import SQLAlchemyWorkflowNodeExecutionRepository
+from core.workflow.entities import WorkflowNodeExecution
+from core.workflow.repositories.workflow_node_execution_repository import OrderConfig
+from libs.datetime_utils import naive_utc_now
+from models import (
+    Account,
+    EndUser,
+    WorkflowNodeExecutionModel,
+    WorkflowNodeExecutionTriggeredFrom,
+)
+from models.enums import ExecutionOffLoadType
+from models.workflow import WorkflowNodeExecutionOffload
+
+logger = logging.getLogger(__name__)
+
+# Columns written by `save_execution_data`, `save` leaves them untouched on existing rows
+_EXECUTION_DATA_COLUMNS = frozenset(("inputs", "process_data", "outputs"))
+
+# Dialects supporting `INSERT ... ON CONFLICT DO UPDATE`
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+@dataclasses.dataclass
+class _PendingExecution:
+    model: WorkflowNodeExecutionModel
+    # execution data columns set by `save_execution_data`, the others keep their stored value
+    data_columns: frozenset[str] = frozenset()
+
+    def merge_older(self, older: "_PendingExecution") -> None:
+        """Keep the execution data of an older pending state that this one does not set."""
+        for column in older.data_columns - self.data_columns:
+            setattr(self.model, column, getattr(older.model, column))
+        self.data_columns |= older.data_columns
+
+
+class BatchedWorkflowNodeExecutionRepository(SQLAlchemyWorkflowNodeExecutionRepository):
+    """
+    Write-behind variant of SQLAlchemyWorkflowNodeExecutionRepository.
+
+    `save` and `save_execution_data` only record the latest state of each node execution in
+    memory, so the many state changes of a node are coalesced into a single row write. The buffer
+    is written with multi-row upserts in one transaction:
+
+    - `flush_interval` seconds after the first change buffered since the previous write
+    - as soon as `batch_size` node executions are buffered
+    - before node executions are read back from the database
+    - on `flush`, which the workflow cycle manager calls before a workflow execution completes
+
+    Inputs, outputs and process data are still truncated and offloaded to storage when they are
+    saved, only the database writes are deferred.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker | Engine,
+        user: Union[Account, EndUser],
+        app_id: str | None,
+        triggered_from: WorkflowNodeExecutionTriggeredFrom | None,
+        *,
+        flush_interval: float | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        Initialize the repository.
+
+        Args:
+            session_factory: SQLAlchemy sessionmaker or engine for creating sessions
+            user: Account or EndUser object containing tenant_id, user ID, and role information
+            app_id: App ID for filtering by application (can be None)
+            triggered_from: Source of the execution trigger (SINGLE_STEP or WORKFLOW_RUN)
+            flush_interval: Maximum number of seconds changes stay buffered,
+                defaults to WORKFLOW_NODE_EXECUTION_FLUSH_INTERVAL
+            batch_size: Number of buffered node executions that triggers a write,
+                defaults to WORKFLOW_NODE_EXECUTION_FLUSH_BATCH_SIZE
+        """
+        super().__init__(session_factory, user, app_id, triggered_from)
+        self._flush_interval = (
+            flush_interval if flush_interval is not None else dify_config.WORKFLOW_NODE_EXECUTION_FLUSH_INTERVAL
+        )
+        self._batch_size = (
+            batch_size if batch_size is not None else dify_config.WORKFLOW_NODE_EXECUTION_FLUSH_BATCH_SIZE
+        )
+
+        # Guards the buffers and the timer
+        self._lock = threading.Lock()
+        # Serializes writes, so that an older state never overwrites a newer one
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, _PendingExecution] = {}
+        self._pending_offloads: dict[tuple[str, ExecutionOffLoadType], WorkflowNodeExecutionOffload] = {}
+        self._flush_timer: threading.Timer | None = None
+
+        # Number of writes to the database, for monitoring and benchmarks
+        self.flush_count = 0
+
+    def save(self, execution: WorkflowNodeExecution) -> None:
+        """
+        Buffer the state of a NodeExecution, except for its inputs, process_data and outputs.
+
+        Args:
+            execution: The NodeExecution domain entity to persist
+        """
+        self._buffer(_PendingExecution(model=self._to_db_model(execution)))
+
+    def save_execution_data(self, execution: WorkflowNodeExecution):
+        """
+        Buffer the inputs, process_data and outputs of a NodeExecution, along with its state.
+
+        Large values are truncated and offloaded to storage right away.
+        """
+        db_model = self._to_db_model(execution)
+        offloads = self._apply_execution_data(execution, db_model, [])
+        data_columns = frozenset(column for column in _EXECUTION_DATA_COLUMNS if getattr(execution, column) is not None)
+        self._buffer(_PendingExecution(model=db_model, data_columns=data_columns), offloads)
+
+    def _buffer(
+        self,
+        pending: _PendingExecution,
+        offloads: Iterable[WorkflowNodeExecutionOffload] = (),
+    ) -> None:
+        db_model = pending.model
+        with self._lock:
+            older = self._pending.get(db_model.id)
+            if older is not None:
+                pending.merge_older(older)
+            self._pending[db_model.id] = pending
+            for offload in offloads:
+                self._pending_offloads[(db_model.id, offload.type_)] = offload
+
+            if db_model.node_execution_id:
+                self._node_execution_cache[db_model.node_execution_id] = db_model
+
+            batch_full = len(self._pending) >= self._batch_size
+            if not batch_full and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_interval, self._flush_on_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if batch_full:
+            self.flush()
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # the changes stay buffered and are written by the next flush
+            logger.exception("Failed to flush buffered workflow node executions")
+
+    def flush(self) -> None:
+        """Write all buffered node executions to the database."""
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending, self._pending = self._pending, {}
+                offloads, self._pending_offloads = self._pending_offloads, {}
+
+            if not pending and not offloads:
+                return
+
+            try:
+                with self._session_factory() as session, session.begin():
+                    self._write(session, list(pending.values()), list(offloads.values()))
+            except Exception:
+                self._requeue(pending, offloads)
+                raise
+
+            self.flush_count += 1
+            logger.debug("Flushed %d workflow node executions and %d offload records", len(pending), len(offloads))
+
+    def _requeue(
+        self,
+        pending: dict[str, _PendingExecution],
+        offloads: dict[tuple[str, ExecutionOffLoadType], WorkflowNodeExecutionOffload],
+    ) -> None:
+        with self._lock:
+            for execution_id, older in pending.items():
+                newer = self._pending.get(execution_id)
+                if newer is None:
+                    self._pending[execution_id] = older
+                else:
+                    newer.merge_older(older)
+            for key, offload in offloads.items():
+                self._pending_offloads.setdefault(key, offload)
+
+    def _write(
+        self,
+        session: Session,
+        pending: Sequence[_PendingExecution],
+        offloads: Sequence[WorkflowNodeExecutionOffload],
+    ) -> None:
+        insert = _UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            # no multi-row upsert, still a single transaction for the whole batch
+            for item in pending:
+                session.merge(item.model)
+            for offload in offloads:
+                session.merge(offload)
+            return
+
+        execution_table: Table = WorkflowNodeExecutionModel.__table__  # type: ignore[assignment]
+        # rows are grouped by the execution data they update, each group is one statement per batch
+        groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for item in pending:
+            groups.setdefault(item.data_columns, []).append(_to_row(item.model))
+        for data_columns, rows in groups.items():
+            update_columns = [
+                column.name
+                for column in execution_table.columns
+                if not column.primary_key
+                and (column.name not in _EXECUTION_DATA_COLUMNS or column.name in data_columns)
+            ]
+            for batch in _batched(rows, self._batch_size):
+                stmt = insert(execution_table).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[execution_table.c.id],
+                    set_={name: stmt.excluded[name] for name in update_columns},
+                    # never overwrite the node execution of another tenant sharing the ID
+                    where=execution_table.c.tenant_id == stmt.excluded.tenant_id,
+                )
+                session.execute(stmt)
+
+        offload_table: Table = WorkflowNodeExecutionOffload.__table__  # type: ignore[assignment]
+        offload_rows = []
+        for offload in offloads:
+            if offload.created_at is None:
+                offload.created_at = naive_utc_now()
+            offload_rows.append(_to_row(offload))
+        for batch in _batched(offload_rows, self._batch_size):
+            stmt = insert(offload_table).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[offload_table.c.node_execution_id, offload_table.c.type],
+                set_={"file_id": stmt.excluded.file_id},
+            )
+            session.execute(stmt)
+
+    def get_db_models_by_workflow_run(
+        self,
+        workflow_run_id: str,
+        order_config: OrderConfig | None = None,
+        triggered_from: WorkflowNodeExecutionTriggeredFrom = WorkflowNodeExecutionTriggeredFrom.WORKFLOW_RUN,
+    ) -> Sequence[WorkflowNodeExecutionModel]:
+        """Flush the buffered node executions, then retrieve the database models of a workflow run."""
+        self.flush()
+        return super().get_db_models_by_workflow_run(workflow_run_id, order_config, triggered_from)
+
+
+def _to_row(model: WorkflowNodeExecutionModel | WorkflowNodeExecutionOffload) -> dict[str, Any]:
+    """Map the column attributes of a model to a row keyed by column name."""
+    return {attr.columns[0].name: getattr(model, attr.key) for attr in inspect(type(model)).column_attrs}
+
+
+def _batched(rows: Sequence[dict[str, Any]], size: int) -> Iterable[Sequence[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
@@ -148,6 +148,9 @@ class CeleryWorkflowNodeExecutionRepository(WorkflowNodeExecutionRepository):
             # For now, we'll re-raise the exception
             raise
 
+    def flush(self):
+        """Saves are queued to Celery as soon as they happen, there is nothing to flush."""
+
     def get_by_workflow_run(
         self,
         workflow_run_id: str,
@@ -11,6 +11,8 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from configs import dify_config
+from core.repositories.batched_workflow_node_execution_repository import BatchedWorkflowNodeExecutionRepository
+from core.repositories.sqlalchemy_workflow_node_execution_repository import SQLAlchemyWorkflowNodeExecutionRepository
 from core.workflow.repositories.workflow_execution_repository import WorkflowExecutionRepository
 from core.workflow.repositories.workflow_node_execution_repository import WorkflowNodeExecutionRepository
 from libs.module_loading import import_string
@@ -96,6 +98,13 @@ class DifyCoreRepositoryFactory:
 
         try:
             repository_class = import_string(class_path)
+            if (
+                triggered_from == WorkflowNodeExecutionTriggeredFrom.SINGLE_STEP
+                and isinstance(repository_class, type)
+                and issubclass(repository_class, BatchedWorkflowNodeExecutionRepository)
+            ):
+                # single-step runs read the execution back right after saving it, write it immediately
+                repository_class = SQLAlchemyWorkflowNodeExecutionRepository
             return repository_class(  # type: ignore[no-any-return]
                 session_factory=session_factory,
                 user=user,
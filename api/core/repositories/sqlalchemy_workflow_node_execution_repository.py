@@ -415,12 +415,30 @@ class SQLAlchemyWorkflowNodeExecutionRepository(WorkflowNodeExecutionRepository)
             )
             db_model: WorkflowNodeExecutionModel | None = session.execute(query).scalars().first()
 
-        if db_model is not None:
-            offload_data = db_model.offload_data
-        else:
+        if db_model is None:
             db_model = self._to_db_model(domain_model)
-            offload_data = db_model.offload_data
+        db_model.offload_data = self._apply_execution_data(domain_model, db_model, db_model.offload_data)
+
+        with self._session_factory() as session, session.begin():
+            session.merge(db_model)
+            session.flush()
+
+    def flush(self) -> None:
+        """Changes are written by `save` and `save_execution_data` directly, there is nothing to flush."""
+
+    def _apply_execution_data(
+        self,
+        domain_model: WorkflowNodeExecution,
+        db_model: WorkflowNodeExecutionModel,
+        offload_data: list[WorkflowNodeExecutionOffload],
+    ) -> list[WorkflowNodeExecutionOffload]:
+        """
+        Set the inputs, outputs and process_data of the database model, truncating and offloading
+        large values to storage.
 
+        Returns:
+            The offload records of the execution, with the ones created here replacing those of the same type.
+        """
         if domain_model.inputs is not None:
             result = self._truncate_and_upload(
                 domain_model.inputs,
@@ -460,10 +478,7 @@ class SQLAlchemyWorkflowNodeExecutionRepository(WorkflowNodeExecutionRepository)
             else:
                 db_model.process_data = self._json_encode(domain_model.process_data)
 
-        db_model.offload_data = offload_data
-        with self._session_factory() as session, session.begin():
-            session.merge(db_model)
-            session.flush()
+        return offload_data
 
     def get_db_models_by_workflow_run(
         self,
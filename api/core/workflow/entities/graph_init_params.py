@@ -18,3 +18,6 @@ class GraphInitParams(BaseModel):
         ..., description="invoke from, service-api, web-app, explore or debugger"
     )  # Should be InvokeFrom enum: 'service-api' | 'web-app' | 'explore' | 'debugger'
     call_depth: int = Field(..., description="call depth")
+    graph_cache_key: str | None = Field(
+        default=None, description="key identifying the graph config content, to share its compiled topology"
+    )
@@ -1,4 +1,5 @@
 from copy import deepcopy
+from typing import Protocol
 
 from pydantic import BaseModel, PrivateAttr
 
@@ -7,6 +8,10 @@ from core.model_runtime.entities.llm_entities import LLMUsage
 from .variable_pool import VariablePool
 
 
+class _SerializableState(Protocol):
+    def dumps(self) -> str: ...
+
+
 class GraphRuntimeState(BaseModel):
     # Private attributes to prevent direct modification
     _variable_pool: VariablePool = PrivateAttr()
@@ -18,6 +23,9 @@ class GraphRuntimeState(BaseModel):
     _ready_queue_json: str = PrivateAttr()
     _graph_execution_json: str = PrivateAttr()
     _response_coordinator_json: str = PrivateAttr()
+    _graph_state_json: str = PrivateAttr()
+    # Live engine components, attached by the GraphEngine running with this state
+    _engine_components: dict[str, _SerializableState] = PrivateAttr(default_factory=dict)
 
     def __init__(
         self,
@@ -31,6 +39,7 @@ class GraphRuntimeState(BaseModel):
         ready_queue_json: str = "",
         graph_execution_json: str = "",
         response_coordinator_json: str = "",
+        graph_state_json: str = "",
         **kwargs: object,
     ):
         """Initialize the GraphRuntimeState with validation."""
@@ -60,6 +69,7 @@ class GraphRuntimeState(BaseModel):
         self._ready_queue_json = ready_queue_json
         self._graph_execution_json = graph_execution_json
         self._response_coordinator_json = response_coordinator_json
+        self._graph_state_json = graph_state_json
 
     @property
     def variable_pool(self) -> VariablePool:
@@ -147,14 +157,55 @@ class GraphRuntimeState(BaseModel):
     @property
     def ready_queue_json(self) -> str:
         """Get a copy of the ready queue state."""
-        return self._ready_queue_json
+        return self._dump_engine_component("ready_queue", self._ready_queue_json)
 
     @property
     def graph_execution_json(self) -> str:
         """Get a copy of the serialized graph execution state."""
-        return self._graph_execution_json
+        return self._dump_engine_component("graph_execution", self._graph_execution_json)
 
     @property
     def response_coordinator_json(self) -> str:
         """Get a copy of the serialized response coordinator state."""
-        return self._response_coordinator_json
+        return self._dump_engine_component("response_coordinator", self._response_coordinator_json)
+
+    @property
+    def graph_state_json(self) -> str:
+        """Get a copy of the serialized node and edge states."""
+        return self._dump_engine_component("graph_state", self._graph_state_json)
+
+    def load_engine_state(
+        self,
+        *,
+        ready_queue_json: str,
+        graph_execution_json: str,
+        response_coordinator_json: str,
+        graph_state_json: str,
+    ) -> None:
+        """Set the serialized engine state the next GraphEngine created with this state resumes from."""
+        self._ready_queue_json = ready_queue_json
+        self._graph_execution_json = graph_execution_json
+        self._response_coordinator_json = response_coordinator_json
+        self._graph_state_json = graph_state_json
+
+    def attach_engine_state(
+        self,
+        *,
+        ready_queue: _SerializableState,
+        graph_execution: _SerializableState,
+        response_coordinator: _SerializableState,
+        graph_state: _SerializableState,
+    ) -> None:
+        """Attach the components of a running GraphEngine, the `*_json` properties then serialize them live."""
+        self._engine_components = {
+            "ready_queue": ready_queue,
+            "graph_execution": graph_execution,
+            "response_coordinator": response_coordinator,
+            "graph_state": graph_state,
+        }
+
+    def _dump_engine_component(self, name: str, default: str) -> str:
+        component = self._engine_components.get(name)
+        if component is None:
+            return default
+        return component.dumps()
@@ -3,7 +3,7 @@ from collections import defaultdict
 from collections.abc import Mapping, Sequence
 from typing import Annotated, Any, Union, cast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, Variable
@@ -21,6 +21,8 @@ from factories import variable_factory
 
 VariableValue = Union[str, int, float, dict[str, object], list[object], File]
 
+_NODE_VARIABLES_ADAPTER: TypeAdapter[dict[str, VariableUnion]] = TypeAdapter(dict[str, VariableUnion])
+
 VARIABLE_PATTERN = re.compile(r"\{\{#([a-zA-Z0-9_]{1,50}(?:\.[a-zA-Z_][a-zA-Z0-9_]{0,29}){1,10})#\}\}")
 
 
@@ -56,6 +58,12 @@ class VariablePool(BaseModel):
         default_factory=list,
     )
 
+    # Parent pool of a copy-on-write child scope, see `create_child`.
+    _parent: "VariablePool | None" = PrivateAttr(default=None)
+    # Nodes and variables removed in this scope, they must not be read through from the parent.
+    _removed_nodes: set[str] = PrivateAttr(default_factory=set)
+    _removed_variables: set[tuple[str, str]] = PrivateAttr(default_factory=set)
+
     def model_post_init(self, context: Any, /):
         # Create a mapping from field names to SystemVariableKey enum values
         self._add_system_variables(self.system_variables)
@@ -114,18 +122,87 @@ class VariablePool(BaseModel):
         # Based on the definition of `VariableUnion`,
         # `list[Variable]` can be safely used as `list[VariableUnion]` since they are compatible.
         self.variable_dictionary[node_id][name] = cast(VariableUnion, variable)
+        self._removed_variables.discard((node_id, name))
 
     @classmethod
     def _selector_to_keys(cls, selector: Sequence[str]) -> tuple[str, str]:
         return selector[0], selector[1]
 
+    def _lookup(self, node_id: str, name: str) -> VariableUnion | None:
+        pool: VariablePool | None = self
+        while pool is not None:
+            variables = pool.variable_dictionary.get(node_id)
+            if variables is not None and name in variables:
+                return variables[name]
+            if node_id in pool._removed_nodes or (node_id, name) in pool._removed_variables:
+                return None
+            pool = pool._parent
+        return None
+
     def _has(self, selector: Sequence[str]) -> bool:
         node_id, name = self._selector_to_keys(selector)
-        if node_id not in self.variable_dictionary:
-            return False
-        if name not in self.variable_dictionary[node_id]:
-            return False
-        return True
+        return self._lookup(node_id, name) is not None
+
+    def get_node_variables(self, node_id: str, /) -> dict[str, VariableUnion]:
+        """
+        Return all variables of a node, including the ones read through from parent scopes.
+        """
+        local_variables = self.variable_dictionary.get(node_id, {})
+        if self._parent is None or node_id in self._removed_nodes:
+            return dict(local_variables)
+        variables = {
+            name: variable
+            for name, variable in self._parent.get_node_variables(node_id).items()
+            if (node_id, name) not in self._removed_variables
+        }
+        variables.update(local_variables)
+        return variables
+
+    def get_node_ids(self) -> list[str]:
+        """
+        Return the IDs of all nodes that have variables, including the ones in parent scopes.
+        """
+        node_ids = [node_id for node_id, variables in self.variable_dictionary.items() if variables]
+        if self._parent is not None:
+            local = set(node_ids)
+            node_ids.extend(
+                node_id
+                for node_id in self._parent.get_node_ids()
+                if node_id not in local and node_id not in self._removed_nodes and self.get_node_variables(node_id)
+            )
+        return node_ids
+
+    def dumps_node_variables(self, node_id: str, /) -> str:
+        """
+        Serialize all variables of a node to a JSON string.
+        """
+        return _NODE_VARIABLES_ADAPTER.dump_json(self.get_node_variables(node_id)).decode()
+
+    def loads_node_variables(self, node_id: str, data: str, /) -> None:
+        """
+        Replace all variables of a node with the ones serialized by `dumps_node_variables`.
+        """
+        self.variable_dictionary[node_id] = _NODE_VARIABLES_ADAPTER.validate_json(data)
+        self._removed_nodes.discard(node_id)
+
+    def create_child(self) -> "VariablePool":
+        """
+        Create a copy-on-write child scope of this pool.
+
+        The child reads through to this pool and writes only to its own layer, so creating it
+        is O(1) regardless of how many (or how large) variables this pool holds. This pool must
+        not be modified through the child. Conversation variables are the exception to the
+        read-through: they are pinned in the child when it is created, so that conversation
+        variables synced into this pool while the child runs do not leak into it.
+        """
+        child = self.model_copy(update={"variable_dictionary": defaultdict(dict)})
+        child._parent = self
+        child._removed_nodes = {CONVERSATION_VARIABLE_NODE_ID}
+        child._removed_variables = set()
+        child.variable_dictionary[CONVERSATION_VARIABLE_NODE_ID] = self.get_node_variables(
+            CONVERSATION_VARIABLE_NODE_ID
+        )
+        return child
 
     def get(self, selector: Sequence[str], /) -> Segment | None:
         """
@@ -152,7 +229,7 @@ class VariablePool(BaseModel):
             return None
 
         node_id, name = self._selector_to_keys(selector)
-        segment: Segment | None = self.variable_dictionary[node_id].get(name)
+        segment: Segment | None = self._lookup(node_id, name)
 
         if segment is None:
             return None
@@ -215,9 +292,13 @@ class VariablePool(BaseModel):
             return
         if len(selector) == 1:
             self.variable_dictionary[selector[0]] = {}
+            if self._parent is not None:
+                self._removed_nodes.add(selector[0])
             return
         key, hash_key = self._selector_to_keys(selector)
         self.variable_dictionary[key].pop(hash_key, None)
+        if self._parent is not None:
+            self._removed_variables.add((key, hash_key))
 
     def convert_template(self, template: str, /):
         parts = VARIABLE_PATTERN.split(template)
@@ -8,6 +8,7 @@ from core.workflow.nodes.base.node import Node
 from libs.typing import is_str, is_str_dict
 
 from .edge import Edge
+from .graph_topology import GraphTopology, graph_topology_cache
 
 logger = logging.getLogger(__name__)
 
@@ -262,20 +263,17 @@ class Graph:
             mark_downstream(root_id)
 
     @classmethod
-    def init(
+    def _compile_topology(
         cls,
-        *,
         graph_config: Mapping[str, object],
-        node_factory: "NodeFactory",
         root_node_id: str | None = None,
-    ) -> "Graph":
+    ) -> GraphTopology:
         """
-        Initialize graph
+        Parse the graph config into its run-independent topology.
 
         :param graph_config: graph config containing nodes and edges
-        :param node_factory: factory for creating node instances from config data
         :param root_node_id: root node id
-        :return: graph instance
+        :return: compiled graph topology
         """
         # Parse configs
         edge_configs = graph_config.get("edges", [])
@@ -287,6 +285,7 @@ class Graph:
         if not node_configs:
             raise ValueError("Graph must have at least one node")
 
+        node_indices = {id(node_config): index for index, node_config in enumerate(node_configs)}
         node_configs = [node_config for node_config in node_configs if node_config.get("type", "") != "custom-note"]
 
         # Parse node configurations
@@ -298,14 +297,52 @@ class Graph:
         # Build edges
         edges, in_edges, out_edges = cls._build_edges(edge_configs)
 
+        return GraphTopology(
+            node_indices={node_id: node_indices[id(node_config)] for node_id, node_config in node_configs_map.items()},
+            edges=tuple(edges.values()),
+            in_edges={node_id: tuple(edge_ids) for node_id, edge_ids in in_edges.items()},
+            out_edges={node_id: tuple(edge_ids) for node_id, edge_ids in out_edges.items()},
+            root_node_id=root_node_id,
+        )
+
+    @classmethod
+    def init(
+        cls,
+        *,
+        graph_config: Mapping[str, object],
+        node_factory: "NodeFactory",
+        root_node_id: str | None = None,
+        cache_key: str | None = None,
+    ) -> "Graph":
+        """
+        Initialize graph
+
+        When a cache key is given, the topology parsed from the graph config is cached, so only
+        the node instances are created when the same graph is initialized again.
+
+        :param graph_config: graph config containing nodes and edges
+        :param node_factory: factory for creating node instances from config data
+        :param root_node_id: root node id
+        :param cache_key: key identifying the graph config content, e.g. workflow id and graph hash
+        :return: graph instance
+        """
+        topology = graph_topology_cache.get_or_compile(
+            cache_key,
+            root_node_id,
+            lambda: cls._compile_topology(graph_config, root_node_id),
+        )
+
+        # Build edges
+        edges, in_edges, out_edges = topology.create_edges()
+
         # Create node instances
-        nodes = cls._create_node_instances(node_configs_map, node_factory)
+        nodes = cls._create_node_instances(topology.get_node_configs(graph_config), node_factory)
 
         # Get root node instance
-        root_node = nodes[root_node_id]
+        root_node = nodes[topology.root_node_id]
 
         # Mark inactive root branches as skipped
-        cls._mark_inactive_root_branches(nodes, edges, in_edges, out_edges, root_node_id)
+        cls._mark_inactive_root_branches(nodes, edges, in_edges, out_edges, topology.root_node_id)
 
         # Create and return the graph
         return cls(
@@ -16,6 +16,14 @@ class ReadOnlyVariablePool(Protocol):
         """Get all variables for a node (read-only)."""
         ...
 
+    def get_node_ids(self) -> list[str]:
+        """Get the IDs of all nodes that have variables (read-only)."""
+        ...
+
+    def dumps_node_variables(self, node_id: str) -> str:
+        """Serialize all variables of a node to a JSON string (read-only)."""
+        ...
+
 
 class ReadOnlyGraphRuntimeState(Protocol):
     """
@@ -59,3 +67,23 @@ class ReadOnlyGraphRuntimeState(Protocol):
     def get_output(self, key: str, default: Any = None) -> Any:
         """Get a single output value (returns a copy)."""
         ...
+
+    @property
+    def ready_queue_json(self) -> str:
+        """Get the serialized ready queue state (read-only)."""
+        ...
+
+    @property
+    def graph_execution_json(self) -> str:
+        """Get the serialized graph execution state (read-only)."""
+        ...
+
+    @property
+    def response_coordinator_json(self) -> str:
+        """Get the serialized response coordinator state (read-only)."""
+        ...
+
+    @property
+    def graph_state_json(self) -> str:
+        """Get the serialized node and edge states (read-only)."""
+        ...
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+
+from configs import dify_config
+
+from .edge import Edge
+
+
+@dataclass(frozen=True)
+class GraphTopology:
+    """
+    Run-independent structure of a workflow graph, compiled once from the graph config.
+
+    It holds everything `Graph.init` derives from the config apart from the node instances,
+    so that repeated instantiation of the same graph (every workflow run, every iteration and
+    loop round) only has to create the nodes. Node configs are referenced by their position in
+    the config's node list rather than held directly, so a topology can be shared by graph
+    configs with the same content without sharing their (mutable) node config dicts.
+    """
+
+    node_indices: Mapping[str, int]  # node id -> index in graph_config["nodes"]
+    edges: tuple[Edge, ...]  # edge templates, copied for each graph instance
+    in_edges: Mapping[str, tuple[str, ...]]
+    out_edges: Mapping[str, tuple[str, ...]]
+    root_node_id: str
+
+    def get_node_configs(self, graph_config: Mapping[str, object]) -> dict[str, dict[str, object]]:
+        node_configs = graph_config["nodes"]
+        assert isinstance(node_configs, list)
+        return {node_id: node_configs[index] for node_id, index in self.node_indices.items()}
+
+    def create_edges(self) -> tuple[dict[str, Edge], dict[str, list[str]], dict[str, list[str]]]:
+        """
+        Create fresh edge objects and mappings, edges carry per-run execution state.
+        """
+        edges = {edge.id: replace(edge) for edge in self.edges}
+        in_edges = {node_id: list(edge_ids) for node_id, edge_ids in self.in_edges.items()}
+        out_edges = {node_id: list(edge_ids) for node_id, edge_ids in self.out_edges.items()}
+        return edges, in_edges, out_edges
+
+
+def workflow_graph_cache_key(workflow_id: str, serialized_graph: str) -> str:
+    """Key identifying the content of a workflow graph, under which its compiled topology is cached."""
+    return f"{workflow_id}:{hashlib.sha256(serialized_graph.encode()).hexdigest()}"
+
+
+class GraphTopologyCache:
+    """
+    Bounded LRU cache of compiled graph topologies.
+
+    Entries are looked up by a cache key identifying the graph content (e.g. workflow id and graph
+    hash) and the root node, so the topologies of a workflow graph and of its iteration and loop
+    sub-graphs are shared across runs. Graphs initialized without a cache key are compiled each time.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[str, str | None], GraphTopology] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(
+        self,
+        cache_key: str | None,
+        root_node_id: str | None,
+        compiler: Callable[[], GraphTopology],
+    ) -> GraphTopology:
+        if self._max_size <= 0 or cache_key is None:
+            return compiler()
+
+        key = (cache_key, root_node_id)
+        with self._lock:
+            topology = self._entries.get(key)
+            if topology is not None:
+                self._entries.move_to_end(key)
+                return topology
+
+        topology = compiler()
+        with self._lock:
+            self._entries[key] = topology
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return topology
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+graph_topology_cache = GraphTopologyCache(max_size=dify_config.WORKFLOW_GRAPH_TOPOLOGY_CACHE_SIZE)
@@ -22,12 +22,19 @@ class ReadOnlyVariablePoolWrapper:
     def get_all_by_node(self, node_id: str) -> Mapping[str, object]:
         """Get all variables for a node (returns defensive copies)."""
         variables: dict[str, object] = {}
-        if node_id in self._variable_pool.variable_dictionary:
-            for key, var in self._variable_pool.variable_dictionary[node_id].items():
-                # Variables have a value property that contains the actual data
-                variables[key] = deepcopy(var.value)
+        for key, var in self._variable_pool.get_node_variables(node_id).items():
+            # Variables have a value property that contains the actual data
+            variables[key] = deepcopy(var.value)
         return variables
 
+    def get_node_ids(self) -> list[str]:
+        """Get the IDs of all nodes that have variables."""
+        return self._variable_pool.get_node_ids()
+
+    def dumps_node_variables(self, node_id: str) -> str:
+        """Serialize all variables of a node to a JSON string."""
+        return self._variable_pool.dumps_node_variables(node_id)
+
 
 class ReadOnlyGraphRuntimeStateWrapper:
     """
@@ -75,3 +82,23 @@ class ReadOnlyGraphRuntimeStateWrapper:
     def get_output(self, key: str, default: Any = None) -> Any:
         """Get a single output value (returns a copy)."""
         return self._state.get_output(key, default)
+
+    @property
+    def ready_queue_json(self) -> str:
+        """Get the serialized ready queue state (read-only)."""
+        return self._state.ready_queue_json
+
+    @property
+    def graph_execution_json(self) -> str:
+        """Get the serialized graph execution state (read-only)."""
+        return self._state.graph_execution_json
+
+    @property
+    def response_coordinator_json(self) -> str:
+        """Get the serialized response coordinator state (read-only)."""
+        return self._state.response_coordinator_json
+
+    @property
+    def graph_state_json(self) -> str:
+        """Get the serialized node and edge states (read-only)."""
+        return self._state.graph_state_json
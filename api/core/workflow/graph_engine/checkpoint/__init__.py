@@ -0,0 +1,25 @@
+"""
+Checkpointing of graph engine runs.
+
+This package contains the store protocol and implementations for run
+checkpoints, and the helpers to serialize and restore them. Checkpoints are
+written by `CheckpointLayer`.
+"""
+
+from .factory import create_checkpoint_store
+from .file_store import FileCheckpointStore
+from .in_memory_store import InMemoryCheckpointStore
+from .protocol import CheckpointStore
+from .redis_store import RedisCheckpointStore
+from .sections import dump_engine_sections, restore_checkpoint, variables_section
+
+__all__ = [
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "InMemoryCheckpointStore",
+    "RedisCheckpointStore",
+    "create_checkpoint_store",
+    "dump_engine_sections",
+    "restore_checkpoint",
+    "variables_section",
+]
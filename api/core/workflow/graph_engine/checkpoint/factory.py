@@ -0,0 +1,24 @@
+"""
+Factory for the checkpoint store configured for workflow runs.
+"""
+
+from configs import dify_config
+
+from .file_store import FileCheckpointStore
+from .protocol import CheckpointStore
+from .redis_store import RedisCheckpointStore
+
+
+def create_checkpoint_store() -> CheckpointStore:
+    """
+    Create the checkpoint store selected by `WORKFLOW_CHECKPOINT_STORE`.
+
+    Returns:
+        The configured checkpoint store
+    """
+    if dify_config.WORKFLOW_CHECKPOINT_STORE == "file":
+        return FileCheckpointStore(dify_config.WORKFLOW_CHECKPOINT_FILE_DIR)
+
+    from extensions.ext_redis import redis_client
+
+    return RedisCheckpointStore(redis_client, ttl=dify_config.WORKFLOW_CHECKPOINT_TTL)
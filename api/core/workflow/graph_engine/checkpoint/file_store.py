@@ -0,0 +1,60 @@
+"""
+Local file implementation of the CheckpointStore protocol.
+"""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import final
+from urllib.parse import quote, unquote
+
+
+@final
+class FileCheckpointStore:
+    """
+    Checkpoint store keeping one directory per run and one file per section.
+
+    Sections are written atomically by renaming a temporary file, so a run
+    interrupted while saving keeps the previous state of that section.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        """
+        Initialize the file checkpoint store.
+
+        Args:
+            directory: Directory holding the checkpoints, created on first save
+        """
+        self._directory = Path(directory)
+
+    def _run_directory(self, run_id: str) -> Path:
+        return self._directory / quote(run_id, safe="")
+
+    def load(self, run_id: str) -> dict[str, str] | None:
+        run_directory = self._run_directory(run_id)
+        if not run_directory.is_dir():
+            return None
+        return {
+            unquote(path.name): path.read_text(encoding="utf-8")
+            for path in run_directory.iterdir()
+            if path.is_file() and not path.name.startswith(".")
+        }
+
+    def save(self, run_id: str, sections: Mapping[str, str]) -> None:
+        run_directory = self._run_directory(run_id)
+        run_directory.mkdir(parents=True, exist_ok=True)
+        for name, data in sections.items():
+            # temporary files start with a dot, so load() skips them
+            fd, temp_path = tempfile.mkstemp(dir=run_directory, prefix=".")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, run_directory / quote(name, safe=""))
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+
+    def delete(self, run_id: str) -> None:
+        shutil.rmtree(self._run_directory(run_id), ignore_errors=True)
@@ -0,0 +1,34 @@
+"""
+In-memory implementation of the CheckpointStore protocol.
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import final
+
+
+@final
+class InMemoryCheckpointStore:
+    """
+    Checkpoint store keeping checkpoints in process memory.
+
+    Checkpoints do not survive a restart, this store is meant for tests and
+    single-process setups.
+    """
+
+    def __init__(self) -> None:
+        self._checkpoints: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, run_id: str) -> dict[str, str] | None:
+        with self._lock:
+            checkpoint = self._checkpoints.get(run_id)
+            return dict(checkpoint) if checkpoint is not None else None
+
+    def save(self, run_id: str, sections: Mapping[str, str]) -> None:
+        with self._lock:
+            self._checkpoints.setdefault(run_id, {}).update(sections)
+
+    def delete(self, run_id: str) -> None:
+        with self._lock:
+            self._checkpoints.pop(run_id, None)
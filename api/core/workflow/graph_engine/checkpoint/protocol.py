@@ -0,0 +1,47 @@
+"""
+CheckpointStore protocol for GraphEngine run checkpoints.
+
+A checkpoint is a mapping of section names to serialized section states.
+Stores merge saved sections into the existing checkpoint of a run, so a
+checkpoint can be updated incrementally with only the sections that changed.
+"""
+
+from collections.abc import Mapping
+from typing import Protocol
+
+
+class CheckpointStore(Protocol):
+    """
+    Protocol for storing checkpoints of graph engine runs.
+    """
+
+    def load(self, run_id: str) -> dict[str, str] | None:
+        """
+        Load the checkpoint of a run.
+
+        Args:
+            run_id: ID of the workflow run
+
+        Returns:
+            The checkpoint sections, or None if the run has no checkpoint
+        """
+        ...
+
+    def save(self, run_id: str, sections: Mapping[str, str]) -> None:
+        """
+        Save sections into the checkpoint of a run, keeping sections not given.
+
+        Args:
+            run_id: ID of the workflow run
+            sections: Serialized state per section name
+        """
+        ...
+
+    def delete(self, run_id: str) -> None:
+        """
+        Delete the checkpoint of a run.
+
+        Args:
+            run_id: ID of the workflow run
+        """
+        ...
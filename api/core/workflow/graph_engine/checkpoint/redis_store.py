@@ -0,0 +1,61 @@
+"""
+Redis implementation of the CheckpointStore protocol.
+"""
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, final
+
+if TYPE_CHECKING:
+    from extensions.ext_redis import RedisClientWrapper
+
+
+@final
+class RedisCheckpointStore:
+    """
+    Checkpoint store keeping the checkpoint of each run in a Redis hash.
+
+    Each section is a hash field, so saving only touches the changed
+    sections. Checkpoints expire after `ttl` seconds without a save.
+    """
+
+    def __init__(
+        self,
+        redis_client: "RedisClientWrapper",
+        key_prefix: str = "workflow_checkpoint",
+        ttl: int = 86400,
+    ) -> None:
+        """
+        Initialize the Redis checkpoint store.
+
+        Args:
+            redis_client: Redis client instance
+            key_prefix: Prefix of the Redis key per run
+            ttl: TTL for checkpoints in seconds (default: 86400)
+        """
+        self._redis = redis_client
+        self._key_prefix = key_prefix
+        self._ttl = ttl
+
+    def _key(self, run_id: str) -> str:
+        return f"{self._key_prefix}:{run_id}"
+
+    def load(self, run_id: str) -> dict[str, str] | None:
+        checkpoint = self._redis.hgetall(self._key(run_id))
+        if not checkpoint:
+            return None
+        return {
+            (name.decode() if isinstance(name, bytes) else name): (data.decode() if isinstance(data, bytes) else data)
+            for name, data in checkpoint.items()
+        }
+
+    def save(self, run_id: str, sections: Mapping[str, str]) -> None:
+        if not sections:
+            return
+        key = self._key(run_id)
+        with self._redis.pipeline() as pipe:
+            pipe.hset(key, mapping=dict(sections))
+            pipe.expire(key, self._ttl)
+            pipe.execute()
+
+    def delete(self, run_id: str) -> None:
+        self._redis.delete(self._key(run_id))
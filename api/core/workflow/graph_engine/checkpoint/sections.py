@@ -0,0 +1,108 @@
+"""
+Sections of a graph engine run checkpoint.
+
+A checkpoint holds the serialized engine components, the runtime counters and
+one section per node with variables, so that the variables of nodes that did
+not change are not serialized or written again.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from core.model_runtime.entities.llm_entities import LLMUsage
+from core.workflow.entities import GraphRuntimeState
+from core.workflow.graph.graph_runtime_state_protocol import ReadOnlyGraphRuntimeState
+
+READY_QUEUE_SECTION = "ready_queue"
+GRAPH_EXECUTION_SECTION = "graph_execution"
+RESPONSE_COORDINATOR_SECTION = "response_coordinator"
+GRAPH_STATE_SECTION = "graph_state"
+RUNTIME_SECTION = "runtime"
+VARIABLES_SECTION_PREFIX = "variables:"
+
+_REQUIRED_SECTIONS = (
+    READY_QUEUE_SECTION,
+    GRAPH_EXECUTION_SECTION,
+    RESPONSE_COORDINATOR_SECTION,
+    GRAPH_STATE_SECTION,
+    RUNTIME_SECTION,
+)
+
+
+class RuntimeCheckpointState(BaseModel):
+    """Pydantic model describing the serialized runtime counters and outputs."""
+
+    type: Literal["GraphRuntimeState"] = Field(default="GraphRuntimeState")
+    version: str = Field(default="1.0")
+    total_tokens: int = Field(default=0)
+    llm_usage: LLMUsage = Field(default_factory=LLMUsage.empty_usage)
+    outputs: dict[str, Any] = Field(default_factory=dict)
+    node_run_steps: int = Field(default=0)
+
+
+def variables_section(node_id: str) -> str:
+    """Get the name of the section holding the variables of a node."""
+    return f"{VARIABLES_SECTION_PREFIX}{node_id}"
+
+
+def dump_engine_sections(state: ReadOnlyGraphRuntimeState) -> dict[str, str]:
+    """
+    Serialize the engine components and runtime counters of a running graph.
+
+    Args:
+        state: Read-only runtime state of the running graph
+
+    Returns:
+        Serialized state per section name
+    """
+    runtime = RuntimeCheckpointState(
+        total_tokens=state.total_tokens,
+        llm_usage=state.llm_usage,
+        outputs=state.outputs,
+        node_run_steps=state.node_run_steps,
+    )
+    return {
+        READY_QUEUE_SECTION: state.ready_queue_json,
+        GRAPH_EXECUTION_SECTION: state.graph_execution_json,
+        RESPONSE_COORDINATOR_SECTION: state.response_coordinator_json,
+        GRAPH_STATE_SECTION: state.graph_state_json,
+        RUNTIME_SECTION: runtime.model_dump_json(),
+    }
+
+
+def restore_checkpoint(checkpoint: Mapping[str, str], graph_runtime_state: GraphRuntimeState) -> None:
+    """
+    Load a checkpoint into a runtime state, the next GraphEngine created with it resumes the run.
+
+    Args:
+        checkpoint: Checkpoint sections as returned by `CheckpointStore.load`
+        graph_runtime_state: Runtime state of the run, before its GraphEngine is created
+
+    Raises:
+        ValueError: If the checkpoint is incomplete or invalid
+    """
+    missing = [name for name in _REQUIRED_SECTIONS if name not in checkpoint]
+    if missing:
+        raise ValueError(f"Incomplete checkpoint, missing sections: {', '.join(missing)}")
+
+    runtime = RuntimeCheckpointState.model_validate_json(checkpoint[RUNTIME_SECTION])
+    if runtime.version != "1.0":
+        raise ValueError(f"Unsupported serialized version: {runtime.version}")
+
+    variable_pool = graph_runtime_state.variable_pool
+    for name, data in checkpoint.items():
+        if name.startswith(VARIABLES_SECTION_PREFIX):
+            variable_pool.loads_node_variables(name.removeprefix(VARIABLES_SECTION_PREFIX), data)
+
+    graph_runtime_state.total_tokens = runtime.total_tokens
+    graph_runtime_state.llm_usage = runtime.llm_usage
+    graph_runtime_state.outputs = runtime.outputs
+    graph_runtime_state.node_run_steps = runtime.node_run_steps
+    graph_runtime_state.load_engine_state(
+        ready_queue_json=checkpoint[READY_QUEUE_SECTION],
+        graph_execution_json=checkpoint[GRAPH_EXECUTION_SECTION],
+        response_coordinator_json=checkpoint[RESPONSE_COORDINATOR_SECTION],
+        graph_state_json=checkpoint[GRAPH_STATE_SECTION],
+    )
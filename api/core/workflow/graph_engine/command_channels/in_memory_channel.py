@@ -5,6 +5,7 @@ This implementation uses a thread-safe queue for command communication
 within a single process. Each instance handles commands for one workflow execution.
 """
 
+from collections.abc import Callable
 from queue import Queue
 from typing import final
 
@@ -23,6 +24,18 @@ class InMemoryChannel:
     def __init__(self) -> None:
         """Initialize the in-memory channel with a single queue."""
         self._queue: Queue[GraphEngineCommand] = Queue()
+        self._listener: Callable[[], None] | None = None
+
+    def set_listener(self, listener: Callable[[], None] | None) -> None:
+        """
+        Set a callback invoked whenever a command is sent.
+
+        Used by GraphEngine to wake its dispatcher instead of waiting for the next poll.
+
+        Args:
+            listener: Callback without arguments, or None to remove it
+        """
+        self._listener = listener
 
     def fetch_commands(self) -> list[GraphEngineCommand]:
         """
@@ -51,3 +64,5 @@ class InMemoryChannel:
             command: The command to send
         """
         self._queue.put(command)
+        if self._listener:
+            self._listener()
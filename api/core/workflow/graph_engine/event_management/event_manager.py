@@ -3,74 +3,16 @@ Unified event manager for collecting and emitting events.
 """
 
 import threading
-import time
+from collections import deque
 from collections.abc import Generator
-from contextlib import contextmanager
 from typing import final
 
+from configs import dify_config
 from core.workflow.graph_events import GraphEngineEvent
 
 from ..layers.base import GraphEngineLayer
 
 
-@final
-class ReadWriteLock:
-    """
-    A read-write lock implementation that allows multiple concurrent readers
-    but only one writer at a time.
-    """
-
-    def __init__(self) -> None:
-        self._read_ready = threading.Condition(threading.RLock())
-        self._readers = 0
-
-    def acquire_read(self) -> None:
-        """Acquire a read lock."""
-        _ = self._read_ready.acquire()
-        try:
-            self._readers += 1
-        finally:
-            self._read_ready.release()
-
-    def release_read(self) -> None:
-        """Release a read lock."""
-        _ = self._read_ready.acquire()
-        try:
-            self._readers -= 1
-            if self._readers == 0:
-                self._read_ready.notify_all()
-        finally:
-            self._read_ready.release()
-
-    def acquire_write(self) -> None:
-        """Acquire a write lock."""
-        _ = self._read_ready.acquire()
-        while self._readers > 0:
-            _ = self._read_ready.wait()
-
-    def release_write(self) -> None:
-        """Release a write lock."""
-        self._read_ready.release()
-
-    @contextmanager
-    def read_lock(self):
-        """Return a context manager for read locking."""
-        self.acquire_read()
-        try:
-            yield
-        finally:
-            self.release_read()
-
-    @contextmanager
-    def write_lock(self):
-        """Return a context manager for write locking."""
-        self.acquire_write()
-        try:
-            yield
-        finally:
-            self.release_write()
-
-
 @final
 class EventManager:
     """
@@ -79,14 +21,28 @@ class EventManager:
     This class combines event collection with event emission, providing
     thread-safe event management with support for notifying layers and
     streaming events to external consumers.
+
+    Events are handed over to the consumer through a bounded buffer guarded by a
+    condition variable: the consumer sleeps until events arrive instead of polling,
+    consumed events are released, and producers block while the buffer is full
+    and a consumer is attached.
     """
 
-    def __init__(self) -> None:
-        """Initialize the event manager."""
-        self._events: list[GraphEngineEvent] = []
-        self._lock = ReadWriteLock()
+    def __init__(self, max_buffered_events: int | None = None) -> None:
+        """
+        Initialize the event manager.
+
+        Args:
+            max_buffered_events: Number of unconsumed events after which producers are blocked
+        """
+        self._events: deque[GraphEngineEvent] = deque()
+        self._max_buffered_events = max_buffered_events or dify_config.GRAPH_ENGINE_EVENT_BUFFER_SIZE
+        self._condition = threading.Condition()
+        # serializes producers so that layers observe events in buffer order
+        self._collect_lock = threading.Lock()
         self._layers: list[GraphEngineLayer] = []
-        self._execution_complete = threading.Event()
+        self._execution_complete = False
+        self._consumers = 0
 
     def set_layers(self, layers: list[GraphEngineLayer]) -> None:
         """
@@ -101,39 +57,25 @@ class EventManager:
         """
         Thread-safe method to collect an event.
 
+        Blocks while the buffer is full and a consumer is attached. Without a consumer
+        the buffer is unbounded, so collecting never deadlocks a single thread.
+
         Args:
             event: The event to collect
         """
-        with self._lock.write_lock():
-            self._events.append(event)
+        with self._collect_lock:
+            with self._condition:
+                while self._consumers > 0 and len(self._events) >= self._max_buffered_events:
+                    _ = self._condition.wait()
+                self._events.append(event)
+                self._condition.notify_all()
             self._notify_layers(event)
 
-    def _get_new_events(self, start_index: int) -> list[GraphEngineEvent]:
-        """
-        Get new events starting from a specific index.
-
-        Args:
-            start_index: The index to start from
-
-        Returns:
-            List of new events
-        """
-        with self._lock.read_lock():
-            return list(self._events[start_index:])
-
-    def _event_count(self) -> int:
-        """
-        Get the current count of collected events.
-
-        Returns:
-            Number of collected events
-        """
-        with self._lock.read_lock():
-            return len(self._events)
-
     def mark_complete(self) -> None:
         """Mark execution as complete to stop the event emission generator."""
-        self._execution_complete.set()
+        with self._condition:
+            self._execution_complete = True
+            self._condition.notify_all()
 
     def emit_events(self) -> Generator[GraphEngineEvent, None, None]:
         """
@@ -142,20 +84,26 @@ class EventManager:
         Yields:
             GraphEngineEvent instances as they're processed
         """
-        yielded_count = 0
-
-        while not self._execution_complete.is_set() or yielded_count < self._event_count():
-            # Get new events since last yield
-            new_events = self._get_new_events(yielded_count)
-
-            # Yield any new events
-            for event in new_events:
-                yield event
-                yielded_count += 1
-
-            # Small sleep to avoid busy waiting
-            if not self._execution_complete.is_set() and not new_events:
-                time.sleep(0.001)
+        with self._condition:
+            self._consumers += 1
+        try:
+            while True:
+                with self._condition:
+                    while not self._events and not self._execution_complete:
+                        _ = self._condition.wait()
+                    if not self._events:
+                        return
+                    # take the whole backlog at once, releasing it from the buffer
+                    batch = list(self._events)
+                    self._events.clear()
+                    self._condition.notify_all()
+
+                yield from batch
+        finally:
+            with self._condition:
+                self._consumers -= 1
+                # lift the backpressure if the consumer stops early
+                self._condition.notify_all()
 
     def _notify_layers(self, event: GraphEngineEvent) -> None:
         """
@@ -6,6 +6,7 @@ Domain-Driven Design principles for improved maintainability and testability.
 """
 
 import contextvars
+import functools
 import logging
 import queue
 from collections.abc import Generator
@@ -13,11 +14,12 @@ from typing import final
 
 from flask import Flask, current_app
 
+from configs import dify_config
 from core.workflow.entities import GraphRuntimeState
 from core.workflow.enums import NodeExecutionType
 from core.workflow.graph import Graph
 from core.workflow.graph.read_only_state_wrapper import ReadOnlyGraphRuntimeStateWrapper
-from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue
+from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue, PriorityReadyQueue
 from core.workflow.graph_events import (
     GraphEngineEvent,
     GraphNodeEventBase,
@@ -28,6 +30,7 @@ from core.workflow.graph_events import (
     GraphRunSucceededEvent,
 )
 
+from .command_channels import InMemoryChannel
 from .command_processing import AbortCommandHandler, CommandProcessor
 from .domain import GraphExecution
 from .entities.commands import AbortCommand
@@ -40,7 +43,7 @@ from .orchestration import Dispatcher, ExecutionCoordinator
 from .protocols.command_channel import CommandChannel
 from .ready_queue import ReadyQueue, ReadyQueueState, create_ready_queue_from_state
 from .response_coordinator import ResponseStreamCoordinator
-from .worker_management import WorkerPool
+from .worker_management import SharedWorkerPoolRun, WorkerPool, get_shared_worker_pool
 
 logger = logging.getLogger(__name__)
 
@@ -88,11 +91,16 @@ class GraphEngine:
         # === Execution Queues ===
         # Create ready queue from saved state or initialize new one
         self._ready_queue: ReadyQueue
+        queued_on_restore: set[str] = set()
         if self._graph_runtime_state.ready_queue_json == "":
-            self._ready_queue = InMemoryReadyQueue()
+            if dify_config.GRAPH_ENGINE_READY_QUEUE == "priority":
+                self._ready_queue = PriorityReadyQueue.from_graph(self._graph)
+            else:
+                self._ready_queue = InMemoryReadyQueue()
         else:
             ready_queue_state = ReadyQueueState.model_validate_json(self._graph_runtime_state.ready_queue_json)
             self._ready_queue = create_ready_queue_from_state(ready_queue_state)
+            queued_on_restore = set(ready_queue_state.items)
 
         # Queue for events generated during execution
         self._event_queue: queue.Queue[GraphNodeEventBase] = queue.Queue()
@@ -101,6 +109,14 @@ class GraphEngine:
         # Unified state manager handles all node state transitions and queue operations
         self._state_manager = GraphStateManager(self._graph, self._ready_queue)
 
+        # Resume from a checkpoint when node and edge states have been saved
+        self._is_resuming = graph_runtime_state.graph_state_json != ""
+        self._interrupted_nodes: list[str] = []
+        if self._is_resuming:
+            self._state_manager.loads(graph_runtime_state.graph_state_json)
+            # Nodes that were executing rather than queued when the state was saved have to run again
+            self._interrupted_nodes = sorted(self._state_manager.get_executing_nodes() - queued_on_restore)
+
         # === Response Coordination ===
         # Coordinates response streaming from response nodes
         self._response_coordinator = ResponseStreamCoordinator(
@@ -109,6 +125,14 @@ class GraphEngine:
         if graph_runtime_state.response_coordinator_json != "":
             self._response_coordinator.loads(graph_runtime_state.response_coordinator_json)
 
+        # Let the runtime state serialize the live engine state, e.g. for checkpoints
+        self._graph_runtime_state.attach_engine_state(
+            ready_queue=self._ready_queue,
+            graph_execution=self._graph_execution,
+            response_coordinator=self._response_coordinator,
+            graph_state=self._state_manager,
+        )
+
         # === Event Management ===
         # Event manager handles both collection and emission of events
         self._event_manager = EventManager()
@@ -174,17 +198,31 @@ class GraphEngine:
         context_vars = contextvars.copy_context()
 
         # Create worker pool for parallel node execution
-        self._worker_pool = WorkerPool(
-            ready_queue=self._ready_queue,
-            event_queue=self._event_queue,
-            graph=self._graph,
-            flask_app=flask_app,
-            context_vars=context_vars,
-            min_workers=self._min_workers,
-            max_workers=self._max_workers,
-            scale_up_threshold=self._scale_up_threshold,
-            scale_down_idle_time=self._scale_down_idle_time,
-        )
+        self._worker_pool: WorkerPool | SharedWorkerPoolRun
+        if dify_config.GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED:
+            # Run nodes on the process-wide pool, which is told about every enqueued node
+            shared_run = get_shared_worker_pool().register(
+                ready_queue=self._ready_queue,
+                event_queue=self._event_queue,
+                graph=self._graph,
+                flask_app=flask_app,
+                context_vars=context_vars,
+                max_concurrency=self._max_workers,
+            )
+            self._state_manager.add_enqueue_listener(shared_run.notify)
+            self._worker_pool = shared_run
+        else:
+            self._worker_pool = WorkerPool(
+                ready_queue=self._ready_queue,
+                event_queue=self._event_queue,
+                graph=self._graph,
+                flask_app=flask_app,
+                context_vars=context_vars,
+                min_workers=self._min_workers,
+                max_workers=self._max_workers,
+                scale_up_threshold=self._scale_up_threshold,
+                scale_down_idle_time=self._scale_down_idle_time,
+            )
 
         # === Orchestration ===
         # Coordinates the overall execution lifecycle
@@ -206,6 +244,11 @@ class GraphEngine:
             event_emitter=self._event_manager,
         )
 
+        # Commands sent through an in-process channel wake the dispatcher immediately,
+        # other channels are polled by the dispatcher
+        if isinstance(self._command_channel, InMemoryChannel):
+            self._command_channel.set_listener(self._dispatcher.wake)
+
         # === Extensibility ===
         # Layers allow plugins to extend engine functionality
         self._layers: list[GraphEngineLayer] = []
@@ -237,8 +280,9 @@ class GraphEngine:
             # Initialize layers
             self._initialize_layers()
 
-            # Start execution
-            self._graph_execution.start()
+            # Start execution, a resumed execution has already been started
+            if not (self._is_resuming and self._graph_execution.started):
+                self._graph_execution.start()
             start_event = GraphRunStartedEvent()
             yield start_event
 
@@ -299,6 +343,14 @@ class GraphEngine:
             except Exception as e:
                 logger.warning("Layer %s failed on_graph_start: %s", layer.__class__.__name__, e)
 
+        # Instrument the engine internals only for the layers implementing the optional hooks
+        enqueue_layers = [layer for layer in self._layers if _overrides_hook(layer, "on_node_enqueued")]
+        if enqueue_layers:
+            self._state_manager.add_enqueue_listener(functools.partial(_notify_node_enqueued, enqueue_layers))
+        timing_layers = [layer for layer in self._layers if _overrides_hook(layer, "on_event_handled")]
+        if timing_layers:
+            self._dispatcher.set_event_timing_listener(functools.partial(_notify_event_handled, timing_layers))
+
     def _start_execution(self) -> None:
         """Start execution subsystems."""
         # Start worker pool (it calculates initial workers internally)
@@ -309,10 +361,15 @@ class GraphEngine:
             if node.execution_type == NodeExecutionType.RESPONSE:
                 self._response_coordinator.register(node.id)
 
-        # Enqueue root node
-        root_node = self._graph.root_node
-        self._state_manager.enqueue_node(root_node.id)
-        self._state_manager.start_execution(root_node.id)
+        if self._is_resuming:
+            # Re-run the interrupted nodes, queued nodes have been restored with the ready queue
+            for node_id in self._interrupted_nodes:
+                self._state_manager.enqueue_node(node_id)
+        else:
+            # Enqueue root node
+            root_node = self._graph.root_node
+            self._state_manager.enqueue_node(root_node.id)
+            self._state_manager.start_execution(root_node.id)
 
         # Start dispatcher
         self._dispatcher.start()
@@ -337,3 +394,23 @@ class GraphEngine:
     def graph_runtime_state(self) -> GraphRuntimeState:
         """Get the graph runtime state."""
         return self._graph_runtime_state
+
+
+def _overrides_hook(layer: GraphEngineLayer, name: str) -> bool:
+    return getattr(type(layer), name) is not getattr(GraphEngineLayer, name)
+
+
+def _notify_node_enqueued(layers: list[GraphEngineLayer], node_id: str) -> None:
+    for layer in layers:
+        try:
+            layer.on_node_enqueued(node_id)
+        except Exception:
+            logger.warning("Layer %s failed on_node_enqueued", layer.__class__.__name__, exc_info=True)
+
+
+def _notify_event_handled(layers: list[GraphEngineLayer], event: GraphNodeEventBase, duration: float) -> None:
+    for layer in layers:
+        try:
+            layer.on_event_handled(event, duration)
+        except Exception:
+            logger.warning("Layer %s failed on_event_handled", layer.__class__.__name__, exc_info=True)
@@ -3,8 +3,10 @@ Graph state manager that combines node, edge, and execution tracking.
 """
 
 import threading
-from collections.abc import Sequence
-from typing import TypedDict, final
+from collections.abc import Callable, Sequence
+from typing import Literal, TypedDict, final
+
+from pydantic import BaseModel, Field
 
 from core.workflow.enums import NodeState
 from core.workflow.graph import Edge, Graph
@@ -20,6 +22,16 @@ class EdgeStateAnalysis(TypedDict):
     all_skipped: bool
 
 
+class GraphStateManagerState(BaseModel):
+    """Pydantic model describing serialized GraphStateManager state."""
+
+    type: Literal["GraphStateManager"] = Field(default="GraphStateManager")
+    version: str = Field(default="1.0")
+    node_states: dict[str, NodeState] = Field(default_factory=dict)
+    edge_states: dict[str, NodeState] = Field(default_factory=dict)
+    executing_nodes: list[str] = Field(default_factory=list)
+
+
 @final
 class GraphStateManager:
     def __init__(self, graph: Graph, ready_queue: ReadyQueue) -> None:
@@ -36,6 +48,16 @@ class GraphStateManager:
 
         # Execution tracking state
         self._executing_nodes: set[str] = set()
+        self._enqueue_listeners: list[Callable[[str], None]] = []
+
+    def add_enqueue_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback invoked after a node has been added to the ready queue.
+
+        Args:
+            listener: Callback receiving the enqueued node ID
+        """
+        self._enqueue_listeners.append(listener)
 
     # ============= Node State Operations =============
 
@@ -52,6 +74,8 @@ class GraphStateManager:
         with self._lock:
             self._graph.nodes[node_id].state = NodeState.TAKEN
             self._ready_queue.put(node_id)
+        for listener in self._enqueue_listeners:
+            listener(node_id)
 
     def mark_node_skipped(self, node_id: str) -> None:
         """
@@ -286,3 +310,50 @@ class GraphStateManager:
                 "skipped_nodes": skipped_nodes,
                 "unknown_nodes": unknown_nodes,
             }
+
+    # ============= Serialization =============
+
+    def dumps(self) -> str:
+        """
+        Serialize the node states, edge states and executing nodes to a JSON string.
+
+        Returns:
+            A JSON string containing the serialized state
+        """
+        with self._lock:
+            state = GraphStateManagerState(
+                node_states={
+                    node_id: node.state
+                    for node_id, node in self._graph.nodes.items()
+                    if node.state != NodeState.UNKNOWN
+                },
+                edge_states={
+                    edge_id: edge.state
+                    for edge_id, edge in self._graph.edges.items()
+                    if edge.state != NodeState.UNKNOWN
+                },
+                executing_nodes=sorted(self._executing_nodes),
+            )
+        return state.model_dump_json()
+
+    def loads(self, data: str) -> None:
+        """
+        Restore the node states, edge states and executing nodes from a JSON string.
+
+        Args:
+            data: The JSON string containing the serialized state
+        """
+        state = GraphStateManagerState.model_validate_json(data)
+
+        if state.type != "GraphStateManager":
+            raise ValueError(f"Invalid serialized data type: {state.type}")
+
+        if state.version != "1.0":
+            raise ValueError(f"Unsupported serialized version: {state.version}")
+
+        with self._lock:
+            for node_id, node in self._graph.nodes.items():
+                node.state = state.node_states.get(node_id, NodeState.UNKNOWN)
+            for edge_id, edge in self._graph.edges.items():
+                edge.state = state.edge_states.get(edge_id, NodeState.UNKNOWN)
+            self._executing_nodes = set(state.executing_nodes)
@@ -6,11 +6,18 @@ with middleware-like components that can observe events and interact with execut
 """
 
 from .base import GraphEngineLayer
+from .checkpoint import CheckpointLayer
 from .debug_logging import DebugLoggingLayer
 from .execution_limits import ExecutionLimitsLayer
+from .profiling import NodeExecutionProfile, ProfilingLayer
+from .worker_pool_metrics import WorkerPoolMetricsLayer
 
 __all__ = [
+    "CheckpointLayer",
     "DebugLoggingLayer",
     "ExecutionLimitsLayer",
     "GraphEngineLayer",
+    "NodeExecutionProfile",
+    "ProfilingLayer",
+    "WorkerPoolMetricsLayer",
 ]
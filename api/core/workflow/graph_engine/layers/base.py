@@ -9,7 +9,7 @@ from abc import ABC, abstractmethod
 
 from core.workflow.graph.graph_runtime_state_protocol import ReadOnlyGraphRuntimeState
 from core.workflow.graph_engine.protocols.command_channel import CommandChannel
-from core.workflow.graph_events import GraphEngineEvent
+from core.workflow.graph_events import GraphEngineEvent, GraphNodeEventBase
 
 
 class GraphEngineLayer(ABC):
@@ -22,7 +22,9 @@ class GraphEngineLayer(ABC):
     - Send commands to control execution
 
     Subclasses should override the constructor to accept configuration parameters,
-    then implement the three lifecycle methods.
+    then implement the three lifecycle methods. The engine internals hooks
+    `on_node_enqueued` and `on_event_handled` are optional, the engine only
+    instruments itself for them when a layer overrides them.
     """
 
     def __init__(self) -> None:
@@ -83,3 +85,22 @@ class GraphEngineLayer(ABC):
             error: The exception that caused execution to fail, or None if successful
         """
         pass
+
+    def on_node_enqueued(self, node_id: str) -> None:  # noqa: B027
+        """
+        Called when a node is added to the ready queue, before a worker picks it up.
+
+        Args:
+            node_id: The ID of the enqueued node
+        """
+        pass
+
+    def on_event_handled(self, event: GraphNodeEventBase, duration: float) -> None:  # noqa: B027
+        """
+        Called on the dispatcher thread after a node event from a worker has been handled.
+
+        Args:
+            event: The handled node event
+            duration: Seconds the engine spent handling the event
+        """
+        pass
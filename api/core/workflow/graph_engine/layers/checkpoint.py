@@ -0,0 +1,141 @@
+"""
+Checkpoint layer for GraphEngine.
+
+This layer periodically saves the state of a run to a checkpoint store at node
+boundaries, so that a run interrupted by a restart can resume from its last
+checkpoint instead of running its completed nodes again.
+"""
+
+import hashlib
+import logging
+import time
+from typing import final
+
+from typing_extensions import override
+
+from core.workflow.constants import (
+    CONVERSATION_VARIABLE_NODE_ID,
+    ENVIRONMENT_VARIABLE_NODE_ID,
+    RAG_PIPELINE_VARIABLE_NODE_ID,
+    SYSTEM_VARIABLE_NODE_ID,
+)
+from core.workflow.graph_engine.checkpoint import CheckpointStore, dump_engine_sections, variables_section
+from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_events import GraphEngineEvent, NodeRunExceptionEvent, NodeRunSucceededEvent
+
+logger = logging.getLogger(__name__)
+
+# Variables that nodes may write besides their own outputs, e.g. conversation variables
+# updated by variable assigners. They are small and checked at every checkpoint.
+_SHARED_VARIABLE_NODE_IDS = (
+    SYSTEM_VARIABLE_NODE_ID,
+    ENVIRONMENT_VARIABLE_NODE_ID,
+    CONVERSATION_VARIABLE_NODE_ID,
+    RAG_PIPELINE_VARIABLE_NODE_ID,
+)
+
+
+def _digest(data: str) -> bytes:
+    return hashlib.blake2b(data.encode(), digest_size=16).digest()
+
+
+@final
+class CheckpointLayer(GraphEngineLayer):
+    """
+    Layer that saves checkpoints of a run at node boundaries.
+
+    A checkpoint is saved after a node completes once at least `interval` seconds
+    have passed since the previous one. Only the variables of nodes completed since
+    then are serialized, and only sections whose content changed are written.
+    The checkpoint is deleted when the run succeeds.
+    """
+
+    def __init__(self, store: CheckpointStore, run_id: str, interval: float = 10.0) -> None:
+        """
+        Initialize the checkpoint layer.
+
+        Args:
+            store: Store to save the checkpoints to
+            run_id: ID of the workflow run, the key of its checkpoint
+            interval: Minimum number of seconds between two checkpoints, 0 to save at every node boundary
+        """
+        super().__init__()
+        self.store = store
+        self.run_id = run_id
+        self.interval = interval
+
+        self.checkpoint_count = 0
+        self._last_checkpoint_at = 0.0
+        self._section_digests: dict[str, bytes] = {}
+        self._dirty_node_ids: set[str] = set()
+        self._saved_all_variables = False
+
+    @override
+    def on_graph_start(self) -> None:
+        """Called when graph execution starts."""
+        self.checkpoint_count = 0
+        self._last_checkpoint_at = time.monotonic()
+        self._section_digests.clear()
+        self._dirty_node_ids.clear()
+        self._saved_all_variables = False
+
+    @override
+    def on_event(self, event: GraphEngineEvent) -> None:
+        """
+        Called for every event emitted by the engine.
+
+        Saves a checkpoint when a top-level node has completed and the interval has passed.
+        """
+        if not isinstance(event, NodeRunSucceededEvent | NodeRunExceptionEvent):
+            return
+        # nodes inside iterations and loops write to the container's own variable pool
+        if event.in_iteration_id or event.in_loop_id:
+            return
+
+        self._dirty_node_ids.add(event.node_id)
+        if time.monotonic() - self._last_checkpoint_at >= self.interval:
+            self.checkpoint()
+
+    @override
+    def on_graph_end(self, error: Exception | None) -> None:
+        """Called when graph execution ends."""
+        if error is not None:
+            # keep the last checkpoint, it expires with the store's retention
+            return
+        try:
+            self.store.delete(self.run_id)
+        except Exception:
+            logger.exception("Failed to delete checkpoint of workflow run %s", self.run_id)
+
+    def checkpoint(self) -> None:
+        """Save a checkpoint of the current state of the run."""
+        state = self.graph_runtime_state
+        if state is None:
+            return
+
+        sections = dump_engine_sections(state)
+
+        variable_pool = state.variable_pool
+        if self._saved_all_variables:
+            node_ids = self._dirty_node_ids.union(_SHARED_VARIABLE_NODE_IDS).intersection(variable_pool.get_node_ids())
+        else:
+            node_ids = set(variable_pool.get_node_ids())
+        for node_id in node_ids:
+            sections[variables_section(node_id)] = variable_pool.dumps_node_variables(node_id)
+
+        digests = {name: _digest(data) for name, data in sections.items()}
+        changed = {name: data for name, data in sections.items() if self._section_digests.get(name) != digests[name]}
+        self.store.save(self.run_id, changed)
+
+        self._section_digests.update(digests)
+        self._dirty_node_ids.clear()
+        self._saved_all_variables = True
+        self._last_checkpoint_at = time.monotonic()
+        self.checkpoint_count += 1
+        logger.debug(
+            "Saved checkpoint %d of workflow run %s, %d of %d sections changed",
+            self.checkpoint_count,
+            self.run_id,
+            len(changed),
+            len(sections),
+        )
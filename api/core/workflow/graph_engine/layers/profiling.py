@@ -0,0 +1,327 @@
+"""
+Profiling layer for GraphEngine.
+
+This layer records where the time of a run goes for each node execution: how
+long the node waited in the ready queue, how long it ran, how long the engine
+spent handling its events, how large the variables it read and wrote were and,
+for LLM nodes, token counts and latencies. The profile is exported as
+OpenTelemetry spans and/or handed over as a compact JSON flamegraph.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC
+from typing import Any, final
+
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+from typing_extensions import override
+
+from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_events import (
+    GraphEngineEvent,
+    GraphNodeEventBase,
+    NodeRunExceptionEvent,
+    NodeRunFailedEvent,
+    NodeRunStartedEvent,
+    NodeRunStreamChunkEvent,
+    NodeRunSucceededEvent,
+)
+from core.workflow.workflow_type_encoder import WorkflowRuntimeTypeConverter
+
+logger = logging.getLogger(__name__)
+
+_tracer = trace.get_tracer(__name__)
+
+
+@dataclass
+class NodeExecutionProfile:
+    """Timings and sizes recorded for one node execution. Times are epoch seconds."""
+
+    execution_id: str
+    node_id: str
+    node_type: str
+    title: str
+    # ID of the iteration or loop node this node runs in
+    parent_node_id: str | None
+    started_at: float
+    queue_wait: float | None = None
+    finished_at: float | None = None
+    status: str = "running"
+    retries: int = 0
+    event_count: int = 0
+    event_processing_time: float = 0.0
+    variable_read_bytes: int | None = None
+    variable_write_bytes: int | None = None
+    first_chunk_latency: float | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_latency: float | None = None
+
+    @property
+    def execution_time(self) -> float | None:
+        """Seconds from the start of the node to the engine receiving its result."""
+        if self.finished_at is None:
+            return None
+        return max(self.finished_at - self.started_at, 0.0)
+
+
+@final
+class ProfilingLayer(GraphEngineLayer):
+    """
+    Layer that profiles each node execution of a graph run.
+
+    The profile is available through `executions` and `flamegraph()`. When the run
+    ends it is exported as OpenTelemetry spans if `export_spans` is set, and the
+    flamegraph is passed to `on_profile` if given. The engine only times its event
+    handling and queueing while a profiling layer is attached.
+    """
+
+    def __init__(
+        self,
+        export_spans: bool = True,
+        on_profile: Callable[[dict[str, Any]], None] | None = None,
+        measure_variable_sizes: bool = True,
+    ) -> None:
+        """
+        Initialize the profiling layer.
+
+        Args:
+            export_spans: Whether to export the profile as OpenTelemetry spans when the run ends
+            on_profile: Callback receiving the JSON flamegraph when the run ends
+            measure_variable_sizes: Whether to measure the serialized size of node inputs and outputs,
+                which costs a serialization of each on the dispatcher thread
+        """
+        super().__init__()
+        self.export_spans = export_spans
+        self.on_profile = on_profile
+        self.measure_variable_sizes = measure_variable_sizes
+
+        self.executions: dict[str, NodeExecutionProfile] = {}
+        self._enqueued_at: dict[str, float] = {}
+        self._graph_started_at: float | None = None
+        self._graph_finished_at: float | None = None
+        self._error: Exception | None = None
+
+    @override
+    def on_graph_start(self) -> None:
+        """Called when graph execution starts."""
+        self.executions = {}
+        self._enqueued_at.clear()
+        self._graph_started_at = time.time()
+        self._graph_finished_at = None
+        self._error = None
+
+    @override
+    def on_event(self, event: GraphEngineEvent) -> None:
+        """Node events are profiled as the engine handles them, in `on_event_handled`."""
+
+    @override
+    def on_node_enqueued(self, node_id: str) -> None:
+        """Called when a node is added to the ready queue."""
+        self._enqueued_at[node_id] = time.time()
+
+    @override
+    def on_event_handled(self, event: GraphNodeEventBase, duration: float) -> None:
+        """Called after the engine handled a node event from a worker."""
+        received_at = time.time() - duration
+        profile = self.executions.get(event.id)
+
+        if isinstance(event, NodeRunStartedEvent):
+            if profile is None:
+                profile = self._start_profile(event)
+            else:
+                # a retry attempt of the same node execution
+                profile.retries += 1
+                profile.status = "running"
+                profile.finished_at = None
+        elif profile is None:
+            return
+
+        profile.event_count += 1
+        profile.event_processing_time += duration
+
+        if isinstance(event, NodeRunStreamChunkEvent):
+            if profile.first_chunk_latency is None:
+                profile.first_chunk_latency = max(received_at - profile.started_at, 0.0)
+        elif isinstance(event, NodeRunSucceededEvent | NodeRunFailedEvent | NodeRunExceptionEvent):
+            self._finish_profile(profile, event, received_at)
+
+    @override
+    def on_graph_end(self, error: Exception | None) -> None:
+        """Called when graph execution ends."""
+        self._graph_finished_at = time.time()
+        self._error = error
+
+        if self.export_spans:
+            try:
+                self._export_spans()
+            except Exception:
+                logger.exception("Failed to export the workflow profile as spans")
+        if self.on_profile is not None:
+            try:
+                self.on_profile(self.flamegraph())
+            except Exception:
+                logger.exception("Failed to hand over the workflow profile")
+
+    def flamegraph(self) -> dict[str, Any]:
+        """
+        Build a flamegraph of the run, in the d3-flame-graph JSON format.
+
+        Executions of the same node are merged into one frame, nodes running in an
+        iteration or loop are children of its frame. Frame values are the summed
+        execution times in milliseconds, `data` holds the other summed metrics.
+        """
+        graph_end = self._graph_finished_at or time.time()
+        graph_start = self._graph_started_at or graph_end
+        root: dict[str, Any] = {"name": "workflow", "value": _ms(graph_end - graph_start), "children": []}
+
+        frames: dict[str, dict[str, Any]] = {}
+        for profile in sorted(self.executions.values(), key=lambda p: p.started_at):
+            frame = frames.get(profile.node_id)
+            if frame is None:
+                frame = {
+                    "name": f"{profile.title} ({profile.node_type})",
+                    "value": 0,
+                    "children": [],
+                    "data": {
+                        "node_id": profile.node_id,
+                        "executions": 0,
+                        "retries": 0,
+                        "failures": 0,
+                        "queue_wait_ms": 0,
+                        "event_processing_ms": 0,
+                        "variable_read_bytes": 0,
+                        "variable_write_bytes": 0,
+                        "prompt_tokens": 0,
+                        "completion_tokens": 0,
+                    },
+                }
+                frames[profile.node_id] = frame
+                parent = frames.get(profile.parent_node_id or "", root)
+                parent["children"].append(frame)
+
+            data = frame["data"]
+            frame["value"] += _ms(profile.execution_time or graph_end - profile.started_at)
+            data["executions"] += 1
+            data["retries"] += profile.retries
+            data["failures"] += profile.status == "failed"
+            data["queue_wait_ms"] += _ms(profile.queue_wait or 0.0)
+            data["event_processing_ms"] += _ms(profile.event_processing_time)
+            data["variable_read_bytes"] += profile.variable_read_bytes or 0
+            data["variable_write_bytes"] += profile.variable_write_bytes or 0
+            data["prompt_tokens"] += profile.prompt_tokens
+            data["completion_tokens"] += profile.completion_tokens
+            if profile.first_chunk_latency is not None:
+                data["first_chunk_ms"] = min(
+                    data.get("first_chunk_ms", _ms(profile.first_chunk_latency)), _ms(profile.first_chunk_latency)
+                )
+
+        return root
+
+    def _start_profile(self, event: NodeRunStartedEvent) -> NodeExecutionProfile:
+        started_at = event.start_at.replace(tzinfo=UTC).timestamp()
+        parent_node_id = event.in_iteration_id or event.in_loop_id
+        profile = NodeExecutionProfile(
+            execution_id=event.id,
+            node_id=event.node_id,
+            node_type=event.node_type.value,
+            title=event.node_title,
+            parent_node_id=parent_node_id,
+            started_at=started_at,
+        )
+        # nodes in iterations and loops are queued by the engine of the container
+        enqueued_at = self._enqueued_at.pop(event.node_id, None) if parent_node_id is None else None
+        if enqueued_at is not None:
+            profile.queue_wait = max(started_at - enqueued_at, 0.0)
+        self.executions[event.id] = profile
+        return profile
+
+    def _finish_profile(
+        self,
+        profile: NodeExecutionProfile,
+        event: NodeRunSucceededEvent | NodeRunFailedEvent | NodeRunExceptionEvent,
+        received_at: float,
+    ) -> None:
+        profile.finished_at = received_at
+        profile.status = "succeeded" if isinstance(event, NodeRunSucceededEvent) else "failed"
+
+        result = event.node_run_result
+        if self.measure_variable_sizes:
+            profile.variable_read_bytes = _json_size(result.inputs)
+            profile.variable_write_bytes = _json_size(result.outputs)
+
+        usage = result.llm_usage
+        if usage.total_tokens:
+            profile.prompt_tokens = usage.prompt_tokens
+            profile.completion_tokens = usage.completion_tokens
+            profile.llm_latency = usage.latency
+
+    def _export_spans(self) -> None:
+        graph_end = self._graph_finished_at or time.time()
+        graph_start = self._graph_started_at or graph_end
+        graph_span = _tracer.start_span("workflow.graph_run", start_time=_ns(graph_start))
+        graph_span.set_attribute("dify.workflow.node_executions", len(self.executions))
+        if self._error is not None:
+            graph_span.set_status(Status(StatusCode.ERROR, str(self._error)))
+
+        spans: dict[str, trace.Span] = {}
+        for profile in sorted(self.executions.values(), key=lambda p: p.started_at):
+            parent = spans.get(profile.parent_node_id or "", graph_span)
+            span = _tracer.start_span(
+                f"workflow.node.{profile.node_type}",
+                context=trace.set_span_in_context(parent),
+                start_time=_ns(profile.started_at),
+                attributes=_span_attributes(profile),
+            )
+            if profile.status == "failed":
+                span.set_status(Status(StatusCode.ERROR))
+            span.end(end_time=_ns(profile.finished_at or graph_end))
+            # later executions of a container are the parents of the nodes that follow
+            spans[profile.node_id] = span
+
+        graph_span.end(end_time=_ns(graph_end))
+
+
+def _span_attributes(profile: NodeExecutionProfile) -> dict[str, str | int | float]:
+    attributes: dict[str, str | int | float] = {
+        "dify.node.id": profile.node_id,
+        "dify.node.execution_id": profile.execution_id,
+        "dify.node.title": profile.title,
+        "dify.node.status": profile.status,
+        "dify.node.retries": profile.retries,
+        "dify.node.event_count": profile.event_count,
+        "dify.node.event_processing_time": profile.event_processing_time,
+    }
+    optional: Mapping[str, int | float | None] = {
+        "dify.node.queue_wait": profile.queue_wait,
+        "dify.node.variable_read_bytes": profile.variable_read_bytes,
+        "dify.node.variable_write_bytes": profile.variable_write_bytes,
+        "dify.llm.first_chunk_latency": profile.first_chunk_latency,
+        "dify.llm.latency": profile.llm_latency,
+    }
+    attributes.update({key: value for key, value in optional.items() if value is not None})
+    if profile.prompt_tokens or profile.completion_tokens:
+        attributes["gen_ai.usage.input_tokens"] = profile.prompt_tokens
+        attributes["gen_ai.usage.output_tokens"] = profile.completion_tokens
+    return attributes
+
+
+def _json_size(values: Mapping[str, Any] | None) -> int | None:
+    if values is None:
+        return None
+    try:
+        return len(json.dumps(WorkflowRuntimeTypeConverter().to_json_encodable(values)).encode())
+    except (TypeError, ValueError):
+        return None
+
+
+def _ms(seconds: float) -> int:
+    return round(seconds * 1000)
+
+
+def _ns(timestamp: float) -> int:
+    return int(timestamp * 1_000_000_000)
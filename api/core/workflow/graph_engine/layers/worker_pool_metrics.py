@@ -0,0 +1,119 @@
+"""
+Worker pool metrics layer for GraphEngine.
+
+This layer records how many nodes of a run execute concurrently and, when the
+shared worker pool is enabled, samples the pool's load while the run is active.
+"""
+
+import logging
+import time
+from typing import final
+
+from typing_extensions import override
+
+from configs import dify_config
+from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_engine.worker_management import SharedWorkerPool, get_shared_worker_pool
+from core.workflow.graph_events import (
+    GraphEngineEvent,
+    NodeRunExceptionEvent,
+    NodeRunFailedEvent,
+    NodeRunStartedEvent,
+    NodeRunSucceededEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@final
+class WorkerPoolMetricsLayer(GraphEngineLayer):
+    """
+    Layer that collects worker concurrency metrics for a graph run.
+
+    Metrics are available through `metrics` and logged when the run ends.
+    """
+
+    def __init__(self, pool: SharedWorkerPool | None = None) -> None:
+        """
+        Initialize the worker pool metrics layer.
+
+        Args:
+            pool: Shared worker pool to sample, defaults to the process-wide pool when it is enabled
+        """
+        super().__init__()
+        if pool is None and dify_config.GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED:
+            pool = get_shared_worker_pool()
+        self._pool = pool
+
+        self._start_time: float | None = None
+        self._running: set[str] = set()
+        self._nodes_started = 0
+        self._peak_concurrency = 0
+        self._peak_pool_busy_threads = 0
+        self._peak_pool_threads = 0
+        self._peak_pool_waiting_runs = 0
+        self._peak_pool_active_runs = 0
+        self._duration: float | None = None
+
+    @override
+    def on_graph_start(self) -> None:
+        """Called when graph execution starts."""
+        self._start_time = time.perf_counter()
+        self._running.clear()
+        self._nodes_started = 0
+        self._peak_concurrency = 0
+        self._peak_pool_busy_threads = 0
+        self._peak_pool_threads = 0
+        self._peak_pool_waiting_runs = 0
+        self._peak_pool_active_runs = 0
+        self._duration = None
+        self._sample_pool()
+
+    @override
+    def on_event(self, event: GraphEngineEvent) -> None:
+        """Called for every event emitted by the engine."""
+        if isinstance(event, NodeRunStartedEvent):
+            # retry events share the execution ID of the attempt they follow
+            if event.id not in self._running:
+                self._nodes_started += 1
+            self._running.add(event.id)
+            self._peak_concurrency = max(self._peak_concurrency, len(self._running))
+            self._sample_pool()
+        elif isinstance(event, NodeRunSucceededEvent | NodeRunFailedEvent | NodeRunExceptionEvent):
+            self._running.discard(event.id)
+
+    @override
+    def on_graph_end(self, error: Exception | None) -> None:
+        """Called when graph execution ends."""
+        if self._start_time is not None:
+            self._duration = time.perf_counter() - self._start_time
+        logger.info("Graph run worker metrics: %s", self.metrics)
+
+    @property
+    def metrics(self) -> dict[str, float | int | None]:
+        """Metrics of the current or last graph run."""
+        metrics: dict[str, float | int | None] = {
+            "duration": self._duration,
+            "nodes_started": self._nodes_started,
+            "peak_concurrency": self._peak_concurrency,
+        }
+        if self._pool is not None:
+            metrics.update(
+                {
+                    "pool_max_workers": self._pool.get_status()["max_workers"],
+                    "peak_pool_threads": self._peak_pool_threads,
+                    "peak_pool_busy_threads": self._peak_pool_busy_threads,
+                    "peak_pool_active_runs": self._peak_pool_active_runs,
+                    "peak_pool_waiting_runs": self._peak_pool_waiting_runs,
+                }
+            )
+        return metrics
+
+    def _sample_pool(self) -> None:
+        if self._pool is None:
+            return
+        status = self._pool.get_status()
+        self._peak_pool_threads = max(self._peak_pool_threads, status["total_threads"])
+        self._peak_pool_busy_threads = max(self._peak_pool_busy_threads, status["busy_threads"])
+        self._peak_pool_active_runs = max(self._peak_pool_active_runs, status["active_runs"])
+        self._peak_pool_waiting_runs = max(self._peak_pool_waiting_runs, status["waiting_runs"])
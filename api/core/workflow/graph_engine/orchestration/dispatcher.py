@@ -6,7 +6,8 @@ import logging
 import queue
 import threading
 import time
-from typing import TYPE_CHECKING, final
+from collections.abc import Callable
+from typing import TYPE_CHECKING, cast, final
 
 from core.workflow.graph_events.base import GraphNodeEventBase
 
@@ -18,6 +19,13 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Commands and worker scaling are checked at most this often while events keep flowing,
+# and the dispatcher sleeps at most this long when idle.
+_HOUSEKEEPING_INTERVAL = 0.1
+
+# Placed on the event queue by wake() to interrupt the blocking get.
+_WAKEUP = cast(GraphNodeEventBase, object())
+
 
 @final
 class Dispatcher:
@@ -25,7 +33,9 @@ class Dispatcher:
     Main dispatcher that processes events from the event queue.
 
     This runs in a separate thread and coordinates event processing
-    with timeout and completion detection.
+    with timeout and completion detection. The thread blocks on the event
+    queue and is woken by worker events, by wake() when a command arrives,
+    or when periodic command polling and scaling are due.
     """
 
     def __init__(
@@ -54,7 +64,20 @@ class Dispatcher:
 
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
+        self._commands_pending = threading.Event()
         self._start_time: float | None = None
+        self._event_timing_listener: Callable[[GraphNodeEventBase, float], None] | None = None
+
+    def set_event_timing_listener(self, listener: Callable[[GraphNodeEventBase, float], None] | None) -> None:
+        """
+        Register a callback receiving each handled event and the seconds spent handling it.
+
+        Events are only timed while a listener is set.
+
+        Args:
+            listener: Callback receiving the event and its handling time, or None to remove it
+        """
+        self._event_timing_listener = listener
 
     def start(self) -> None:
         """Start the dispatcher thread."""
@@ -69,29 +92,56 @@ class Dispatcher:
     def stop(self) -> None:
         """Stop the dispatcher thread."""
         self._stop_event.set()
+        self._event_queue.put(_WAKEUP)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=10.0)
 
+    def wake(self) -> None:
+        """Wake the dispatcher to process newly arrived commands immediately."""
+        self._commands_pending.set()
+        self._event_queue.put(_WAKEUP)
+
     def _dispatcher_loop(self) -> None:
         """Main dispatcher loop."""
         try:
+            next_housekeeping = 0.0
             while not self._stop_event.is_set():
-                # Check for commands
-                self._execution_coordinator.check_commands()
+                now = time.monotonic()
+                if self._commands_pending.is_set() or now >= next_housekeeping:
+                    self._commands_pending.clear()
+                    # Check for commands
+                    self._execution_coordinator.check_commands()
 
-                # Check for scaling
-                self._execution_coordinator.check_scaling()
+                    # Check for scaling
+                    self._execution_coordinator.check_scaling()
+                    next_housekeeping = now + _HOUSEKEEPING_INTERVAL
+
+                    if self._is_drained_and_complete():
+                        break
 
-                # Process events
+                # Process events, sleeping until the next housekeeping at most
                 try:
-                    event = self._event_queue.get(timeout=0.1)
-                    # Route to the event handler
-                    self._event_handler.dispatch(event)
-                    self._event_queue.task_done()
+                    event = self._event_queue.get(timeout=max(next_housekeeping - time.monotonic(), 0.0))
                 except queue.Empty:
-                    # Check if execution is complete
-                    if self._execution_coordinator.is_execution_complete():
-                        break
+                    continue
+
+                if event is _WAKEUP:
+                    self._event_queue.task_done()
+                    continue
+
+                # Route to the event handler
+                timing_listener = self._event_timing_listener
+                if timing_listener is None:
+                    self._event_handler.dispatch(event)
+                else:
+                    handling_start = time.perf_counter()
+                    self._event_handler.dispatch(event)
+                    timing_listener(event, time.perf_counter() - handling_start)
+                self._event_queue.task_done()
+
+                # Detect completion right after the last event instead of waiting for a timeout
+                if self._is_drained_and_complete():
+                    break
 
         except Exception as e:
             logger.exception("Dispatcher error")
@@ -102,3 +152,6 @@ class Dispatcher:
             # Signal the event emitter that execution is complete
             if self._event_emitter:
                 self._event_emitter.mark_complete()
+
+    def _is_drained_and_complete(self) -> bool:
+        return self._event_queue.empty() and self._execution_coordinator.is_execution_complete()
@@ -8,7 +8,7 @@ from ..command_processing import CommandProcessor
 from ..domain import GraphExecution
 from ..event_management import EventManager
 from ..graph_state_manager import GraphStateManager
-from ..worker_management import WorkerPool
+from ..worker_management import SharedWorkerPoolRun, WorkerPool
 
 if TYPE_CHECKING:
     from ..event_management import EventHandler
@@ -30,7 +30,7 @@ class ExecutionCoordinator:
         event_handler: "EventHandler",
         event_collector: EventManager,
         command_processor: CommandProcessor,
-        worker_pool: WorkerPool,
+        worker_pool: WorkerPool | SharedWorkerPoolRun,
     ) -> None:
         """
         Initialize the execution coordinator.
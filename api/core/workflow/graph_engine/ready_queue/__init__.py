@@ -7,6 +7,13 @@ the queue of nodes ready for execution.
 
 from .factory import create_ready_queue_from_state
 from .in_memory import InMemoryReadyQueue
+from .priority import PriorityReadyQueue
 from .protocol import ReadyQueue, ReadyQueueState
 
-__all__ = ["InMemoryReadyQueue", "ReadyQueue", "ReadyQueueState", "create_ready_queue_from_state"]
+__all__ = [
+    "InMemoryReadyQueue",
+    "PriorityReadyQueue",
+    "ReadyQueue",
+    "ReadyQueueState",
+    "create_ready_queue_from_state",
+]
@@ -5,6 +5,7 @@ Factory for creating ReadyQueue instances from serialized state.
 from typing import TYPE_CHECKING
 
 from .in_memory import InMemoryReadyQueue
+from .priority import PriorityReadyQueue
 from .protocol import ReadyQueueState
 
 if TYPE_CHECKING:
@@ -31,5 +32,11 @@ def create_ready_queue_from_state(state: ReadyQueueState) -> "ReadyQueue":
         # Always pass as JSON string to loads()
         queue.loads(state.model_dump_json())
         return queue
+    elif state.type == "PriorityReadyQueue":
+        if state.version != "1.0":
+            raise ValueError(f"Unsupported PriorityReadyQueue version: {state.version}")
+        priority_queue = PriorityReadyQueue()
+        priority_queue.loads(state.model_dump_json())
+        return priority_queue
     else:
         raise ValueError(f"Unknown ready queue type: {state.type}")
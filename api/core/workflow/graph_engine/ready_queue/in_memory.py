@@ -1,11 +1,14 @@
 """
 In-memory implementation of the ReadyQueue protocol.
 
-This implementation wraps Python's standard queue.Queue and adds
+This implementation keeps node IDs in a condition-guarded deque and adds
 serialization capabilities for state storage.
 """
 
 import queue
+import threading
+import time
+from collections import deque
 from typing import final
 
 from .protocol import ReadyQueue, ReadyQueueState
@@ -16,8 +19,9 @@ class InMemoryReadyQueue(ReadyQueue):
     """
     In-memory ready queue implementation with serialization support.
 
-    This implementation uses Python's queue.Queue internally and provides
-    methods to serialize and restore the queue state.
+    Items are kept in a deque guarded by a condition variable, so consumers
+    blocked in `get()` are woken as soon as an item is added, and can be
+    woken without an item through `interrupt()`.
     """
 
     def __init__(self, maxsize: int = 0) -> None:
@@ -27,7 +31,12 @@ class InMemoryReadyQueue(ReadyQueue):
         Args:
             maxsize: Maximum size of the queue (0 for unlimited)
         """
-        self._queue: queue.Queue[str] = queue.Queue(maxsize=maxsize)
+        self._maxsize = maxsize
+        self._items: deque[str] = deque()
+        self._condition = threading.Condition()
+        self._unfinished_tasks = 0
+        # bumped by interrupt() to release every consumer currently waiting
+        self._interrupt_generation = 0
 
     def put(self, item: str) -> None:
         """
@@ -36,7 +45,12 @@ class InMemoryReadyQueue(ReadyQueue):
         Args:
             item: The node ID to add to the queue
         """
-        self._queue.put(item)
+        with self._condition:
+            while self._maxsize > 0 and len(self._items) >= self._maxsize:
+                _ = self._condition.wait()
+            self._items.append(item)
+            self._unfinished_tasks += 1
+            self._condition.notify_all()
 
     def get(self, timeout: float | None = None) -> str:
         """
@@ -49,11 +63,32 @@ class InMemoryReadyQueue(ReadyQueue):
             The node ID retrieved from the queue
 
         Raises:
-            queue.Empty: If timeout expires and no item is available
-        """
-        if timeout is None:
-            return self._queue.get(block=True)
-        return self._queue.get(timeout=timeout)
+            queue.Empty: If timeout expires or the wait is interrupted before an item is available
+        """
+        with self._condition:
+            generation = self._interrupt_generation
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items:
+                if self._interrupt_generation != generation:
+                    raise queue.Empty
+                if deadline is None:
+                    _ = self._condition.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                _ = self._condition.wait(remaining)
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def interrupt(self) -> None:
+        """
+        Wake every consumer currently blocked in `get()` without an item.
+        """
+        with self._condition:
+            self._interrupt_generation += 1
+            self._condition.notify_all()
 
     def task_done(self) -> None:
         """
@@ -62,7 +97,10 @@ class InMemoryReadyQueue(ReadyQueue):
         Used by worker threads to signal task completion for
         join() synchronization.
         """
-        self._queue.task_done()
+        with self._condition:
+            if self._unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished_tasks -= 1
 
     def empty(self) -> bool:
         """
@@ -71,7 +109,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             True if the queue has no items, False otherwise
         """
-        return self._queue.empty()
+        with self._condition:
+            return not self._items
 
     def qsize(self) -> int:
         """
@@ -80,7 +119,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             The approximate number of items in the queue
         """
-        return self._queue.qsize()
+        with self._condition:
+            return len(self._items)
 
     def dumps(self) -> str:
         """
@@ -89,22 +129,8 @@ class InMemoryReadyQueue(ReadyQueue):
         Returns:
             A JSON string containing the serialized queue state
         """
-        # Extract all items from the queue without removing them
-        items: list[str] = []
-        temp_items: list[str] = []
-
-        # Drain the queue temporarily to get all items
-        while not self._queue.empty():
-            try:
-                item = self._queue.get_nowait()
-                temp_items.append(item)
-                items.append(item)
-            except queue.Empty:
-                break
-
-        # Put items back in the same order
-        for item in temp_items:
-            self._queue.put(item)
+        with self._condition:
+            items = list(self._items)
 
         state = ReadyQueueState(
             type="InMemoryReadyQueue",
@@ -128,13 +154,7 @@ class InMemoryReadyQueue(ReadyQueue):
         if state.version != "1.0":
             raise ValueError(f"Unsupported version: {state.version}")
 
-        # Clear the current queue
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-            except queue.Empty:
-                break
-
-        # Restore items
-        for item in state.items:
-            self._queue.put(item)
+        with self._condition:
+            self._items = deque(state.items)
+            self._unfinished_tasks = len(self._items)
+            self._condition.notify_all()
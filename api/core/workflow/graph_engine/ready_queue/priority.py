@@ -0,0 +1,281 @@
+"""
+Priority and fair-share implementation of the ReadyQueue protocol.
+
+Nodes closer to a response node (Answer/End) are dequeued first, so the
+critical path to the first streamed output is not delayed behind unrelated
+work, and workers are shared fairly between parallel branches, so a branch
+with many ready nodes cannot starve the others.
+"""
+
+import heapq
+import operator
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import final
+
+from core.workflow.enums import NodeType
+from core.workflow.graph import Graph
+
+from .protocol import ReadyQueue, ReadyQueueState
+
+_RESPONSE_NODE_TYPES = (NodeType.ANSWER, NodeType.END)
+# group of node IDs the queue has no schedule for
+_DEFAULT_GROUP = ""
+
+
+def compute_node_priorities(graph: Graph) -> dict[str, int]:
+    """
+    Compute the number of edges from each node to the nearest response node.
+
+    Nodes that cannot reach a response node get the lowest priority.
+    """
+    priorities: dict[str, int] = {}
+    pending: deque[str] = deque()
+    for node_id, node in graph.nodes.items():
+        if node.node_type in _RESPONSE_NODE_TYPES:
+            priorities[node_id] = 0
+            pending.append(node_id)
+
+    # breadth-first search backwards along the edges
+    while pending:
+        node_id = pending.popleft()
+        for edge in graph.get_incoming_edges(node_id):
+            if edge.tail not in priorities:
+                priorities[edge.tail] = priorities[node_id] + 1
+                pending.append(edge.tail)
+
+    unreachable = len(graph.nodes)
+    for node_id in graph.nodes:
+        priorities.setdefault(node_id, unreachable)
+    return priorities
+
+
+def compute_node_groups(graph: Graph) -> dict[str, str]:
+    """
+    Assign each node to the parallel branch it runs in.
+
+    Every target of a fan-out starts a new branch named after it, other nodes
+    inherit the branch of the predecessor they are first reached from.
+    """
+    root_id = graph.root_node.id
+    groups: dict[str, str] = {root_id: root_id}
+    pending: deque[str] = deque([root_id])
+    while pending:
+        node_id = pending.popleft()
+        heads = [edge.head for edge in graph.get_outgoing_edges(node_id)]
+        fan_out = len(set(heads)) > 1
+        for head in heads:
+            if head in groups:
+                continue
+            groups[head] = head if fan_out else groups[node_id]
+            pending.append(head)
+    return groups
+
+
+@final
+class PriorityReadyQueue(ReadyQueue):
+    """
+    Ready queue ordering nodes by branch fairness, then by critical path.
+
+    Each parallel branch (group) has its own heap ordered by node priority and
+    insertion order. `get()` serves the group that has been served least, ties
+    broken by the best priority at the head of each group. A group that becomes
+    ready again starts from the least service among the ready groups, so idle
+    time does not accumulate into a burst.
+    """
+
+    def __init__(
+        self,
+        node_priorities: Mapping[str, int] | None = None,
+        node_groups: Mapping[str, str] | None = None,
+        maxsize: int = 0,
+    ) -> None:
+        """
+        Initialize the priority ready queue.
+
+        Args:
+            node_priorities: Priority per node ID, lower values are dequeued first
+            node_groups: Fair-share group per node ID
+            maxsize: Maximum size of the queue (0 for unlimited)
+        """
+        self._node_priorities = dict(node_priorities or {})
+        self._node_groups = dict(node_groups or {})
+        self._default_priority = max(self._node_priorities.values(), default=0)
+        self._maxsize = maxsize
+        self._heaps: dict[str, list[tuple[int, int, str]]] = {}
+        self._service: dict[str, int] = {}
+        self._size = 0
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._unfinished_tasks = 0
+        # bumped by interrupt() to release every consumer currently waiting
+        self._interrupt_generation = 0
+
+    @classmethod
+    def from_graph(cls, graph: Graph, maxsize: int = 0) -> "PriorityReadyQueue":
+        """
+        Create a queue scheduling the nodes of the given graph.
+
+        Args:
+            graph: The graph whose nodes will be queued
+            maxsize: Maximum size of the queue (0 for unlimited)
+        """
+        return cls(
+            node_priorities=compute_node_priorities(graph),
+            node_groups=compute_node_groups(graph),
+            maxsize=maxsize,
+        )
+
+    def _push(self, item: str) -> None:
+        group = self._node_groups.get(item, _DEFAULT_GROUP)
+        heap = self._heaps.get(group)
+        if heap is None:
+            heap = self._heaps[group] = []
+            least_service = min((self._service[g] for g in self._heaps if g != group), default=0)
+            self._service[group] = max(self._service.get(group, 0), least_service)
+        priority = self._node_priorities.get(item, self._default_priority)
+        heapq.heappush(heap, (priority, self._sequence, item))
+        self._sequence += 1
+        self._size += 1
+
+    def _pop(self) -> str:
+        group = min(self._heaps, key=lambda g: (self._service[g], self._heaps[g][0][0]))
+        heap = self._heaps[group]
+        _, _, item = heapq.heappop(heap)
+        if not heap:
+            del self._heaps[group]
+        self._service[group] += 1
+        self._size -= 1
+        return item
+
+    def put(self, item: str) -> None:
+        """
+        Add a node ID to the ready queue.
+
+        Args:
+            item: The node ID to add to the queue
+        """
+        with self._condition:
+            while self._maxsize > 0 and self._size >= self._maxsize:
+                _ = self._condition.wait()
+            self._push(item)
+            self._unfinished_tasks += 1
+            self._condition.notify_all()
+
+    def get(self, timeout: float | None = None) -> str:
+        """
+        Retrieve and remove the next node ID to execute.
+
+        Args:
+            timeout: Maximum time to wait for an item (None for blocking)
+
+        Returns:
+            The node ID retrieved from the queue
+
+        Raises:
+            queue.Empty: If timeout expires or the wait is interrupted before an item is available
+        """
+        with self._condition:
+            generation = self._interrupt_generation
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._size:
+                if self._interrupt_generation != generation:
+                    raise queue.Empty
+                if deadline is None:
+                    _ = self._condition.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                _ = self._condition.wait(remaining)
+            item = self._pop()
+            self._condition.notify_all()
+            return item
+
+    def interrupt(self) -> None:
+        """
+        Wake every consumer currently blocked in `get()` without an item.
+        """
+        with self._condition:
+            self._interrupt_generation += 1
+            self._condition.notify_all()
+
+    def task_done(self) -> None:
+        """
+        Indicate that a previously retrieved task is complete.
+        """
+        with self._condition:
+            if self._unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished_tasks -= 1
+
+    def empty(self) -> bool:
+        """
+        Check if the queue is empty.
+
+        Returns:
+            True if the queue has no items, False otherwise
+        """
+        with self._condition:
+            return not self._size
+
+    def qsize(self) -> int:
+        """
+        Get the approximate size of the queue.
+
+        Returns:
+            The approximate number of items in the queue
+        """
+        with self._condition:
+            return self._size
+
+    def dumps(self) -> str:
+        """
+        Serialize the queue state to a JSON string for storage.
+
+        Returns:
+            A JSON string containing the serialized queue state
+        """
+        with self._condition:
+            # in insertion order, priorities are restored from node_priorities
+            entries = sorted((entry for heap in self._heaps.values() for entry in heap), key=operator.itemgetter(1))
+            state = ReadyQueueState(
+                type="PriorityReadyQueue",
+                version="1.0",
+                items=[item for _, _, item in entries],
+                node_priorities=dict(self._node_priorities),
+                node_groups=dict(self._node_groups),
+                group_service=dict(self._service),
+            )
+        return state.model_dump_json()
+
+    def loads(self, data: str) -> None:
+        """
+        Restore the queue state from a JSON string.
+
+        Args:
+            data: The JSON string containing the serialized queue state to restore
+        """
+        state = ReadyQueueState.model_validate_json(data)
+
+        if state.type != "PriorityReadyQueue":
+            raise ValueError(f"Invalid serialized data type: {state.type}")
+
+        if state.version != "1.0":
+            raise ValueError(f"Unsupported version: {state.version}")
+
+        with self._condition:
+            self._node_priorities = dict(state.node_priorities)
+            self._node_groups = dict(state.node_groups)
+            self._default_priority = max(self._node_priorities.values(), default=0)
+            self._heaps = {}
+            self._service = dict(state.group_service)
+            self._size = 0
+            self._sequence = 0
+            for item in state.items:
+                self._push(item)
+            self._unfinished_tasks = self._size
+            self._condition.notify_all()
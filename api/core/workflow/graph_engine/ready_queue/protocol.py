@@ -5,7 +5,7 @@ This protocol defines the interface for managing the queue of nodes ready
 for execution, supporting both in-memory and persistent storage scenarios.
 """
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from typing import Protocol
 
 from pydantic import BaseModel, Field
@@ -22,6 +22,13 @@ class ReadyQueueState(BaseModel):
     type: str = Field(description="Queue implementation type (e.g., 'InMemoryReadyQueue')")
     version: str = Field(description="Serialization format version")
     items: Sequence[str] = Field(default_factory=list, description="List of node IDs in the queue")
+    node_priorities: Mapping[str, int] = Field(
+        default_factory=dict, description="Scheduling priority per node ID, lower values run first"
+    )
+    node_groups: Mapping[str, str] = Field(default_factory=dict, description="Fair-share group per node ID")
+    group_service: Mapping[str, int] = Field(
+        default_factory=dict, description="Number of items served per fair-share group"
+    )
 
 
 class ReadyQueue(Protocol):
@@ -57,6 +64,15 @@ class ReadyQueue(Protocol):
         """
         ...
 
+    def interrupt(self) -> None:
+        """
+        Wake every consumer currently blocked in get() without an item.
+
+        The woken get() calls raise queue.Empty, so that workers being
+        stopped do not wait for their timeout to expire.
+        """
+        ...
+
     def task_done(self) -> None:
         """
         Indicate that a previously retrieved task is complete.
@@ -24,6 +24,10 @@ from libs.flask_utils import preserve_flask_contexts
 
 from .ready_queue import ReadyQueue
 
+# Idle workers block on the ready queue and are woken by new items or by stop(),
+# this timeout only bounds the wait if a stop races with entering the queue.
+_IDLE_WAIT_TIMEOUT = 1.0
+
 
 @final
 class Worker(threading.Thread):
@@ -68,6 +72,7 @@ class Worker(threading.Thread):
     def stop(self) -> None:
         """Signal the worker to stop processing."""
         self._stop_event.set()
+        self._ready_queue.interrupt()
 
     @property
     def is_idle(self) -> bool:
@@ -94,9 +99,9 @@ class Worker(threading.Thread):
         and pushes events to event_queue until stopped.
         """
         while not self._stop_event.is_set():
-            # Try to get a node ID from the ready queue (with timeout)
+            # Wait for a node ID from the ready queue
             try:
-                node_id = self._ready_queue.get(timeout=0.1)
+                node_id = self._ready_queue.get(timeout=_IDLE_WAIT_TIMEOUT)
             except queue.Empty:
                 continue
 
@@ -106,15 +111,7 @@ class Worker(threading.Thread):
                 self._execute_node(node)
                 self._ready_queue.task_done()
             except Exception as e:
-                error_event = NodeRunFailedEvent(
-                    id=str(uuid4()),
-                    node_id="unknown",
-                    node_type=NodeType.CODE,
-                    in_iteration_id=None,
-                    error=str(e),
-                    start_at=datetime.now(),
-                )
-                self._event_queue.put(error_event)
+                self._event_queue.put(create_worker_error_event(e))
 
     def _execute_node(self, node: Node) -> None:
         """
@@ -123,20 +120,50 @@ class Worker(threading.Thread):
         Args:
             node: The node instance to execute
         """
-        # Execute the node with preserved context if Flask app is provided
-        if self._flask_app and self._context_vars:
-            with preserve_flask_contexts(
-                flask_app=self._flask_app,
-                context_vars=self._context_vars,
-            ):
-                # Execute the node
-                node_events = node.run()
-                for event in node_events:
-                    # Forward event to dispatcher immediately for streaming
-                    self._event_queue.put(event)
-        else:
-            # Execute without context preservation
+        execute_node(node, self._event_queue, self._flask_app, self._context_vars)
+
+
+def execute_node(
+    node: Node,
+    event_queue: queue.Queue[GraphNodeEventBase],
+    flask_app: Flask | None = None,
+    context_vars: contextvars.Context | None = None,
+) -> None:
+    """
+    Execute a single node on the current thread and forward its events.
+
+    Args:
+        node: The node instance to execute
+        event_queue: Queue for pushing execution events
+        flask_app: Optional Flask application for context preservation
+        context_vars: Optional context variables to preserve
+    """
+    # Execute the node with preserved context if Flask app is provided
+    if flask_app and context_vars:
+        with preserve_flask_contexts(
+            flask_app=flask_app,
+            context_vars=context_vars,
+        ):
+            # Execute the node
             node_events = node.run()
             for event in node_events:
                 # Forward event to dispatcher immediately for streaming
-                self._event_queue.put(event)
+                event_queue.put(event)
+    else:
+        # Execute without context preservation
+        node_events = node.run()
+        for event in node_events:
+            # Forward event to dispatcher immediately for streaming
+            event_queue.put(event)
+
+
+def create_worker_error_event(error: Exception) -> NodeRunFailedEvent:
+    """Create the event reported for an error raised outside of the node's own error handling."""
+    return NodeRunFailedEvent(
+        id=str(uuid4()),
+        node_id="unknown",
+        node_type=NodeType.CODE,
+        in_iteration_id=None,
+        error=str(error),
+        start_at=datetime.now(),
+    )
@@ -5,8 +5,12 @@ This package manages the worker pool, including creation,
 scaling, and activity tracking.
 """
 
+from .shared_worker_pool import SharedWorkerPool, SharedWorkerPoolRun, get_shared_worker_pool
 from .worker_pool import WorkerPool
 
 __all__ = [
+    "SharedWorkerPool",
+    "SharedWorkerPoolRun",
     "WorkerPool",
+    "get_shared_worker_pool",
 ]
@@ -0,0 +1,343 @@
+"""
+Process-wide worker pool shared by all GraphEngine runs.
+
+Instead of every engine, including the sub-engines of iteration and loop
+nodes, starting its own worker threads, engines register a run with this
+pool. A bounded set of threads serves all registered runs round-robin,
+each run limited to its own concurrency cap.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, final
+
+from configs import dify_config
+from core.workflow.graph import Graph
+from core.workflow.graph_events import GraphNodeEventBase
+
+from ..ready_queue import ReadyQueue
+from ..worker import create_worker_error_event, execute_node
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from contextvars import Context
+
+    from flask import Flask
+
+
+class _PoolThread:
+    """
+    A pool thread executing a node, as seen by the runs the node starts.
+
+    Nodes that run a nested graph, such as iterations, loops, workflow tools or agents, hold
+    their thread until the nested run finishes. While they do, the thread counts as blocked
+    and the pool may start a replacement thread, so that nested runs cannot starve on threads
+    held by their own parents.
+    """
+
+    def __init__(self, pool: "SharedWorkerPool") -> None:
+        self.pool = pool
+        # guarded by the pool's condition
+        self.nested_runs = 0
+
+
+# The pool thread executing the current node. Nested runs started by the node see it, also
+# from other threads as long as they copy the node's context.
+_current_pool_thread: contextvars.ContextVar[_PoolThread | None] = contextvars.ContextVar(
+    "graph_engine_current_pool_thread", default=None
+)
+
+
+@final
+class SharedWorkerPoolRun:
+    """
+    Registration of one GraphEngine run with the shared worker pool.
+
+    Provides the same lifecycle interface as `WorkerPool`. The state manager
+    calls `notify()` for every node it enqueues, and the pool executes the
+    node on one of its threads once the run is below its concurrency cap.
+    """
+
+    def __init__(
+        self,
+        pool: "SharedWorkerPool",
+        ready_queue: ReadyQueue,
+        event_queue: queue.Queue[GraphNodeEventBase],
+        graph: Graph,
+        flask_app: "Flask | None",
+        context_vars: "Context | None",
+        max_concurrency: int,
+    ) -> None:
+        self._pool = pool
+        self._ready_queue = ready_queue
+        self._event_queue = event_queue
+        self._graph = graph
+        self._flask_app = flask_app
+        self._context_vars = context_vars
+        self._max_concurrency = max_concurrency
+
+        # guarded by the pool's condition
+        self._active = False
+        self._scheduled = False
+        self._pending = 0
+        self._in_flight = 0
+        # pool thread blocked while this nested run is active
+        self._parent_thread: _PoolThread | None = None
+
+    def start(self) -> None:
+        """Start serving the run, including nodes already in a restored ready queue."""
+        self._pool.start_run(self)
+
+    def stop(self) -> None:
+        """Stop serving the run and wait for its executing nodes to finish."""
+        self._pool.stop_run(self)
+
+    def notify(self, node_id: str) -> None:
+        """Signal that a node has been added to the run's ready queue."""
+        self._pool.notify_run(self)
+
+    def check_and_scale(self) -> None:
+        """The shared pool sizes itself on demand, nothing to do per run."""
+
+    def get_worker_count(self) -> int:
+        """Get the number of nodes of this run currently executing."""
+        with self._pool.condition:
+            return self._in_flight
+
+    def get_status(self) -> dict[str, int]:
+        """
+        Get run status information.
+
+        Returns:
+            Dictionary with status information
+        """
+        with self._pool.condition:
+            return {
+                "total_workers": self._in_flight,
+                "queue_depth": self._ready_queue.qsize(),
+                "min_workers": 0,
+                "max_workers": self._max_concurrency,
+            }
+
+    def execute_next(self) -> None:
+        """Execute the next ready node of this run on the calling pool thread."""
+        try:
+            node_id = self._ready_queue.get(timeout=0)
+        except queue.Empty:
+            return
+
+        node = self._graph.nodes[node_id]
+        pool_thread = _PoolThread(self._pool)
+        context_vars = self._context_vars
+        if context_vars is not None:
+            # the node runs in a copy of the engine's context, which may carry the parent's pool thread
+            context_vars = context_vars.copy()
+            context_vars.run(_current_pool_thread.set, pool_thread)
+        token = _current_pool_thread.set(pool_thread)
+        try:
+            execute_node(node, self._event_queue, self._flask_app, context_vars)
+            self._ready_queue.task_done()
+        except Exception as e:
+            self._event_queue.put(create_worker_error_event(e))
+        finally:
+            _current_pool_thread.reset(token)
+
+
+@final
+class SharedWorkerPool:
+    """
+    Bounded pool of worker threads shared by all graph engine runs in the process.
+
+    Threads are started on demand up to `max_workers` (not counting threads blocked
+    waiting for nested runs) and exit after `idle_timeout` seconds without work.
+    """
+
+    def __init__(self, max_workers: int, idle_timeout: float) -> None:
+        self._max_workers = max_workers
+        self._idle_timeout = idle_timeout
+        self.condition = threading.Condition()
+        self._pending_runs: deque[SharedWorkerPoolRun] = deque()
+        self._active_runs = 0
+        self._threads = 0
+        self._idle_threads = 0
+        self._busy_threads = 0
+        self._blocked_threads = 0
+        self._thread_counter = 0
+        self._completed_tasks = 0
+
+    def register(
+        self,
+        ready_queue: ReadyQueue,
+        event_queue: queue.Queue[GraphNodeEventBase],
+        graph: Graph,
+        flask_app: "Flask | None" = None,
+        context_vars: "Context | None" = None,
+        max_concurrency: int | None = None,
+    ) -> SharedWorkerPoolRun:
+        """
+        Register a graph engine run with the pool.
+
+        Args:
+            ready_queue: Ready queue of the run
+            event_queue: Queue for the run's worker events
+            graph: The workflow graph of the run
+            flask_app: Optional Flask app for context preservation
+            context_vars: Optional context variables
+            max_concurrency: Maximum number of nodes of the run executing at once
+        """
+        return SharedWorkerPoolRun(
+            pool=self,
+            ready_queue=ready_queue,
+            event_queue=event_queue,
+            graph=graph,
+            flask_app=flask_app,
+            context_vars=context_vars,
+            max_concurrency=max_concurrency or dify_config.GRAPH_ENGINE_MAX_WORKERS,
+        )
+
+    def start_run(self, run: SharedWorkerPoolRun) -> None:
+        with self.condition:
+            if run._active:
+                return
+            run._active = True
+            run._pending = run._ready_queue.qsize()
+            self._active_runs += 1
+            parent_thread = _current_pool_thread.get()
+            if parent_thread is not None and parent_thread.pool is self:
+                # a node executing on one of our threads waits for this run
+                run._parent_thread = parent_thread
+                parent_thread.nested_runs += 1
+                if parent_thread.nested_runs == 1:
+                    self.begin_blocking()
+            self._schedule(run)
+
+    def stop_run(self, run: SharedWorkerPoolRun, timeout: float = 10.0) -> None:
+        with self.condition:
+            if not run._active:
+                return
+            run._active = False
+            self._active_runs -= 1
+            if run._scheduled:
+                self._pending_runs.remove(run)
+                run._scheduled = False
+            if not self.condition.wait_for(lambda: run._in_flight == 0, timeout=timeout):
+                logger.warning("Timed out waiting for %d executing nodes of a stopped run", run._in_flight)
+            parent_thread = run._parent_thread
+            if parent_thread is not None:
+                run._parent_thread = None
+                parent_thread.nested_runs -= 1
+                if parent_thread.nested_runs == 0:
+                    self.end_blocking()
+
+    def notify_run(self, run: SharedWorkerPoolRun) -> None:
+        with self.condition:
+            run._pending += 1
+            self._schedule(run)
+
+    def begin_blocking(self) -> None:
+        """Mark the calling thread as blocked, e.g. waiting for a sub-engine."""
+        with self.condition:
+            self._blocked_threads += 1
+            if self._pending_runs:
+                self._ensure_thread()
+
+    def end_blocking(self) -> None:
+        with self.condition:
+            self._blocked_threads -= 1
+
+    def get_status(self) -> dict[str, int]:
+        """
+        Get pool status information.
+
+        Returns:
+            Dictionary with status information
+        """
+        with self.condition:
+            return {
+                "max_workers": self._max_workers,
+                "total_threads": self._threads,
+                "busy_threads": self._busy_threads,
+                "blocked_threads": self._blocked_threads,
+                "idle_threads": self._idle_threads,
+                "active_runs": self._active_runs,
+                "waiting_runs": len(self._pending_runs),
+                "completed_tasks": self._completed_tasks,
+            }
+
+    def _schedule(self, run: SharedWorkerPoolRun) -> None:
+        # caller holds the condition
+        if run._scheduled or not run._active or run._pending <= 0 or run._in_flight >= run._max_concurrency:
+            return
+        run._scheduled = True
+        self._pending_runs.append(run)
+        self._ensure_thread()
+        self.condition.notify()
+
+    def _ensure_thread(self) -> None:
+        # caller holds the condition
+        if self._idle_threads >= len(self._pending_runs):
+            return
+        if self._threads - self._blocked_threads >= self._max_workers:
+            return
+        self._threads += 1
+        self._thread_counter += 1
+        thread = threading.Thread(
+            target=self._worker_loop, name=f"GraphSharedWorker-{self._thread_counter}", daemon=True
+        )
+        thread.start()
+
+    def _worker_loop(self) -> None:
+        with self.condition:
+            while True:
+                # threads started to compensate for blocked ones retire once those resume
+                if self._threads - self._blocked_threads > self._max_workers:
+                    break
+                if not self._pending_runs:
+                    self._idle_threads += 1
+                    notified = self.condition.wait(self._idle_timeout)
+                    self._idle_threads -= 1
+                    if not notified and not self._pending_runs:
+                        break
+                    continue
+
+                run = self._pending_runs.popleft()
+                run._scheduled = False
+                run._pending -= 1
+                run._in_flight += 1
+                self._busy_threads += 1
+                # round-robin: the run goes to the back of the line if it has more ready nodes
+                self._schedule(run)
+
+                self.condition.release()
+                try:
+                    run.execute_next()
+                finally:
+                    self.condition.acquire()
+                    self._busy_threads -= 1
+                    self._completed_tasks += 1
+                    run._in_flight -= 1
+                    self._schedule(run)
+                    # wake stop_run() waiting for the run's in-flight nodes
+                    self.condition.notify_all()
+
+            self._threads -= 1
+
+
+_shared_worker_pool: SharedWorkerPool | None = None
+_shared_worker_pool_lock = threading.Lock()
+
+
+def get_shared_worker_pool() -> SharedWorkerPool:
+    """Get the process-wide shared worker pool, creating it on first use."""
+    global _shared_worker_pool
+    with _shared_worker_pool_lock:
+        if _shared_worker_pool is None:
+            _shared_worker_pool = SharedWorkerPool(
+                max_workers=dify_config.GRAPH_ENGINE_SHARED_WORKER_POOL_SIZE,
+                idle_timeout=dify_config.GRAPH_ENGINE_SCALE_DOWN_IDLE_TIME,
+            )
+        return _shared_worker_pool
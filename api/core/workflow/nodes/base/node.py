@@ -1,8 +1,8 @@
 import logging
 from abc import abstractmethod
-from collections.abc import Generator, Mapping, Sequence
+from collections.abc import Callable, Generator, Mapping, Sequence
 from functools import singledispatchmethod
-from typing import Any, ClassVar
+from typing import Any, ClassVar, ParamSpec, TypeVar
 from uuid import uuid4
 
 from core.app.entities.app_invoke_entities import InvokeFrom
@@ -45,13 +45,19 @@ from libs.datetime_utils import naive_utc_now
 from models.enums import UserFrom
 
 from .entities import BaseNodeData, RetryConfig
+from .process_pool import run_in_process_pool
 
 logger = logging.getLogger(__name__)
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
 
 class Node:
     node_type: ClassVar["NodeType"]
     execution_type: NodeExecutionType = NodeExecutionType.EXECUTABLE
+    # CPU-bound node types run their heavy work passed to `run_cpu_bound` in a process pool
+    cpu_bound: ClassVar[bool] = False
 
     def __init__(
         self,
@@ -65,6 +71,7 @@ class Node:
         self.app_id = graph_init_params.app_id
         self.workflow_id = graph_init_params.workflow_id
         self.graph_config = graph_init_params.graph_config
+        self.graph_cache_key = graph_init_params.graph_cache_key
         self.user_id = graph_init_params.user_id
         self.user_from = UserFrom(graph_init_params.user_from)
         self.invoke_from = InvokeFrom(graph_init_params.invoke_from)
@@ -246,6 +253,18 @@ class Node:
         """
         return False
 
+    def run_cpu_bound(self, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> R:
+        """
+        Run a CPU-bound step of this node.
+
+        For node types declared `cpu_bound`, `fn` runs in the workflow process pool so that it doesn't
+        hold the GIL of the worker threads; `fn` must be a module-level function and its arguments
+        and result must be picklable. Otherwise `fn` runs inline on the worker thread.
+        """
+        if not self.cpu_bound:
+            return fn(*args, **kwargs)
+        return run_in_process_pool(fn, *args, **kwargs)
+
     @classmethod
     def get_default_config(cls, filters: Mapping[str, object] | None = None) -> Mapping[str, object]:
         return {}
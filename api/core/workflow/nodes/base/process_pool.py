@@ -0,0 +1,79 @@
+"""
+Process pool for the CPU-bound parts of workflow nodes.
+
+Graph engine workers are threads, so pure-Python work inside a node holds the GIL and
+serializes with every other node running in the same API or Celery process. Node types that
+declare themselves CPU-bound (`Node.cpu_bound`) hand such work to this pool through
+`Node.run_cpu_bound`, while the node itself, its I/O and its events stay on the worker thread.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import ParamSpec, TypeVar
+
+from configs import dify_config
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor | None:
+    global _executor
+    max_workers = dify_config.WORKFLOW_CPU_BOUND_PROCESS_POOL_SIZE
+    if max_workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # worker processes are spawned rather than forked, the calling process runs threads
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_in_process_pool(fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> R:
+    """
+    Run `fn(*args, **kwargs)` in the shared process pool and wait for its result.
+
+    `fn` must be a module-level function, and its arguments and result must be picklable.
+    Exceptions raised by `fn` are re-raised in the caller. Runs `fn` inline when the pool is
+    disabled (`WORKFLOW_CPU_BOUND_PROCESS_POOL_SIZE=0`).
+    """
+    executor = _get_executor()
+    if executor is None:
+        return fn(*args, **kwargs)
+
+    try:
+        return executor.submit(fn, *args, **kwargs).result()
+    except BrokenProcessPool:
+        # a worker process died (e.g. killed for memory), start a fresh pool for later calls
+        logger.exception("Workflow process pool is broken, recreating it")
+        _discard_executor(executor)
+        raise
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool, it is recreated on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
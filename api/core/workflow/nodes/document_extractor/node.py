@@ -43,6 +43,7 @@ class DocumentExtractorNode(Node):
     """
 
     node_type = NodeType.DOCUMENT_EXTRACTOR
+    cpu_bound = True
 
     _node_data: DocumentExtractorNodeData
 
@@ -88,7 +89,7 @@ class DocumentExtractorNode(Node):
 
         try:
             if isinstance(value, list):
-                extracted_text_list = list(map(_extract_text_from_file, value))
+                extracted_text_list = list(map(self._extract_text_from_file, value))
                 return NodeRunResult(
                     status=WorkflowNodeExecutionStatus.SUCCEEDED,
                     inputs=inputs,
@@ -96,7 +97,7 @@ class DocumentExtractorNode(Node):
                     outputs={"text": ArrayStringSegment(value=extracted_text_list)},
                 )
             elif isinstance(value, File):
-                extracted_text = _extract_text_from_file(value)
+                extracted_text = self._extract_text_from_file(value)
                 return NodeRunResult(
                     status=WorkflowNodeExecutionStatus.SUCCEEDED,
                     inputs=inputs,
@@ -113,6 +114,16 @@ class DocumentExtractorNode(Node):
                 process_data=process_data,
             )
 
+    def _extract_text_from_file(self, file: File) -> str:
+        file_content = _download_file_content(file)
+        # parsing runs in the process pool, the download stays on the worker thread
+        return self.run_cpu_bound(
+            _extract_text_from_content,
+            file_content=file_content,
+            file_extension=file.extension,
+            mime_type=file.mime_type,
+        )
+
     @classmethod
     def _extract_variable_selector_to_variable_mapping(
         cls,
@@ -434,12 +445,11 @@ def _download_file_content(file: File) -> bytes:
         raise FileDownloadError(f"Error downloading file: {str(e)}") from e
 
 
-def _extract_text_from_file(file: File):
-    file_content = _download_file_content(file)
-    if file.extension:
-        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
-    elif file.mime_type:
-        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type)
+def _extract_text_from_content(*, file_content: bytes, file_extension: str | None, mime_type: str | None) -> str:
+    if file_extension:
+        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file_extension)
+    elif mime_type:
+        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=mime_type)
     else:
         raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
     return extracted_text
@@ -455,12 +455,12 @@ class IterationNode(Node):
         return variable_mapping
 
     def _extract_conversation_variable_snapshot(self, *, variable_pool: VariablePool) -> dict[str, VariableUnion]:
-        conversation_variables = variable_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
+        conversation_variables = variable_pool.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)
         return {name: variable.model_copy(deep=True) for name, variable in conversation_variables.items()}
 
     def _sync_conversation_variables_from_snapshot(self, snapshot: dict[str, VariableUnion]) -> None:
         parent_pool = self.graph_runtime_state.variable_pool
-        parent_conversations = parent_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
+        parent_conversations = parent_pool.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)
 
         current_keys = set(parent_conversations.keys())
         snapshot_keys = set(snapshot.keys())
@@ -541,9 +541,10 @@ class IterationNode(Node):
             user_from=self.user_from.value,
             invoke_from=self.invoke_from.value,
             call_depth=self.workflow_call_depth,
+            graph_cache_key=self.graph_cache_key,
         )
-        # Create a deep copy of the variable pool for each iteration
-        variable_pool_copy = self.graph_runtime_state.variable_pool.model_copy(deep=True)
+        # Create a copy-on-write child of the variable pool for each iteration
+        variable_pool_copy = self.graph_runtime_state.variable_pool.create_child()
 
         # append iteration variable (item, index) to variable pool
         variable_pool_copy.add([self._node_id, "index"], index)
@@ -564,7 +565,10 @@ class IterationNode(Node):
 
         # Initialize the iteration graph with the new node factory
         iteration_graph = Graph.init(
-            graph_config=self.graph_config, node_factory=node_factory, root_node_id=self._node_data.start_node_id
+            graph_config=self.graph_config,
+            node_factory=node_factory,
+            root_node_id=self._node_data.start_node_id,
+            cache_key=self.graph_cache_key,
         )
 
         if not iteration_graph:
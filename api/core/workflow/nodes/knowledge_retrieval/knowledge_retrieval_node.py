@@ -299,6 +299,7 @@ class KnowledgeRetrievalNode(Node):
                     raise ValueError("weights is required")
                 reranking_model = None
                 vector_setting = node_data.multiple_retrieval_config.weights.vector_setting
+                keyword_setting = node_data.multiple_retrieval_config.weights.keyword_setting
                 weights = {
                     "vector_setting": {
                         "vector_weight": vector_setting.vector_weight,
@@ -306,7 +307,10 @@ class KnowledgeRetrievalNode(Node):
                         "embedding_model_name": vector_setting.embedding_model_name,
                     },
                     "keyword_setting": {
-                        "keyword_weight": node_data.multiple_retrieval_config.weights.keyword_setting.keyword_weight
+                        "keyword_weight": keyword_setting.keyword_weight,
+                        "scoring_method": keyword_setting.scoring_method,
+                        "bm25_k1": keyword_setting.bm25_k1,
+                        "bm25_b": keyword_setting.bm25_b,
                     },
                 }
             else:
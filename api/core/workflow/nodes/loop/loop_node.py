@@ -422,6 +422,7 @@ class LoopNode(Node):
             user_from=self.user_from.value,
             invoke_from=self.invoke_from.value,
             call_depth=self.workflow_call_depth,
+            graph_cache_key=self.graph_cache_key,
         )
 
         # Create a new GraphRuntimeState for this iteration
@@ -436,7 +437,12 @@ class LoopNode(Node):
         )
 
         # Initialize the loop graph with the new node factory
-        loop_graph = Graph.init(graph_config=self.graph_config, node_factory=node_factory, root_node_id=root_node_id)
+        loop_graph = Graph.init(
+            graph_config=self.graph_config,
+            node_factory=node_factory,
+            root_node_id=root_node_id,
+            cache_key=self.graph_cache_key,
+        )
 
         # Create a new GraphEngine for this iteration
         graph_engine = GraphEngine(
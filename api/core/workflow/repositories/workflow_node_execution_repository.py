@@ -53,6 +53,15 @@ class WorkflowNodeExecutionRepository(Protocol):
         """
         ...
 
+    def flush(self):
+        """
+        Persist the changes buffered by previous `save` and `save_execution_data` calls.
+
+        Implementations that write changes immediately have nothing to do here. It is called
+        before a workflow execution is marked as completed, so that its node executions are durable by then.
+        """
+        ...
+
     def get_by_workflow_run(
         self,
         workflow_run_id: str,
@@ -101,6 +101,7 @@ class WorkflowCycleManager:
 
         self._add_trace_task_if_needed(trace_manager, workflow_execution, conversation_id, external_trace_id)
 
+        self._workflow_node_execution_repository.flush()
         self._workflow_execution_repository.save(workflow_execution)
         return workflow_execution
 
@@ -129,6 +130,7 @@ class WorkflowCycleManager:
 
         self._add_trace_task_if_needed(trace_manager, execution, conversation_id, external_trace_id)
 
+        self._workflow_node_execution_repository.flush()
         self._workflow_execution_repository.save(execution)
         return execution
 
@@ -161,6 +163,7 @@ class WorkflowCycleManager:
         self._fail_running_node_executions(workflow_execution.id_, error_message, now)
         self._add_trace_task_if_needed(trace_manager, workflow_execution, conversation_id, external_trace_id)
 
+        self._workflow_node_execution_repository.flush()
         self._workflow_execution_repository.save(workflow_execution)
         return workflow_execution
 
@@ -1,7 +1,8 @@
+import json
 import logging
 import time
 import uuid
-from collections.abc import Generator, Mapping, Sequence
+from collections.abc import Callable, Generator, Mapping, Sequence
 from typing import Any
 
 from configs import dify_config
@@ -12,9 +13,11 @@ from core.workflow.constants import ENVIRONMENT_VARIABLE_NODE_ID
 from core.workflow.entities import GraphInitParams, GraphRuntimeState, VariablePool
 from core.workflow.errors import WorkflowNodeRunFailedError
 from core.workflow.graph import Graph
+from core.workflow.graph.graph_topology import workflow_graph_cache_key
 from core.workflow.graph_engine import GraphEngine
+from core.workflow.graph_engine.checkpoint import create_checkpoint_store, restore_checkpoint
 from core.workflow.graph_engine.command_channels import InMemoryChannel
-from core.workflow.graph_engine.layers import DebugLoggingLayer, ExecutionLimitsLayer
+from core.workflow.graph_engine.layers import CheckpointLayer, DebugLoggingLayer, ExecutionLimitsLayer, ProfilingLayer
 from core.workflow.graph_engine.protocols.command_channel import CommandChannel
 from core.workflow.graph_events import GraphEngineEvent, GraphNodeEventBase, GraphRunFailedEvent
 from core.workflow.nodes import NodeType
@@ -22,6 +25,7 @@ from core.workflow.nodes.base.node import Node
 from core.workflow.nodes.node_mapping import NODE_TYPE_CLASSES_MAPPING
 from core.workflow.system_variable import SystemVariable
 from core.workflow.variable_loader import DUMMY_VARIABLE_LOADER, VariableLoader, load_into_variable_pool
+from extensions.ext_storage import storage
 from factories import file_factory
 from models.enums import UserFrom
 from models.workflow import Workflow
@@ -72,6 +76,27 @@ class WorkflowEntry:
             command_channel = InMemoryChannel()
 
         self.command_channel = command_channel
+
+        # Resume the run from its checkpoint, if it was interrupted before
+        checkpoint_layer: CheckpointLayer | None = None
+        workflow_execution_id = (
+            variable_pool.system_variables.workflow_execution_id if dify_config.WORKFLOW_CHECKPOINT_ENABLED else None
+        )
+        if workflow_execution_id:
+            checkpoint_store = create_checkpoint_store()
+            checkpoint = checkpoint_store.load(workflow_execution_id)
+            if checkpoint:
+                try:
+                    restore_checkpoint(checkpoint, graph_runtime_state)
+                    logger.info("Resuming workflow run %s from checkpoint", workflow_execution_id)
+                except ValueError:
+                    logger.warning("Ignoring invalid checkpoint of workflow run %s", workflow_execution_id)
+            checkpoint_layer = CheckpointLayer(
+                store=checkpoint_store,
+                run_id=workflow_execution_id,
+                interval=dify_config.WORKFLOW_CHECKPOINT_INTERVAL,
+            )
+
         self.graph_engine = GraphEngine(
             workflow_id=workflow_id,
             graph=graph,
@@ -97,6 +122,18 @@ class WorkflowEntry:
         )
         self.graph_engine.layer(limits_layer)
 
+        if checkpoint_layer is not None:
+            self.graph_engine.layer(checkpoint_layer)
+
+        if dify_config.WORKFLOW_PROFILING_ENABLED:
+            json_export = dify_config.WORKFLOW_PROFILING_EXPORTER == "json"
+            run_id = variable_pool.system_variables.workflow_execution_id or str(uuid.uuid4())
+            profiling_layer = ProfilingLayer(
+                export_spans=not json_export,
+                on_profile=_profile_saver(f"workflow_profiles/{tenant_id}/{run_id}.json") if json_export else None,
+            )
+            self.graph_engine.layer(profiling_layer)
+
     def run(self) -> Generator[GraphEngineEvent, None, None]:
         graph_engine = self.graph_engine
 
@@ -148,6 +185,7 @@ class WorkflowEntry:
             user_from=UserFrom.ACCOUNT,
             invoke_from=InvokeFrom.DEBUGGER,
             call_depth=0,
+            graph_cache_key=workflow_graph_cache_key(workflow.id, workflow.graph),
         )
         graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
 
@@ -421,3 +459,10 @@ class WorkflowEntry:
                     input_value = {variable_key_list[1]: input_value}
                     variable_key_list = variable_key_list[0:1]
                 variable_pool.add([variable_node_id] + variable_key_list, input_value)
+
+
+def _profile_saver(filename: str) -> Callable[[Mapping[str, Any]], None]:
+    def save(profile: Mapping[str, Any]) -> None:
+        storage.save(filename, json.dumps(profile).encode())
+
+    return save
@@ -15,7 +15,12 @@ dataset_fields = {
 
 reranking_model_fields = {"reranking_provider_name": fields.String, "reranking_model_name": fields.String}
 
-keyword_setting_fields = {"keyword_weight": fields.Float}
+keyword_setting_fields = {
+    "keyword_weight": fields.Float,
+    "scoring_method": fields.String,
+    "bm25_k1": fields.Float,
+    "bm25_b": fields.Float,
+}
 
 vector_setting_fields = {
     "vector_weight": fields.Float,
@@ -14,6 +14,7 @@ from .dataset import (
     AppDatasetJoin,
     Dataset,
     DatasetCollectionBinding,
+    DatasetKeyword,
     DatasetKeywordTable,
     DatasetPermission,
     DatasetPermissionEnum,
@@ -122,6 +123,7 @@ __all__ = [
     "DataSourceOauthBinding",
     "Dataset",
     "DatasetCollectionBinding",
+    "DatasetKeyword",
     "DatasetKeywordTable",
     "DatasetPermission",
     "DatasetPermissionEnum",
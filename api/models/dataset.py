@@ -984,6 +984,23 @@ class DatasetKeywordTable(Base):
                 return None
 
 
+class DatasetKeyword(Base):
+    """Posting list entry of the keyword index, one row per (keyword, index node) pair of a dataset."""
+
+    __tablename__ = "dataset_keywords"
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("id", name="dataset_keyword_pkey"),
+        sa.UniqueConstraint("dataset_id", "keyword", "index_node_id", name="dataset_keyword_posting_idx"),
+        sa.Index("dataset_keyword_node_idx", "dataset_id", "index_node_id"),
+    )
+
+    id = mapped_column(StringUUID, primary_key=True, server_default=sa.text("uuid_generate_v4()"))
+    dataset_id = mapped_column(StringUUID, nullable=False)
+    keyword: Mapped[str] = mapped_column(sa.Text, nullable=False)
+    index_node_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+
 class Embedding(Base):
     __tablename__ = "embeddings"
     __table_args__ = (
@@ -86,6 +86,9 @@ class WeightVectorSetting(BaseModel):
 
 class WeightKeywordSetting(BaseModel):
     keyword_weight: float
+    scoring_method: Literal["tf_idf", "bm25"] | None = None
+    bm25_k1: float | None = None
+    bm25_b: float | None = None
 
 
 class WeightModel(BaseModel):
@@ -50,6 +50,9 @@ class KeywordSetting(BaseModel):
     """
 
     keyword_weight: float
+    scoring_method: Literal["tf_idf", "bm25"] | None = None
+    bm25_k1: float | None = None
+    bm25_b: float | None = None
 
 
 class WeightedScoreConfig(BaseModel):
@@ -0,0 +1,165 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from configs import dify_config
+from core.memory.memory_snapshot import MemorySnapshot, MemorySnapshotEntry, MemorySnapshotStore
+from core.memory.token_buffer_memory import TokenBufferMemory
+from core.model_runtime.entities import AssistantPromptMessage, PromptMessageRole, UserPromptMessage
+from tests.unit_tests.conftest import redis_mock
+
+
+def _entries(*message_ids: str, tokens: int = 10) -> list[MemorySnapshotEntry]:
+    # newest first, assistant before user as stored in snapshots
+    return [
+        MemorySnapshotEntry(message_id=message_id, role=role, content=f"{role.value} {message_id}", tokens=tokens)
+        for message_id in message_ids
+        for role in (PromptMessageRole.ASSISTANT, PromptMessageRole.USER)
+    ]
+
+
+def test_select_window_respects_token_and_message_limits():
+    snapshot = MemorySnapshot(entries=_entries("m3", "m2", "m1"), token_limit=60, message_limit=3, exhausted=True)
+
+    window = snapshot.select_window(max_token_limit=35, message_limit=3)
+    assert [(entry.message_id, entry.role) for entry in window] == [
+        ("m2", PromptMessageRole.ASSISTANT),
+        ("m3", PromptMessageRole.USER),
+        ("m3", PromptMessageRole.ASSISTANT),
+    ]
+
+    window = snapshot.select_window(max_token_limit=2000, message_limit=1)
+    assert [entry.message_id for entry in window] == ["m3", "m3"]
+
+
+def test_covers():
+    snapshot = MemorySnapshot(entries=_entries("m2", "m1"), token_limit=100, message_limit=10, exhausted=False)
+    assert snapshot.covers(max_token_limit=100, message_limit=10)
+    assert not snapshot.covers(max_token_limit=101, message_limit=10)
+    assert not snapshot.covers(max_token_limit=100, message_limit=11)
+
+    snapshot.exhausted = True
+    assert snapshot.covers(max_token_limit=2000, message_limit=500)
+
+
+def test_extend_and_truncate(mocker):
+    mocker.patch.object(dify_config, "CONVERSATION_MEMORY_SNAPSHOT_MAX_TOKENS", 40)
+    parent = MemorySnapshot(entries=_entries("m2", "m1"), token_limit=40, message_limit=2, exhausted=True)
+
+    child = parent.extend(_entries("m3"))
+
+    assert [entry.message_id for entry in child.entries] == ["m3", "m3", "m2", "m2"]
+    assert child.token_limit == 40
+    assert child.message_limit == 3
+    assert not child.exhausted
+    # the parent snapshot is left untouched
+    assert len(parent.entries) == 4
+
+
+def test_store_ignores_invalid_data():
+    redis_mock.get.return_value = b"not json"
+    assert MemorySnapshotStore("conversation", "openai", "gpt").get("m1") is None
+
+
+def _message(message_id: str, parent_message_id: str | None, answer: str = "answer"):
+    return SimpleNamespace(
+        id=message_id,
+        parent_message_id=parent_message_id,
+        query=f"query {message_id}",
+        answer=answer,
+        answer_tokens=1 if answer else 0,
+    )
+
+
+@pytest.fixture
+def model_instance():
+    instance = MagicMock()
+    instance.provider = "openai"
+    instance.model = "gpt"
+    instance.get_llm_num_tokens.side_effect = lambda prompt_messages: 10 * len(prompt_messages)
+    return instance
+
+
+@pytest.fixture
+def snapshots(mocker):
+    mocker.patch.object(dify_config, "CONVERSATION_MEMORY_SNAPSHOT_ENABLED", True)
+    store = MemorySnapshotStore("conversation", "openai", "gpt")
+    stored: dict[str, bytes] = {}
+    redis_mock.get.side_effect = lambda key: stored.get(key)
+    redis_mock.setex.side_effect = lambda key, ttl, value: stored.__setitem__(key, value)
+    redis_mock.delete.side_effect = lambda key: stored.pop(key, None)
+    redis_mock.mget.return_value = [None, None]
+    yield store, stored
+    redis_mock.get.side_effect = None
+    redis_mock.setex.side_effect = None
+    redis_mock.delete.side_effect = None
+
+
+def test_history_is_read_from_snapshot_of_thread_head(model_instance, snapshots, mocker):
+    store, stored = snapshots
+    stored[store._key("m2")] = MemorySnapshot(
+        entries=_entries("m2", "m1"), token_limit=40, message_limit=2, exhausted=True
+    ).model_dump_json()
+    mock_db = mocker.patch("core.memory.token_buffer_memory.db")
+    # the latest message is still being answered, its parent is the thread head
+    mock_db.session.scalar.return_value = _message("m3", "m2", answer="")
+
+    memory = TokenBufferMemory(conversation=MagicMock(id="conversation"), model_instance=model_instance)
+    prompt_messages = memory.get_history_prompt_messages(max_token_limit=2000)
+
+    assert prompt_messages == [
+        UserPromptMessage(content="user m1"),
+        AssistantPromptMessage(content="assistant m1"),
+        UserPromptMessage(content="user m2"),
+        AssistantPromptMessage(content="assistant m2"),
+    ]
+    mock_db.session.scalars.assert_not_called()
+    model_instance.get_llm_num_tokens.assert_not_called()
+
+
+def test_snapshot_of_parent_is_extended_with_new_message(model_instance, snapshots, mocker):
+    store, stored = snapshots
+    stored[store._key("m1")] = MemorySnapshot(
+        entries=_entries("m1"), token_limit=20, message_limit=1, exhausted=True
+    ).model_dump_json()
+    mock_db = mocker.patch("core.memory.token_buffer_memory.db")
+    mock_db.session.scalar.return_value = _message("m3", "m2", answer="")
+    mock_db.session.get.return_value = _message("m2", "m1")
+    mock_db.session.scalars.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    memory = TokenBufferMemory(conversation=MagicMock(id="conversation"), model_instance=model_instance)
+    prompt_messages = memory.get_history_prompt_messages(max_token_limit=2000)
+
+    assert prompt_messages == [
+        UserPromptMessage(content="user m1"),
+        AssistantPromptMessage(content="assistant m1"),
+        UserPromptMessage(content="query m2"),
+        AssistantPromptMessage(content="answer"),
+    ]
+    # only the new message is tokenized, and its snapshot replaces the one of its parent
+    assert model_instance.get_llm_num_tokens.call_count == 2
+    snapshot = MemorySnapshot.model_validate_json(stored[store._key("m2")])
+    assert [entry.message_id for entry in snapshot.entries] == ["m2", "m2", "m1", "m1"]
+    assert snapshot.exhausted
+    assert list(stored) == [store._key("m2")]
+
+
+def test_snapshot_miss_falls_back_to_full_history(model_instance, snapshots, mocker):
+    store, stored = snapshots
+    mock_db = mocker.patch("core.memory.token_buffer_memory.db")
+    mock_db.session.scalar.return_value = _message("m2", "m1")
+    mock_db.session.get.return_value = None
+    mock_db.session.scalars.side_effect = [
+        MagicMock(all=MagicMock(return_value=[_message("m2", "m1"), _message("m1", None)])),
+        [],
+    ]
+    redis_mock.mget.return_value = [None] * 4
+
+    memory = TokenBufferMemory(conversation=MagicMock(id="conversation"), model_instance=model_instance)
+    prompt_messages = memory.get_history_prompt_messages(max_token_limit=2000)
+
+    assert len(prompt_messages) == 4
+    snapshot = MemorySnapshot.model_validate_json(stored[store._key("m2")])
+    assert snapshot.exhausted
+    assert len(snapshot.entries) == 4
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from configs import dify_config
+from constants import UUID_NIL
+from core.memory.token_buffer_memory import TokenBufferMemory
+from core.model_runtime.entities import AssistantPromptMessage, UserPromptMessage
+from tests.unit_tests.conftest import redis_mock
+
+
+def _messages(count: int):
+    # newest first, as returned by the query
+    return [
+        SimpleNamespace(
+            id=f"message-{i}",
+            parent_message_id=UUID_NIL,
+            query=f"query {i}",
+            answer=f"answer {i}",
+            answer_tokens=1,
+        )
+        for i in reversed(range(count))
+    ]
+
+
+@pytest.fixture
+def model_instance():
+    instance = MagicMock()
+    instance.provider = "openai"
+    instance.model = "gpt"
+    # every prompt message costs 10 tokens
+    instance.get_llm_num_tokens.side_effect = lambda prompt_messages: 10 * len(prompt_messages)
+    return instance
+
+
+@pytest.fixture
+def mock_db(mocker):
+    mocker.patch.object(dify_config, "CONVERSATION_MEMORY_SNAPSHOT_ENABLED", False)
+    return mocker.patch("core.memory.token_buffer_memory.db")
+
+
+def test_history_is_pruned_with_one_token_count_per_message(model_instance, mock_db):
+    mock_db.session.scalars.side_effect = [MagicMock(all=MagicMock(return_value=_messages(50))), []]
+    redis_mock.mget.return_value = [None] * 100
+
+    memory = TokenBufferMemory(conversation=MagicMock(), model_instance=model_instance)
+    prompt_messages = memory.get_history_prompt_messages(max_token_limit=45)
+
+    assert prompt_messages == [
+        UserPromptMessage(content="query 48"),
+        AssistantPromptMessage(content="answer 48"),
+        UserPromptMessage(content="query 49"),
+        AssistantPromptMessage(content="answer 49"),
+    ]
+    # one count for the whole history, then each prompt message in the window, plus the first one
+    # that does not fit, is tokenized once
+    assert model_instance.get_llm_num_tokens.call_count == 6
+    # message files are loaded with a single query
+    assert mock_db.session.scalars.call_count == 2
+
+
+def test_history_within_limit_is_counted_with_a_single_call(model_instance, mock_db):
+    mock_db.session.scalars.side_effect = [MagicMock(all=MagicMock(return_value=_messages(10))), []]
+    redis_mock.mget.return_value = [None] * 20
+
+    memory = TokenBufferMemory(conversation=MagicMock(), model_instance=model_instance)
+    prompt_messages = memory.get_history_prompt_messages(max_token_limit=2000)
+
+    assert len(prompt_messages) == 20
+    assert prompt_messages[0] == UserPromptMessage(content="query 0")
+    assert prompt_messages[-1] == AssistantPromptMessage(content="answer 9")
+    model_instance.get_llm_num_tokens.assert_called_once()
+
+
+def test_history_uses_cached_token_counts(model_instance, mock_db):
+    mock_db.session.scalars.side_effect = [MagicMock(all=MagicMock(return_value=_messages(2))), []]
+    redis_mock.mget.return_value = [b"10"] * 4
+
+    memory = TokenBufferMemory(conversation=MagicMock(), model_instance=model_instance)
+    prompt_messages = memory.get_history_prompt_messages(max_token_limit=2000)
+
+    assert len(prompt_messages) == 4
+    assert prompt_messages[0] == UserPromptMessage(content="query 0")
+    model_instance.get_llm_num_tokens.assert_not_called()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from pydantic import BaseModel
+from yarl import URL
+
+from core.model_runtime.entities.message_entities import UserPromptMessage
+from core.plugin.entities.plugin_daemon import PluginDaemonInnerError
+from core.plugin.impl import async_base, base
+from core.plugin.impl.base import BasePluginClient, _iter_stream_lines
+from core.plugin.impl.model import AsyncPluginModelClient
+
+
+class _Item(BaseModel):
+    value: int
+
+
+def test_iter_stream_lines_splits_across_chunks():
+    chunks = [b'data: {"a"', b": 1}\n\n", b'{"b": 2}\r\ndata:', b' {"c": 3}']
+    assert list(_iter_stream_lines(chunks)) == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+@pytest.fixture
+def mock_daemon(mocker):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/stream"):
+            body = b"".join(b'data: {"code": 0, "message": "", "data": {"value": %d}}\n\n' % i for i in range(3))
+            return httpx.Response(200, content=body)
+        return httpx.Response(200, json={"code": 0, "message": "", "data": {"value": 1}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    get_client = mocker.patch.object(base, "get_pooled_http_client", return_value=client)
+    return requests, get_client
+
+
+def test_requests_reuse_pooled_client(mock_daemon):
+    requests, get_client = mock_daemon
+    plugin_client = BasePluginClient()
+
+    for _ in range(2):
+        result = plugin_client._request_with_plugin_daemon_response(
+            "POST", "plugin/tenant/dispatch/item", _Item, data={"key": "value"}
+        )
+        assert result == _Item(value=1)
+
+    assert get_client.call_count == 2
+    assert get_client.call_args.args[0] == base._PLUGIN_DAEMON_CLIENT_KEY
+    assert requests[0].headers["X-Api-Key"]
+    assert requests[0].content == b"key=value"
+
+
+def test_stream_response_is_parsed_incrementally(mock_daemon):
+    plugin_client = BasePluginClient()
+
+    items = list(
+        plugin_client._request_with_plugin_daemon_response_stream(
+            "POST",
+            "plugin/tenant/dispatch/stream",
+            _Item,
+            data={"key": "value"},
+            headers={"Content-Type": "application/json"},
+        )
+    )
+
+    assert items == [_Item(value=0), _Item(value=1), _Item(value=2)]
+    requests, _ = mock_daemon
+    assert requests[0].content == b'{"key": "value"}'
+
+
+def test_connection_error_is_wrapped(mocker):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    mocker.patch.object(base, "get_pooled_http_client", return_value=client)
+
+    with pytest.raises(PluginDaemonInnerError):
+        BasePluginClient()._request("GET", "plugin/tenant/asset/id")
+
+
+@pytest.fixture
+def streaming_daemon():
+    """A local daemon whose streamed responses stay open until the test finishes."""
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{")
+            self.wfile.flush()
+            release.wait(5)
+            self.wfile.write(b"}")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield URL(f"http://127.0.0.1:{server.server_address[1]}")
+    release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_timeout_is_wrapped(mocker, streaming_daemon):
+    mocker.patch.object(base, "plugin_daemon_inner_api_baseurl", streaming_daemon)
+    mocker.patch.object(base.dify_config, "PLUGIN_DAEMON_POOL_MAX_CONNECTIONS", 1)
+    mocker.patch.object(base.dify_config, "PLUGIN_DAEMON_POOL_TIMEOUT", 0.1)
+    client = base._build_plugin_daemon_client()
+    mocker.patch.object(base, "get_pooled_http_client", return_value=client)
+    plugin_client = BasePluginClient()
+
+    # a streaming invocation holds the only connection of the pool
+    response = plugin_client._request("GET", "plugin/tenant/dispatch/stream", stream=True)
+    try:
+        with pytest.raises(PluginDaemonInnerError) as exc_info:
+            plugin_client._request("GET", "plugin/tenant/asset/id")
+    finally:
+        response.close()
+        client.close()
+
+    assert exc_info.value.message == base.POOL_TIMEOUT_MESSAGE
+
+
+def test_async_invoke_llm_streams_chunks(mocker):
+    def handler(request: httpx.Request) -> httpx.Response:
+        chunk = {
+            "model": "gpt",
+            "prompt_messages": [],
+            "delta": {"index": 0, "message": {"role": "assistant", "content": "hi"}},
+        }
+        line = json.dumps({"code": 0, "message": "", "data": chunk}).encode()
+        return httpx.Response(200, content=b"data: " + line + b"\n\n" + b"data: " + line + b"\n\n")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    mocker.patch.object(async_base, "_get_async_plugin_daemon_client", return_value=client)
+
+    async def invoke():
+        return [
+            chunk
+            async for chunk in AsyncPluginModelClient().invoke_llm(
+                tenant_id="tenant",
+                user_id="user",
+                plugin_id="langgenius/openai",
+                provider="openai",
+                model="gpt",
+                credentials={},
+                prompt_messages=[UserPromptMessage(content="hello")],
+            )
+        ]
+
+    chunks = asyncio.run(invoke())
+
+    assert [chunk.delta.message.content for chunk in chunks] == ["hi", "hi"]
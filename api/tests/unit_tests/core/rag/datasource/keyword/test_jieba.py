@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.rag.datasource.keyword.jieba.jieba import Jieba
+
+
+@pytest.fixture
+def dataset():
+    return MagicMock(id="dataset-1", keyword_number=None)
+
+
+def _segment(node_id: str):
+    return SimpleNamespace(
+        index_node_id=node_id,
+        content=f"content of {node_id}",
+        index_node_hash=f"hash-{node_id}",
+        document_id="document-1",
+        dataset_id="dataset-1",
+    )
+
+
+def test_search_loads_segments_with_single_query(mocker, dataset):
+    mock_db = mocker.patch("core.rag.datasource.keyword.jieba.jieba.db")
+    mocker.patch.object(
+        Jieba,
+        "_get_dataset_keyword_table",
+        return_value={"dify": {"node-1", "node-2", "node-3"}, "rag": {"node-2", "node-3"}, "llm": {"node-3"}},
+    )
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify", "rag", "llm"},
+    )
+    # segments come back from the database in arbitrary order, node-1 is filtered out
+    mock_db.session.scalars.return_value = [_segment("node-2"), _segment("node-3")]
+
+    documents = Jieba(dataset).search("query", top_k=3, document_ids_filter=["document-1"])
+
+    assert [document.metadata["doc_id"] for document in documents] == ["node-3", "node-2"]
+    assert mock_db.session.scalars.call_count == 1
+
+
+def test_retrieve_ids_by_query_ranks_by_matching_keywords(mocker, dataset):
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify", "rag", "unknown"},
+    )
+    keyword_table = {"dify": {"node-1", "node-2"}, "rag": {"node-2"}}
+
+    assert Jieba(dataset)._retrieve_ids_by_query(keyword_table, "query", k=1) == ["node-2"]
+
+
+def test_text_exists(mocker, dataset):
+    get_keyword_table = mocker.patch.object(Jieba, "_get_dataset_keyword_table", return_value={})
+    jieba = Jieba(dataset)
+    assert jieba.text_exists("node-1") is False
+
+    get_keyword_table.return_value = {"dify": {"node-1"}, "rag": {"node-2"}}
+    assert jieba.text_exists("node-2") is True
+    assert jieba.text_exists("node-3") is False
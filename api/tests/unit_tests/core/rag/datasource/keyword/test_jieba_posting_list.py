@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, PropertyMock
+
+import pytest
+
+from core.rag.datasource.keyword.jieba.jieba_posting_list import JiebaPostingList
+from core.rag.datasource.keyword.keyword_factory import Keyword
+from core.rag.datasource.keyword.keyword_type import KeyWordType
+from core.rag.models.document import Document
+
+
+@pytest.fixture
+def dataset():
+    return MagicMock(id="dataset-1", keyword_number=None, dataset_keyword_table=None)
+
+
+@pytest.fixture
+def legacy_keyword_table(dataset, mock_db):
+    """A keyword table left by the `Jieba` backend, removed from the dataset once deleted."""
+    keyword_table = MagicMock(data_source_type="database")
+    keyword_table.keyword_table_dict = {"__data__": {"table": {"dify": {"node-1"}, "knowledge": {"node-1", "node-2"}}}}
+    tables = [keyword_table]
+    type(dataset).dataset_keyword_table = PropertyMock(side_effect=lambda: tables[0] if tables else None)
+    mock_db.session.delete.side_effect = lambda instance: tables.remove(instance)
+    return keyword_table
+
+
+@pytest.fixture
+def mock_db(mocker):
+    db = mocker.patch("core.rag.datasource.keyword.jieba.jieba_posting_list.db")
+    mocker.patch("core.rag.datasource.keyword.jieba.jieba.db", db)
+    return db
+
+
+def _segment(node_id: str):
+    return SimpleNamespace(
+        index_node_id=node_id,
+        content=f"content of {node_id}",
+        index_node_hash=f"hash-{node_id}",
+        document_id="document-1",
+        dataset_id="dataset-1",
+    )
+
+
+def test_factory_returns_posting_list_backend():
+    assert Keyword.get_keyword_factory(KeyWordType.JIEBA_POSTING_LIST) is JiebaPostingList
+
+
+def test_search_hydrates_segments_in_rank_order(mocker, dataset, mock_db):
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba_posting_list.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify", "knowledge"},
+    )
+    mock_db.session.execute.return_value = [
+        SimpleNamespace(index_node_id="node-2", match_count=2),
+        SimpleNamespace(index_node_id="node-1", match_count=1),
+    ]
+    mock_db.session.scalars.return_value = [_segment("node-1"), _segment("node-2")]
+
+    documents = JiebaPostingList(dataset).search("dify knowledge", top_k=2)
+
+    assert [document.metadata["doc_id"] for document in documents] == ["node-2", "node-1"]
+    assert mock_db.session.execute.call_count == 1
+    assert mock_db.session.scalars.call_count == 1
+
+
+def test_search_without_matches_skips_segment_query(mocker, dataset, mock_db):
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba_posting_list.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify"},
+    )
+    mock_db.session.execute.return_value = []
+
+    assert JiebaPostingList(dataset).search("dify") == []
+    mock_db.session.scalars.assert_not_called()
+
+
+def test_add_texts_inserts_only_affected_postings(mocker, dataset, mock_db):
+    mocker.patch.object(JiebaPostingList, "_update_segment_keywords")
+    texts = [
+        Document(page_content="a", metadata={"doc_id": "node-1"}),
+        Document(page_content="b", metadata={"doc_id": "node-2"}),
+    ]
+
+    JiebaPostingList(dataset).add_texts(texts, keywords_list=[["x", "y", "x"], ["y"]])
+
+    stmt = mock_db.session.execute.call_args.args[0]
+    params = stmt.compile().params
+    inserted = sorted((params[f"keyword_m{i}"], params[f"index_node_id_m{i}"]) for i in range(3))
+    assert inserted == [("x", "node-1"), ("y", "node-1"), ("y", "node-2")]
+    mock_db.session.commit.assert_called_once()
+
+
+def _inserted_postings(mock_db) -> list[tuple[str, str]]:
+    inserted = []
+    for call in mock_db.session.execute.call_args_list:
+        stmt = call.args[0]
+        if getattr(stmt, "is_insert", False):
+            params = stmt.compile().params
+            rows = sum(1 for key in params if key.startswith("keyword_m"))
+            inserted.extend((params[f"keyword_m{i}"], params[f"index_node_id_m{i}"]) for i in range(rows))
+    return sorted(inserted)
+
+
+def test_search_backfills_postings_from_existing_keyword_table(mocker, dataset, mock_db, legacy_keyword_table):
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba_posting_list.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify"},
+    )
+    mock_db.session.execute.side_effect = [
+        [],
+        None,
+        [SimpleNamespace(index_node_id="node-1", match_count=1)],
+    ]
+    mock_db.session.scalars.return_value = [_segment("node-1")]
+
+    documents = JiebaPostingList(dataset).search("dify")
+
+    assert [document.metadata["doc_id"] for document in documents] == ["node-1"]
+    assert _inserted_postings(mock_db) == [("dify", "node-1"), ("knowledge", "node-1"), ("knowledge", "node-2")]
+    # the converted keyword table is removed
+    mock_db.session.delete.assert_called_once_with(legacy_keyword_table)
+    assert dataset.dataset_keyword_table is None
+
+
+def test_search_of_converted_dataset_does_not_backfill(mocker, dataset, mock_db):
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba_posting_list.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify"},
+    )
+    mock_db.session.execute.return_value = []
+
+    assert JiebaPostingList(dataset).search("dify") == []
+    assert mock_db.session.execute.call_count == 1
+
+
+def test_deleted_keywords_are_not_backfilled_again(mocker, dataset, mock_db, legacy_keyword_table):
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba_posting_list.JiebaKeywordTableHandler.extract_keywords",
+        return_value={"dify"},
+    )
+    mocker.patch.object(JiebaPostingList, "_update_segment_keywords")
+    mock_db.session.execute.return_value = []
+    keyword = JiebaPostingList(dataset)
+
+    keyword.delete()
+    mock_db.session.delete.assert_called_once_with(legacy_keyword_table)
+
+    keyword.add_texts([Document(page_content="a", metadata={"doc_id": "node-3"})], keywords_list=[["dify"]])
+    assert keyword.search("dify") == []
+
+    # only the node added after the delete is indexed, none of the nodes of the old keyword table
+    assert _inserted_postings(mock_db) == [("dify", "node-3")]
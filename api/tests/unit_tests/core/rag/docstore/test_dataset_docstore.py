@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.rag.docstore.dataset_docstore import DatasetDocumentStore
+from core.rag.models.document import ChildDocument, Document
+from models.dataset import DocumentSegment
+
+
+@pytest.fixture
+def mock_db(mocker):
+    mock_db = mocker.patch("core.rag.docstore.dataset_docstore.db")
+    mock_db.session.query.return_value.where.return_value.scalar.return_value = 2
+    mock_db.session.scalars.return_value = []
+    return mock_db
+
+
+@pytest.fixture
+def store():
+    dataset = MagicMock()
+    dataset.id = "dataset-id"
+    dataset.tenant_id = "tenant-id"
+    dataset.indexing_technique = "economy"
+    return DatasetDocumentStore(dataset=dataset, user_id="user-id", document_id="document-id")
+
+
+def _doc(doc_id: str, children: int = 0) -> Document:
+    return Document(
+        page_content=f"content of {doc_id}",
+        metadata={"doc_id": doc_id, "doc_hash": f"hash-{doc_id}"},
+        children=[
+            ChildDocument(page_content=f"child {i}", metadata={"doc_id": f"{doc_id}-{i}", "doc_hash": "h"})
+            for i in range(children)
+        ]
+        or None,
+    )
+
+
+def _inserted_rows(mock_db, table: str) -> list[dict]:
+    rows = []
+    for call in mock_db.session.execute.call_args_list:
+        stmt = call.args[0]
+        if stmt.is_insert and stmt.table.name == table:
+            rows.extend(call.args[1])
+    return rows
+
+
+def test_add_documents_inserts_in_batches(mocker, mock_db, store):
+    mocker.patch("core.rag.docstore.dataset_docstore.dify_config.DOCUMENT_SEGMENT_BATCH_SIZE", 2)
+
+    store.add_documents([_doc(f"doc-{i}", children=2) for i in range(5)], save_child=True)
+
+    # one lookup, one segment insert, one child chunk insert and one commit per batch
+    assert mock_db.session.scalars.call_count == 3
+    assert mock_db.session.execute.call_count == 6
+    assert mock_db.session.commit.call_count == 3
+
+    segments = _inserted_rows(mock_db, "document_segments")
+    assert [row["position"] for row in segments] == [3, 4, 5, 6, 7]
+    assert [row["index_node_id"] for row in segments] == [f"doc-{i}" for i in range(5)]
+    child_chunks = _inserted_rows(mock_db, "child_chunks")
+    assert len(child_chunks) == 10
+    assert {row["segment_id"] for row in child_chunks} == {row["id"] for row in segments}
+
+
+def test_add_documents_updates_existing_segments(mock_db, store):
+    existing = DocumentSegment(id="segment-id", index_node_id="doc-0", content="old", position=1)
+    mock_db.session.scalars.return_value = [existing]
+
+    store.add_documents([_doc("doc-0", children=1), _doc("doc-1")], save_child=True)
+
+    assert existing.content == "content of doc-0"
+    assert existing.index_node_hash == "hash-doc-0"
+    statements = [call.args[0] for call in mock_db.session.execute.call_args_list]
+    assert statements[0].is_delete
+    assert [row["index_node_id"] for row in _inserted_rows(mock_db, "document_segments")] == ["doc-1"]
+    assert [row["segment_id"] for row in _inserted_rows(mock_db, "child_chunks")] == ["segment-id"]
+    mock_db.session.commit.assert_called_once()
+
+
+def test_add_documents_rejects_existing_without_update(mock_db, store):
+    with pytest.raises(ValueError, match="already exists"):
+        store.add_documents([_doc("doc-0"), _doc("doc-0")], allow_update=False)
+    mock_db.session.commit.assert_not_called()
@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from core.entities.embedding_type import EmbeddingInputType
+from core.rag.embedding.cached_embedding import CacheEmbedding
+from core.rag.embedding.embedding_cache import (
+    EmbeddingCache,
+    LocalEmbeddingCache,
+    TieredEmbeddingCache,
+    decode_embedding,
+    encode_embedding,
+)
+from libs import helper
+from models.dataset import Embedding
+
+
+@pytest.fixture
+def model_instance():
+    instance = MagicMock()
+    instance.model = "text-embedding"
+    instance.provider = "openai"
+    instance.model_type_instance.get_model_schema.return_value = None
+    instance.invoke_text_embedding.side_effect = lambda texts, user, input_type: MagicMock(
+        embeddings=[[float(len(text)), 1.0] for text in texts]
+    )
+    return instance
+
+
+def _cached(text: str, vector: list[float]) -> Embedding:
+    embedding = Embedding(model_name="text-embedding", hash=helper.generate_text_hash(text), provider_name="openai")
+    embedding.set_embedding(vector)
+    return embedding
+
+
+def test_embed_documents_uses_single_lookup_and_bulk_insert(mocker, model_instance):
+    mock_db = mocker.patch("core.rag.embedding.cached_embedding.db")
+    mock_db.session.scalars.return_value = [_cached("hit", [0.0, 1.0])]
+    hash_spy = mocker.spy(helper, "generate_text_hash")
+
+    cache_embedding = CacheEmbedding(model_instance, document_cache=LocalEmbeddingCache(maxsize=16))
+    result = cache_embedding.embed_documents(["hit", "miss", "miss", "other"])
+
+    assert result[0] == [0.0, 1.0]
+    assert result[1] == result[2]
+    np.testing.assert_allclose(np.linalg.norm(result[3]), 1.0)
+    assert hash_spy.call_count == 4
+    assert mock_db.session.scalars.call_count == 1
+    # duplicated misses are only embedded once, with a single bulk insert
+    assert model_instance.invoke_text_embedding.call_count == 2
+    assert mock_db.session.execute.call_count == 1
+    mock_db.session.commit.assert_called_once()
+    assert cache_embedding.cache_stats.hits == 1
+    assert cache_embedding.cache_stats.misses == 2
+
+
+def test_embed_documents_chunks_cache_lookup(mocker, model_instance):
+    mock_db = mocker.patch("core.rag.embedding.cached_embedding.db")
+    mock_db.session.scalars.return_value = []
+    mocker.patch("core.rag.embedding.cached_embedding.dify_config.EMBEDDING_CACHE_LOOKUP_BATCH_SIZE", 2)
+
+    cache_embedding = CacheEmbedding(model_instance, document_cache=LocalEmbeddingCache(maxsize=16))
+    result = cache_embedding.embed_documents([f"text-{i}" for i in range(5)])
+
+    assert all(vector is not None for vector in result)
+    assert mock_db.session.scalars.call_count == 3
+    assert mock_db.session.execute.call_count == 3
+    assert cache_embedding.cache_stats.hits == 0
+    assert cache_embedding.cache_stats.misses == 5
+
+
+class _DictEmbeddingCache(EmbeddingCache):
+    def __init__(self):
+        self.data: dict[str, np.ndarray] = {}
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set_many(self, embeddings):
+        self.data.update(embeddings)
+
+
+def test_embed_documents_reads_local_cache_before_database(mocker, model_instance):
+    mock_db = mocker.patch("core.rag.embedding.cached_embedding.db")
+    document_cache = LocalEmbeddingCache(maxsize=16)
+    cache_embedding = CacheEmbedding(model_instance, document_cache=document_cache)
+    document_cache.set_many(
+        {
+            cache_embedding._cache_key(helper.generate_text_hash("hit"), EmbeddingInputType.DOCUMENT): np.array(
+                [1.0, 0.0]
+            )
+        }
+    )
+
+    result = cache_embedding.embed_documents(["hit"])
+
+    assert result == [[1.0, 0.0]]
+    mock_db.session.scalars.assert_not_called()
+    model_instance.invoke_text_embedding.assert_not_called()
+
+
+def test_embed_query_uses_tiered_cache(model_instance):
+    local_tier = LocalEmbeddingCache(maxsize=16)
+    remote_tier = _DictEmbeddingCache()
+    cache_embedding = CacheEmbedding(model_instance, query_cache=TieredEmbeddingCache([local_tier, remote_tier]))
+
+    first = cache_embedding.embed_query("query")
+    key = cache_embedding._cache_key(helper.generate_text_hash("query"), EmbeddingInputType.QUERY)
+    assert key in remote_tier.data
+    assert local_tier.get_many([key])
+
+    local_tier.clear()
+    second = cache_embedding.embed_query("query")
+
+    np.testing.assert_allclose(first, second, rtol=1e-6)
+    assert model_instance.invoke_text_embedding.call_count == 1
+    # the local tier is backfilled on a remote hit
+    assert local_tier.get_many([key])
+    assert cache_embedding.cache_stats.hits == 1
+    assert cache_embedding.cache_stats.misses == 1
+
+
+def test_document_and_query_embeddings_are_cached_separately(mocker, model_instance):
+    mock_db = mocker.patch("core.rag.embedding.cached_embedding.db")
+    mock_db.session.scalars.return_value = []
+    model_instance.invoke_text_embedding.side_effect = lambda texts, user, input_type: MagicMock(
+        embeddings=[[1.0, 0.0] if input_type == EmbeddingInputType.DOCUMENT else [0.0, 1.0] for _ in texts]
+    )
+    shared_cache = LocalEmbeddingCache(maxsize=16)
+    cache_embedding = CacheEmbedding(model_instance, document_cache=shared_cache, query_cache=shared_cache)
+
+    assert cache_embedding.embed_documents(["same text"]) == [[1.0, 0.0]]
+    assert cache_embedding.embed_query("same text") == [0.0, 1.0]
+    assert cache_embedding.embed_documents(["same text"]) == [[1.0, 0.0]]
+    assert model_instance.invoke_text_embedding.call_count == 2
+
+
+def test_embedding_codec_uses_float32_buffers():
+    data = encode_embedding([0.5, -1.25, 3.0])
+
+    assert len(data) == 12
+    decoded = decode_embedding(data)
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [0.5, -1.25, 3.0]
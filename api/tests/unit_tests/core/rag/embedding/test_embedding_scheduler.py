@@ -0,0 +1,139 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.model_runtime.errors.invoke import InvokeRateLimitError
+from core.rag.embedding.embedding_scheduler import AdaptiveConcurrencyLimiter, EmbeddingScheduler, pack_batches
+
+
+def _model_instance(api_key: str = "key") -> MagicMock:
+    instance = MagicMock()
+    instance.provider = "openai"
+    instance.credentials = {"api_key": api_key}
+    instance.invoke_text_embedding.side_effect = lambda texts, user, input_type: MagicMock(
+        embeddings=[[float(len(text))] for text in texts]
+    )
+    return instance
+
+
+def _scheduler(**kwargs) -> EmbeddingScheduler:
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("backoff_max", 0.05)
+    return EmbeddingScheduler(**kwargs)
+
+
+def test_pack_batches_by_chunks_and_token_budget():
+    assert pack_batches([1, 1, 1, 1, 1], max_chunks=2, max_tokens=100) == [range(0, 2), range(2, 4), range(4, 5)]
+    assert pack_batches([40, 40, 40, 150, 10], max_chunks=10, max_tokens=100) == [
+        range(0, 2),
+        range(2, 3),
+        # a text over the budget is sent alone
+        range(3, 4),
+        range(4, 5),
+    ]
+    assert pack_batches([], max_chunks=10, max_tokens=100) == []
+
+
+def test_embed_runs_batches_concurrently_within_limit(mocker):
+    mocker.patch(
+        "core.rag.embedding.embedding_scheduler.GPT2Tokenizer.get_num_tokens", side_effect=lambda text: len(text)
+    )
+    model_instance = _model_instance()
+    lock = threading.Lock()
+    in_flight = []
+    max_in_flight = []
+
+    def invoke(texts, user, input_type):
+        with lock:
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.02)
+        with lock:
+            in_flight.pop()
+        return MagicMock(embeddings=[[float(len(text))] for text in texts])
+
+    model_instance.invoke_text_embedding.side_effect = invoke
+    scheduler = _scheduler(max_concurrency=2, max_batch_tokens=10)
+    texts = ["a" * (i % 7 + 1) for i in range(20)]
+
+    embeddings = scheduler.embed(model_instance, texts, max_chunks=4)
+
+    assert embeddings == [[float(len(text))] for text in texts]
+    assert max(max_in_flight) == 2
+    for call in model_instance.invoke_text_embedding.call_args_list:
+        batch = call.kwargs["texts"]
+        assert len(batch) <= 4
+        assert sum(len(text) for text in batch) <= 10 or len(batch) == 1
+
+
+def test_rate_limited_requests_back_off_and_retry():
+    model_instance = _model_instance()
+    results = iter([InvokeRateLimitError("429"), InvokeRateLimitError("429")])
+
+    def invoke(texts, user, input_type):
+        error = next(results, None)
+        if error:
+            raise error
+        return MagicMock(embeddings=[[1.0]])
+
+    model_instance.invoke_text_embedding.side_effect = invoke
+    scheduler = _scheduler(max_concurrency=8, max_retries=2)
+
+    assert scheduler.embed(model_instance, ["text"], max_chunks=1) == [[1.0]]
+    assert model_instance.invoke_text_embedding.call_count == 3
+    # halved twice, then grown back a little by the successful request
+    assert 2 <= scheduler.limiter(model_instance).limit < 3
+
+    model_instance.invoke_text_embedding.side_effect = InvokeRateLimitError("429")
+    with pytest.raises(InvokeRateLimitError):
+        _scheduler(max_retries=1).invoke(model_instance, ["text"])
+
+
+def test_limiters_are_shared_per_provider_credentials():
+    scheduler = _scheduler()
+
+    assert scheduler.limiter(_model_instance()) is scheduler.limiter(_model_instance())
+    assert scheduler.limiter(_model_instance()) is not scheduler.limiter(_model_instance(api_key="other"))
+
+
+def test_small_requests_do_not_count_as_saturation():
+    limiter = AdaptiveConcurrencyLimiter(max_concurrency=4, backoff_base=0.01, backoff_max=0.05)
+
+    def release(latency, size):
+        limiter.acquire()
+        limiter.release(latency=latency, size=size)
+
+    for _ in range(3):
+        release(2.0, 100_000)
+    # small tail batches are slower per character only because of the fixed cost of a request
+    for _ in range(3):
+        release(0.15, 40)
+    assert limiter.limit == 4.0
+
+    # a comparable batch twice as slow per character is saturation
+    release(5.0, 80_000)
+    assert limiter.limit == 3.0
+
+
+def test_query_embeddings_bypass_the_limiter():
+    model_instance = _model_instance()
+    scheduler = _scheduler(max_concurrency=1)
+    limiter = scheduler.limiter(model_instance)
+    limiter.acquire()
+    results = iter([InvokeRateLimitError("429")])
+
+    def invoke(texts, user, input_type):
+        error = next(results, None)
+        if error:
+            raise error
+        return MagicMock(embeddings=[[1.0]])
+
+    model_instance.invoke_text_embedding.side_effect = invoke
+
+    # served while indexing holds every slot, and retried when rate limited
+    assert scheduler.invoke_query(model_instance, "query").embeddings == [[1.0]]
+    assert model_instance.invoke_text_embedding.call_count == 2
+    assert limiter.limit == 1.0
+    assert limiter.in_flight == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from core.rag.extractor.extract_process_pool import shutdown_extract_process_pool
+from core.rag.extractor.pdf_extractor import PdfExtractor
+
+
+def _make_pdf(page_texts: list[str]) -> bytes:
+    """Build a PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >>"
+            f" /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return content
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(_make_pdf([f"Page {page}" for page in range(8)]))
+    return str(path)
+
+
+def test_parallel_extraction_matches_sequential(mocker, pdf_path):
+    mocker.patch("core.rag.extractor.extract_process_pool.dify_config.EXTRACT_PROCESS_POOL_SIZE", 0)
+    sequential = list(PdfExtractor(pdf_path).load())
+
+    mocker.patch("core.rag.extractor.extract_process_pool.dify_config.EXTRACT_PROCESS_POOL_SIZE", 2)
+    mocker.patch("core.rag.extractor.pdf_extractor.dify_config.PDF_EXTRACT_PAGES_PER_TASK", 3)
+    try:
+        parallel = list(PdfExtractor(pdf_path).load())
+    finally:
+        shutdown_extract_process_pool()
+
+    assert [document.page_content for document in parallel] == [f"Page {page}" for page in range(8)]
+    assert [document.metadata for document in parallel] == [{"source": pdf_path, "page": page} for page in range(8)]
+    assert [(document.page_content, document.metadata) for document in sequential] == [
+        (document.page_content, document.metadata) for document in parallel
+    ]
@@ -0,0 +1,91 @@
+import math
+from collections import Counter
+
+import pytest
+
+from core.rag.models.document import Document
+from core.rag.rerank.keyword_scorer import KeywordScorer, KeywordScoringMethod, keyword_extraction_cache
+
+DOCUMENTS_KEYWORDS = {
+    "dify workflow": {"dify", "workflow"},
+    "dify knowledge retrieval": {"dify", "knowledge", "retrieval"},
+    "vector database": {"vector", "database"},
+}
+QUERY_KEYWORDS = {"dify", "retrieval"}
+
+
+@pytest.fixture(autouse=True)
+def _mock_extract_keywords(mocker):
+    def extract_keywords(self, text, max_keywords_per_chunk=10):
+        if text == "query":
+            return set(QUERY_KEYWORDS)
+        return set(DOCUMENTS_KEYWORDS[text])
+
+    mocker.patch(
+        "core.rag.datasource.keyword.jieba.jieba_keyword_table_handler.JiebaKeywordTableHandler.extract_keywords",
+        extract_keywords,
+    )
+    keyword_extraction_cache.clear()
+
+
+def _documents() -> list[Document]:
+    return [Document(page_content=text, metadata={"doc_id": text}) for text in DOCUMENTS_KEYWORDS]
+
+
+def _reference_tf_idf(query_keywords: set[str], documents_keywords: list[set[str]]) -> list[float]:
+    total_documents = len(documents_keywords)
+    all_keywords = set().union(*documents_keywords)
+    keyword_idf = {
+        keyword: math.log((1 + total_documents) / (1 + sum(1 for d in documents_keywords if keyword in d))) + 1
+        for keyword in all_keywords
+    }
+    query_tfidf = {k: c * keyword_idf.get(k, 0) for k, c in Counter(query_keywords).items()}
+    similarities = []
+    for document_keywords in documents_keywords:
+        document_tfidf = {k: c * keyword_idf.get(k, 0) for k, c in Counter(document_keywords).items()}
+        numerator = sum(query_tfidf[k] * document_tfidf[k] for k in set(query_tfidf) & set(document_tfidf))
+        denominator = math.sqrt(sum(v**2 for v in query_tfidf.values())) * math.sqrt(
+            sum(v**2 for v in document_tfidf.values())
+        )
+        similarities.append(numerator / denominator if denominator else 0.0)
+    return similarities
+
+
+def test_tf_idf_matches_reference_implementation():
+    documents = _documents()
+
+    scores = KeywordScorer().score("query", documents)
+
+    expected = _reference_tf_idf(QUERY_KEYWORDS, list(DOCUMENTS_KEYWORDS.values()))
+    assert scores == pytest.approx(expected)
+    assert documents[1].metadata["keywords"] == DOCUMENTS_KEYWORDS["dify knowledge retrieval"]
+
+
+def test_bm25_scores_are_normalized_and_ranked():
+    scores = KeywordScorer(method=KeywordScoringMethod.BM25, k1=1.5, b=0.5).score("query", _documents())
+
+    assert max(scores) == pytest.approx(1.0)
+    assert scores[1] == max(scores)
+    assert scores[0] > scores[2] == 0.0
+
+
+def test_bm25_term_frequencies_count_tokens(mocker):
+    mocker.patch.dict(DOCUMENTS_KEYWORDS, {"AI MAIL AI": {"AI", "MAIL"}})
+    scorer = KeywordScorer(method=KeywordScoringMethod.BM25)
+
+    frequencies = keyword_extraction_cache.term_frequencies(scorer._keyword_table_handler, "AI MAIL AI")
+
+    # "AI" inside "MAIL" is not an occurrence
+    assert frequencies == {"AI": 2, "MAIL": 1}
+
+
+def test_scorer_from_keyword_setting():
+    scorer = KeywordScorer.from_keyword_setting({"keyword_weight": 0.3, "scoring_method": "bm25", "bm25_k1": 2.0})
+    assert (scorer.method, scorer.k1, scorer.b) == (KeywordScoringMethod.BM25, 2.0, 0.75)
+
+    scorer = KeywordScorer.from_keyword_setting(None)
+    assert (scorer.method, scorer.k1, scorer.b) == (KeywordScoringMethod.TF_IDF, 1.2, 0.75)
+
+
+def test_score_empty_documents():
+    assert KeywordScorer().score("query", []) == []
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from core.rag.data_post_processor.data_post_processor import DataPostProcessor
+from core.rag.models.document import Document
+from core.rag.rerank.entity.weight import KeywordSetting, VectorSetting, Weights
+from core.rag.rerank.keyword_scorer import KeywordScoringMethod
+from core.rag.rerank.weight_rerank import WeightRerankRunner
+
+
+@pytest.fixture
+def runner():
+    weights = Weights(
+        vector_setting=VectorSetting(
+            vector_weight=0.7, embedding_provider_name="openai", embedding_model_name="text-embedding"
+        ),
+        keyword_setting=KeywordSetting(keyword_weight=0.3),
+    )
+    return WeightRerankRunner(tenant_id="tenant-1", weights=weights)
+
+
+@pytest.fixture
+def cache_embedding(mocker):
+    mocker.patch("core.rag.rerank.weight_rerank.ModelManager")
+    embedding = MagicMock()
+    embedding.embed_query.return_value = [1.0, 0.0]
+    embedding.embed_documents.side_effect = lambda texts: [[0.0, 1.0] for _ in texts]
+    mocker.patch("core.rag.rerank.weight_rerank.CacheEmbedding", return_value=embedding)
+    return embedding
+
+
+def test_calculate_cosine_reuses_document_vectors(runner, cache_embedding):
+    documents = [
+        Document(page_content="scored", metadata={"score": 0.42}),
+        Document(page_content="with vector", vector=[3.0, 4.0], metadata={}),
+        Document(page_content="without vector", metadata={}),
+    ]
+
+    scores = runner._calculate_cosine("tenant-1", "query", documents, runner.weights.vector_setting)
+
+    assert scores[0] == 0.42
+    np.testing.assert_allclose(scores[1:], [0.6, 0.0], atol=1e-6)
+    cache_embedding.embed_documents.assert_called_once_with(["without vector"])
+
+
+def test_calculate_cosine_skips_embedding_when_all_scored(runner, cache_embedding):
+    documents = [Document(page_content="scored", metadata={"score": 0.9})]
+
+    assert runner._calculate_cosine("tenant-1", "query", documents, runner.weights.vector_setting) == [0.9]
+    cache_embedding.embed_query.assert_not_called()
+
+
+def test_data_post_processor_passes_keyword_scoring_settings():
+    vector_setting = {"vector_weight": 0.7, "embedding_provider_name": "openai", "embedding_model_name": "embedding"}
+    weights = {
+        "vector_setting": vector_setting,
+        "keyword_setting": {"keyword_weight": 0.3, "scoring_method": "bm25", "bm25_k1": 1.5, "bm25_b": None},
+    }
+
+    runner = DataPostProcessor("tenant-1", "weighted_score", weights=weights).rerank_runner
+
+    assert isinstance(runner, WeightRerankRunner)
+    keyword_setting = runner.weights.keyword_setting
+    assert keyword_setting.scoring_method == KeywordScoringMethod.BM25
+    assert keyword_setting.bm25_k1 == 1.5
+    assert keyword_setting.bm25_b == 0.75
@@ -0,0 +1,41 @@
+from core.rag.splitter.fixed_text_splitter import FixedRecursiveCharacterTextSplitter
+from core.rag.splitter.text_splitter import RecursiveCharacterTextSplitter, _compile_separator
+
+
+def test_merge_splits_with_overlap():
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=10, chunk_overlap=4, keep_separator=False, separators=[" ", ""]
+    )
+
+    assert splitter.split_text("aa bb cc dd ee ff gg") == ["aa bb cc", "cc dd ee", "ee ff gg"]
+    assert splitter.split_text("aaaaaaaaaaaaaa bb") == ["aaaaaaaaaa", "aaaaaaaa", "bb"]
+
+
+def test_lengths_are_measured_once_per_split_list():
+    measured: list[list[str]] = []
+
+    def length_function(texts: list[str]) -> list[int]:
+        measured.append(texts)
+        return [len(text) for text in texts]
+
+    splitter = FixedRecursiveCharacterTextSplitter(
+        fixed_separator="\n\n", chunk_size=50, chunk_overlap=10, length_function=length_function
+    )
+    text = " ".join(f"word{i}" for i in range(2000))
+
+    chunks = splitter.split_text(text)
+
+    assert len(chunks) > 100
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    # the whole text, its words and the separator, the merge window reuses the measured lengths
+    assert len(measured) == 3
+
+
+def test_separator_patterns_are_compiled_once():
+    _compile_separator.cache_clear()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=20, chunk_overlap=0)
+
+    for _ in range(10):
+        splitter.split_text("first paragraph\n\nsecond paragraph\nwith two lines and some more words")
+
+    assert _compile_separator.cache_info().misses <= 6
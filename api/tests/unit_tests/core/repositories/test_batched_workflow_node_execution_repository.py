@@ -0,0 +1,143 @@
+"""Unit tests for the write-behind workflow node execution repository."""
+
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.repositories.batched_workflow_node_execution_repository import BatchedWorkflowNodeExecutionRepository
+from core.workflow.entities.workflow_node_execution import (
+    WorkflowNodeExecution,
+    WorkflowNodeExecutionStatus,
+)
+from core.workflow.enums import NodeType
+from libs.datetime_utils import naive_utc_now
+from models import Account, WorkflowNodeExecutionTriggeredFrom
+from models.workflow import WorkflowNodeExecutionModel, WorkflowNodeExecutionOffload
+
+_WORKFLOW_RUN_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    WorkflowNodeExecutionModel.__table__.create(engine)
+    WorkflowNodeExecutionOffload.__table__.create(engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _create_repository(session_factory, **kwargs) -> BatchedWorkflowNodeExecutionRepository:
+    user = Mock(spec=Account)
+    user.id = "00000000-0000-0000-0000-00000000000a"
+    user.current_tenant_id = "00000000-0000-0000-0000-00000000000b"
+    kwargs.setdefault("flush_interval", 60.0)
+    return BatchedWorkflowNodeExecutionRepository(
+        session_factory=session_factory,
+        user=user,
+        app_id="00000000-0000-0000-0000-00000000000c",
+        triggered_from=WorkflowNodeExecutionTriggeredFrom.WORKFLOW_RUN,
+        **kwargs,
+    )
+
+
+def _create_execution(index: int) -> WorkflowNodeExecution:
+    return WorkflowNodeExecution(
+        id=f"00000000-0000-0000-0001-{index:012d}",
+        node_execution_id=f"node-execution-{index}",
+        workflow_id="00000000-0000-0000-0000-00000000000d",
+        workflow_execution_id=_WORKFLOW_RUN_ID,
+        index=index,
+        node_id=f"node-{index}",
+        node_type=NodeType.CODE,
+        title=f"Node {index}",
+        status=WorkflowNodeExecutionStatus.RUNNING,
+        created_at=naive_utc_now(),
+    )
+
+
+def _complete(execution: WorkflowNodeExecution) -> None:
+    execution.status = WorkflowNodeExecutionStatus.SUCCEEDED
+    execution.inputs = {"value": execution.index}
+    execution.outputs = {"result": execution.index * 2}
+    execution.finished_at = naive_utc_now()
+    execution.elapsed_time = 0.5
+
+
+def _stored_rows(session_factory) -> dict[str, WorkflowNodeExecutionModel]:
+    with session_factory() as session:
+        return {model.id: model for model in session.scalars(select(WorkflowNodeExecutionModel))}
+
+
+def test_changes_are_coalesced_into_one_write(session_factory):
+    repository = _create_repository(session_factory)
+    executions = [_create_execution(i) for i in range(20)]
+    for execution in executions:
+        repository.save(execution)
+        _complete(execution)
+        repository.save(execution)
+        repository.save_execution_data(execution)
+
+    assert _stored_rows(session_factory) == {}
+
+    repository.flush()
+
+    rows = _stored_rows(session_factory)
+    assert repository.flush_count == 1
+    assert len(rows) == 20
+    row = rows[executions[3].id]
+    assert row.status == WorkflowNodeExecutionStatus.SUCCEEDED
+    assert json.loads(row.inputs) == {"value": 3}
+    assert json.loads(row.outputs) == {"result": 6}
+
+
+def test_save_keeps_stored_execution_data(session_factory):
+    repository = _create_repository(session_factory)
+    execution = _create_execution(1)
+    _complete(execution)
+    repository.save_execution_data(execution)
+    repository.flush()
+
+    # a later status-only update, e.g. when the run fails, keeps the stored data
+    execution.outputs = None
+    execution.status = WorkflowNodeExecutionStatus.FAILED
+    repository.save(execution)
+    repository.flush()
+
+    row = _stored_rows(session_factory)[execution.id]
+    assert row.status == WorkflowNodeExecutionStatus.FAILED
+    assert json.loads(row.outputs) == {"result": 2}
+    assert repository.flush_count == 2
+
+
+def test_full_batch_is_written_immediately(session_factory):
+    repository = _create_repository(session_factory, batch_size=5)
+    for i in range(12):
+        repository.save(_create_execution(i))
+
+    assert repository.flush_count == 2
+    assert len(_stored_rows(session_factory)) == 10
+
+
+def test_buffer_is_written_after_interval(session_factory):
+    repository = _create_repository(session_factory, flush_interval=0.05)
+    repository.save(_create_execution(1))
+
+    deadline = time.monotonic() + 5
+    while repository.flush_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(_stored_rows(session_factory)) == 1
+
+
+def test_reads_see_buffered_changes(session_factory):
+    repository = _create_repository(session_factory)
+    for i in range(3):
+        repository.save(_create_execution(i))
+
+    executions = repository.get_by_workflow_run(_WORKFLOW_RUN_ID)
+
+    assert sorted(execution.index for execution in executions) == [0, 1, 2]
@@ -11,6 +11,7 @@ import pytest
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+from core.repositories import BatchedWorkflowNodeExecutionRepository, SQLAlchemyWorkflowNodeExecutionRepository
 from core.repositories.factory import DifyCoreRepositoryFactory, RepositoryImportError
 from core.workflow.repositories.workflow_execution_repository import WorkflowExecutionRepository
 from core.workflow.repositories.workflow_node_execution_repository import WorkflowNodeExecutionRepository
@@ -202,6 +203,29 @@ class TestRepositoryFactory:
                 )
             assert "Failed to create WorkflowNodeExecutionRepository" in str(exc_info.value)
 
+    @patch("core.repositories.factory.dify_config")
+    def test_create_batched_workflow_node_execution_repository_for_single_step(self, mock_config):
+        """Test single-step runs get a repository writing immediately when the batched one is configured."""
+        mock_config.CORE_WORKFLOW_NODE_EXECUTION_REPOSITORY = (
+            "core.repositories.batched_workflow_node_execution_repository.BatchedWorkflowNodeExecutionRepository"
+        )
+        mock_user = MagicMock(spec=Account)
+        mock_user.id = "test-user-id"
+        mock_user.current_tenant_id = "test-tenant-id"
+
+        def create(triggered_from):
+            return DifyCoreRepositoryFactory.create_workflow_node_execution_repository(
+                session_factory=MagicMock(spec=sessionmaker),
+                user=mock_user,
+                app_id="test-app-id",
+                triggered_from=triggered_from,
+            )
+
+        single_step_repository = create(WorkflowNodeExecutionTriggeredFrom.SINGLE_STEP)
+        assert type(single_step_repository) is SQLAlchemyWorkflowNodeExecutionRepository
+        workflow_run_repository = create(WorkflowNodeExecutionTriggeredFrom.WORKFLOW_RUN)
+        assert isinstance(workflow_run_repository, BatchedWorkflowNodeExecutionRepository)
+
     def test_repository_import_error_exception(self):
         """Test RepositoryImportError exception handling."""
         error_message = "Custom error message"
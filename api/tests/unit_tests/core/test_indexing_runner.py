@@ -0,0 +1,130 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.indexing_runner import DocumentIsPausedError, IndexingRunner
+from core.rag.index_processor.processor.parent_child_index_processor import ParentChildIndexProcessor
+from core.rag.index_processor.processor.qa_index_processor import QAIndexProcessor
+from core.rag.models.document import Document
+
+
+@pytest.fixture
+def runner(mocker):
+    mocker.patch("core.indexing_runner.ModelManager")
+    mocker.patch("core.indexing_runner.db")
+    mocker.patch("core.indexing_runner.DatasetDocumentStore")
+    mocker.patch.object(IndexingRunner, "_get_extract_setting", return_value=MagicMock())
+    return IndexingRunner()
+
+
+@pytest.fixture
+def dataset_document():
+    dataset_document = MagicMock()
+    dataset_document.id = "document-id"
+    dataset_document.dataset_id = "dataset-id"
+    dataset_document.data_source_type = "upload_file"
+    dataset_document.doc_form = "text_model"
+    return dataset_document
+
+
+def test_run_pipeline_indexes_batches_while_extracting(mocker, runner, dataset_document):
+    mocker.patch("core.indexing_runner.dify_config.INDEXING_PIPELINE_BATCH_SIZE", 2)
+    mocker.patch("core.indexing_runner.dify_config.INDEXING_PIPELINE_MAX_PENDING_BATCHES", 1)
+    events = []
+    statuses = []
+    mocker.patch.object(
+        IndexingRunner,
+        "_update_document_index_status",
+        side_effect=lambda document_id, after_indexing_status, extra_update_params=None: statuses.append(
+            after_indexing_status
+        ),
+    )
+
+    def process_chunk(flask_app, index_processor, chunk_documents, dataset, dataset_document, model_instance):
+        events.append(f"index {[document.page_content for document in chunk_documents]}")
+        return len(chunk_documents)
+
+    mocker.patch.object(runner, "_process_chunk", side_effect=process_chunk)
+
+    def lazy_extract(extract_setting, **kwargs):
+        for page in range(5):
+            events.append(f"extract {page}")
+            yield Document(page_content=f"page {page}", metadata={})
+
+    index_processor = MagicMock()
+    index_processor.lazy_extract.side_effect = lazy_extract
+    index_processor.transform.side_effect = lambda documents, **kwargs: [
+        Document(page_content=document.page_content, metadata={"doc_id": document.page_content})
+        for document in documents
+    ]
+    dataset = MagicMock()
+    dataset.indexing_technique = "high_quality"
+
+    runner._run_pipeline(index_processor, dataset, dataset_document, {"mode": "custom"})
+
+    assert [call.args[0][0].metadata["document_id"] for call in index_processor.transform.call_args_list] == [
+        "document-id"
+    ] * 5
+    # the first batch is indexed before extraction is done
+    assert events.index("index ['page 0', 'page 1']") < events.index("extract 4")
+    assert events[-1] == "index ['page 4']"
+    assert statuses == ["splitting", "indexing", "completed"]
+
+
+def test_run_pipeline_paused_after_first_batch_is_recovered_by_splitting_again(mocker, runner, dataset_document):
+    mocker.patch("core.indexing_runner.dify_config.INDEXING_PIPELINE_BATCH_SIZE", 1)
+    statuses = []
+    mocker.patch.object(
+        IndexingRunner,
+        "_update_document_index_status",
+        side_effect=lambda document_id, after_indexing_status, extra_update_params=None: statuses.append(
+            after_indexing_status
+        ),
+    )
+    mocker.patch.object(IndexingRunner, "_check_document_paused_status", side_effect=[None, DocumentIsPausedError()])
+    mocker.patch.object(runner, "_process_chunk", return_value=1)
+    index_processor = MagicMock()
+    index_processor.lazy_extract.return_value = iter(
+        [Document(page_content=f"page {page}", metadata={}) for page in range(3)]
+    )
+    index_processor.transform.side_effect = lambda documents, **kwargs: [
+        Document(page_content=document.page_content, metadata={"doc_id": document.page_content})
+        for document in documents
+    ]
+    dataset = MagicMock()
+    dataset.indexing_technique = "high_quality"
+
+    with pytest.raises(DocumentIsPausedError):
+        runner._run_pipeline(index_processor, dataset, dataset_document, {"mode": "custom"})
+
+    # the document is still splitting, so recovery splits it again instead of completing the saved batch
+    assert statuses == ["splitting"]
+
+    mock_db = mocker.patch("core.indexing_runner.db")
+    segment = MagicMock(index_node_id="page 0")
+    mock_db.session.query.return_value.filter_by.return_value.all.return_value = [segment]
+    mocker.patch(
+        "core.indexing_runner.IndexProcessorFactory"
+    ).return_value.init_index_processor.return_value = index_processor
+    index_document = mocker.patch.object(IndexingRunner, "_index_document")
+
+    runner.run_in_splitting_status(dataset_document)
+
+    index_processor.clean.assert_called_once()
+    assert index_processor.clean.call_args.args[1] == ["page 0"]
+    mock_db.session.delete.assert_called_once_with(segment)
+    index_document.assert_called_once()
+
+
+def test_full_doc_parent_child_is_not_transformed_incrementally():
+    processor = ParentChildIndexProcessor()
+    rules = {"parent_mode": "full-doc", "subchunk_segmentation": {"separator": "\n", "max_tokens": 100}}
+
+    assert not processor.supports_incremental_transform({"mode": "hierarchical", "rules": rules})
+    assert processor.supports_incremental_transform(
+        {"mode": "hierarchical", "rules": rules | {"parent_mode": "paragraph"}}
+    )
+
+
+def test_qa_documents_are_not_transformed_incrementally():
+    assert not QAIndexProcessor().supports_incremental_transform({"mode": "custom", "rules": {}})
@@ -4,6 +4,8 @@ from core.variables.segments import (
     NoneSegment,
     StringSegment,
 )
+from core.variables.variables import StringVariable
+from core.workflow.constants import CONVERSATION_VARIABLE_NODE_ID
 from core.workflow.entities.variable_pool import VariablePool
 
 
@@ -111,3 +113,69 @@ class TestVariablePoolGetAndNestedAttribute:
         assert segment_false is not None
         assert isinstance(segment_false, BooleanSegment)
         assert segment_false.value is False
+
+
+class TestVariablePoolChild:
+    def test_child_reads_through_to_parent(self):
+        parent = VariablePool.empty()
+        parent.add(("node1", "output"), "large value")
+        child = parent.create_child()
+
+        segment = child.get(("node1", "output"))
+        assert segment is not None
+        assert segment.value == "large value"
+        # the variable is shared, not copied
+        assert segment is parent.get(("node1", "output"))
+
+    def test_child_writes_do_not_reach_parent(self):
+        parent = VariablePool.empty()
+        parent.add(("node1", "output"), "parent")
+        child = parent.create_child()
+
+        child.add(("node1", "output"), "child")
+        child.add(("iteration", "index"), 1)
+
+        assert child.get(("node1", "output")).value == "child"
+        assert parent.get(("node1", "output")).value == "parent"
+        assert parent.get(("iteration", "index")) is None
+
+    def test_child_remove_hides_parent_variable(self):
+        parent = VariablePool.empty()
+        parent.add(("node1", "a"), "a")
+        parent.add(("node1", "b"), "b")
+        parent.add(("node2", "c"), "c")
+        child = parent.create_child()
+
+        child.remove(("node1", "a"))
+        child.remove(("node2",))
+
+        assert child.get(("node1", "a")) is None
+        assert child.get(("node2", "c")) is None
+        assert set(child.get_node_variables("node1")) == {"b"}
+        assert parent.get(("node1", "a")) is not None
+        assert parent.get(("node2", "c")) is not None
+
+        child.add(("node1", "a"), "again")
+        assert child.get(("node1", "a")).value == "again"
+
+    def test_child_pins_conversation_variables(self):
+        variable = StringVariable(name="topic", value="initial")
+        parent = VariablePool(conversation_variables=[variable])
+        child = parent.create_child()
+
+        parent.add((CONVERSATION_VARIABLE_NODE_ID, "topic"), variable.model_copy(update={"value": "synced"}))
+        child.add((CONVERSATION_VARIABLE_NODE_ID, "other"), "value")
+
+        assert child.get((CONVERSATION_VARIABLE_NODE_ID, "topic")).value == "initial"
+        assert set(child.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)) == {"topic", "other"}
+        assert set(parent.get_node_variables(CONVERSATION_VARIABLE_NODE_ID)) == {"topic"}
+
+    def test_nested_children(self):
+        root = VariablePool.empty()
+        root.add(("node1", "output"), "root")
+        child = root.create_child()
+        child.add(("node2", "output"), "child")
+        grandchild = child.create_child()
+
+        assert grandchild.get(("node1", "output")).value == "root"
+        assert grandchild.get(("node2", "output")).value == "child"
@@ -0,0 +1,160 @@
+"""Unit tests for compiled graph topologies and their cache."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import yaml
+
+from core.workflow.entities import GraphInitParams, GraphRuntimeState, VariablePool
+from core.workflow.enums import NodeExecutionType, NodeState, NodeType
+from core.workflow.graph.graph import Graph
+from core.workflow.graph.graph_topology import GraphTopologyCache, graph_topology_cache
+from core.workflow.nodes.base.node import Node
+from core.workflow.nodes.iteration.iteration_node import IterationNode
+from core.workflow.system_variable import SystemVariable
+
+FIXTURES_DIR = Path(__file__).parents[4] / "fixtures" / "workflow"
+
+
+def _graph_config() -> dict[str, object]:
+    return {
+        "nodes": [
+            {"id": "start", "data": {"type": "start", "title": "Start"}},
+            {"id": "note", "type": "custom-note", "data": {"type": "", "title": "Note"}},
+            {"id": "end", "data": {"type": "end", "title": "End"}},
+        ],
+        "edges": [{"source": "start", "target": "end"}],
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clear_graph_topology_cache():
+    graph_topology_cache.clear()
+    yield
+    graph_topology_cache.clear()
+
+
+class _MockNodeFactory:
+    def __init__(self) -> None:
+        self.node_configs: list[dict[str, object]] = []
+
+    def create_node(self, node_config: dict[str, object]) -> Node:
+        self.node_configs.append(node_config)
+        node = Mock(spec=Node)
+        node.id = node_config["id"]
+        node.execution_type = NodeExecutionType.ROOT if node.id == "start" else NodeExecutionType.EXECUTABLE
+        node.state = NodeState.UNKNOWN
+        node.node_type = NodeType.START
+        return node
+
+
+def test_init_reuses_topology_for_same_cache_key(mocker):
+    compile_topology = mocker.spy(Graph, "_compile_topology")
+    graph_config = _graph_config()
+
+    first = Graph.init(graph_config=graph_config, node_factory=_MockNodeFactory(), cache_key="workflow:hash")
+    second = Graph.init(graph_config=graph_config, node_factory=_MockNodeFactory(), cache_key="workflow:hash")
+
+    assert compile_topology.call_count == 1
+    assert first.root_node.id == second.root_node.id == "start"
+    assert set(second.nodes) == {"start", "end"}
+    # edges carry per-run state and must not be shared between graph instances
+    assert first.edges["edge_0"] is not second.edges["edge_0"]
+    first.edges["edge_0"].state = NodeState.TAKEN
+    assert second.edges["edge_0"].state == NodeState.UNKNOWN
+
+
+def test_content_key_shares_topology_but_not_node_configs(mocker):
+    compile_topology = mocker.spy(Graph, "_compile_topology")
+    first_config, second_config = _graph_config(), _graph_config()
+    factory = _MockNodeFactory()
+
+    Graph.init(graph_config=first_config, node_factory=_MockNodeFactory(), cache_key="workflow:hash")
+    Graph.init(graph_config=second_config, node_factory=factory, cache_key="workflow:hash")
+
+    assert compile_topology.call_count == 1
+    # nodes are created from the config of the current run
+    assert factory.node_configs[0] is second_config["nodes"][0]
+
+
+def test_graph_without_cache_key_is_not_cached(mocker):
+    compile_topology = mocker.spy(Graph, "_compile_topology")
+    graph_config = _graph_config()
+
+    Graph.init(graph_config=graph_config, node_factory=_MockNodeFactory())
+    Graph.init(graph_config=graph_config, node_factory=_MockNodeFactory())
+
+    assert compile_topology.call_count == 2
+
+
+def test_root_node_id_is_part_of_the_key():
+    graph_config = _graph_config()
+
+    def init(root_node_id=None):
+        return Graph.init(
+            graph_config=graph_config,
+            node_factory=_MockNodeFactory(),
+            root_node_id=root_node_id,
+            cache_key="workflow:hash",
+        )
+
+    assert init().root_node.id == "start"
+    assert init(root_node_id="end").root_node.id == "end"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = GraphTopologyCache(max_size=1)
+    first_config = _graph_config()
+    compiled: list[str] = []
+
+    def compiler(name):
+        def compile_topology():
+            compiled.append(name)
+            return Graph._compile_topology(first_config)
+
+        return compile_topology
+
+    cache.get_or_compile("first", None, compiler("first"))
+    cache.get_or_compile("second", None, compiler("second"))
+    cache.get_or_compile("first", None, compiler("first"))
+
+    assert compiled == ["first", "second", "first"]
+
+
+def test_iteration_sub_graph_is_cached_under_the_workflow_cache_key(mocker):
+    compile_topology = mocker.spy(Graph, "_compile_topology")
+    fixture = yaml.safe_load((FIXTURES_DIR / "array_iteration_formatting_workflow.yml").read_text())
+    graph_config = fixture["workflow"]["graph"]
+    node_config = next(node for node in graph_config["nodes"] if node["data"]["type"] == "iteration")
+
+    def create_iteration_node() -> IterationNode:
+        graph_init_params = GraphInitParams(
+            tenant_id="tenant",
+            app_id="app",
+            workflow_id="workflow",
+            graph_config=graph_config,
+            user_id="user",
+            user_from="account",
+            invoke_from="debugger",
+            call_depth=0,
+            graph_cache_key="workflow:hash",
+        )
+        graph_runtime_state = GraphRuntimeState(
+            variable_pool=VariablePool(system_variables=SystemVariable.empty(), user_inputs={}), start_at=0
+        )
+        node = IterationNode(
+            id="iteration",
+            config=node_config,
+            graph_init_params=graph_init_params,
+            graph_runtime_state=graph_runtime_state,
+        )
+        node.init_node_data(node_config["data"])
+        return node
+
+    # the iterations of two runs of the same workflow share the compiled sub-graph
+    create_iteration_node()._create_graph_engine(0, 1)
+    create_iteration_node()._create_graph_engine(0, 1)
+
+    assert compile_topology.call_count == 1
+    assert list(graph_topology_cache._entries) == [("workflow:hash", node_config["data"]["start_node_id"])]
@@ -0,0 +1,47 @@
+"""Tests for checkpoint store implementations."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.workflow.graph_engine.checkpoint import FileCheckpointStore, InMemoryCheckpointStore, RedisCheckpointStore
+
+
+@pytest.fixture(params=["in_memory", "file"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(tmp_path / "checkpoints")
+    return InMemoryCheckpointStore()
+
+
+def test_save_merges_sections(store):
+    assert store.load("run/1") is None
+
+    store.save("run/1", {"runtime": "{}", "variables:node_1": '{"a": 1}'})
+    store.save("run/1", {"variables:node_1": '{"a": 2}', "variables:node_2": "{}"})
+
+    assert store.load("run/1") == {"runtime": "{}", "variables:node_1": '{"a": 2}', "variables:node_2": "{}"}
+    assert store.load("run/2") is None
+
+    store.delete("run/1")
+    assert store.load("run/1") is None
+
+
+def test_redis_store_uses_one_hash_per_run():
+    mock_redis = MagicMock()
+    mock_pipe = MagicMock()
+    mock_redis.pipeline.return_value.__enter__ = MagicMock(return_value=mock_pipe)
+    mock_redis.pipeline.return_value.__exit__ = MagicMock(return_value=None)
+    store = RedisCheckpointStore(mock_redis, ttl=60)
+
+    store.save("run-1", {"runtime": "{}"})
+    mock_pipe.hset.assert_called_once_with("workflow_checkpoint:run-1", mapping={"runtime": "{}"})
+    mock_pipe.expire.assert_called_once_with("workflow_checkpoint:run-1", 60)
+
+    mock_redis.hgetall.return_value = {b"runtime": b"{}"}
+    assert store.load("run-1") == {"runtime": "{}"}
+    mock_redis.hgetall.return_value = {}
+    assert store.load("run-1") is None
+
+    store.delete("run-1")
+    mock_redis.delete.assert_called_once_with("workflow_checkpoint:run-1")
@@ -0,0 +1,96 @@
+"""Tests for the graph engine event manager."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from core.workflow.graph_engine.event_management.event_manager import EventManager
+from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_events import GraphEngineEvent, GraphRunStartedEvent
+
+
+class _RecordingLayer(GraphEngineLayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[GraphEngineEvent] = []
+
+    def on_graph_start(self) -> None:
+        pass
+
+    def on_event(self, event: GraphEngineEvent) -> None:
+        self.events.append(event)
+
+    def on_graph_end(self, error: Exception | None) -> None:
+        pass
+
+
+def test_emit_events_yields_collected_events_until_complete() -> None:
+    manager = EventManager()
+    layer = _RecordingLayer()
+    manager.set_layers([layer])
+    events = [GraphRunStartedEvent() for _ in range(100)]
+
+    def produce() -> None:
+        for event in events:
+            manager.collect(event)
+        manager.mark_complete()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    emitted = list(manager.emit_events())
+    producer.join()
+
+    assert emitted == events
+    assert layer.events == events
+    # consumed events are released from the buffer
+    assert len(manager._events) == 0
+
+
+def test_collect_blocks_while_buffer_is_full() -> None:
+    manager = EventManager(max_buffered_events=2)
+    generator = manager.emit_events()
+    manager.collect(GraphRunStartedEvent())
+    first = next(generator)
+    assert isinstance(first, GraphRunStartedEvent)
+
+    collected: list[int] = []
+
+    def produce() -> None:
+        for i in range(5):
+            manager.collect(GraphRunStartedEvent())
+            collected.append(i)
+        manager.mark_complete()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    time.sleep(0.1)
+    # the producer is blocked until the consumer drains the buffer
+    assert len(collected) == 2
+
+    assert len(list(generator)) == 5
+    producer.join(timeout=1)
+    assert len(collected) == 5
+
+
+def test_collect_without_consumer_does_not_block() -> None:
+    manager = EventManager(max_buffered_events=1)
+    for _ in range(3):
+        manager.collect(GraphRunStartedEvent())
+    manager.mark_complete()
+
+    assert len(list(manager.emit_events())) == 3
+
+
+def test_closing_consumer_releases_blocked_producer() -> None:
+    manager = EventManager(max_buffered_events=1)
+    generator = manager.emit_events()
+    manager.collect(GraphRunStartedEvent())
+    next(generator)
+
+    producer = threading.Thread(target=lambda: [manager.collect(GraphRunStartedEvent()) for _ in range(3)])
+    producer.start()
+    generator.close()
+    producer.join(timeout=1)
+
+    assert not producer.is_alive()
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from core.model_runtime.entities.llm_entities import LLMUsage
+from core.workflow.enums import NodeType
+from core.workflow.graph_engine.layers import ProfilingLayer
+from core.workflow.graph_events import (
+    NodeRunStartedEvent,
+    NodeRunStreamChunkEvent,
+    NodeRunSucceededEvent,
+)
+from core.workflow.node_events import NodeRunResult
+from libs.datetime_utils import naive_utc_now
+
+
+def _started(execution_id: str, node_id: str, node_type: NodeType = NodeType.CODE, **kwargs) -> NodeRunStartedEvent:
+    return NodeRunStartedEvent(
+        id=execution_id,
+        node_id=node_id,
+        node_type=node_type,
+        node_title=node_id.title(),
+        start_at=naive_utc_now() - timedelta(seconds=1),
+        **kwargs,
+    )
+
+
+def _succeeded(execution_id: str, node_id: str, node_type: NodeType = NodeType.CODE, **kwargs) -> NodeRunSucceededEvent:
+    return NodeRunSucceededEvent(
+        id=execution_id, node_id=node_id, node_type=node_type, start_at=naive_utc_now(), **kwargs
+    )
+
+
+def test_profiles_node_executions_into_a_flamegraph():
+    profiles = []
+    layer = ProfilingLayer(export_spans=False, on_profile=profiles.append)
+    layer.on_graph_start()
+
+    layer.on_node_enqueued("llm")
+    layer.on_event_handled(_started("e1", "llm", NodeType.LLM), 0.001)
+    chunk = NodeRunStreamChunkEvent(id="e1", node_id="llm", node_type=NodeType.LLM, selector=["llm", "text"], chunk="a")
+    layer.on_event_handled(chunk, 0.001)
+    result = NodeRunResult(
+        inputs={"query": "hello"},
+        outputs={"text": "hello world"},
+        llm_usage=LLMUsage.empty_usage().model_copy(
+            update={"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10, "latency": 0.5}
+        ),
+    )
+    layer.on_event_handled(_succeeded("e1", "llm", NodeType.LLM, node_run_result=result), 0.002)
+
+    layer.on_event_handled(_started("e2", "iteration", NodeType.ITERATION), 0.001)
+    for index in range(3):
+        execution_id = f"inner-{index}"
+        layer.on_event_handled(_started(execution_id, "code", in_iteration_id="iteration"), 0.001)
+        layer.on_event_handled(_succeeded(execution_id, "code", in_iteration_id="iteration"), 0.001)
+    layer.on_event_handled(_succeeded("e2", "iteration", NodeType.ITERATION), 0.001)
+    layer.on_graph_end(None)
+
+    llm = layer.executions["e1"]
+    assert llm.queue_wait is not None
+    assert llm.execution_time is not None
+    assert llm.execution_time >= 0.9
+    assert llm.event_count == 3
+    assert llm.first_chunk_latency is not None
+    assert (llm.prompt_tokens, llm.completion_tokens, llm.llm_latency) == (7, 3, 0.5)
+    assert llm.variable_read_bytes == len('{"query": "hello"}')
+    assert llm.variable_write_bytes == len('{"text": "hello world"}')
+
+    (flamegraph,) = profiles
+    llm_frame, iteration_frame = flamegraph["children"]
+    assert llm_frame["name"] == "Llm (llm)"
+    assert llm_frame["data"]["prompt_tokens"] == 7
+    # the executions of a node in an iteration are merged into one frame under the iteration
+    (code_frame,) = iteration_frame["children"]
+    assert code_frame["data"]["executions"] == 3
+    assert code_frame["value"] >= 2900
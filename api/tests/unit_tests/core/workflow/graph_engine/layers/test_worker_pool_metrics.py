@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from core.workflow.enums import NodeType
+from core.workflow.graph_engine.layers import WorkerPoolMetricsLayer
+from core.workflow.graph_engine.worker_management import SharedWorkerPool
+from core.workflow.graph_events import NodeRunFailedEvent, NodeRunStartedEvent, NodeRunSucceededEvent
+
+
+def _started(execution_id: str) -> NodeRunStartedEvent:
+    return NodeRunStartedEvent(
+        id=execution_id,
+        node_id=f"node_{execution_id}",
+        node_type=NodeType.CODE,
+        node_title="Code",
+        start_at=datetime.now(),
+    )
+
+
+def _succeeded(execution_id: str) -> NodeRunSucceededEvent:
+    return NodeRunSucceededEvent(
+        id=execution_id,
+        node_id=f"node_{execution_id}",
+        node_type=NodeType.CODE,
+        start_at=datetime.now(),
+    )
+
+
+def _failed(execution_id: str) -> NodeRunFailedEvent:
+    return NodeRunFailedEvent(
+        id=execution_id,
+        node_id=f"node_{execution_id}",
+        node_type=NodeType.CODE,
+        start_at=datetime.now(),
+        error="boom",
+    )
+
+
+def test_tracks_peak_concurrency():
+    layer = WorkerPoolMetricsLayer(pool=SharedWorkerPool(max_workers=4, idle_timeout=1.0))
+    layer.on_graph_start()
+    for event in [_started("a"), _started("b"), _succeeded("a"), _started("c"), _failed("b"), _succeeded("c")]:
+        layer.on_event(event)
+    layer.on_graph_end(None)
+
+    metrics = layer.metrics
+    assert metrics["nodes_started"] == 3
+    assert metrics["peak_concurrency"] == 2
+    assert metrics["duration"] is not None
+    assert metrics["pool_max_workers"] == 4
+    assert metrics["peak_pool_threads"] == 0
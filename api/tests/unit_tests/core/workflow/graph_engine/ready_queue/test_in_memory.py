@@ -0,0 +1,71 @@
+"""Tests for the in-memory ready queue."""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue, create_ready_queue_from_state
+from core.workflow.graph_engine.ready_queue.protocol import ReadyQueueState
+
+
+def test_get_returns_items_in_order() -> None:
+    ready_queue = InMemoryReadyQueue()
+    ready_queue.put("a")
+    ready_queue.put("b")
+
+    assert ready_queue.qsize() == 2
+    assert ready_queue.get() == "a"
+    assert ready_queue.get(timeout=0.1) == "b"
+    assert ready_queue.empty()
+    with pytest.raises(queue.Empty):
+        ready_queue.get(timeout=0.01)
+
+
+def test_blocked_get_is_woken_by_put() -> None:
+    ready_queue = InMemoryReadyQueue()
+    received: list[str] = []
+    consumer = threading.Thread(target=lambda: received.append(ready_queue.get(timeout=5)))
+    consumer.start()
+
+    time.sleep(0.05)
+    ready_queue.put("node")
+    consumer.join(timeout=1)
+
+    assert received == ["node"]
+
+
+def test_interrupt_wakes_blocked_get() -> None:
+    ready_queue = InMemoryReadyQueue()
+    errors: list[Exception] = []
+
+    def consume() -> None:
+        try:
+            ready_queue.get()
+        except queue.Empty as e:
+            errors.append(e)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    time.sleep(0.05)
+    ready_queue.interrupt()
+    consumer.join(timeout=1)
+
+    assert not consumer.is_alive()
+    assert len(errors) == 1
+
+
+def test_dumps_and_loads_round_trip() -> None:
+    ready_queue = InMemoryReadyQueue()
+    for node_id in ("a", "b", "c"):
+        ready_queue.put(node_id)
+    assert ready_queue.get() == "a"
+
+    restored = create_ready_queue_from_state(ReadyQueueState.model_validate_json(ready_queue.dumps()))
+
+    assert restored.qsize() == 2
+    assert restored.get() == "b"
+    assert restored.get() == "c"
+    # the original queue is left untouched
+    assert ready_queue.qsize() == 2
@@ -0,0 +1,114 @@
+"""Tests for the priority and fair-share ready queue."""
+
+from unittest.mock import Mock
+
+from core.workflow.enums import NodeType
+from core.workflow.graph import Edge, Graph
+from core.workflow.graph_engine.ready_queue import (
+    PriorityReadyQueue,
+    ReadyQueueState,
+    create_ready_queue_from_state,
+)
+from core.workflow.graph_engine.ready_queue.priority import compute_node_groups, compute_node_priorities
+from core.workflow.nodes.base.node import Node
+
+
+def _build_graph(node_types: dict[str, NodeType], connections: list[tuple[str, str]]) -> Graph:
+    nodes: dict[str, Node] = {}
+    for node_id, node_type in node_types.items():
+        node = Mock(spec=Node)
+        node.id = node_id
+        node.node_type = node_type
+        nodes[node_id] = node
+
+    edges: dict[str, Edge] = {}
+    in_edges: dict[str, list[str]] = {}
+    out_edges: dict[str, list[str]] = {}
+    for index, (tail, head) in enumerate(connections):
+        edge = Edge(id=f"edge_{index}", tail=tail, head=head)
+        edges[edge.id] = edge
+        out_edges.setdefault(tail, []).append(edge.id)
+        in_edges.setdefault(head, []).append(edge.id)
+
+    return Graph(nodes=nodes, edges=edges, in_edges=in_edges, out_edges=out_edges, root_node=nodes["start"])
+
+
+def _parallel_graph() -> Graph:
+    # start -> llm -> answer
+    #       -> tool_1 -> tool_2 -> tool_3
+    return _build_graph(
+        {
+            "start": NodeType.START,
+            "llm": NodeType.LLM,
+            "answer": NodeType.ANSWER,
+            "tool_1": NodeType.TOOL,
+            "tool_2": NodeType.TOOL,
+            "tool_3": NodeType.TOOL,
+        },
+        [
+            ("start", "llm"),
+            ("llm", "answer"),
+            ("start", "tool_1"),
+            ("tool_1", "tool_2"),
+            ("tool_2", "tool_3"),
+        ],
+    )
+
+
+def test_compute_priorities_and_groups() -> None:
+    graph = _parallel_graph()
+
+    priorities = compute_node_priorities(graph)
+    assert priorities["answer"] == 0
+    assert priorities["llm"] == 1
+    assert priorities["start"] == 2
+    # nodes that never reach a response node come last
+    assert priorities["tool_1"] == len(graph.nodes)
+
+    groups = compute_node_groups(graph)
+    assert groups["start"] == "start"
+    assert groups["llm"] == groups["answer"] == "llm"
+    assert groups["tool_1"] == groups["tool_2"] == groups["tool_3"] == "tool_1"
+
+
+def test_critical_path_is_served_first() -> None:
+    queue = PriorityReadyQueue(node_priorities={"tool": 5, "llm": 1}, node_groups={"tool": "a", "llm": "a"})
+    queue.put("tool")
+    queue.put("llm")
+
+    assert queue.get(timeout=0) == "llm"
+    assert queue.get(timeout=0) == "tool"
+
+
+def test_branches_share_workers_fairly() -> None:
+    priorities = {f"tool_{i}": 10 for i in range(100)} | {"llm": 1, "answer": 0}
+    groups = {f"tool_{i}": "tools" for i in range(100)} | {"llm": "llm", "answer": "llm"}
+    queue = PriorityReadyQueue(node_priorities=priorities, node_groups=groups)
+    for i in range(100):
+        queue.put(f"tool_{i}")
+    assert [queue.get(timeout=0) for _ in range(3)] == ["tool_0", "tool_1", "tool_2"]
+
+    # a branch becoming ready late is not queued behind the backlog of another branch
+    queue.put("llm")
+    assert queue.get(timeout=0) == "llm"
+    # and afterwards the branches take turns
+    queue.put("answer")
+    assert [queue.get(timeout=0) for _ in range(3)] == ["tool_3", "answer", "tool_4"]
+
+
+def test_dumps_and_loads_round_trip() -> None:
+    queue = PriorityReadyQueue.from_graph(_parallel_graph())
+    for node_id in ["tool_1", "llm", "tool_2"]:
+        queue.put(node_id)
+    assert queue.get(timeout=0) == "llm"
+
+    state = ReadyQueueState.model_validate_json(queue.dumps())
+    assert state.type == "PriorityReadyQueue"
+    assert list(state.items) == ["tool_1", "tool_2"]
+
+    restored = create_ready_queue_from_state(state)
+    assert isinstance(restored, PriorityReadyQueue)
+    assert restored.qsize() == 2
+    # the service of each branch is restored, the tool branch has not been served yet
+    restored.put("answer")
+    assert [restored.get(timeout=0) for _ in range(3)] == ["tool_1", "answer", "tool_2"]
@@ -0,0 +1,78 @@
+"""Tests for checkpointing a graph engine run and resuming it."""
+
+from collections.abc import Mapping
+
+from core.workflow.graph_engine import GraphEngine
+from core.workflow.graph_engine.checkpoint import InMemoryCheckpointStore, restore_checkpoint
+from core.workflow.graph_engine.command_channels import InMemoryChannel
+from core.workflow.graph_engine.layers import CheckpointLayer
+from core.workflow.graph_events import GraphRunSucceededEvent, NodeRunStartedEvent
+
+from .test_table_runner import WorkflowRunner
+
+_FIXTURE = "conditional_hello_branching_workflow"
+_START_NODE_ID = "1754154032319"
+_IF_ELSE_NODE_ID = "1754217359748"
+
+
+class _RecordingStore(InMemoryCheckpointStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.saves: list[dict[str, str]] = []
+        self.history: list[dict[str, str]] = []
+
+    def save(self, run_id: str, sections: Mapping[str, str]) -> None:
+        super().save(run_id, sections)
+        self.saves.append(dict(sections))
+        self.history.append(self.load(run_id) or {})
+
+
+def _create_engine(runner: WorkflowRunner, checkpoint: Mapping[str, str] | None = None):
+    fixture_data = runner.load_fixture(_FIXTURE)
+    graph, graph_runtime_state = runner.create_graph_from_fixture(fixture_data, inputs={"query": "hello world"})
+    if checkpoint is not None:
+        restore_checkpoint(checkpoint, graph_runtime_state)
+    engine = GraphEngine(
+        workflow_id="test_workflow",
+        graph=graph,
+        graph_runtime_state=graph_runtime_state,
+        command_channel=InMemoryChannel(),
+    )
+    return engine
+
+
+def test_checkpoints_are_incremental_and_deleted_on_success():
+    runner = WorkflowRunner()
+    store = _RecordingStore()
+    engine = _create_engine(runner)
+    layer = CheckpointLayer(store=store, run_id="run-1", interval=0)
+    engine.layer(layer)
+
+    events = list(engine.run())
+
+    assert isinstance(events[-1], GraphRunSucceededEvent)
+    assert layer.checkpoint_count == len(store.saves) >= 2
+    # the first checkpoint has all variables, later ones only those of newly completed nodes
+    assert "variables:sys" in store.saves[0]
+    assert f"variables:{_START_NODE_ID}" in store.saves[0]
+    assert all("variables:sys" not in sections for sections in store.saves[1:])
+    assert all(f"variables:{_START_NODE_ID}" not in sections for sections in store.saves[1:])
+    assert store.load("run-1") is None
+
+
+def test_resume_from_checkpoint_skips_completed_nodes():
+    runner = WorkflowRunner()
+    store = _RecordingStore()
+    engine = _create_engine(runner)
+    engine.layer(CheckpointLayer(store=store, run_id="run-1", interval=0))
+    expected_outputs = list(engine.run())[-1].outputs
+
+    # resume from the checkpoint taken after the start node, as if the process had died
+    resumed = _create_engine(runner, checkpoint=store.history[0])
+    events = list(resumed.run())
+
+    assert isinstance(events[-1], GraphRunSucceededEvent)
+    assert events[-1].outputs == expected_outputs == {"true": "hello world"}
+    started = [event.node_id for event in events if isinstance(event, NodeRunStartedEvent)]
+    assert _START_NODE_ID not in started
+    assert _IF_ELSE_NODE_ID in started
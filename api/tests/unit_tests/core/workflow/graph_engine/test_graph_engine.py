@@ -586,6 +586,90 @@ def test_layer_error_handling():
     assert events[-1].outputs == {"query": "test error handling"}
 
 
+def test_shared_worker_pool(monkeypatch):
+    """Test running a workflow on the shared worker pool."""
+    from configs import dify_config
+    from core.workflow.graph_engine.layers import WorkerPoolMetricsLayer
+
+    monkeypatch.setattr(dify_config, "GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED", True)
+
+    runner = WorkflowRunner()
+    fixture_data = runner.load_fixture("simple_passthrough_workflow")
+    graph, graph_runtime_state = runner.create_graph_from_fixture(fixture_data, inputs={"query": "shared pool"})
+
+    engine = GraphEngine(
+        workflow_id="test_workflow",
+        graph=graph,
+        graph_runtime_state=graph_runtime_state,
+        command_channel=InMemoryChannel(),
+    )
+    metrics_layer = WorkerPoolMetricsLayer()
+    engine.layer(metrics_layer)
+
+    events = list(engine.run())
+
+    assert isinstance(events[-1], GraphRunSucceededEvent)
+    assert events[-1].outputs == {"query": "shared pool"}
+    assert metrics_layer.metrics["nodes_started"] == len(graph.nodes)
+    assert metrics_layer.metrics["peak_pool_threads"] >= 1
+
+
+def test_nested_workflow_on_single_thread_shared_worker_pool(monkeypatch):
+    """Test that an iteration does not deadlock on a shared pool with a single thread."""
+    from configs import dify_config
+    from core.workflow.graph_engine.worker_management import shared_worker_pool
+
+    monkeypatch.setattr(dify_config, "GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED", True)
+    monkeypatch.setattr(dify_config, "GRAPH_ENGINE_SHARED_WORKER_POOL_SIZE", 1)
+    monkeypatch.setattr(shared_worker_pool, "_shared_worker_pool", None)
+
+    runner = TableTestRunner()
+    test_case = WorkflowTestCase(
+        fixture_path="array_iteration_formatting_workflow",
+        inputs={},
+        expected_outputs={"output": ["output: 1", "output: 2", "output: 3"]},
+        description="Iteration sub-engine runs on the same single-thread pool",
+        use_auto_mock=True,
+    )
+
+    result = runner.run_test_case(test_case)
+
+    assert result.success, f"Iteration workflow failed: {result.error}"
+    status = shared_worker_pool.get_shared_worker_pool().get_status()
+    assert status["max_workers"] == 1
+    assert status["blocked_threads"] == 0
+
+
+def test_profiling_layer():
+    """Test that the engine reports queueing and event handling to a profiling layer."""
+    from core.workflow.graph_engine.layers import ProfilingLayer
+    from core.workflow.graph_events import NodeRunStartedEvent
+
+    runner = WorkflowRunner()
+    fixture_data = runner.load_fixture("conditional_hello_branching_workflow")
+    graph, graph_runtime_state = runner.create_graph_from_fixture(fixture_data, inputs={"query": "hello world"})
+
+    engine = GraphEngine(
+        workflow_id="test_workflow",
+        graph=graph,
+        graph_runtime_state=graph_runtime_state,
+        command_channel=InMemoryChannel(),
+    )
+    profiling_layer = ProfilingLayer(export_spans=True)
+    engine.layer(profiling_layer)
+
+    events = list(engine.run())
+
+    assert isinstance(events[-1], GraphRunSucceededEvent)
+    started_node_ids = {event.node_id for event in events if isinstance(event, NodeRunStartedEvent)}
+    profiles = profiling_layer.executions.values()
+    assert {profile.node_id for profile in profiles} == started_node_ids
+    for profile in profiles:
+        assert profile.status == "succeeded"
+        assert profile.queue_wait is not None
+        assert profile.event_processing_time > 0
+
+
 def test_event_sequence_validation():
     """Test the new event sequence validation feature."""
     from core.workflow.graph_events import NodeRunStartedEvent, NodeRunStreamChunkEvent, NodeRunSucceededEvent
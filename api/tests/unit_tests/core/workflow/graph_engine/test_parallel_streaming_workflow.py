@@ -12,6 +12,7 @@ import time
 from unittest.mock import patch
 from uuid import uuid4
 
+from configs import dify_config
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.workflow.entities import GraphInitParams, GraphRuntimeState, VariablePool
 from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
@@ -60,23 +61,14 @@ def create_llm_generator_with_delay(chunks: list[str], delay: float = 0.1):
     return llm_generator
 
 
-def test_parallel_streaming_workflow():
-    """
-    Test parallel streaming workflow to verify:
-    1. All chunks from LLM 2 are output before LLM 1
-    2. At least one chunk from LLM 2 is output before LLM 1 completes (Success)
-    3. At least one chunk from LLM 1 is output before LLM 2 completes (EXPECTED TO FAIL)
-    4. All chunks are output before End begins
-    5. The final output content matches the order defined in the Answer
+LLM1_NODE_ID = "1754339718571"
+LLM2_NODE_ID = "1754339725656"
+LLM1_CHUNKS = ["Hello", ", ", "I", " ", "am", " ", "an", " ", "AI", " ", "assistant", "."]  # English (slower)
+LLM2_CHUNKS = ["你好", "，", "我", "是", "AI", "助手", "。"]  # Chinese (faster)
 
-    Test setup:
-    - LLM 1 outputs English (slower)
-    - LLM 2 outputs Chinese (faster)
-    - Both run in parallel
 
-    This test is expected to FAIL because chunks are currently buffered
-    until after node completion instead of streaming during execution.
-    """
+def _run_parallel_streaming_workflow() -> list:
+    """Run the multilingual parallel LLM workflow with mocked LLMs and return its events."""
     runner = TableTestRunner()
 
     # Load the workflow configuration
@@ -124,19 +116,15 @@ def test_parallel_streaming_workflow():
         command_channel=InMemoryChannel(),
     )
 
-    # Define LLM outputs
-    llm1_chunks = ["Hello", ", ", "I", " ", "am", " ", "an", " ", "AI", " ", "assistant", "."]  # English (slower)
-    llm2_chunks = ["你好", "，", "我", "是", "AI", "助手", "。"]  # Chinese (faster)
-
     # Create generators with different delays (LLM 2 is faster)
-    llm1_generator = create_llm_generator_with_delay(llm1_chunks, delay=0.05)  # Slower
-    llm2_generator = create_llm_generator_with_delay(llm2_chunks, delay=0.01)  # Faster
+    llm1_generator = create_llm_generator_with_delay(LLM1_CHUNKS, delay=0.05)  # Slower
+    llm2_generator = create_llm_generator_with_delay(LLM2_CHUNKS, delay=0.01)  # Faster
 
     # Track which LLM node is being called
     llm_call_order = []
     generators = {
-        "1754339718571": llm1_generator,  # LLM 1 node ID
-        "1754339725656": llm2_generator,  # LLM 2 node ID
+        LLM1_NODE_ID: llm1_generator,
+        LLM2_NODE_ID: llm2_generator,
     }
 
     def mock_llm_run(self):
@@ -149,7 +137,29 @@ def test_parallel_streaming_workflow():
 
     # Execute with mocked LLMs
     with patch.object(LLMNode, "_run", new=mock_llm_run):
-        events = list(engine.run())
+        return list(engine.run())
+
+
+def test_parallel_streaming_workflow(monkeypatch):
+    """
+    Test parallel streaming workflow to verify:
+    1. All chunks from LLM 2 are output before LLM 1
+    2. At least one chunk from LLM 2 is output before LLM 1 completes (Success)
+    3. At least one chunk from LLM 1 is output before LLM 2 completes (EXPECTED TO FAIL)
+    4. All chunks are output before End begins
+    5. The final output content matches the order defined in the Answer
+
+    Test setup:
+    - LLM 1 outputs English (slower)
+    - LLM 2 outputs Chinese (faster)
+    - Both run in parallel
+
+    This test is expected to FAIL because chunks are currently buffered
+    until after node completion instead of streaming during execution.
+    """
+    # the sequential assertions below rely on the per-engine pool starting with a single worker
+    monkeypatch.setattr(dify_config, "GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED", False)
+    events = _run_parallel_streaming_workflow()
 
     # Check for successful completion
     success_events = [e for e in events if isinstance(e, GraphRunSucceededEvent)]
@@ -171,11 +181,11 @@ def test_parallel_streaming_workflow():
     llm2_chunks_events = [e for e in stream_chunk_events if e.node_id == "1754339725656"]
 
     # Verify both LLMs produced chunks
-    assert len(llm1_chunks_events) == len(llm1_chunks), (
-        f"Expected {len(llm1_chunks)} chunks from LLM 1, got {len(llm1_chunks_events)}"
+    assert len(llm1_chunks_events) == len(LLM1_CHUNKS), (
+        f"Expected {len(LLM1_CHUNKS)} chunks from LLM 1, got {len(llm1_chunks_events)}"
     )
-    assert len(llm2_chunks_events) == len(llm2_chunks), (
-        f"Expected {len(llm2_chunks)} chunks from LLM 2, got {len(llm2_chunks_events)}"
+    assert len(llm2_chunks_events) == len(LLM2_CHUNKS), (
+        f"Expected {len(LLM2_CHUNKS)} chunks from LLM 2, got {len(llm2_chunks_events)}"
     )
 
     # 1. Verify chunk ordering based on actual implementation
@@ -271,3 +281,54 @@ def test_parallel_streaming_workflow():
             f"Answer content should match the order defined in Answer node. "
             f"Expected: '{expected_answer_text}', Got: '{actual_answer_text}'"
         )
+
+
+def test_parallel_streaming_workflow_with_shared_worker_pool(monkeypatch):
+    """
+    Test the intended streaming order when both LLMs run concurrently on the shared worker pool:
+    - LLM 2 streams its chunks while LLM 1 is still running
+    - LLM 1 chunks are held back until all LLM 2 chunks are out, following the Answer order
+    - All chunks are output before the Answer node starts
+    """
+    monkeypatch.setattr(dify_config, "GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED", True)
+    events = _run_parallel_streaming_workflow()
+
+    assert isinstance(events[-1], GraphRunSucceededEvent)
+
+    def index_of(event_type, node_id):
+        return next(i for i, e in enumerate(events) if isinstance(e, event_type) and e.node_id == node_id)
+
+    llm1_chunk_indices = [
+        i for i, e in enumerate(events) if isinstance(e, NodeRunStreamChunkEvent) and e.node_id == LLM1_NODE_ID
+    ]
+    llm2_chunk_indices = [
+        i for i, e in enumerate(events) if isinstance(e, NodeRunStreamChunkEvent) and e.node_id == LLM2_NODE_ID
+    ]
+    assert len(llm1_chunk_indices) == len(LLM1_CHUNKS)
+    assert len(llm2_chunk_indices) == len(LLM2_CHUNKS)
+
+    # both LLMs start before either completes
+    llm1_complete_idx = index_of(NodeRunSucceededEvent, LLM1_NODE_ID)
+    llm2_complete_idx = index_of(NodeRunSucceededEvent, LLM2_NODE_ID)
+    assert max(index_of(NodeRunStartedEvent, LLM1_NODE_ID), index_of(NodeRunStartedEvent, LLM2_NODE_ID)) < min(
+        llm1_complete_idx, llm2_complete_idx
+    )
+
+    # the faster LLM 2 streams before the slower LLM 1 completes
+    assert llm2_complete_idx < llm1_complete_idx
+    assert min(llm2_chunk_indices) < llm1_complete_idx
+
+    # chunks follow the Answer template order and precede the Answer node
+    assert max(llm2_chunk_indices) < min(llm1_chunk_indices)
+    answer_start_idx = next(
+        i for i, e in enumerate(events) if isinstance(e, NodeRunStartedEvent) and e.node_type == NodeType.ANSWER
+    )
+    assert max(llm1_chunk_indices) < answer_start_idx
+
+    answer_complete_events = [
+        e for e in events if isinstance(e, NodeRunSucceededEvent) and e.node_type == NodeType.ANSWER
+    ]
+    assert len(answer_complete_events) == 1
+    assert (
+        answer_complete_events[0].node_run_result.outputs["answer"] == "你好，我是AI助手。Hello, I am an AI assistant."
+    )
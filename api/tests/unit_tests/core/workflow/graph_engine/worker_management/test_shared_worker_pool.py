@@ -0,0 +1,204 @@
+"""Tests for the worker pool shared between graph engine runs."""
+
+import contextvars
+import queue
+import threading
+import time
+from unittest.mock import Mock
+
+from core.workflow.enums import NodeType
+from core.workflow.graph import Graph
+from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue
+from core.workflow.graph_engine.worker_management import SharedWorkerPool, SharedWorkerPoolRun
+from core.workflow.nodes.base.node import Node
+
+
+class _ConcurrencyProbe:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self) -> None:
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *args: object) -> None:
+        with self._lock:
+            self.current -= 1
+
+
+def _make_node(node_id: str, run, node_type: NodeType = NodeType.CODE) -> Node:
+    node = Mock(spec=Node)
+    node.id = node_id
+    node.node_type = node_type
+    node.run.side_effect = run
+    return node
+
+
+def _sleeping_node(node_id: str, probe: _ConcurrencyProbe, duration: float = 0.05) -> Node:
+    def run():
+        with probe:
+            time.sleep(duration)
+        yield node_id
+
+    return _make_node(node_id, run)
+
+
+def _register(
+    pool: SharedWorkerPool, nodes: list[Node], max_concurrency: int
+) -> tuple[SharedWorkerPoolRun, queue.Queue]:
+    graph = Mock(spec=Graph)
+    graph.nodes = {node.id: node for node in nodes}
+    event_queue: queue.Queue = queue.Queue()
+    run = pool.register(
+        ready_queue=InMemoryReadyQueue(),
+        event_queue=event_queue,
+        graph=graph,
+        max_concurrency=max_concurrency,
+    )
+    return run, event_queue
+
+
+def _enqueue(run: SharedWorkerPoolRun, node_id: str) -> None:
+    run._ready_queue.put(node_id)
+    run.notify(node_id)
+
+
+def _collect(event_queue: queue.Queue, count: int, timeout: float = 5.0) -> set:
+    return {event_queue.get(timeout=timeout) for _ in range(count)}
+
+
+def test_run_concurrency_is_capped():
+    pool = SharedWorkerPool(max_workers=10, idle_timeout=1.0)
+    probe = _ConcurrencyProbe()
+    nodes = [_sleeping_node(f"node_{i}", probe) for i in range(6)]
+    run, event_queue = _register(pool, nodes, max_concurrency=2)
+
+    run.start()
+    for node in nodes:
+        _enqueue(run, node.id)
+
+    assert _collect(event_queue, 6) == {node.id for node in nodes}
+    run.stop()
+    assert probe.peak == 2
+    assert run.get_worker_count() == 0
+
+
+def test_runs_share_bounded_threads():
+    pool = SharedWorkerPool(max_workers=3, idle_timeout=1.0)
+    probe = _ConcurrencyProbe()
+    runs = []
+    for name in ("a", "b"):
+        nodes = [_sleeping_node(f"{name}_{i}", probe) for i in range(5)]
+        run, event_queue = _register(pool, nodes, max_concurrency=10)
+        run.start()
+        for node in nodes:
+            _enqueue(run, node.id)
+        runs.append((run, event_queue, nodes))
+
+    for run, event_queue, nodes in runs:
+        assert _collect(event_queue, len(nodes)) == {node.id for node in nodes}
+        run.stop()
+
+    assert probe.peak <= 3
+    status = pool.get_status()
+    assert status["total_threads"] <= 3
+    assert status["completed_tasks"] == 10
+    assert status["active_runs"] == 0
+
+
+def test_restored_ready_queue_is_served_on_start():
+    pool = SharedWorkerPool(max_workers=2, idle_timeout=1.0)
+    probe = _ConcurrencyProbe()
+    nodes = [_sleeping_node(f"node_{i}", probe, duration=0) for i in range(3)]
+    run, event_queue = _register(pool, nodes, max_concurrency=2)
+    for node in nodes:
+        run._ready_queue.put(node.id)
+
+    run.start()
+
+    assert _collect(event_queue, 3) == {node.id for node in nodes}
+    run.stop()
+
+
+def test_nested_run_does_not_deadlock_on_a_full_pool():
+    pool = SharedWorkerPool(max_workers=1, idle_timeout=1.0)
+    child_node = _make_node("child", lambda: iter(["child"]))
+    child_run, child_events = _register(pool, [child_node], max_concurrency=1)
+
+    def run_iteration():
+        # like an iteration node, wait on this thread for a sub-run on the same pool
+        child_run.start()
+        _enqueue(child_run, "child")
+        child_events.get(timeout=5)
+        child_run.stop()
+        yield "iteration"
+
+    parent_node = _make_node("iteration", run_iteration, node_type=NodeType.ITERATION)
+    parent_run, parent_events = _register(pool, [parent_node], max_concurrency=1)
+    parent_run.start()
+    _enqueue(parent_run, "iteration")
+
+    assert parent_events.get(timeout=5) == "iteration"
+    parent_run.stop()
+    assert pool.get_status()["blocked_threads"] == 0
+
+
+def test_nested_run_on_another_thread_does_not_deadlock_on_a_full_pool():
+    pool = SharedWorkerPool(max_workers=1, idle_timeout=1.0)
+    child_node = _make_node("child", lambda: iter(["child"]))
+    child_run, child_events = _register(pool, [child_node], max_concurrency=1)
+
+    def run_nested_workflow():
+        child_run.start()
+        _enqueue(child_run, "child")
+        child_events.get(timeout=5)
+        child_run.stop()
+
+    def run_workflow_tool():
+        # like a workflow tool, run the nested workflow on a new thread with a copy of the context
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(run_nested_workflow,))
+        thread.start()
+        thread.join()
+        yield "tool"
+
+    parent_node = _make_node("tool", run_workflow_tool, node_type=NodeType.TOOL)
+    parent_run, parent_events = _register(pool, [parent_node], max_concurrency=1)
+    parent_run.start()
+    _enqueue(parent_run, "tool")
+
+    assert parent_events.get(timeout=5) == "tool"
+    parent_run.stop()
+    assert pool.get_status()["blocked_threads"] == 0
+
+
+def test_node_without_nested_run_does_not_block():
+    pool = SharedWorkerPool(max_workers=1, idle_timeout=1.0)
+
+    def run_iteration():
+        yield pool.get_status()["blocked_threads"]
+
+    run, event_queue = _register(pool, [_make_node("iteration", run_iteration, NodeType.ITERATION)], 1)
+    run.start()
+    _enqueue(run, "iteration")
+
+    assert event_queue.get(timeout=5) == 0
+    run.stop()
+
+
+def test_node_errors_are_reported_as_failed_events():
+    pool = SharedWorkerPool(max_workers=1, idle_timeout=1.0)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    run, event_queue = _register(pool, [_make_node("broken", fail)], max_concurrency=1)
+    run.start()
+    _enqueue(run, "broken")
+
+    event = event_queue.get(timeout=5)
+    run.stop()
+    assert event.error == "boom"
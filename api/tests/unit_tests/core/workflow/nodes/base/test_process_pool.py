@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from configs import dify_config
+from core.workflow.nodes.base import process_pool
+from core.workflow.nodes.base.process_pool import run_in_process_pool, shutdown_process_pool
+
+
+def test_runs_inline_when_pool_is_disabled(monkeypatch):
+    monkeypatch.setattr(dify_config, "WORKFLOW_CPU_BOUND_PROCESS_POOL_SIZE", 0)
+    calls = []
+
+    # a local function can't be pickled, so this only works inline
+    def work(value: int) -> int:
+        calls.append(value)
+        return value * 2
+
+    assert run_in_process_pool(work, 21) == 42
+    assert calls == [21]
+    assert process_pool._executor is None
+
+
+def test_runs_in_worker_process(monkeypatch):
+    monkeypatch.setattr(dify_config, "WORKFLOW_CPU_BOUND_PROCESS_POOL_SIZE", 1)
+    try:
+        assert run_in_process_pool(math.factorial, 20) == math.factorial(20)
+        assert process_pool._executor is not None
+
+        # exceptions raised in the worker process are re-raised in the caller
+        with pytest.raises(ValueError):
+            run_in_process_pool(math.factorial, -1)
+    finally:
+        shutdown_process_pool()
+
+    assert process_pool._executor is None
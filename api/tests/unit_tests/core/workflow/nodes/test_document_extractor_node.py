@@ -15,6 +15,7 @@ from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
 from core.workflow.node_events import NodeRunResult
 from core.workflow.nodes.document_extractor import DocumentExtractorNode, DocumentExtractorNodeData
 from core.workflow.nodes.document_extractor.node import (
+    _extract_text_from_content,
     _extract_text_from_docx,
     _extract_text_from_excel,
     _extract_text_from_pdf,
@@ -219,6 +220,26 @@ def test_node_type(document_extractor_node):
     assert document_extractor_node.node_type == NodeType.DOCUMENT_EXTRACTOR
 
 
+def test_text_extraction_runs_in_process_pool(document_extractor_node, mock_graph_runtime_state, monkeypatch):
+    document_extractor_node.graph_runtime_state = mock_graph_runtime_state
+    mock_file = Mock(spec=File)
+    mock_file.transfer_method = FileTransferMethod.LOCAL_FILE
+    mock_file.extension = ".txt"
+    mock_file.mime_type = "text/plain"
+    mock_graph_runtime_state.variable_pool.get.return_value = Mock(spec=ArrayFileSegment, value=[mock_file])
+    monkeypatch.setattr("core.file.file_manager.download", Mock(return_value=b"Hello"))
+    mock_run_in_process_pool = Mock(return_value="Hello")
+    monkeypatch.setattr("core.workflow.nodes.base.node.run_in_process_pool", mock_run_in_process_pool)
+
+    result = document_extractor_node._run()
+
+    assert result.outputs["text"] == ArrayStringSegment(value=["Hello"])
+    # the file is downloaded on the worker thread and only parsed in the pool
+    mock_run_in_process_pool.assert_called_once_with(
+        _extract_text_from_content, file_content=b"Hello", file_extension=".txt", mime_type="text/plain"
+    )
+
+
 @patch("pandas.ExcelFile")
 def test_extract_text_from_excel_single_sheet(mock_excel_file):
     """Test extracting text from Excel file with single sheet and multiline content."""
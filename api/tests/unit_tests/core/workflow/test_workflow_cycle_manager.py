@@ -204,7 +204,9 @@ def test_handle_workflow_run_start(workflow_cycle_manager):
     workflow_cycle_manager._workflow_execution_repository.save.assert_called_once_with(workflow_execution)
 
 
-def test_handle_workflow_run_success(workflow_cycle_manager, mock_workflow_execution_repository):
+def test_handle_workflow_run_success(
+    workflow_cycle_manager, mock_workflow_execution_repository, mock_node_execution_repository
+):
     """Test handle_workflow_run_success method"""
     # Create a real WorkflowExecution
 
@@ -236,6 +238,8 @@ def test_handle_workflow_run_success(workflow_cycle_manager, mock_workflow_execu
     assert result.total_tokens == 100
     assert result.total_steps == 5
     assert result.finished_at is not None
+    # node executions are durable before the workflow execution is completed
+    mock_node_execution_repository.flush.assert_called_once()
 
 
 def test_handle_workflow_run_failed(workflow_cycle_manager, mock_workflow_execution_repository):
@@ -1,9 +1,17 @@
 from unittest.mock import MagicMock
 
 import pytest
-
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+
+from core.workflow.entities import WorkflowNodeExecution
+from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
+from libs.datetime_utils import naive_utc_now
+from models.account import Account
 from models.model import App
-from models.workflow import Workflow
+from models.workflow import Workflow, WorkflowNodeExecutionModel, WorkflowNodeExecutionOffload
 from services.workflow_service import WorkflowService
 
 
@@ -161,3 +169,55 @@ class TestWorkflowService:
         assert workflows == []
         assert has_more is False
         mock_session.scalars.assert_called_once()
+
+
+def test_run_draft_workflow_node_with_batched_node_execution_repository(mocker):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        # without indexes, mocks specced on the model re-evaluate its __table_args__ and duplicate them
+        connection.execute(CreateTable(WorkflowNodeExecutionModel.__table__))
+        connection.execute(CreateTable(WorkflowNodeExecutionOffload.__table__))
+    mocker.patch("services.workflow_service.db", engine=engine)
+    mocker.patch(
+        "core.repositories.factory.dify_config.CORE_WORKFLOW_NODE_EXECUTION_REPOSITORY",
+        "core.repositories.batched_workflow_node_execution_repository.BatchedWorkflowNodeExecutionRepository",
+    )
+    mocker.patch("services.workflow_service.WorkflowDraftVariableService")
+    mocker.patch("services.workflow_service.DraftVarLoader")
+    mocker.patch("services.workflow_service.DraftVariableSaver")
+    mocker.patch("services.workflow_service.WorkflowEntry.single_step_run")
+    node_execution = WorkflowNodeExecution(
+        id="00000000-0000-0000-0000-000000000001",
+        node_execution_id="node-execution-id",
+        workflow_id="",
+        index=1,
+        node_id="code",
+        node_type=NodeType.CODE,
+        title="Code",
+        status=WorkflowNodeExecutionStatus.SUCCEEDED,
+        outputs={"result": 1},
+        created_at=naive_utc_now(),
+        finished_at=naive_utc_now(),
+    )
+    mocker.patch.object(WorkflowService, "_handle_single_step_result", return_value=node_execution)
+
+    app_model = MagicMock(spec=App)
+    app_model.id = "00000000-0000-0000-0000-00000000000a"
+    app_model.tenant_id = "00000000-0000-0000-0000-00000000000b"
+    draft_workflow = MagicMock(spec=Workflow)
+    draft_workflow.id = "00000000-0000-0000-0000-00000000000c"
+    draft_workflow.get_node_config_by_id.return_value = {"id": "code", "data": {"type": "code"}}
+    draft_workflow.get_enclosing_node_type_and_id.return_value = None
+    draft_workflow.environment_variables = []
+    account = MagicMock(spec=Account)
+    account.id = "00000000-0000-0000-0000-00000000000d"
+    account.current_tenant_id = app_model.tenant_id
+
+    workflow_node_execution = WorkflowService(
+        sessionmaker(bind=engine, expire_on_commit=False)
+    ).run_draft_workflow_node(
+        app_model=app_model, draft_workflow=draft_workflow, node_id="code", user_inputs={}, account=account
+    )
+
+    assert workflow_node_execution.id == node_execution.id
+    assert workflow_node_execution.outputs_dict == {"result": 1}
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Per-node scheduling overhead benchmark for the workflow GraphEngine.
+
+Runs a long linear chain of trivial variable aggregator nodes (start -> N aggregators -> end)
+in-process and reports the wall time per node transition, which is dominated by dispatcher and
+worker scheduling rather than by node execution.
+
+Usage (from the repository root):
+    python scripts/stress-test/graph_engine_scheduling_benchmark.py --nodes 500 --runs 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+API_ROOT = Path(__file__).resolve().parents[2] / "api"
+
+
+def build_graph_config(node_count: int) -> dict:
+    nodes = [
+        {
+            "id": "start",
+            "data": {
+                "type": "start",
+                "title": "Start",
+                "variables": [{"variable": "query", "label": "query", "type": "text-input", "required": True}],
+            },
+        }
+    ]
+    edges = []
+    previous = "start"
+    for i in range(node_count):
+        node_id = f"aggregator_{i}"
+        nodes.append(
+            {
+                "id": node_id,
+                "data": {
+                    "type": "variable-aggregator",
+                    "title": f"Aggregator {i}",
+                    "output_type": "string",
+                    "variables": [["start", "query"]],
+                },
+            }
+        )
+        edges.append({"id": f"{previous}-{node_id}", "source": previous, "target": node_id})
+        previous = node_id
+
+    nodes.append(
+        {
+            "id": "end",
+            "data": {
+                "type": "end",
+                "title": "End",
+                "outputs": [{"variable": "query", "value_selector": [previous, "output"]}],
+            },
+        }
+    )
+    edges.append({"id": f"{previous}-end", "source": previous, "target": "end"})
+    return {"nodes": nodes, "edges": edges}
+
+
+def run_once(node_count: int) -> float:
+    from core.workflow.entities import GraphInitParams, GraphRuntimeState, VariablePool
+    from core.workflow.graph import Graph
+    from core.workflow.graph_engine import GraphEngine
+    from core.workflow.graph_engine.command_channels import InMemoryChannel
+    from core.workflow.graph_events import GraphRunSucceededEvent
+    from core.workflow.nodes.node_factory import DifyNodeFactory
+    from core.workflow.system_variable import SystemVariable
+
+    graph_config = build_graph_config(node_count)
+    graph_init_params = GraphInitParams(
+        tenant_id="tenant",
+        app_id="app",
+        workflow_id="workflow",
+        graph_config=graph_config,
+        user_id="user",
+        user_from="account",
+        invoke_from="debugger",
+        call_depth=0,
+    )
+    variable_pool = VariablePool(
+        system_variables=SystemVariable(user_id="user", app_id="app", workflow_id="workflow", files=[]),
+        user_inputs={"query": "hello"},
+    )
+    graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
+    node_factory = DifyNodeFactory(graph_init_params=graph_init_params, graph_runtime_state=graph_runtime_state)
+    graph = Graph.init(graph_config=graph_config, node_factory=node_factory)
+
+    engine = GraphEngine(
+        workflow_id="workflow",
+        graph=graph,
+        graph_runtime_state=graph_runtime_state,
+        command_channel=InMemoryChannel(),
+    )
+
+    started = time.perf_counter()
+    events = list(engine.run())
+    elapsed = time.perf_counter() - started
+    if not isinstance(events[-1], GraphRunSucceededEvent):
+        raise RuntimeError(f"workflow did not succeed: {events[-1]}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=200, help="number of chained aggregator nodes")
+    parser.add_argument("--runs", type=int, default=5, help="number of measured runs")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(API_ROOT))
+
+    # warm up imports and node classes
+    run_once(2)
+
+    durations = [run_once(args.nodes) for _ in range(args.runs)]
+    transitions = args.nodes + 2
+    median = statistics.median(durations)
+    print(f"{args.nodes} chained nodes, {args.runs} runs")
+    print(f"median run: {median * 1000:.1f} ms, min run: {min(durations) * 1000:.1f} ms")
+    print(f"per node transition: {median / transitions * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Concurrent LLM stream capacity benchmark for the plugin daemon clients.
+
+Starts a local stub plugin daemon that streams LLM chunks with a fixed delay, then runs the same
+number of concurrent `invoke_llm` streams through the blocking `PluginModelClient` (one thread per
+stream) and through the asyncio `AsyncPluginModelClient` (one event loop), reporting wall time,
+chunk throughput and peak thread count.
+
+Usage (from the repository root):
+    python scripts/stress-test/plugin_stream_benchmark.py --streams 500 --chunks 20 --delay 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+API_ROOT = Path(__file__).resolve().parents[2] / "api"
+
+
+def _chunk_line(index: int) -> bytes:
+    chunk = {
+        "model": "stub",
+        "prompt_messages": [],
+        "delta": {"index": index, "message": {"role": "assistant", "content": f"token-{index} "}},
+    }
+    return b"data: " + json.dumps({"code": 0, "message": "", "data": chunk}).encode() + b"\n\n"
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, chunks: int, delay: float):
+    lines = [_chunk_line(i) for i in range(chunks)]
+    content_length = sum(len(line) for line in lines)
+    try:
+        # keep-alive: serve requests until the client closes the connection
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            body_length = 0
+            for header in head.decode("latin-1").split("\r\n"):
+                name, _, value = header.partition(":")
+                if name.lower() == "content-length":
+                    body_length = int(value)
+            if body_length:
+                await reader.readexactly(body_length)
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                + f"Content-Length: {content_length}\r\n\r\n".encode()
+            )
+            for line in lines:
+                await asyncio.sleep(delay)
+                writer.write(line)
+                await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def start_stub_daemon(chunks: int, delay: float) -> int:
+    """Run the stub daemon on its own event loop thread and return its port."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(4096)
+    port = sock.getsockname()[1]
+
+    async def serve():
+        server = await asyncio.start_server(
+            lambda reader, writer: _handle_connection(reader, writer, chunks, delay), sock=sock
+        )
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    return port
+
+
+def _invoke_kwargs() -> dict:
+    from core.model_runtime.entities.message_entities import UserPromptMessage
+
+    return {
+        "tenant_id": "tenant",
+        "user_id": "user",
+        "plugin_id": "stub/stub",
+        "provider": "stub",
+        "model": "stub",
+        "credentials": {},
+        "prompt_messages": [UserPromptMessage(content="hello")],
+    }
+
+
+def run_sync(streams: int) -> tuple[float, int, int]:
+    from core.plugin.impl.model import PluginModelClient
+
+    client = PluginModelClient()
+    kwargs = _invoke_kwargs()
+    peak_threads = 0
+
+    def consume() -> int:
+        nonlocal peak_threads
+        peak_threads = max(peak_threads, threading.active_count())
+        return sum(1 for _ in client.invoke_llm(**kwargs))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=streams) as executor:
+        total_chunks = sum(executor.map(lambda _: consume(), range(streams)))
+    return time.perf_counter() - started, total_chunks, peak_threads
+
+
+def run_async(streams: int) -> tuple[float, int, int]:
+    from core.plugin.impl.model import AsyncPluginModelClient
+
+    client = AsyncPluginModelClient()
+    kwargs = _invoke_kwargs()
+
+    async def consume() -> int:
+        return len([chunk async for chunk in client.invoke_llm(**kwargs)])
+
+    async def main() -> int:
+        return sum(await asyncio.gather(*(consume() for _ in range(streams))))
+
+    started = time.perf_counter()
+    total_chunks = asyncio.run(main())
+    return time.perf_counter() - started, total_chunks, threading.active_count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=200, help="number of concurrent streams")
+    parser.add_argument("--chunks", type=int, default=20, help="chunks per stream")
+    parser.add_argument("--delay", type=float, default=0.05, help="delay in seconds between chunks")
+    args = parser.parse_args()
+
+    port = start_stub_daemon(args.chunks, args.delay)
+    os.environ["PLUGIN_DAEMON_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("PLUGIN_DAEMON_POOL_MAX_CONNECTIONS", str(args.streams))
+    os.environ.setdefault("PLUGIN_DAEMON_POOL_MAX_KEEPALIVE_CONNECTIONS", str(args.streams))
+    sys.path.insert(0, str(API_ROOT))
+
+    ideal = args.chunks * args.delay
+    print(f"{args.streams} streams x {args.chunks} chunks, ideal stream duration {ideal:.2f}s")
+    for name, runner in (("sync", run_sync), ("async", run_async)):
+        elapsed, total_chunks, threads = runner(args.streams)
+        print(
+            f"{name:>5}: {elapsed:6.2f}s wall, {total_chunks / elapsed:9.1f} chunks/s, "
+            f"{threads} threads, {total_chunks} chunks"
+        )
+
+
+if __name__ == "__main__":
+    main()
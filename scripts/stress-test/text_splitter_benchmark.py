@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the recursive text splitters used by dataset indexing.
+
+Generates multi-megabyte synthetic documents (paragraphs of short lines of words, plus a
+document without any line break, which puts thousands of words into each merge window) and
+splits them with the splitters built by the index processors, reporting wall time, MB/s and
+chunk count per document size.
+
+Usage (from the repository root):
+    python scripts/stress-test/text_splitter_benchmark.py --sizes 1 4 16 --chunk-size 1000 --overlap 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+API_ROOT = Path(__file__).resolve().parents[2] / "api"
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do", "eiusmod"]
+
+
+def generate_text(size: int, line_breaks: bool, seed: int = 0) -> str:
+    """Generate about `size` characters of words, in paragraphs of lines when `line_breaks` is set."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        if not line_breaks:
+            separator = " "
+        else:
+            roll = rng.random()
+            separator = "\n\n" if roll < 0.01 else "\n" if roll < 0.1 else " "
+        parts.append(word)
+        parts.append(separator)
+        length += len(word) + len(separator)
+    return "".join(parts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 16], help="document sizes in MB")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="maximum chunk size in characters")
+    parser.add_argument("--overlap", type=int, default=200, help="chunk overlap in characters")
+    parser.add_argument("--runs", type=int, default=3, help="runs per document, the median is reported")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(API_ROOT))
+    from core.rag.splitter.fixed_text_splitter import (
+        EnhanceRecursiveCharacterTextSplitter,
+        FixedRecursiveCharacterTextSplitter,
+    )
+
+    splitters = {
+        # automatic and hierarchical modes
+        "enhance recursive": EnhanceRecursiveCharacterTextSplitter.from_encoder(
+            embedding_model_instance=None,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.overlap,
+            separators=["\n\n", "。", ". ", " ", ""],
+        ),
+        # custom mode
+        "fixed recursive": FixedRecursiveCharacterTextSplitter.from_encoder(
+            embedding_model_instance=None,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.overlap,
+            fixed_separator="\n\n",
+            separators=["\n\n", "。", ". ", " ", ""],
+        ),
+    }
+
+    print(f"{'splitter':<18} {'document':<14} {'MB':>6} {'chunks':>8} {'seconds':>9} {'MB/s':>8}")
+    for size_mb in args.sizes:
+        size = int(size_mb * 1024 * 1024)
+        documents = {
+            "paragraphs": generate_text(size, line_breaks=True),
+            "single line": generate_text(size, line_breaks=False),
+        }
+        for document_name, text in documents.items():
+            for splitter_name, splitter in splitters.items():
+                timings = []
+                chunks: list[str] = []
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    chunks = splitter.split_text(text)
+                    timings.append(time.perf_counter() - start)
+                seconds = statistics.median(timings)
+                print(
+                    f"{splitter_name:<18} {document_name:<14} {size_mb:>6g} {len(chunks):>8} "
+                    f"{seconds:>9.3f} {size_mb / seconds:>8.2f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())